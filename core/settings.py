@@ -60,6 +60,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "core",
     "resume",
     "crispy_forms",
@@ -74,6 +75,8 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "resume.middleware.LLMMeteringMiddleware",
+    "resume.middleware.RequestDeadlineMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -243,6 +246,9 @@ CRISPY_ALLOWED_TEMPLATE_PACKS = "bootstrap4"
 CRISPY_TEMPLATE_PACK = "bootstrap4"
 
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
+# Optional: point the engine at an OpenAI-compatible server, e.g. the local
+# stub started with `python manage.py openai_stub` (http://127.0.0.1:8765/v1)
+OPENAI_BASE_URL = os.environ.get("OPENAI_BASE_URL") or None
 
 # TODO: Convert to template selector map (faangpath-simple: faangpath_simple_template.tex, cls)
 # LATEX_SETTINGS = {
@@ -275,6 +281,17 @@ PDF_SETTINGS = {
     "FONT_CONFIG": True,
 }
 
+# Text extraction from uploaded PDFs (see resume/services/import_service.py)
+PDF_TEXT_EXTRACTION = {
+    "max_pages": 20,  # Pages beyond this are ignored
+    "time_budget_seconds": 15,  # Return the pages finished by then
+    "max_workers": 4,  # Process pool size for per-page extraction
+    "parallel_min_pages": 4,  # Shorter PDFs are extracted inline
+    "layout": True,  # Rebuild reading order of multi-column pages from text positions
+    # Less text than this (scanned/blank PDF) is never escalated to a stronger model
+    "min_text_chars": 50,
+}
+
 # Subscription Tier Limits
 FREE_TIER_LIMITS = {
     "import_count": 2,  # Monthly PDF imports
@@ -284,10 +301,171 @@ FREE_TIER_LIMITS = {
     "agent_message_count": 10,  # Monthly agent chat messages
 }
 
+# LLM routing: per-task model cascade (fastest first) and output token budget.
+# send_openai_message(task=...) escalates to the next model only when the
+# response fails validation (bad JSON, missing keys, invalid patch, ...).
+LLM_TASK_POLICIES = {
+    "default": {"models": ["gpt-4o-mini"], "max_tokens": None},
+    "classify_intent": {"models": ["gpt-4.1-nano", "gpt-4o-mini"], "max_tokens": 400},
+    "enhance_experience": {"models": ["gpt-4o-mini"], "max_tokens": 1500},
+    "enhance_project": {"models": ["gpt-4o-mini"], "max_tokens": 1500},
+    "extract_resume": {"models": ["gpt-4o-mini", "gpt-4o"], "max_tokens": 6000},
+    "extract_linkedin": {"models": ["gpt-4o-mini", "gpt-4o"], "max_tokens": 6000},
+    "extract_resume_section": {"models": ["gpt-4o-mini", "gpt-4o"], "max_tokens": 4000},
+    "modify_resume_patch": {"models": ["gpt-4o-mini"], "max_tokens": 1500},
+    "modify_resume": {"models": ["gpt-4o-mini", "gpt-4o"], "max_tokens": 4000},
+    "analyze_resume": {"models": ["gpt-4o-mini"], "max_tokens": 600},
+    "compare_resumes": {"models": ["gpt-4o-mini"], "max_tokens": 300},
+    "translate_resume_section": {
+        "models": ["gpt-4o-mini", "gpt-4o"],
+        "max_tokens": 3000,
+    },
+}
+
+# Batch AI enhancement ("enhance all" endpoint)
+ENHANCE_BATCH_SETTINGS = {
+    "max_concurrency": 4,  # Concurrent OpenAI requests per batch
+    "max_entries": 20,  # Maximum descriptions per batch
+}
+
+# Section-chunked resume extraction for long CVs (see extract_resume_data)
+RESUME_CHUNKED_EXTRACTION = {
+    "enabled": True,
+    "min_chars": 8000,  # Shorter resumes are extracted in one call
+    "max_concurrency": 5,  # Concurrent section requests per resume
+}
+
+# Background PDF import jobs (see resume/services/import_jobs.py)
+IMPORT_JOBS = {
+    "max_workers": 2,  # Concurrent imports per web worker process
+    "stale_after_seconds": 300,  # Queued/running jobs idle this long can be retried
+    "eager": False,  # Run jobs inline in the request (tests, debugging)
+}
+
+# Multi-file bulk import (see resume/services/bulk_import.py)
+BULK_IMPORT = {
+    "max_files": 20,  # PDFs per batch, counting ZIP members
+    "max_file_size": 5 * 1024 * 1024,  # Per PDF, same as single uploads
+    "max_zip_size": 50 * 1024 * 1024,  # Per uploaded ZIP
+    "max_zip_uncompressed_size": 100 * 1024 * 1024,  # Declared PDF sizes, all ZIPs
+}
+
+# LLM usage metering (see resume/services/llm_metering.py)
+LLM_METERING = {
+    "enabled": os.environ.get("LLM_METERING_ENABLED", "True").lower() == "true",
+    "batch_size": 50,  # Flush after this many buffered calls
+    "flush_interval_seconds": 30,  # ...or when the oldest buffered call is this old
+    # Latency rows read into Python for percentiles on non-PostgreSQL databases
+    "report_max_latency_rows": 50000,
+    # USD per 1M tokens, used for cost estimates in reports
+    "pricing_per_1m_tokens": {
+        "gpt-4.1-nano": {"input": 0.10, "cached_input": 0.025, "output": 0.40},
+        "gpt-4o-mini": {"input": 0.15, "cached_input": 0.075, "output": 0.60},
+        "gpt-4o": {"input": 2.50, "cached_input": 1.25, "output": 10.00},
+    },
+}
+
+# Single-flight coalescing of identical concurrent LLM calls
+# (see resume/services/llm_singleflight.py)
+LLM_SINGLE_FLIGHT = {
+    "enabled": os.environ.get("LLM_SINGLE_FLIGHT_ENABLED", "True").lower() == "true",
+    "shared": True,  # Coordinate across workers through the LLMInflightCall table
+    "lock_timeout_seconds": 150,  # A crashed leader's lock expires after this
+    "wait_timeout_seconds": 120,  # Followers give up and call upstream themselves
+    "poll_interval_seconds": 0.25,  # How often followers in other workers re-check
+    "result_ttl_seconds": 10,  # Late duplicates (client retries) reuse the result
+}
+
+# Reuse of LLM intent classifications for repeated agent messages
+# (see resume/services/intent_cache.py)
+AGENT_CLASSIFY_CACHE = {
+    "enabled": os.environ.get("AGENT_CLASSIFY_CACHE_ENABLED", "True").lower() == "true",
+    "ttl_seconds": 300,  # Keep answers short-lived; context changes also change the key
+}
+
+# Per-user context appended to the intent classification prompt
+AGENT_CLASSIFY_PROMPT = {
+    "max_resumes": 15,  # Most recent resumes listed (the active one is always added)
+    "max_active_experiences": 5,  # Experiences summarized for the active resume
+}
+
+# Local intent classifier trained on logged classifications
+# (see resume/services/intent_classifier.py and train_intent_classifier)
+LOCAL_INTENT_CLASSIFIER = {
+    "enabled": (
+        os.environ.get("LOCAL_INTENT_CLASSIFIER_ENABLED", "True").lower() == "true"
+    ),
+    "log_enabled": True,  # Store parser/LLM/local classifications as training data
+    "max_message_length": 1000,  # Longer messages are truncated in the log
+    "log_retention_days": 90,  # Older logged messages are deleted; 0 keeps them
+    "confidence_threshold": 0.9,  # Below this the LLM classifies the message
+    "reload_interval_seconds": 300,  # How often workers look for a newer model
+    # Training (manage.py train_intent_classifier)
+    "min_samples": 200,  # Refuse to train on less data than this
+    "max_samples": 50000,  # Newest logged messages used
+    "min_label_confidence": 0.7,  # Skip LLM labels the model itself was unsure of
+    "epochs": 8,
+    "learning_rate": 0.5,
+    "l2": 1e-5,
+    "min_feature_count": 2,  # N-grams seen in fewer messages are dropped
+}
+
+# Multi-intent agent messages ("analyze resume 1 and 2")
+AGENT_PLAN = {
+    "max_steps": 5,  # Steps beyond this are dropped
+    "max_concurrency": 4,  # Independent steps run at the same time
+}
+
+# Time budgets for requests that chain LLM calls (see resume/services/deadline.py)
+LLM_DEADLINES = {
+    "enabled": os.environ.get("LLM_DEADLINES_ENABLED", "True").lower() == "true",
+    "call_timeout_seconds": 90,  # Upper bound for one upstream call
+    "min_call_seconds": 5,  # Calls are not started with less budget left
+    # Per-view budgets by URL name; keep them below gunicorn's --timeout (120 s)
+    "views": {"agent_chat": 100, "analysis_suggestions": 60, "compare_summary": 60},
+    "modify_fallback_seconds": 30,  # Left budget a full-document modify retry needs
+    "plan_step_seconds": 10,  # Left budget a multi-intent plan needs per wave
+}
+
+# analyze_resume: local scores plus optional LLM suggestions
+# (see resume/services/resume_scoring.py)
+ANALYZE_RESUME = {
+    # Fetch qualitative LLM suggestions after the scores are shown
+    "llm_suggestions": True,
+    "max_suggestions": 3,
+    "cache_ttl_seconds": 24 * 3600,  # Analyses are cached by content hash
+}
+
+# compare_resumes: local structural diff (see resume/services/resume_diff.py)
+COMPARE_RESUMES = {
+    "llm_summary": True,  # Fetch an LLM-written summary after the diff is shown
+    "cache_ttl_seconds": 24 * 3600,  # Summaries are cached by diff
+}
+
+# Resume translation by section with a shared translation memory
+# (see resume/services/resume_translation.py)
+RESUME_TRANSLATION = {
+    "max_concurrency": 4,  # Section batches translated at the same time
+    "max_strings_per_call": 40,  # Strings per LLM request
+    "memory_enabled": True,  # Reuse and store translations in TranslationMemory
+    "memory_max_chars": 120,  # Longer strings (bullets) are not stored
+    "min_users_to_share": 3,  # Users that must agree before others reuse an entry
+}
+
+# Indexed resume search for find_resume and /api/v1/resumes/search/
+# (see resume/services/resume_search.py)
+RESUME_SEARCH = {
+    "max_results": 20,  # Resumes returned per query
+    "fuzzy": True,  # Also match typos via pg_trgm word similarity (PostgreSQL)
+}
+
 # Agent Chat Rate Limiting
 AGENT_CHAT_RATE_LIMIT = {
     "max_requests": 20,  # Maximum requests per window
     "window_seconds": 60,  # Time window in seconds
+    # One-use follow-up links in agent replies (LLM suggestions and summaries)
+    # expire after this
+    "followup_ttl_seconds": 600,
 }
 
 # Cache backend (required for rate limiting)
@@ -1,5 +1,19 @@
 from django.contrib import admin
-from .models import Resume, Feedback, UserProfile
+from django.template.response import TemplateResponse
+from django.urls import path
+
+from .models import (
+    Resume,
+    ResumeImport,
+    Feedback,
+    UserProfile,
+    LLMUsageRecord,
+    LLMUsageDaily,
+    IntentClassification,
+    IntentClassifierModel,
+    TranslationMemory,
+)
+from .services.llm_metering import estimate_cost, usage_meter, usage_report
 
 # Register your models here.
 
@@ -12,6 +26,14 @@ class ResumeAdmin(admin.ModelAdmin):
     date_hierarchy = "created_at"
 
 
+@admin.register(ResumeImport)
+class ResumeImportAdmin(admin.ModelAdmin):
+    list_display = ("user", "source", "file_name", "resume", "created_at")
+    list_filter = ("source", "created_at")
+    search_fields = ("user__username", "file_name", "content_hash")
+    raw_id_fields = ("user", "resume")
+
+
 @admin.register(Feedback)
 class FeedbackAdmin(admin.ModelAdmin):
     list_display = ("user", "rating", "page", "created_at")
@@ -33,3 +55,107 @@ class UserProfileAdmin(admin.ModelAdmin):
     list_editable = ("tier",)
     search_fields = ("user__username", "user__email")
     list_filter = ("tier", "quota_reset_date")
+
+
+@admin.register(LLMUsageRecord)
+class LLMUsageRecordAdmin(admin.ModelAdmin):
+    list_display = (
+        "created_at",
+        "user",
+        "intent",
+        "call_site",
+        "model",
+        "prompt_tokens",
+        "cached_tokens",
+        "completion_tokens",
+        "latency_ms",
+        "success",
+    )
+    list_filter = ("intent", "model", "success", "created_at")
+    search_fields = ("user__username", "intent", "call_site")
+    date_hierarchy = "created_at"
+    change_list_template = "admin/resume/llmusagerecord/change_list.html"
+
+    def get_urls(self):
+        urls = [
+            path(
+                "report/",
+                self.admin_site.admin_view(self.report_view),
+                name="resume_llmusagerecord_report",
+            )
+        ]
+        return urls + super().get_urls()
+
+    def report_view(self, request):
+        """Cost and latency percentiles per intent, user or model."""
+        usage_meter.flush()
+        try:
+            days = int(request.GET.get("days", 7))
+        except ValueError:
+            days = 7
+        group_by = request.GET.get("by", "intent")
+        if group_by not in ("intent", "user", "model"):
+            group_by = "intent"
+
+        context = {
+            **self.admin_site.each_context(request),
+            "title": "LLM cost and latency",
+            "opts": self.model._meta,
+            "rows": usage_report(days=days, group_by=group_by),
+            "days": days,
+            "group_by": group_by,
+        }
+        return TemplateResponse(
+            request, "admin/resume/llmusagerecord/report.html", context
+        )
+
+
+@admin.register(LLMUsageDaily)
+class LLMUsageDailyAdmin(admin.ModelAdmin):
+    list_display = (
+        "date",
+        "user",
+        "intent",
+        "model",
+        "calls",
+        "errors",
+        "prompt_tokens",
+        "cached_tokens",
+        "completion_tokens",
+        "avg_latency_ms",
+        "estimated_cost",
+    )
+    list_filter = ("intent", "model", "date")
+    search_fields = ("user__username", "intent")
+    date_hierarchy = "date"
+
+    @admin.display(description="Cost ($)")
+    def estimated_cost(self, obj):
+        return round(
+            estimate_cost(
+                obj.model, obj.prompt_tokens, obj.completion_tokens, obj.cached_tokens
+            ),
+            4,
+        )
+
+
+@admin.register(IntentClassification)
+class IntentClassificationAdmin(admin.ModelAdmin):
+    list_display = ("created_at", "user", "intent", "source", "confidence", "message")
+    list_filter = ("source", "intent", "created_at")
+    search_fields = ("user__username", "message")
+    raw_id_fields = ("user",)
+    date_hierarchy = "created_at"
+
+
+@admin.register(IntentClassifierModel)
+class IntentClassifierModelAdmin(admin.ModelAdmin):
+    list_display = ("pk", "created_at", "samples", "metrics")
+    exclude = ("weights", "bias")
+
+
+@admin.register(TranslationMemory)
+class TranslationMemoryAdmin(admin.ModelAdmin):
+    list_display = ("source_text", "target_language", "translated_text", "created_at")
+    list_filter = ("target_language",)
+    search_fields = ("source_text", "translated_text")
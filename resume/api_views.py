@@ -12,9 +12,12 @@ from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
 
-from .models import Resume, Feedback
+from .models import Resume, Feedback, ResumeImport
+from .services.bulk_import import BulkImportError, run_bulk_import
+from .services.resume_search import search_resumes, search_terms
 from .serializers import (
     ResumeListSerializer,
     ResumeDetailSerializer,
@@ -46,6 +49,8 @@ class ResumeViewSet(viewsets.ModelViewSet):
     update: PUT /api/v1/resumes/{id}/ - Full update
     partial_update: PATCH /api/v1/resumes/{id}/ - Partial update
     destroy: DELETE /api/v1/resumes/{id}/ - Delete resume
+    bulk_import: POST /api/v1/resumes/bulk-import/ - Import several PDFs or a ZIP
+    search: GET /api/v1/resumes/search/?q=... - Search resume content
     """
 
     permission_classes = [permissions.IsAuthenticated, IsOwnerOrReadOnly]
@@ -106,6 +111,55 @@ class ResumeViewSet(viewsets.ModelViewSet):
         serializer = ResumeDetailSerializer(new_resume)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
+    @action(detail=False, methods=["get"])
+    def search(self, request):
+        """
+        Search the current user's resumes by skills, companies, titles and bullets.
+        GET /api/v1/resumes/search/?q=python
+        Accent-insensitive ("muhendis" finds "Mühendis"), best match first.
+        """
+        query = (request.query_params.get("q") or "").strip()
+        if not search_terms(query):
+            return Response(
+                {"error": "Query parameter 'q' is required."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        resumes = search_resumes(self.get_queryset(), query)
+        return Response(ResumeListSerializer(resumes, many=True).data)
+
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="bulk-import",
+        parser_classes=[MultiPartParser],
+    )
+    def bulk_import(self, request):
+        """
+        Import several resume PDFs (or ZIP archives of PDFs) in one request.
+        POST /api/v1/resumes/bulk-import/ with multipart "files" and optional "source".
+        Returns 202 with an import job id per new file to poll for progress.
+        QUOTA: Checked once for the whole batch; rejected batches import nothing.
+        """
+        source = request.data.get("source", ResumeImport.SOURCE_PDF)
+        if source not in dict(ResumeImport.SOURCE_CHOICES):
+            return Response(
+                {"error": "Invalid source."}, status=status.HTTP_400_BAD_REQUEST
+            )
+        files = request.FILES.getlist("files")
+        if not files:
+            return Response(
+                {"error": "No files uploaded."}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            result = run_bulk_import(request.user, files, source=source)
+        except BulkImportError as e:
+            return Response({"error": str(e)}, status=e.status)
+        return Response(
+            result.as_dict(),
+            status=status.HTTP_202_ACCEPTED if result.job_ids else status.HTTP_200_OK,
+        )
+
 
 @require_http_methods(["POST"])
 def submit_feedback(request):
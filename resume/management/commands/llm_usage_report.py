@@ -0,0 +1,62 @@
+"""
+Django management command to report LLM token cost and latency percentiles.
+"""
+
+from django.core.management.base import BaseCommand
+
+from resume.services.llm_metering import usage_meter, usage_report
+
+
+class Command(BaseCommand):
+    """Print per-intent, per-user or per-model LLM cost and latency."""
+
+    help = "Report LLM token usage, estimated cost and latency percentiles"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=7,
+            help="Number of days to include (default: 7)",
+        )
+        parser.add_argument(
+            "--by",
+            choices=["intent", "user", "model"],
+            default="intent",
+            help="Group rows by intent, user or model (default: intent)",
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=20,
+            help="Show at most this many rows, most expensive first (default: 20)",
+        )
+
+    def handle(self, *args, **options):
+        # Include anything still buffered in this process.
+        usage_meter.flush()
+        rows = usage_report(days=options["days"], group_by=options["by"])
+        if not rows:
+            self.stdout.write("No LLM usage recorded in this period.")
+            return
+
+        header = (
+            f"{options['by']:<32} {'calls':>7} {'errors':>6} {'prompt':>10} "
+            f"{'cached':>9} {'output':>9} {'cost $':>9} {'p50 ms':>7} {'p95 ms':>7} {'p99 ms':>7}"
+        )
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+        for row in rows[: options["limit"]]:
+            self.stdout.write(
+                f"{str(row['key'])[:32]:<32} {row['calls']:>7} {row['errors']:>6} "
+                f"{row['prompt_tokens']:>10} {row['cached_tokens']:>9} "
+                f"{row['completion_tokens']:>9} {row['cost_usd']:>9.4f} "
+                f"{row['p50_ms']:>7} {row['p95_ms']:>7} {row['p99_ms']:>7}"
+            )
+
+        total_cost = sum(row["cost_usd"] for row in rows)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Total estimated cost over {options['days']} days: ${total_cost:.4f}"
+            )
+        )
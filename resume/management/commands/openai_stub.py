@@ -0,0 +1,46 @@
+"""
+Django management command to run the local OpenAI-compatible stub server.
+
+Point the app at it with OPENAI_BASE_URL=http://127.0.0.1:8765/v1.
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from resume.services.openai_stub import add_stub_arguments, make_server, state_from_options
+
+
+class Command(BaseCommand):
+    """Serve /v1/chat/completions locally with record/replay and latency profiles."""
+
+    help = "Run a local OpenAI-compatible stub server for load tests and offline development"
+
+    def add_arguments(self, parser):
+        add_stub_arguments(parser)
+
+    def handle(self, *args, **options):
+        if options["mode"] == "record" and not settings.OPENAI_API_KEY:
+            raise CommandError("Record mode needs OPENAI_API_KEY to reach the real API.")
+        if options["mode"] in ("record", "replay") and not options["recordings_dir"]:
+            raise CommandError(f"--recordings-dir is required in {options['mode']} mode.")
+
+        try:
+            state = state_from_options(options, settings.OPENAI_API_KEY)
+            server = make_server(options["host"], options["port"], state)
+        except (ValueError, OSError) as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"OpenAI stub ({options['mode']}) listening on "
+                f"http://{options['host']}:{options['port']}/v1"
+            )
+        )
+        self.stdout.write(f"Set OPENAI_BASE_URL=http://{options['host']}:{options['port']}/v1")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            self.stdout.write("Stopping stub server.")
+        finally:
+            server.server_close()
+            self.stdout.write(f"Stats: {state.stats}")
@@ -0,0 +1,102 @@
+"""
+Django management command to train the local intent classifier.
+"""
+
+import random
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from resume.models import IntentClassifierModel
+from resume.services.intent_classifier import (
+    evaluate,
+    prune_classifications,
+    train_model,
+    training_samples,
+)
+
+
+class Command(BaseCommand):
+    """Fit the local intent classifier on logged classifications and save it."""
+
+    help = "Train the local intent classifier on logged agent classifications"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--holdout",
+            type=float,
+            default=0.1,
+            help="Fraction of samples kept aside for evaluation (default: 0.1)",
+        )
+        parser.add_argument(
+            "--epochs",
+            type=int,
+            default=None,
+            help="Training epochs (default: LOCAL_INTENT_CLASSIFIER['epochs'])",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Train and evaluate without saving the model",
+        )
+        parser.add_argument(
+            "--prune-only",
+            action="store_true",
+            help="Delete logged messages past their retention period and exit",
+        )
+
+    def handle(self, *args, **options):
+        cfg = settings.LOCAL_INTENT_CLASSIFIER
+        if cfg["log_retention_days"] and not options["dry_run"]:
+            deleted = prune_classifications(cfg["log_retention_days"])
+            self.stdout.write(
+                f"Deleted {deleted} logged messages older than "
+                f"{cfg['log_retention_days']} days."
+            )
+        if options["prune_only"]:
+            return
+
+        samples = training_samples(cfg["max_samples"], cfg["min_label_confidence"])
+        if len(samples) < cfg["min_samples"]:
+            raise CommandError(
+                f"Only {len(samples)} labelled messages logged; "
+                f"at least {cfg['min_samples']} are needed."
+            )
+
+        random.Random(0).shuffle(samples)
+        split = int(len(samples) * (1 - options["holdout"]))
+        train, holdout = samples[:split], samples[split:]
+        self.stdout.write(
+            f"Training on {len(train)} messages, evaluating on {len(holdout)}..."
+        )
+
+        model = train_model(
+            train,
+            epochs=options["epochs"] or cfg["epochs"],
+            learning_rate=cfg["learning_rate"],
+            l2=cfg["l2"],
+            min_feature_count=cfg["min_feature_count"],
+        )
+        metrics = evaluate(model, holdout, cfg["confidence_threshold"])
+        self.stdout.write(
+            f"Holdout accuracy {metrics['accuracy']:.1%}; "
+            f"{metrics['coverage']:.1%} of messages clear the "
+            f"{cfg['confidence_threshold']} threshold with "
+            f"{metrics['confident_accuracy']:.1%} accuracy."
+        )
+        if options["dry_run"]:
+            return
+
+        record = IntentClassifierModel.objects.create(
+            labels=model.labels,
+            weights=model.weights,
+            bias=model.bias,
+            samples=len(train),
+            metrics=metrics,
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Saved intent classifier {record.pk} "
+                f"({len(model.labels)} intents, {len(model.weights)} features)."
+            )
+        )
@@ -0,0 +1,49 @@
+from django.conf import settings
+
+from resume.services.deadline import deadline_scope, set_deadline
+from resume.services.llm_metering import metering_scope, set_metering_intent
+
+
+class LLMMeteringMiddleware:
+    """
+    Attributes LLM calls made while handling a request to the request user
+    and, by default, to the URL name of the view (e.g. "upload_cv").
+    Must come after AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        # request.user is lazy; it is only resolved if an LLM call is recorded.
+        # The scope also restores the intent that process_view sets below.
+        with metering_scope(user=request.user, intent="request"):
+            return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if request.resolver_match and request.resolver_match.url_name:
+            set_metering_intent(request.resolver_match.url_name)
+        return None
+
+
+class RequestDeadlineMiddleware:
+    """
+    Starts the time budget LLM_DEADLINES["views"] sets for the matched view,
+    so the LLM calls it chains share one deadline instead of each getting a
+    full timeout (see resume/services/deadline.py).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with deadline_scope():
+            return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        cfg = settings.LLM_DEADLINES
+        match = request.resolver_match
+        seconds = cfg["views"].get(match.url_name) if match else None
+        if cfg["enabled"] and seconds:
+            set_deadline(seconds)
+        return None
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.16 on 2026-10-19 13:54
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('resume', '0010_llm_inflight_call'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeImport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(choices=[('pdf', 'PDF'), ('linkedin', 'LinkedIn')], max_length=20)),
+                ('content_hash', models.CharField(max_length=64)),
+                ('file_name', models.CharField(blank=True, default='', max_length=255)),
+                ('extracted_text', models.TextField(blank=True, default='')),
+                ('parsed_json', models.JSONField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('resume', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='imports', to='resume.resume')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='imports', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='resumeimport',
+            constraint=models.UniqueConstraint(fields=('user', 'source', 'content_hash'), name='unique_resume_import'),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 4.2.16 on 2026-10-19 14:25
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('resume', '0012_import_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IntentClassifierModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('labels', models.JSONField(default=list)),
+                ('weights', models.JSONField(default=dict)),
+                ('bias', models.JSONField(default=list)),
+                ('samples', models.IntegerField(default=0)),
+                ('metrics', models.JSONField(default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='IntentClassification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('message', models.TextField()),
+                ('intent', models.CharField(max_length=50)),
+                ('lang', models.CharField(blank=True, default='', max_length=5)),
+                ('source', models.CharField(choices=[('llm', 'LLM'), ('rules', 'Command parser'), ('local', 'Local model')], db_index=True, max_length=10)),
+                ('confidence', models.FloatField(blank=True, null=True)),
+                ('has_active_resume', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='intent_classifications', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 4.2.16 on 2026-10-19 14:53
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+from resume.services.resume_search import build_search_document
+
+SEARCH_INDEXES = [
+    django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.search.SearchVector('search_document', config='simple'), name='resume_search_vector_idx'),
+    django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass('search_document', name='gin_trgm_ops'), name='resume_search_trgm_idx'),
+]
+
+
+def fill_search_documents(apps, schema_editor):
+    Resume = apps.get_model('resume', 'Resume')
+    batch = []
+    for resume in Resume.objects.only('id', 'title', 'content').iterator(chunk_size=500):
+        resume.search_document = build_search_document(resume.title, resume.content)
+        batch.append(resume)
+        if len(batch) == 500:
+            Resume.objects.bulk_update(batch, ['search_document'])
+            batch = []
+    Resume.objects.bulk_update(batch, ['search_document'])
+
+
+def add_search_indexes(apps, schema_editor):
+    # GIN indexes are PostgreSQL-only; other databases search without them.
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    Resume = apps.get_model('resume', 'Resume')
+    for index in SEARCH_INDEXES:
+        schema_editor.add_index(Resume, index)
+
+
+def remove_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    Resume = apps.get_model('resume', 'Resume')
+    for index in SEARCH_INDEXES:
+        schema_editor.remove_index(Resume, index)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume', '0014_translation_memory'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='resume',
+            name='search_document',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(fill_search_documents, migrations.RunPython.noop),
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(model_name='resume', index=index)
+                for index in SEARCH_INDEXES
+            ],
+            database_operations=[
+                migrations.RunPython(add_search_indexes, remove_search_indexes),
+            ],
+        ),
+    ]
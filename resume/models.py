@@ -1,9 +1,13 @@
 from django.db import models
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVector
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from datetime import date
 
+from resume.services.resume_search import SEARCH_CONFIG, build_search_document
+
 
 User = get_user_model()
 
@@ -20,12 +24,33 @@ class Resume(models.Model):
     template_selector = models.CharField(max_length=50, default="faangpath-simple")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Folded search text, kept in sync by save() (see services/resume_search.py)
+    search_document = models.TextField(blank=True, default="", editable=False)
 
     # Optional: File field for the generated PDF if we want to store history later
     # pdf_file = models.FileField(upload_to="resumes/pdfs/", null=True, blank=True)
 
     _GENERIC_TITLES = {"My Resume", "New Resume", "Untitled Resume", ""}
 
+    class Meta:
+        indexes = [
+            GinIndex(
+                SearchVector("search_document", config=SEARCH_CONFIG),
+                name="resume_search_vector_idx",
+            ),
+            GinIndex(
+                OpClass("search_document", name="gin_trgm_ops"),
+                name="resume_search_trgm_idx",
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.search_document = build_search_document(self.title, self.content)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"title", "content"} & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "search_document"}
+        super().save(*args, **kwargs)
+
     @property
     def display_name(self):
         """
@@ -171,3 +196,291 @@ def create_user_profile(sender, instance, created, **kwargs):
     """Automatically create UserProfile when a new User is created."""
     if created:
         UserProfile.objects.create(user=instance)
+
+
+class LLMUsageRecord(models.Model):
+    """
+    One row per OpenAI call: token usage, latency and where it came from.
+    Written in batches by resume.services.llm_metering.
+    """
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="llm_usage",
+    )
+    intent = models.CharField(max_length=100, db_index=True)
+    call_site = models.CharField(max_length=100)
+    model = models.CharField(max_length=50)
+    prompt_tokens = models.IntegerField(default=0)
+    completion_tokens = models.IntegerField(default=0)
+    cached_tokens = models.IntegerField(default=0)
+    latency_ms = models.IntegerField(default=0)
+    success = models.BooleanField(default=True)
+    created_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.intent} ({self.model}) at {self.created_at:%Y-%m-%d %H:%M}"
+
+
+class LLMUsageDaily(models.Model):
+    """
+    Daily per-user, per-intent totals of LLMUsageRecord rows.
+    Kept up to date on every metering flush so reports don't scan raw records.
+    """
+
+    date = models.DateField()
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="llm_usage_daily",
+    )
+    intent = models.CharField(max_length=100)
+    model = models.CharField(max_length=50)
+    calls = models.IntegerField(default=0)
+    errors = models.IntegerField(default=0)
+    prompt_tokens = models.BigIntegerField(default=0)
+    completion_tokens = models.BigIntegerField(default=0)
+    cached_tokens = models.BigIntegerField(default=0)
+    total_latency_ms = models.BigIntegerField(default=0)
+
+    class Meta:
+        ordering = ["-date"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["date", "user", "intent", "model"],
+                name="unique_llm_usage_daily",
+            )
+        ]
+
+    @property
+    def avg_latency_ms(self):
+        return round(self.total_latency_ms / self.calls) if self.calls else 0
+
+    def __str__(self):
+        return f"{self.date} {self.user or 'anonymous'} {self.intent}"
+
+
+class LLMInflightCall(models.Model):
+    """
+    Shared lock table for single-flight LLM calls across workers.
+
+    The worker that inserts the row for a request fingerprint makes the
+    upstream call; others wait for `result` to be filled in. Rows expire and
+    are cleared by resume.services.llm_singleflight.
+    """
+
+    fingerprint = models.CharField(max_length=64, unique=True)
+    result = models.TextField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        state = "done" if self.result is not None else "in flight"
+        return f"{self.fingerprint[:12]} ({state})"
+
+
+class ResumeImport(models.Model):
+    """
+    One row per distinct PDF a user imported, keyed by SHA-256 of the file.
+
+    Keeps the extracted text and the parsed JSON so re-uploading the same file
+    reuses them instead of parsing the PDF and calling the LLM again, and so
+    the import quota is charged only once per file.
+    """
+
+    SOURCE_PDF = "pdf"
+    SOURCE_LINKEDIN = "linkedin"
+    SOURCE_CHOICES = [(SOURCE_PDF, "PDF"), (SOURCE_LINKEDIN, "LinkedIn")]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="imports")
+    source = models.CharField(max_length=20, choices=SOURCE_CHOICES)
+    content_hash = models.CharField(max_length=64)
+    file_name = models.CharField(max_length=255, blank=True, default="")
+    extracted_text = models.TextField(blank=True, default="")
+    parsed_json = models.JSONField(null=True, blank=True)
+    resume = models.ForeignKey(
+        Resume,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="imports",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "source", "content_hash"],
+                name="unique_resume_import",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.user} {self.source} {self.content_hash[:12]}"
+
+
+class ImportJob(models.Model):
+    """
+    A background PDF import run by resume.services.import_jobs.
+
+    Stages run in order and record start/finish events the client polls for.
+    Results of finished stages live on the ResumeImport row, so a failed job
+    retries from the first unfinished stage without a new upload.
+    """
+
+    STATUS_QUEUED = "queued"
+    STATUS_RUNNING = "running"
+    STATUS_SUCCEEDED = "succeeded"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, "Queued"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_SUCCEEDED, "Succeeded"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    STAGE_EXTRACT_TEXT = "extract_text"
+    STAGE_CALL_LLM = "call_llm"
+    STAGE_VALIDATE = "validate"
+    STAGE_CREATE_RESUME = "create_resume"
+    STAGES = [STAGE_EXTRACT_TEXT, STAGE_CALL_LLM, STAGE_VALIDATE, STAGE_CREATE_RESUME]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="import_jobs")
+    import_record = models.ForeignKey(
+        ResumeImport, on_delete=models.CASCADE, related_name="jobs"
+    )
+    upload = models.FileField(upload_to="imports/", blank=True)
+    status = models.CharField(
+        max_length=20, choices=STATUS_CHOICES, default=STATUS_QUEUED, db_index=True
+    )
+    stage = models.CharField(max_length=30, blank=True, default="")
+    progress = models.IntegerField(default=0)
+    error = models.TextField(blank=True, default="")
+    error_code = models.IntegerField(null=True, blank=True)
+    attempts = models.IntegerField(default=0)
+    events = models.JSONField(default=list)
+    resume = models.ForeignKey(
+        Resume,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="import_jobs",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    @property
+    def is_active(self):
+        return self.status in (self.STATUS_QUEUED, self.STATUS_RUNNING)
+
+    def __str__(self):
+        return f"Import job {self.pk} ({self.status})"
+
+
+class IntentClassification(models.Model):
+    """
+    One agent chat message and the intent it was classified as.
+
+    Messages labelled by the LLM or the command parser are the training data
+    for the local intent classifier (resume.services.intent_classifier).
+    """
+
+    SOURCE_LLM = "llm"
+    SOURCE_RULES = "rules"
+    SOURCE_LOCAL = "local"
+    SOURCE_CHOICES = [
+        (SOURCE_LLM, "LLM"),
+        (SOURCE_RULES, "Command parser"),
+        (SOURCE_LOCAL, "Local model"),
+    ]
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="intent_classifications",
+    )
+    message = models.TextField()
+    intent = models.CharField(max_length=50)
+    lang = models.CharField(max_length=5, blank=True, default="")
+    source = models.CharField(max_length=10, choices=SOURCE_CHOICES, db_index=True)
+    confidence = models.FloatField(null=True, blank=True)
+    has_active_resume = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.intent} ({self.source}): {self.message[:40]}"
+
+
+class IntentClassifierModel(models.Model):
+    """
+    A trained local intent classifier (see train_intent_classifier).
+    The newest row is the one served.
+    """
+
+    labels = models.JSONField(default=list)
+    weights = models.JSONField(default=dict)  # feature -> one weight per label
+    bias = models.JSONField(default=list)
+    samples = models.IntegerField(default=0)
+    metrics = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"Intent classifier {self.pk} ({self.samples} samples)"
+
+
+class TranslationMemory(models.Model):
+    """
+    A resume string as translated for one user.
+
+    Keyed by SHA-256 of the source text and the target language, so strings
+    that recur across resumes (skills, job titles, schools, degrees) are
+    translated once (see resume.services.resume_translation). A user reuses
+    their own entries; another user's translation is reused only after
+    RESUME_TRANSLATION["min_users_to_share"] users got the same one.
+    """
+
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="translation_memory"
+    )
+    source_hash = models.CharField(max_length=64)
+    target_language = models.CharField(max_length=32)
+    source_text = models.TextField()
+    translated_text = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "source_hash", "target_language"],
+                name="unique_translation_memory",
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["source_hash", "target_language"],
+                name="translation_memory_idx",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.source_text[:40]} -> {self.target_language}"
@@ -1,40 +1,189 @@
+import contextvars
+import json
 import logging
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
 from django.conf import settings
+from django.db import connections
 
 import openai
 from openai import OpenAI
 
+from resume.services import resume_sections
+from resume.services.deadline import capped, has_time_for, remaining
+from resume.services.llm_metering import current_user_id, usage_meter
+from resume.services.llm_singleflight import request_fingerprint, single_flight
+from resume.services.resume_preparse import merge_contact_hints, preparse_resume_text
+from resume.services.resume_sections import split_resume_sections
+
 logger = logging.getLogger(__name__)
-client = OpenAI(api_key=settings.OPENAI_API_KEY)
+client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
+
+
+def get_task_policy(task: str = None) -> dict:
+    """
+    Returns the routing policy for `task` from settings.LLM_TASK_POLICIES:
+    {"models": [fastest, ..., strongest], "max_tokens": int | None}.
+    Unknown or missing tasks use the "default" policy.
+    """
+    policies = settings.LLM_TASK_POLICIES
+    return policies.get(task) or policies["default"]
+
+
+def _is_valid_json(result: str) -> bool:
+    try:
+        json.loads(result)
+        return True
+    except (ValueError, TypeError):
+        return False
 
 
 def send_openai_message(
     user_message: str,
     meta_prompt: str = None,
-    model: str = "gpt-4o-mini",
+    model: str = None,
     is_json: bool = False,
     temperature: float = None,
     max_tokens: int = None,
+    call_site: str = None,
+    task: str = None,
+    validate=None,
 ):
     """
     Sends a message to the OpenAI API with a specified system prompt.
 
+    Model and token budget come from the task policy table (LLM_TASK_POLICIES)
+    unless passed explicitly. When a policy lists several models, the call
+    cascades from the fastest/cheapest to the next one whenever the response
+    fails validation; each escalation is logged.
+
+    Identical concurrent calls (same user, prompts, models and options) are
+    coalesced into one upstream request whose result is shared (see llm_singleflight).
+
     Parameters:
         user_message (str): The content provided by the user to be processed.
         meta_prompt (str): The system prompt to guide the assistant's response style.
                            Defaults to a generic "helpful assistant" if not specified.
-        model (str): The OpenAI model to use (default: "gpt-4o-mini").
+        model (str): The OpenAI model to use. Disables the cascade when given.
         is_json (bool): Whether to enforce JSON output format (default: False).
         temperature (float): Sampling temperature. Use 0 for deterministic outputs
                              (e.g. JSON extraction), ~0.7 for creative tasks.
         max_tokens (int): Maximum tokens to generate. Limits response length and
-                          reduces latency.
+                          reduces latency. Defaults to the task policy's budget.
+        call_site (str): Label recorded by usage metering. Defaults to the name of
+                         the calling function.
+        task (str): Key into LLM_TASK_POLICIES (e.g. "classify_intent").
+        validate (callable): Predicate on the response text; a falsy result escalates
+                             to the next model. Defaults to a JSON parse check when
+                             is_json is set.
 
     Returns:
         str: The response content generated by the OpenAI API, or an error message in case of an exception.
     """
     meta_prompt = meta_prompt if meta_prompt else "You are a helpful assistant."
+    call_site = call_site or sys._getframe(1).f_code.co_name
+    policy = get_task_policy(task)
+    models = [model] if model else policy["models"]
+    if max_tokens is None:
+        max_tokens = policy.get("max_tokens")
+    if validate is None and is_json:
+        validate = _is_valid_json
+
+    # Scoped to the user: a result shared between users would let one user's
+    # call stand in for another's and skip their quota.
+    key = request_fingerprint(
+        user=current_user_id(),
+        task=task,
+        models=models,
+        meta_prompt=meta_prompt,
+        user_message=user_message,
+        is_json=is_json,
+        temperature=temperature,
+        max_tokens=max_tokens,
+    )
+    return single_flight.do(
+        key,
+        partial(
+            _send_with_cascade,
+            user_message,
+            meta_prompt,
+            models,
+            is_json,
+            temperature,
+            max_tokens,
+            call_site,
+            task,
+            validate,
+        ),
+        shareable=lambda result: not is_error_response(result)
+        and (validate is None or validate(result)),
+    )
+
+
+DEADLINE_ERROR = "Error: Request deadline exceeded before the call could start"
+
+
+def _send_with_cascade(
+    user_message: str,
+    meta_prompt: str,
+    models: list,
+    is_json: bool,
+    temperature: float,
+    max_tokens: int,
+    call_site: str,
+    task: str,
+    validate,
+) -> str:
+    result = None
+    for index, current_model in enumerate(models):
+        if not has_time_for(settings.LLM_DEADLINES["min_call_seconds"]):
+            # Out of request budget: keep the answer we have, if any.
+            logger.warning(
+                "LLM deadline: task=%s call_site=%s skipping %s with %.1fs left",
+                task,
+                call_site,
+                current_model,
+                remaining(),
+            )
+            return result if result is not None else DEADLINE_ERROR
+        result = _send_once(
+            user_message,
+            meta_prompt,
+            current_model,
+            is_json,
+            temperature,
+            max_tokens,
+            call_site,
+        )
+        # API errors are returned as-is; escalation is only for bad answers.
+        if is_error_response(result) or validate is None or validate(result):
+            return result
+        if index + 1 < len(models):
+            logger.warning(
+                "LLM cascade: task=%s call_site=%s escalating %s -> %s after failed validation",
+                task,
+                call_site,
+                current_model,
+                models[index + 1],
+            )
+    return result
+
+
+def _send_once(
+    user_message: str,
+    meta_prompt: str,
+    model: str,
+    is_json: bool,
+    temperature: float,
+    max_tokens: int,
+    call_site: str,
+) -> str:
+    start = time.monotonic()
+    usage = None
+    success = False
 
     try:
         kwargs = {
@@ -52,12 +201,20 @@ def send_openai_message(
         if max_tokens is not None:
             kwargs["max_tokens"] = max_tokens
 
-        response = client.chat.completions.create(**kwargs, timeout=90)
+        # Under a request deadline a call gets only the time left, and the
+        # SDK's own retries are off: they would restart the full timeout.
+        api = client if remaining() is None else client.with_options(max_retries=0)
+        response = api.chat.completions.create(
+            **kwargs, timeout=capped(settings.LLM_DEADLINES["call_timeout_seconds"])
+        )
 
         if hasattr(response, "usage"):
             logger.info("OpenAI Usage: %s", response.usage)
+            usage = response.usage
 
-        return response.choices[0].message.content
+        content = response.choices[0].message.content
+        success = True
+        return content
 
     except openai.APIError as e:
         return f"OpenAI API returned an API Error: {e}"
@@ -65,6 +222,57 @@ def send_openai_message(
         return f"OpenAI API request exceeded rate limit: {e}"
     except Exception as e:
         return f"Error: {str(e)}"
+    finally:
+        usage_meter.record(
+            call_site=call_site,
+            model=model,
+            latency_ms=int((time.monotonic() - start) * 1000),
+            usage=usage,
+            success=success,
+        )
+
+
+def is_error_response(result: str) -> bool:
+    """
+    Returns True when a value returned by send_openai_message is an error string
+    rather than model output.
+    """
+    return not result or result.startswith("OpenAI API") or result.startswith("Error:")
+
+
+def run_concurrently(calls: list, max_workers: int = 4) -> list:
+    """
+    Runs independent LLM calls on a thread pool so the total wall time is roughly
+    that of the slowest call instead of the sum of all of them. Pool threads
+    close their DB connections (used by single-flight and metering) when done.
+
+    Parameters:
+        calls (list): Zero-argument callables, e.g. functools.partial wrappers around
+                      the helpers in this module.
+        max_workers (int): Upper bound on concurrent upstream requests.
+
+    Returns:
+        list: The return value of each call, in the same order as `calls`.
+    """
+    if not calls:
+        return []
+    if len(calls) == 1:
+        return [calls[0]()]
+
+    # Each call runs in a copy of the caller's context so usage metering still
+    # attributes it to the right user and intent.
+    contexts = [contextvars.copy_context() for _ in calls]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(calls))) as pool:
+        return list(pool.map(_run_in_pool_thread, contexts, calls))
+
+
+def _run_in_pool_thread(ctx, call):
+    try:
+        return ctx.run(call)
+    finally:
+        # With CONN_MAX_AGE, connections opened by a pool thread would
+        # otherwise stay open after the thread is gone.
+        connections.close_all()
 
 
 # TODO Convert class based structure
@@ -118,9 +326,8 @@ def enhance_resume_experience(user_message: str, language: str = None):
     return send_openai_message(
         user_message=user_message,
         meta_prompt=meta_prompt,
-        model="gpt-4o-mini",
+        task="enhance_experience",
         temperature=0.7,
-        max_tokens=1500,
     )
 
 
@@ -171,16 +378,284 @@ def enhance_project_description(user_message: str, language: str = None):
     return send_openai_message(
         user_message=user_message,
         meta_prompt=meta_prompt,
-        model="gpt-4o-mini",
+        task="enhance_project",
         temperature=0.7,
-        max_tokens=1500,
     )
 
 
+def _has_resume_data(result: str) -> bool:
+    """Validator for extraction output: JSON with at least a name or one experience."""
+    try:
+        parsed = json.loads(result)
+        has_name = bool((parsed.get("user_info", {}).get("full_name") or "").strip())
+        return has_name or bool(parsed.get("experience"))
+    except (ValueError, TypeError, AttributeError):
+        return False
+
+
+def _extraction_validator(raw_text: str):
+    """
+    Validator for extracting `raw_text`: _has_resume_data, or only JSON validity
+    when the PDF gave (almost) no text. A scanned or blank PDF yields no resume
+    data from any model, so escalating it to a stronger one only adds cost.
+    """
+    min_chars = settings.PDF_TEXT_EXTRACTION["min_text_chars"]
+    if len("".join((raw_text or "").split())) < min_chars:
+        return _is_valid_json
+    return _has_resume_data
+
+
+PRE_EXTRACTED_HEADER = "PRE-EXTRACTED FIELDS:"
+RESUME_TEXT_HEADER = "RESUME TEXT:"
+
+PRE_EXTRACTED_RULES = """
+    Pre-extracted input:
+    - The input may start with "PRE-EXTRACTED FIELDS:", a JSON object of contact fields
+      found by a deterministic parser. Use them as-is in "user_info"; they were removed
+      from the resume text that follows "RESUME TEXT:".
+    - Date ranges in the text are already normalized ("YYYY-MM to YYYY-MM" or
+      "YYYY-MM to Present"); copy them without reinterpreting.
+"""
+
+
+def _preparse_for_extraction(raw_text: str):
+    preparsed = preparse_resume_text(raw_text)
+    logger.info(
+        "Resume pre-parse: %d -> %d chars, hints=%s, date_ranges=%d",
+        preparsed.original_length,
+        len(preparsed.text),
+        sorted(preparsed.hints),
+        len(preparsed.date_ranges),
+    )
+    return preparsed
+
+
+def _extraction_message(text: str, hints: dict) -> str:
+    if not hints:
+        return f"{RESUME_TEXT_HEADER}\n{text}"
+    return (
+        f"{PRE_EXTRACTED_HEADER}\n{json.dumps(hints, ensure_ascii=False)}\n\n"
+        f"{RESUME_TEXT_HEADER}\n{text}"
+    )
+
+
+def _prepare_extraction_input(raw_text: str):
+    """
+    Runs the local pre-parser on resume text before an extraction prompt.
+
+    Returns:
+        tuple: (user_message for the LLM, contact hints to merge into the result)
+    """
+    preparsed = _preparse_for_extraction(raw_text)
+    return _extraction_message(preparsed.text, preparsed.hints), preparsed.hints
+
+
+def _merge_extraction_hints(result: str, hints: dict) -> str:
+    """Writes pre-extracted contact fields over the model's values in `result`."""
+    if not hints or not _is_valid_json(result):
+        return result
+    parsed = json.loads(result)
+    if not isinstance(parsed, dict):
+        return result
+    return json.dumps(merge_contact_hints(parsed, hints), ensure_ascii=False)
+
+
+SECTION_EXTRACTION_RULES = """
+    Rules:
+    - Return only the keys shown above, as a JSON object.
+    - Always output dates in YYYY-MM format. If only a year is given (e.g. "2022"),
+      output "2022-01". If "Present" or "Current", set end_date to null and
+      current_role to true.
+    - "description" in experience entries MUST be a JSON array of strings, one bullet
+      point per element, split from paragraphs by newlines or sentence boundaries.
+    - If the start and end dates are not explicitly mentioned for a task or project,
+      inherit them from the main job entry.
+    - Leave a key empty if the text has nothing for it.
+"""
+
+SECTION_EXTRACTION_SCHEMAS = {
+    resume_sections.HEADER: (
+        "the header of a resume (name, contact details, summary)",
+        """{
+        "language": "detected language of the resume (full English name, e.g. English, Turkish)",
+        "user_info": {
+            "full_name": "extracted_full_name",
+            "email": "extracted_email",
+            "phone": "extracted_phone",
+            "address": "extracted_address",
+            "linkedin": "https://... or empty",
+            "github": "https://... or empty",
+            "skills": ["skill mentioned in this part, if any"]
+        }
+    }""",
+    ),
+    resume_sections.EXPERIENCE: (
+        "the work experience section of a resume",
+        """{
+        "experience": [
+            {
+                "title": "job_title",
+                "company": "company_name",
+                "start_date": "YYYY-MM",
+                "end_date": "YYYY-MM",
+                "description": ["bullet_point_1", "bullet_point_2"],
+                "current_role": true or false
+            }
+        ]
+    }""",
+    ),
+    resume_sections.EDUCATION: (
+        "the education section of a resume",
+        """{
+        "education": [
+            {
+                "degree": "Bachelor, Master or PhD",
+                "school": "school_name",
+                "field_of_study": "e.g. Computer Science",
+                "start_date": "YYYY-MM",
+                "end_date": "YYYY-MM"
+            }
+        ]
+    }""",
+    ),
+    resume_sections.PROJECTS: (
+        "the projects and publications sections of a resume",
+        """{
+        "projects_and_publications": [
+            {
+                "name": "project_or_publication_title",
+                "description": "project_or_publication_description",
+                "link": "valid URL or empty"
+            }
+        ]
+    }""",
+    ),
+    resume_sections.SKILLS: (
+        "the skills, languages and certifications sections of a resume",
+        """{
+        "skills": ["skill1", "skill2"]
+    }""",
+    ),
+}
+
+
+def _section_meta_prompt(group: str) -> str:
+    part, schema = SECTION_EXTRACTION_SCHEMAS[group]
+    return f"""
+    Act as a resume parser. I will provide you with {part}, extracted from a PDF.
+    Section headings are marked "## ". Extract it into this JSON format:
+
+    {schema}
+    """.strip() + "\n\n" + SECTION_EXTRACTION_RULES.strip()
+
+
+def _has_section_keys(group: str):
+    keys = {
+        resume_sections.HEADER: "user_info",
+        resume_sections.EXPERIENCE: "experience",
+        resume_sections.EDUCATION: "education",
+        resume_sections.PROJECTS: "projects_and_publications",
+        resume_sections.SKILLS: "skills",
+    }
+
+    def validate(result: str) -> bool:
+        try:
+            return keys[group] in json.loads(result)
+        except (ValueError, TypeError):
+            return False
+
+    return validate
+
+
+def _should_chunk_extraction(sections: dict) -> bool:
+    cfg = settings.RESUME_CHUNKED_EXTRACTION
+    total = sum(len(text) for text in sections.values())
+    return (
+        cfg["enabled"]
+        and total >= cfg["min_chars"]
+        and resume_sections.EXPERIENCE in sections
+        and len(sections) >= 3
+    )
+
+
+def _merge_section_results(parts: dict) -> dict:
+    """Assemble per-section extraction results into the extract_resume_data schema."""
+    header = parts.get(resume_sections.HEADER, {})
+    user_info = dict(header.get("user_info") or {})
+
+    skills = []
+    seen = set()
+    extra_skills = parts.get(resume_sections.SKILLS, {}).get("skills") or []
+    for skill in list(user_info.get("skills") or []) + list(extra_skills):
+        if isinstance(skill, str) and skill.strip() and skill.strip().lower() not in seen:
+            seen.add(skill.strip().lower())
+            skills.append(skill.strip())
+    user_info["skills"] = skills
+
+    return {
+        "language": header.get("language") or "",
+        "user_info": user_info,
+        "experience": parts.get(resume_sections.EXPERIENCE, {}).get("experience") or [],
+        "education": parts.get(resume_sections.EDUCATION, {}).get("education") or [],
+        "projects_and_publications": (
+            parts.get(resume_sections.PROJECTS, {}).get("projects_and_publications") or []
+        ),
+    }
+
+
+def _extract_resume_sections(sections: dict, hints: dict):
+    """
+    Extracts each section group with its own prompt, concurrently.
+
+    Returns:
+        str: The merged JSON string, or None if any section failed (the caller
+             then falls back to a single extraction call).
+    """
+    groups = list(sections)
+    calls = [
+        partial(
+            send_openai_message,
+            user_message=_extraction_message(
+                sections[group], hints if group == resume_sections.HEADER else {}
+            ),
+            meta_prompt=_section_meta_prompt(group),
+            task="extract_resume_section",
+            is_json=True,
+            temperature=0,
+            call_site=f"extract_resume_data.{group}",
+            validate=_has_section_keys(group),
+        )
+        for group in groups
+    ]
+    results = run_concurrently(
+        calls, max_workers=settings.RESUME_CHUNKED_EXTRACTION["max_concurrency"]
+    )
+
+    parts = {}
+    for group, result in zip(groups, results):
+        if is_error_response(result) or not _has_section_keys(group)(result):
+            logger.warning(
+                "Chunked extraction: section %s failed, falling back to one call", group
+            )
+            return None
+        parts[group] = json.loads(result)
+    logger.info("Chunked extraction: %d sections (%s)", len(groups), ", ".join(groups))
+    return json.dumps(_merge_section_results(parts), ensure_ascii=False)
+
+
 def extract_resume_data(user_message: str):
     """
     Extracts structured resume data from a given text using OpenAI GPT.
 
+    The raw text is compacted by the local pre-parser first (page artifacts,
+    whitespace, contact fields, date normalization), and the contact fields it
+    found are merged back into the model's JSON.
+
+    Long resumes (RESUME_CHUNKED_EXTRACTION["min_chars"]) with recognizable
+    sections are extracted section by section with concurrent, smaller
+    prompts and merged, so latency follows the slowest section and no single
+    response runs into the output token limit.
+
     Parameters:
         user_message (str): The raw text extracted from a resume.
 
@@ -191,11 +666,8 @@ def extract_resume_data(user_message: str):
     meta_prompt = """
     Act as a resume parser. I will provide you with raw text extracted from a resume PDF.
 
-    IMPORTANT — Multi-column / garbled text handling:
-    The text may come from a multi-column PDF and could be jumbled, interleaved, or out of order.
-    Reconstruct the logical reading order before extracting data. Look for contextual clues
-    (dates next to company names, job titles near descriptions) to reassemble sections correctly,
-    even if the raw text mixes columns together.
+    The text is already in reading order, with section headings marked "## ".
+    If some lines still look out of place, use dates and company names to attach them.
 
     Your task is to extract and structure the data into the following JSON format:
 
@@ -268,42 +740,44 @@ def extract_resume_data(user_message: str):
 
     Ensure the JSON is well-structured and includes all relevant information.
     If a section is missing in the input text, leave it empty in the JSON.
-    """.strip()
-
-    result = send_openai_message(
-        user_message=user_message,
-        meta_prompt=meta_prompt,
-        model="gpt-4o-mini",
-        is_json=True,
-        temperature=0,
-        max_tokens=6000,
-    )
-
-    # Validation: check for empty/corrupted PDF parse failure
-    try:
-        import json as _json
-
-        parsed = _json.loads(result)
-        has_name = bool(parsed.get("user_info", {}).get("full_name", "").strip())
-        has_experience = bool(parsed.get("experience"))
-        if not has_name and not has_experience:
-            return _json.dumps(
-                {
-                    "parse_error": True,
-                    "message": "Could not extract resume data. Please ensure the PDF contains readable text.",
-                }
-            )
-    except (ValueError, TypeError):
-        # If result isn't valid JSON at all, it's likely an API error string — pass through
-        pass
+    """.strip() + "\n\n" + PRE_EXTRACTED_RULES.strip()
+
+    preparsed = _preparse_for_extraction(user_message)
+    hints = preparsed.hints
+    result = None
+    sections = split_resume_sections(preparsed.text)
+    if _should_chunk_extraction(sections):
+        result = _extract_resume_sections(sections, hints)
+    if result is None:
+        result = send_openai_message(
+            user_message=_extraction_message(preparsed.text, hints),
+            meta_prompt=meta_prompt,
+            task="extract_resume",
+            is_json=True,
+            temperature=0,
+            validate=_extraction_validator(user_message),
+        )
+
+    # Validation: check for empty/corrupted PDF parse failure.
+    # If result isn't valid JSON at all, it's likely an API error string — pass through
+    if _is_valid_json(result) and not _has_resume_data(result):
+        return json.dumps(
+            {
+                "parse_error": True,
+                "message": "Could not extract resume data. Please ensure the PDF contains readable text.",
+            }
+        )
 
-    return result
+    return _merge_extraction_hints(result, hints)
 
 
 def extract_linkedin_resume_data(user_message: str):
     """
     Parses LinkedIn profile data from a PDF file using OpenAI's API.
 
+    Like extract_resume_data, the text goes through the local pre-parser and
+    the contact fields it found are merged into the result.
+
     Args:
         user_message: The raw text extracted from a LinkedIn PDF.
 
@@ -315,10 +789,8 @@ def extract_linkedin_resume_data(user_message: str):
     meta_prompt = """
     Act as a LinkedIn profile parser. I will provide you with raw text extracted from a LinkedIn profile PDF.
 
-    IMPORTANT — Multi-column / garbled text handling:
-    The text may come from a multi-column PDF and could be jumbled, interleaved, or out of order.
-    Reconstruct the logical reading order before extracting data. Look for contextual clues
-    (dates next to company names, job titles near descriptions) to reassemble sections correctly.
+    The text is already in reading order, with section headings marked "## ".
+    If some lines still look out of place, use dates and company names to attach them.
 
     Your task is to extract and structure the data into the following JSON format:
 
@@ -377,13 +849,15 @@ def extract_linkedin_resume_data(user_message: str):
     - Use the full English name of the language.
 
     Ensure the JSON output is well-formed, accurate, and complete.
-    """.strip()
+    """.strip() + "\n\n" + PRE_EXTRACTED_RULES.strip()
 
-    return send_openai_message(
-        user_message=user_message,
+    prepared_message, hints = _prepare_extraction_input(user_message)
+    result = send_openai_message(
+        user_message=prepared_message,
         meta_prompt=meta_prompt,
-        model="gpt-4o-mini",
+        task="extract_linkedin",
         is_json=True,
         temperature=0,
-        max_tokens=6000,
+        validate=_extraction_validator(user_message),
     )
+    return _merge_extraction_hints(result, hints)
@@ -1,28 +1,55 @@
 """
 AgentService — Intent classification and execution for the agentic dashboard.
 
-LLM-first approach:
-1. Every user message is classified by gpt-4o-mini (JSON mode, ~500ms)
-2. The LLM receives full context: user's resumes, quota, active resume
-3. It returns {intent, params, message} — no keyword heuristics needed
-4. Active-resume context: once a resume is selected, subsequent messages
-   are treated as modification instructions for that resume.
-
-Why LLM-only (no keyword map)?
-- Context-aware: "kaldır" in "deneyimimi kaldır" → modify, not delete
-- Multilingual for free: Turkish, English, mixed — all handled naturally
-- Zero maintenance: new intents = update TOOL_CATALOG, no regex/keyword lists
-- Cost: ~$0.0003/message with gpt-4o-mini — negligible at current scale
+Classification order (cheapest first; see classify_intent()):
+1. Quick replies carry a structured intent payload and skip classification.
+2. Typed commands and chip labels ("List resumes", "PDF indir", "Preview
+   resume 12") are matched by the local command parser (intent_parser).
+3. Messages seen recently in an unchanged context (same resumes, active
+   resume, quota) reuse the LLM's earlier answer (intent_cache).
+4. A local model trained on logged LLM answers (intent_classifier) answers
+   routine messages it is confident about.
+5. Everything else goes to the LLM: a fast model in JSON mode, escalating to
+   gpt-4o-mini only if the answer fails validation (see LLM_TASK_POLICIES).
+   It receives a static prompt (tools and rules, cacheable by the provider)
+   followed by a compact context (recent resumes, quota, active resume) and
+   returns {intent, params, message} or several steps for a multi-intent
+   message (execute_plan()).
+
+Parser, local model and LLM answers are logged as training data for step 4.
+Once a resume is active, instructions that don't name another resume are
+applied to it; modify_resume sends the LLM only the sections the instruction
+is about (modify_scope).
 """
 
 import json
 import logging
+import secrets
+from functools import partial
+from urllib.parse import urlencode
 
 from django.conf import settings
+from django.core.cache import cache
 from django.urls import reverse
 
 from resume.models import Resume
-from resume.openai_engine import send_openai_message
+from resume.openai_engine import run_concurrently, send_openai_message
+from resume.services.deadline import has_time_for
+from resume.services.intent_cache import (
+    cache_classification,
+    context_signature,
+    get_cached_classification,
+)
+from resume.services.intent_classifier import local_classify, log_classification
+from resume.services.intent_parser import parse_intent
+from resume.services.json_patch import JsonPatchError, apply_patch
+from resume.services.json_repair import loads_lenient
+from resume.services.llm_metering import metering_scope
+from resume.services.modify_scope import merge_sections, scoped_content, target_sections
+from resume.services.resume_diff import diff_resumes, render_diff
+from resume.services.resume_scoring import SCORING_VERSION, content_hash, score_resume
+from resume.services.resume_search import search_resumes
+from resume.services.resume_translation import translate_content
 
 logger = logging.getLogger(__name__)
 
@@ -154,21 +181,186 @@ BUILDER_PROMPTS = {
 }
 
 
+# Intents a multi-step plan may contain: they answer in the chat instead of
+# navigating away, asking for confirmation or starting a dialog.
+PLAN_READ_INTENTS = {
+    "list_resumes",
+    "get_resume_details",
+    "preview_resume",
+    "download_resume",
+    "analyze_resume",
+    "find_resume",
+    "compare_resumes",
+}
+PLAN_WRITE_INTENTS = {"modify_resume", "switch_template", "translate_resume"}
+PLAN_INTENTS = PLAN_READ_INTENTS | PLAN_WRITE_INTENTS | {"check_quota", "help"}
+
+# Static part of the classification prompt. It must not change between
+# requests: everything per-user is appended after it by _classify_context(),
+# so the provider's prompt prefix cache can reuse it across messages.
+CLASSIFY_SYSTEM_PROMPT = f"""You are ResuStack, an AI assistant for a resume management app.
+Analyze the user message and choose the best tool.
+
+AVAILABLE TOOLS:
+{json.dumps(TOOL_CATALOG, ensure_ascii=False, separators=(",", ":"))}
+
+Rules:
+- Respond ONLY with valid JSON: {{"intent": "tool_name", "params": {{}}, "message": "reply to user", "confidence": 0.0-1.0}}
+- "confidence" is how sure you are that the intent is right.
+- If the message asks for SEVERAL actions ("analyze resume 1 and 2", "translate it to English
+  and then switch it to modern sidebar"), also return "steps": the actions in the order asked,
+  each {{"intent": "tool_name", "params": {{}}}}, with the first one repeated in intent/params.
+  Steps can only use: {", ".join(sorted(PLAN_INTENTS))}.
+  For a modify_resume step, put that step's part of the request in params.instruction.
+- Detect message language and reply in the SAME language.
+- For resume count questions ("how many resumes", "kac tane resume") → use list_resumes.
+- For "last resume" / "son resume" / "en son" without active resume → use the ID where rank=1.
+- Resolve resume references (name, "son", "last", "1.", "#2", positional) to their numeric ID.
+- If you cannot determine which resume → use "clarify".
+- For greetings / general help → use "help".
+- Never invent resume IDs not present in USER'S RESUMES. Only the most recent resumes
+  are listed; for one that isn't, use "find_resume" with the words the user gave.
+- For template switching, set params.template to one of: "faangpath-simple" or "modern-sidebar".
+  Aliases: faang/klasik/classic/simple → faangpath-simple, modern/sidebar → modern-sidebar.
+
+When there is an ACTIVE RESUME (the user is currently working on it):
+- If the user wants to MODIFY content (add/remove/update experiences, skills, education,
+  projects, descriptions, rewrite for a role, etc.) → use "modify_resume" with its ID.
+- "kaldır", "remove", "sil" referring to a PART of the resume (an experience, a skill, etc.)
+  → use "modify_resume", NOT "delete_resume".
+- "delete_resume" is ONLY for deleting the ENTIRE resume permanently.
+- If the message is a system command (list, download, quota, preview, upload, etc.)
+  → use the appropriate system intent.
+- For actions that need a resume_id and none is specified, default to the active resume's ID.
+
+"""
+
+CHIP_INTENTS = {tool["intent"] for tool in TOOL_CATALOG} - {"clarify"}
+CHIP_PARAMS = {param for tool in TOOL_CATALOG for param in tool.get("params", [])}
+
+
+def quick_reply(label: str, intent: str, lang: str, **params) -> dict:
+    """A quick-reply chip that runs `intent` directly when clicked."""
+    return {"label": label, "intent": intent, "params": params, "lang": lang}
+
+
+def _step_resumes(step: dict, active_resume_id) -> set:
+    """Resumes a plan step reads or writes; "*" stands for all of them."""
+    intent, params = step["intent"], step["params"]
+    if intent in ("list_resumes", "find_resume"):
+        return {"*"}
+    if intent == "compare_resumes":
+        return {str(params.get(k)) for k in ("resume_id_1", "resume_id_2")}
+    if intent in PLAN_READ_INTENTS | PLAN_WRITE_INTENTS:
+        # Without an ID the executors fall back to the active or latest resume.
+        return {str(params.get("resume_id") or active_resume_id or "*")}
+    return set()
+
+
+def plan_waves(steps: list, active_resume_id=None) -> list:
+    """
+    Group plan steps into waves that can run concurrently, in order.
+
+    A step goes after every earlier step it conflicts with: both touch the
+    same resume and at least one of them changes it. Returns lists of step
+    indexes.
+    """
+    touched = [_step_resumes(step, active_resume_id) for step in steps]
+    writes = [step["intent"] in PLAN_WRITE_INTENTS for step in steps]
+    wave_of = []
+    for i in range(len(steps)):
+        wave = 0
+        for j in range(i):
+            overlap = touched[i] & touched[j] or (
+                touched[i] and touched[j] and "*" in touched[i] | touched[j]
+            )
+            if overlap and (writes[i] or writes[j]):
+                wave = max(wave, wave_of[j] + 1)
+        wave_of.append(wave)
+    return [
+        [i for i, w in enumerate(wave_of) if w == wave]
+        for wave in range(max(wave_of, default=-1) + 1)
+    ]
+
+
 class AgentService:
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
 
-    def classify_intent(self, message: str, context: dict, active_resume=None) -> dict:
+    def classify_intent(
+        self,
+        message: str,
+        context: dict,
+        active_resume=None,
+        intent_payload=None,
+        user=None,
+    ) -> dict:
         """
-        Send every message to LLM for intent classification.
-        Returns: {intent, params, lang, llm_message?}
+        Classify a message: structured chip payload, then the local command
+        parser, cached and locally predicted answers, then the LLM.
+        Parser, local model and LLM answers are logged as training data.
+        Returns: {intent, params, lang, source, confidence?, llm_message?}
         """
+        result = self._classify(message, context, active_resume, intent_payload)
+        log_classification(user, message, result, active_resume is not None)
+        return result
+
+    def _classify(self, message, context, active_resume, intent_payload) -> dict:
+        chip = self._chip_intent(intent_payload)
+        if chip:
+            return {**chip, "lang": chip["lang"] or self._detect_language(message)}
+
+        parsed = parse_intent(
+            message,
+            context.get("resumes", []),
+            active_resume_id=active_resume.id if active_resume else None,
+        )
+        if parsed:
+            logger.info("Agent intent %s matched locally", parsed["intent"])
+            return {**parsed, "source": "rules"}
+
         lang = self._detect_language(message)
-        result = self._llm_classify(message, context, lang, active_resume=active_resume)
+        signature = context_signature(context, active_resume)
+        result = get_cached_classification(message, lang, signature)
+        if result is not None:
+            return {**result, "lang": lang, "source": "cache"}
+
+        predicted = local_classify(
+            message, active_resume=active_resume, resumes=context.get("resumes", [])
+        )
+        if predicted:
+            logger.info(
+                "Agent intent %s predicted locally (p=%.2f)",
+                predicted["intent"],
+                predicted["confidence"],
+            )
+            return {**predicted, "lang": lang, "source": "local"}
+
+        with metering_scope(intent="agent:classify"):
+            result = self._llm_classify(
+                message, context, lang, active_resume=active_resume
+            )
+        cache_classification(message, lang, signature, dict(result))
         result["lang"] = lang
+        result["source"] = "llm"
         return result
 
+    def _chip_intent(self, payload):
+        """Validate a quick-reply intent payload sent by the client; None if unusable."""
+        if not isinstance(payload, dict) or payload.get("intent") not in CHIP_INTENTS:
+            return None
+        params = payload.get("params") or {}
+        if not isinstance(params, dict):
+            return None
+        # Resume IDs are still checked against the user by each executor.
+        return {
+            "intent": payload["intent"],
+            "params": {k: v for k, v in params.items() if k in CHIP_PARAMS},
+            "lang": payload.get("lang") if payload.get("lang") in ("en", "tr") else None,
+            "source": "chip",
+        }
+
     def execute_intent(
         self,
         intent: str,
@@ -214,9 +406,60 @@ class AgentService:
         }
         handler = handler_map.get(intent)
         if handler:
-            return handler()
+            with metering_scope(intent=f"agent:{intent}"):
+                return handler()
         return self._exec_clarify(lang)
 
+    def execute_plan(
+        self,
+        steps: list,
+        user,
+        lang: str = "en",
+        active_resume=None,
+        user_message: str = "",
+    ) -> dict:
+        """
+        Run the steps of a multi-intent message and combine their results.
+
+        Steps are grouped into waves by plan_waves(): a wave's steps run
+        concurrently, and a step that changes a resume waits for every
+        earlier step touching the same resume.
+        Returns: {type: "plan", message, results: [one result per step, in order]}
+        """
+
+        def run(step):
+            return self.execute_intent(
+                step["intent"],
+                step["params"],
+                user,
+                lang=lang,
+                active_resume=active_resume,
+                user_message=step["params"].get("instruction") or user_message,
+            )
+
+        results = [None] * len(steps)
+        for wave in plan_waves(steps, active_resume.id if active_resume else None):
+            if not has_time_for(settings.LLM_DEADLINES["plan_step_seconds"]):
+                # Out of request budget: report what ran, skip the rest.
+                for index in wave:
+                    results[index] = self._out_of_time(lang, steps[index]["intent"])
+                continue
+            wave_results = run_concurrently(
+                [partial(run, steps[index]) for index in wave],
+                max_workers=settings.AGENT_PLAN["max_concurrency"],
+            )
+            for index, result in zip(wave, wave_results):
+                results[index] = result
+
+        # Only the last step offers follow-up chips.
+        for result in results[:-1]:
+            result.pop("quick_replies", None)
+        return {
+            "type": "plan",
+            "message": "\n\n".join(r["message"] for r in results if r.get("message")),
+            "results": results,
+        }
+
     def handle_builder_step(self, message: str, builder_state: dict, user) -> dict:
         lang = builder_state.get("lang", "en")
         step = builder_state.get("step", "ask_name")
@@ -309,83 +552,97 @@ class AgentService:
     def _llm_classify(
         self, message: str, context: dict, lang: str, active_resume=None
     ) -> dict:
-        resumes_json = json.dumps(context.get("resumes", []), ensure_ascii=False)
-        quota_json = json.dumps(context.get("quota", {}), ensure_ascii=False)
-        tools_json = json.dumps(TOOL_CATALOG, ensure_ascii=False)
-
-        active_section = ""
-        if active_resume:
-            experiences = active_resume.content.get("experience", [])
-            exp_summary = (
-                ", ".join(
-                    f"'{e.get('title', '?')}' at '{e.get('company', '?')}'"
-                    for e in experiences[:5]
-                )
-                if experiences
-                else "none"
-            )
-
-            active_section = f"""
-ACTIVE RESUME (the user is currently working on this one):
-  ID: {active_resume.id}
-  Name: {active_resume.display_name}
-  Experiences ({len(experiences)} entries): {exp_summary}
-
-IMPORTANT — active resume rules:
-- If the user wants to MODIFY content (add/remove/update experiences, skills, education,
-  projects, descriptions, rewrite for a role, etc.) → use "modify_resume" with resume_id={active_resume.id}.
-- "kaldır", "remove", "sil" referring to a PART of the resume (an experience, a skill, etc.)
-  → use "modify_resume", NOT "delete_resume".
-- "delete_resume" is ONLY for deleting the ENTIRE resume permanently.
-- If the message is a system command (list, download, quota, preview, upload, etc.)
-  → use the appropriate system intent.
-- For actions that need a resume_id and none is specified, default to {active_resume.id}.
-"""
-
-        system_prompt = f"""You are ResuStack, an AI assistant for a resume management app.
-Analyze the user message and choose the best tool.
-
-USER'S RESUMES (rank=1 is the most recently updated):
-{resumes_json}
-
-QUOTA STATUS:
-{quota_json}
-{active_section}
-AVAILABLE TOOLS:
-{tools_json}
-
-Rules:
-- Respond ONLY with valid JSON: {{"intent": "tool_name", "params": {{}}, "message": "reply to user"}}
-- Detect message language and reply in the SAME language.
-- For resume count questions ("how many resumes", "kac tane resume") → use list_resumes.
-- For "last resume" / "son resume" / "en son" without active resume → use the ID where rank=1.
-- Resolve resume references (name, "son", "last", "1.", "#2", positional) to their numeric ID.
-- If you cannot determine which resume → use "clarify".
-- For greetings / general help → use "help".
-- Never invent resume IDs not present in USER'S RESUMES.
-- For template switching, set params.template to one of: "faangpath-simple" or "modern-sidebar".
-  Aliases: faang/klasik/classic/simple → faangpath-simple, modern/sidebar → modern-sidebar.
-"""
+        system_prompt = CLASSIFY_SYSTEM_PROMPT + self._classify_context(
+            context, active_resume
+        )
 
         result = send_openai_message(
             user_message=message,
             meta_prompt=system_prompt,
+            task="classify_intent",
             is_json=True,
             temperature=0,
-            max_tokens=400,
+            validate=self._is_valid_classification,
         )
 
         try:
             parsed = json.loads(result)
-            return {
+            result = {
                 "intent": parsed.get("intent", "clarify"),
                 "params": parsed.get("params", {}),
                 "llm_message": parsed.get("message", ""),
+                "confidence": parsed.get("confidence"),
             }
+            steps = self._plan_steps(parsed.get("steps"))
+            if steps:
+                result["steps"] = steps
+            return result
         except (ValueError, TypeError):
             logger.warning("LLM classification failed to parse: %s", result)
             return {"intent": "clarify", "params": {}, "llm_message": ""}
 
+    def _plan_steps(self, steps):
+        """
+        Validated [{intent, params}] for a multi-step answer, or None when the
+        message is a single action or a step can't be part of a plan.
+        """
+        if not isinstance(steps, list) or len(steps) < 2:
+            return None
+        plan = []
+        for step in steps[: settings.AGENT_PLAN["max_steps"]]:
+            if not isinstance(step, dict) or step.get("intent") not in PLAN_INTENTS:
+                logger.info("Ignoring plan with unsupported step: %s", step)
+                return None
+            params = step.get("params")
+            if not isinstance(params, dict):
+                params = {}
+            plan.append({"intent": step["intent"], "params": params})
+        return plan
+
+    def _classify_context(self, context: dict, active_resume=None) -> str:
+        """
+        Per-user part of the classification prompt, appended after the static
+        CLASSIFY_SYSTEM_PROMPT so the provider can cache that prefix.
+        """
+        cfg = settings.AGENT_CLASSIFY_PROMPT
+        resumes = context.get("resumes", [])
+        shown = resumes[: cfg["max_resumes"]]
+        if active_resume and all(r["id"] != active_resume.id for r in shown):
+            shown += [r for r in resumes if r["id"] == active_resume.id]
+        lines = [
+            f"{r.get('rank', '?')}. #{r['id']} | "
+            f"{r.get('display_name') or r.get('title', '')} | "
+            f"{str(r.get('updated_at', ''))[:10]}"
+            for r in shown
+        ]
+        if len(resumes) > len(shown):
+            lines.append(f"(+{len(resumes) - len(shown)} older resumes not shown)")
+
+        quota = ", ".join(f"{k}={v}" for k, v in context.get("quota", {}).items())
+        parts = [
+            "USER'S RESUMES (rank. #id | name | updated; rank 1 is the most recently updated):",
+            "\n".join(lines) or "(none)",
+            f"QUOTA: {quota or 'unknown'}",
+        ]
+
+        if active_resume:
+            experiences = active_resume.content.get("experience", [])
+            exp_summary = (
+                ", ".join(
+                    f"'{e.get('title', '?')}' at '{e.get('company', '?')}'"
+                    for e in experiences[: cfg["max_active_experiences"]]
+                )
+                if experiences
+                else "none"
+            )
+            parts.append(
+                f"ACTIVE RESUME: #{active_resume.id} | {active_resume.display_name}"
+                f" | {len(experiences)} experiences: {exp_summary}"
+            )
+        else:
+            parts.append("ACTIVE RESUME: none")
+        return "\n".join(parts) + "\n"
+
     # ------------------------------------------------------------------
     # Private: intent executors
     # ------------------------------------------------------------------
@@ -414,17 +671,25 @@ Rules:
                 if lang == "tr"
                 else f"You have {count} resume{'s' if count != 1 else ''}:"
             )
-        quick_replies = (
-            ["Preview first resume", "Analyze resume", "Create new"]
-            if lang == "en"
-            else ["İlk resume'u önizle", "Resume'u analiz et", "Yeni oluştur"]
-        )
+        quick_replies = None
+        if data:
+            first_id = data[0]["id"]
+            preview, analyze, create = (
+                ["Preview first resume", "Analyze resume", "Create new"]
+                if lang == "en"
+                else ["İlk resume'u önizle", "Resume'u analiz et", "Yeni oluştur"]
+            )
+            quick_replies = [
+                quick_reply(preview, "preview_resume", lang, resume_id=first_id),
+                quick_reply(analyze, "analyze_resume", lang, resume_id=first_id),
+                quick_reply(create, "create_blank_resume", lang),
+            ]
         return {
             "type": "chat",
             "message": msg,
             "data": data,
             "data_type": "resume_list",
-            "quick_replies": quick_replies if data else None,
+            "quick_replies": quick_replies,
         }
 
     def _exec_get_resume_details(self, user, params: dict, lang: str) -> dict:
@@ -467,11 +732,17 @@ Rules:
             "en": f"Showing preview of **{resume.display_name}**.",
             "tr": f"**{resume.display_name}** onizlemesi sagda gosteriliyor.",
         }.get(lang, f"Previewing resume {resume.id}.")
-        quick_replies = (
+        labels = (
             ["Analyze this resume", "Download PDF", "Edit in form"]
             if lang == "en"
             else ["Bu resume'u analiz et", "PDF indir", "Formda düzenle"]
         )
+        quick_replies = [
+            quick_reply(label, intent, lang, resume_id=resume.id)
+            for label, intent in zip(
+                labels, ["analyze_resume", "download_resume", "edit_resume"]
+            )
+        ]
         return {
             "type": "preview",
             "resume_id": resume.id,
@@ -671,8 +942,21 @@ Rules:
             }.get(lang, "No resumes found.")
             return {"type": "chat", "message": msg}
 
-        resume_json = json.dumps(resume.content, ensure_ascii=False, indent=2)
-        experiences = resume.content.get("experience", [])
+        # Send only the sections the instruction is about; None means all of them.
+        keys = target_sections(user_message, resume.content)
+        document = scoped_content(resume.content, keys) if keys else resume.content
+        resume_json = json.dumps(document, ensure_ascii=False)
+        heading = "CURRENT RESUME"
+        scope_rule = ""
+        if keys:
+            heading = (
+                f"CURRENT RESUME SECTIONS ({', '.join(keys)}; the rest is unchanged)"
+            )
+            scope_rule = (
+                "- Only these sections are shown. Change nothing outside them;"
+                " paths still start at the resume root.\n"
+            )
+        experiences = document.get("experience", [])
         last_exp_note = ""
         if experiences:
             last_exp = experiences[0]
@@ -681,85 +965,92 @@ Rules:
                 f"'{last_exp.get('title')}' at '{last_exp.get('company')}'."
             )
 
-        system_prompt = f"""You are modifying a JSON resume. Apply ALL changes the user requests in one pass.
+        # Patch mode: the model returns only RFC 6902 operations, which keeps
+        # output tokens (and latency) proportional to the size of the edit.
+        patch_prompt = f"""You are modifying a JSON resume. Apply ALL changes the user requests in one pass.
 
-CURRENT RESUME:
+{heading}:
 {resume_json}
 
 {last_exp_note}
 
 RULES:
-- Return the COMPLETE modified resume JSON (all fields, even unchanged ones).
-- 'son deneyim' / 'last experience' = the FIRST item in the experience array (most recent).
+{scope_rule}- Return ONLY the changes as a JSON Patch (RFC 6902) array in "patch". Do NOT return the resume.
+- Paths are JSON Pointers from the resume root, e.g. "/user_info/skills/-" (append a skill),
+  "/experience/0/title", "/experience/1/description/2", "/education/-".
+- Use "add" to insert or append ("-" appends to an array), "remove" to delete,
+  "replace" to change an existing value.
+- When removing several items from the same array, remove the highest index first.
+- 'son deneyim' / 'last experience' = the FIRST item in the experience array (index 0).
 - experience[].description must ALWAYS be an array of strings (one bullet per element).
 - Dates must be in YYYY-MM format (e.g. 2024-03). null means present/current.
-- When optimizing for a role (e.g. 'DevOps Engineer'), rewrite ALL experience descriptions
+- When optimizing for a role (e.g. 'DevOps Engineer'), replace ALL experience descriptions
   with strong action verbs and keywords relevant to that role. Keep factual content accurate.
 - When adding new experience/education/project, APPEND to the appropriate array.
 - Detect user language from their message and reply in that language.
 
 Respond ONLY with valid JSON:
 {{
-  "modified_resume": {{ ...complete resume JSON... }},
+  "patch": [{{"op": "add", "path": "/user_info/skills/-", "value": "AWS"}}],
   "changes_summary": "Brief list of what changed",
   "response_message": "Friendly confirmation to show the user"
 }}"""
 
         result = send_openai_message(
             user_message=user_message,
-            meta_prompt=system_prompt,
+            meta_prompt=patch_prompt,
+            task="modify_resume_patch",
             is_json=True,
             temperature=0.3,
-            max_tokens=4000,
+            validate=lambda r: self._apply_modify_patch(r, resume.content, keys)
+            is not None,
         )
-
-        validated = self._validate_modify_result(result)
+        validated = self._apply_modify_patch(result, resume.content, keys)
         if validated:
-            resume.content = validated["modified_resume"]
-            resume.save(update_fields=["content", "updated_at"])
-            quick_replies = (
-                ["Preview changes", "More changes", "Download PDF"]
-                if lang == "en"
-                else ["Değişiklikleri önizle", "Daha fazla değişiklik", "PDF indir"]
-            )
-            return {
-                "type": "modify_resume",
-                "resume_id": resume.id,
-                "resume_name": resume.display_name,
-                "message": validated.get("response_message", "Changes applied."),
-                "changes_summary": validated.get("changes_summary", ""),
-                "quick_replies": quick_replies,
-            }
+            return self._save_modified_resume(resume, validated, lang)
+
+        # Fall back to full-document mode only when the patch failed
+        if not has_time_for(settings.LLM_DEADLINES["modify_fallback_seconds"]):
+            logger.warning("modify_resume: no time left for the full-document retry")
+            return self._out_of_time(lang, "modify_resume")
+        logger.info("modify_resume: patch attempt failed, falling back to full document")
+        returned = "resume JSON" if not keys else "JSON of the sections shown"
+        system_prompt = f"""You are modifying a JSON resume. Apply ALL changes the user requests in one pass.
+
+{heading}:
+{resume_json}
 
-        # Retry once with simpler prompt
-        logger.info("modify_resume: first attempt failed, retrying with simpler prompt")
-        retry_prompt = f"""Modify this resume JSON as instructed. Return ONLY valid JSON with key "modified_resume" containing the full resume.
-Current resume: {resume_json}
-User request: {user_message}"""
-        retry_result = send_openai_message(
-            user_message=retry_prompt,
-            meta_prompt="Return valid JSON with modified_resume key.",
+{last_exp_note}
+
+RULES:
+- Return the COMPLETE modified {returned} (all fields, even unchanged ones).
+- 'son deneyim' / 'last experience' = the FIRST item in the experience array (most recent).
+- experience[].description must ALWAYS be an array of strings (one bullet per element).
+- Dates must be in YYYY-MM format (e.g. 2024-03). null means present/current.
+- When optimizing for a role (e.g. 'DevOps Engineer'), rewrite ALL experience descriptions
+  with strong action verbs and keywords relevant to that role. Keep factual content accurate.
+- When adding new experience/education/project, APPEND to the appropriate array.
+- Detect user language from their message and reply in that language.
+
+Respond ONLY with valid JSON:
+{{
+  "modified_resume": {{ ...complete {returned}... }},
+  "changes_summary": "Brief list of what changed",
+  "response_message": "Friendly confirmation to show the user"
+}}"""
+
+        full_result = send_openai_message(
+            user_message=user_message,
+            meta_prompt=system_prompt,
+            task="modify_resume",
             is_json=True,
             temperature=0.2,
-            max_tokens=4000,
+            validate=lambda r: self._validate_modify_result(r, resume.content, keys)
+            is not None,
         )
-        validated = self._validate_modify_result(retry_result)
+        validated = self._validate_modify_result(full_result, resume.content, keys)
         if validated:
-            resume.content = validated["modified_resume"]
-            resume.save(update_fields=["content", "updated_at"])
-            quick_replies = (
-                ["Preview changes", "More changes", "Download PDF"]
-                if lang == "en"
-                else ["Değişiklikleri önizle", "Daha fazla değişiklik", "PDF indir"]
-            )
-            return {
-                "type": "modify_resume",
-                "resume_id": resume.id,
-                "resume_name": resume.display_name,
-                "message": validated.get("response_message", "Changes applied."),
-                "changes_summary": validated.get("changes_summary", ""),
-                "quick_replies": quick_replies,
-            }
+            return self._save_modified_resume(resume, validated, lang)
 
         msg = {
             "en": "Sorry, I couldn't apply those changes. Please try rephrasing.",
@@ -767,6 +1058,38 @@ User request: {user_message}"""
         }.get(lang, "Could not apply changes.")
         return {"type": "chat", "message": msg}
 
+    def _out_of_time(self, lang: str, intent: str) -> dict:
+        """Reply for a step skipped because the request deadline was near."""
+        msg = {
+            "en": "That is taking longer than expected, so I stopped before"
+            f" finishing '{intent}'. Please try again.",
+            "tr": f"Bu beklenenden uzun sürüyor; '{intent}' adımını tamamlamadan"
+            " durdum. Lütfen tekrar deneyin.",
+        }.get(lang, f"Out of time before finishing '{intent}'.")
+        return {"type": "chat", "message": msg, "timed_out": True}
+
+    def _save_modified_resume(self, resume, validated: dict, lang: str) -> dict:
+        resume.content = validated["modified_resume"]
+        resume.save(update_fields=["content", "updated_at"])
+        preview, more, download = (
+            ["Preview changes", "More changes", "Download PDF"]
+            if lang == "en"
+            else ["Değişiklikleri önizle", "Daha fazla değişiklik", "PDF indir"]
+        )
+        quick_replies = [
+            quick_reply(preview, "preview_resume", lang, resume_id=resume.id),
+            more,
+            quick_reply(download, "download_resume", lang, resume_id=resume.id),
+        ]
+        return {
+            "type": "modify_resume",
+            "resume_id": resume.id,
+            "resume_name": resume.display_name,
+            "message": validated.get("response_message", "Changes applied."),
+            "changes_summary": validated.get("changes_summary", ""),
+            "quick_replies": quick_replies,
+        }
+
     # Available templates map (key → display name)
     TEMPLATE_ALIASES = {
         "faang": "faangpath-simple",
@@ -855,68 +1178,144 @@ User request: {user_message}"""
         if not resume:
             return self._resume_not_found(lang, params)
 
-        resume_json = json.dumps(resume.content, ensure_ascii=False, indent=2)
-        system_prompt = f"""You are a professional resume reviewer. Analyze the following resume JSON and provide a detailed scoring.
+        # Scores are computed locally and returned at once. The LLM's
+        # suggestions are fetched separately (analysis_suggestions()) unless an
+        # earlier analysis of the same content already cached them.
+        cfg = settings.ANALYZE_RESUME
+        analysis = self._local_analysis(resume, lang)
+        message = {
+            "en": f"Your resume scores {analysis['overall_score']}/100.",
+            "tr": f"Resume'unuz 100 üzerinden {analysis['overall_score']} puan aldı.",
+        }.get(lang, f"Score: {analysis['overall_score']}/100.")
+        pending = {}
+        if cfg["llm_suggestions"]:
+            advice = cache.get(self._analysis_cache_key("advice", resume, lang))
+            if advice:
+                analysis = {**analysis, "top_suggestions": advice["top_suggestions"]}
+                message = advice.get("response_message") or message
+            else:
+                pending = {
+                    "pending_suggestions": True,
+                    "suggestions_url": self._followup_url(
+                        user, "analysis_suggestions", [resume.id], lang
+                    ),
+                }
+
+        improve, switch, download = (
+            ["Improve this resume", "Switch template", "Download PDF"]
+            if lang == "en"
+            else ["Bu resume'u iyileştir", "Şablon değiştir", "PDF indir"]
+        )
+        quick_replies = [
+            improve,
+            quick_reply(switch, "switch_template", lang, resume_id=resume.id),
+            quick_reply(download, "download_resume", lang, resume_id=resume.id),
+        ]
+        return {
+            "type": "analyze_resume",
+            "resume_id": resume.id,
+            "resume_name": resume.display_name,
+            "message": message,
+            "analysis": analysis,
+            "quick_replies": quick_replies,
+            **pending,
+        }
+
+    def _analysis_cache_key(self, kind: str, resume, lang: str) -> str:
+        return (
+            f"analyze_resume:{kind}:{SCORING_VERSION}:{lang}:"
+            f"{content_hash(resume.content)}"
+        )
+
+    def _local_analysis(self, resume, lang: str) -> dict:
+        """Locally scored analysis of `resume`, cached by content hash."""
+        cfg = settings.ANALYZE_RESUME
+        key = self._analysis_cache_key("scores", resume, lang)
+        analysis = cache.get(key)
+        if analysis is None:
+            analysis = score_resume(resume.content, lang, cfg["max_suggestions"])
+            cache.set(key, analysis, cfg["cache_ttl_seconds"])
+        return analysis
+
+    def analysis_suggestions(self, resume, lang: str = "en"):
+        """
+        The LLM's {top_suggestions, response_message} for an analyzed resume,
+        cached by content hash; None when the LLM gave no usable answer.
+        """
+        key = self._analysis_cache_key("advice", resume, lang)
+        advice = cache.get(key)
+        if advice is None:
+            with metering_scope(intent="agent:analyze_resume"):
+                advice = self._llm_suggestions(
+                    resume, self._local_analysis(resume, lang), lang
+                )
+            if advice:
+                cache.set(key, advice, settings.ANALYZE_RESUME["cache_ttl_seconds"])
+        return advice
+
+    def _llm_suggestions(self, resume, analysis: dict, lang: str):
+        """
+        {top_suggestions, response_message} written by the LLM for a locally
+        scored resume, or None when the call or its answer fails.
+        """
+        language = "Turkish" if lang == "tr" else "English"
+        resume_json = json.dumps(
+            resume.content, ensure_ascii=False, separators=(",", ":")
+        )
+        scores = "\n".join(
+            f"- {c['name']}: {c['score']}/{c['max']} ({c['feedback']})"
+            for c in analysis["categories"]
+        )
+        system_prompt = f"""You are a professional resume reviewer. The resume below has already been scored; give the qualitative advice the scores can't.
 
 RESUME:
 {resume_json}
 
+SCORES ({analysis['overall_score']}/100):
+{scores}
+
 Respond ONLY with valid JSON in this exact format:
 {{
-  "overall_score": <number 0-100>,
-  "categories": [
-    {{"name": "Content Completeness", "score": <0-20>, "max": 20, "feedback": "..."}},
-    {{"name": "Impact Language", "score": <0-20>, "max": 20, "feedback": "..."}},
-    {{"name": "Formatting & Structure", "score": <0-20>, "max": 20, "feedback": "..."}},
-    {{"name": "Skills Coverage", "score": <0-20>, "max": 20, "feedback": "..."}},
-    {{"name": "ATS Friendliness", "score": <0-20>, "max": 20, "feedback": "..."}}
-  ],
   "top_suggestions": ["suggestion 1", "suggestion 2", "suggestion 3"],
-  "response_message": "Brief summary message {"in Turkish" if lang == "tr" else "in English"}"
+  "response_message": "Brief summary message in {language}"
 }}
 
 Rules:
-- Be honest but constructive in feedback
-- Respond in {"Turkish" if lang == "tr" else "English"}
-- overall_score should equal sum of category scores
-- Each category feedback should be 1-2 sentences"""
+- Suggestions must be specific and actionable, referring to concrete items in the resume
+- Focus on content: wording, missing achievements, relevance to their field
+- Be honest but constructive
+- Respond in {language}"""
 
         result = send_openai_message(
-            user_message="Analyze this resume",
+            user_message="Suggest improvements for this resume",
             meta_prompt=system_prompt,
+            task="analyze_resume",
             is_json=True,
             temperature=0.3,
-            max_tokens=2000,
+            validate=self._is_valid_suggestions,
         )
+        if not self._is_valid_suggestions(result):
+            logger.warning("analyze_resume: no LLM suggestions, using local ones")
+            return None
+        parsed = json.loads(result)
+        return {
+            "top_suggestions": [str(s) for s in parsed["top_suggestions"]][
+                : settings.ANALYZE_RESUME["max_suggestions"]
+            ],
+            "response_message": parsed.get("response_message"),
+        }
 
+    def _is_valid_suggestions(self, result: str) -> bool:
+        """Cascade validator: a JSON object with a non-empty suggestion list."""
         try:
             parsed = json.loads(result)
-            analysis = {
-                "overall_score": parsed.get("overall_score", 0),
-                "categories": parsed.get("categories", []),
-                "top_suggestions": parsed.get("top_suggestions", []),
-            }
-            msg = parsed.get("response_message", "Analysis complete.")
-            quick_replies = (
-                ["Improve this resume", "Switch template", "Download PDF"]
-                if lang == "en"
-                else ["Bu resume'u iyileştir", "Şablon değiştir", "PDF indir"]
-            )
-            return {
-                "type": "analyze_resume",
-                "resume_id": resume.id,
-                "resume_name": resume.display_name,
-                "message": msg,
-                "analysis": analysis,
-                "quick_replies": quick_replies,
-            }
-        except (ValueError, TypeError) as e:
-            logger.warning("analyze_resume LLM parse error: %s", e)
-            msg = {
-                "en": "Sorry, I couldn't analyze this resume. Please try again.",
-                "tr": "Üzgünüm, bu resume'u analiz edemedim. Lütfen tekrar deneyin.",
-            }.get(lang, "Analysis failed.")
-            return {"type": "chat", "message": msg}
+        except (ValueError, TypeError):
+            return False
+        return (
+            isinstance(parsed, dict)
+            and isinstance(parsed.get("top_suggestions"), list)
+            and bool(parsed["top_suggestions"])
+        )
 
     def _exec_find_resume(self, user, params: dict, lang: str) -> dict:
         """Search resumes by content — skills, companies, job titles, keywords."""
@@ -928,54 +1327,16 @@ Rules:
             }.get(lang, "What to search?")
             return {"type": "chat", "message": msg}
 
-        resumes = list(Resume.objects.filter(user=user).order_by("-updated_at"))
-        matches = []
-
-        for r in resumes:
-            content = r.content or {}
-            searchable_parts = []
-
-            # user_info fields
-            user_info = content.get("user_info", {})
-            searchable_parts.extend(
-                [str(s).lower() for s in user_info.get("skills", [])]
-            )
-            searchable_parts.append(user_info.get("full_name", "").lower())
-
-            # experience fields
-            for exp in content.get("experience", []):
-                searchable_parts.append(exp.get("company", "").lower())
-                searchable_parts.append(exp.get("title", "").lower())
-                desc = exp.get("description", [])
-                if isinstance(desc, list):
-                    searchable_parts.extend(
-                        [d.lower() for d in desc if isinstance(d, str)]
-                    )
-                elif isinstance(desc, str):
-                    searchable_parts.append(desc.lower())
-
-            # education fields
-            for edu in content.get("education", []):
-                searchable_parts.append(edu.get("school", "").lower())
-                searchable_parts.append(edu.get("field_of_study", "").lower())
-                searchable_parts.append(edu.get("degree", "").lower())
-
-            # projects
-            for proj in content.get("projects_and_publications", []):
-                searchable_parts.append(proj.get("name", "").lower())
-                searchable_parts.append(proj.get("description", "").lower())
-
-            combined = " ".join(searchable_parts)
-            if query in combined:
-                matches.append(
-                    {
-                        "id": r.id,
-                        "display_name": r.display_name,
-                        "owner_name": r.owner_name,
-                        "updated_at": r.updated_at.strftime("%Y-%m-%d"),
-                        "template_selector": r.template_selector,
-                    }
-                )
+        matches = [
+            {
+                "id": r.id,
+                "display_name": r.display_name,
+                "owner_name": r.owner_name,
+                "updated_at": r.updated_at.strftime("%Y-%m-%d"),
+                "template_selector": r.template_selector,
+            }
+            for r in search_resumes(Resume.objects.filter(user=user), query)
+        ]
 
         if not matches:
             msg = {
@@ -1018,24 +1379,76 @@ Rules:
             }.get(lang, "Resume not found.")
             return {"type": "chat", "message": msg}
 
-        r1_json = json.dumps(resume1.content, ensure_ascii=False, indent=2)
-        r2_json = json.dumps(resume2.content, ensure_ascii=False, indent=2)
-
-        system_prompt = f"""You are a professional resume reviewer. Compare these two resumes and provide analysis.
+        # The structural diff is local and instant and is returned at once.
+        # The LLM's narrative is fetched separately (compare_summary()) unless
+        # it is already cached for this diff.
+        name1, name2 = resume1.display_name, resume2.display_name
+        diff = diff_resumes(resume1.content, resume2.content)
+        result = {
+            "type": "chat",
+            "message": render_diff(diff, name1, name2, lang),
+            "diff": diff,
+        }
+        if settings.COMPARE_RESUMES["llm_summary"]:
+            narrative = cache.get(self._compare_cache_key(diff, name1, name2, lang))
+            if narrative:
+                result["message"] = (
+                    f"{result['message']}\n\n{self._narrative_message(narrative, lang)}"
+                )
+            else:
+                result["pending_summary"] = True
+                result["summary_url"] = self._followup_url(
+                    user, "compare_summary", [resume1.id, resume2.id], lang
+                )
+        return result
 
-RESUME 1 (ID: {resume1.id}, "{resume1.display_name}"):
-{r1_json}
+    def _compare_cache_key(self, diff: dict, name1: str, name2: str, lang: str) -> str:
+        key = content_hash({"diff": diff, "names": [name1, name2]})
+        return f"compare_resumes:summary:{lang}:{key}"
+
+    def _narrative_message(self, narrative: dict, lang: str) -> str:
+        """Chat text for a {comparison_summary, recommendation} narrative."""
+        lines = []
+        if narrative.get("comparison_summary"):
+            lines.append(f"**{narrative['comparison_summary']}**")
+        if narrative.get("recommendation"):
+            label = "Recommendation" if lang == "en" else "Öneri"
+            lines.append(f"**{label}:** {narrative['recommendation']}")
+        return "\n\n".join(lines)
+
+    def compare_summary(self, resume1, resume2, lang: str = "en") -> str:
+        """
+        Chat text of the LLM's narrative of two resumes' diff, cached by diff;
+        "" when the LLM gave no usable answer.
+        """
+        name1, name2 = resume1.display_name, resume2.display_name
+        diff = diff_resumes(resume1.content, resume2.content)
+        key = self._compare_cache_key(diff, name1, name2, lang)
+        narrative = cache.get(key)
+        if narrative is None:
+            with metering_scope(intent="agent:compare_resumes"):
+                narrative = self._compare_narrative(diff, name1, name2, lang)
+            if not self._narrative_message(narrative, lang):
+                return ""
+            cache.set(key, narrative, settings.COMPARE_RESUMES["cache_ttl_seconds"])
+        return self._narrative_message(narrative, lang)
+
+    def _compare_narrative(
+        self, diff: dict, name1: str, name2: str, lang: str
+    ) -> dict:
+        """{comparison_summary, recommendation} for a resume diff, or {} on failure."""
+        diff_json = json.dumps(diff, ensure_ascii=False, separators=(",", ":"))
+        system_prompt = f"""You are a professional resume reviewer. Summarize how two resumes differ, given their structural diff.
 
-RESUME 2 (ID: {resume2.id}, "{resume2.display_name}"):
-{r2_json}
+RESUME 1: "{name1}"
+RESUME 2: "{name2}"
+DIFF ("only_in_1" = only in resume 1, "bullets.similarity" = 0-1 text similarity of a role's bullets):
+{diff_json}
 
 Respond ONLY with valid JSON:
 {{
   "comparison_summary": "Brief 1-2 sentence overall comparison",
-  "resume_1_strengths": ["strength 1", "strength 2"],
-  "resume_2_strengths": ["strength 1", "strength 2"],
-  "key_differences": ["difference 1", "difference 2", "difference 3"],
-  "recommendation": "Which is stronger and why"
+  "recommendation": "Which is stronger for which kind of role, and why"
 }}
 
 Respond in {"Turkish" if lang == "tr" else "English"}."""
@@ -1043,54 +1456,18 @@ Respond in {"Turkish" if lang == "tr" else "English"}."""
         result = send_openai_message(
             user_message="Compare these two resumes",
             meta_prompt=system_prompt,
+            task="compare_resumes",
             is_json=True,
             temperature=0.3,
-            max_tokens=2000,
         )
-
         try:
             parsed = json.loads(result)
-            name1 = resume1.display_name
-            name2 = resume2.display_name
-
-            lines = [f"**{parsed.get('comparison_summary', '')}**\n"]
-
-            r1_strengths = parsed.get("resume_1_strengths", [])
-            if r1_strengths:
-                lines.append(f"**{name1} — Strengths:**")
-                for s in r1_strengths:
-                    lines.append(f"- {s}")
-                lines.append("")
-
-            r2_strengths = parsed.get("resume_2_strengths", [])
-            if r2_strengths:
-                lines.append(f"**{name2} — Strengths:**")
-                for s in r2_strengths:
-                    lines.append(f"- {s}")
-                lines.append("")
-
-            diffs = parsed.get("key_differences", [])
-            if diffs:
-                lines.append(
-                    "**Key Differences:**" if lang == "en" else "**Temel Farklar:**"
-                )
-                for d in diffs:
-                    lines.append(f"- {d}")
-                lines.append("")
-
-            rec = parsed.get("recommendation", "")
-            if rec:
-                label = "Recommendation" if lang == "en" else "Öneri"
-                lines.append(f"**{label}:** {rec}")
-
-            return {"type": "chat", "message": "\n".join(lines)}
+            if not isinstance(parsed, dict):
+                raise TypeError("Expected a JSON object")
+            return parsed
         except (ValueError, TypeError) as e:
             logger.warning("compare_resumes LLM parse error: %s", e)
-            msg = {
-                "en": "Sorry, I couldn't compare these resumes. Please try again.",
-                "tr": "Üzgünüm, resume'ları karşılaştıramadım. Lütfen tekrar deneyin.",
-            }.get(lang, "Comparison failed.")
-            return {"type": "chat", "message": msg}
+            return {}
 
     def _exec_translate_resume(self, user, params: dict, lang: str, active_resume=None) -> dict:
         """Translate resume content to a target language using LLM."""
@@ -1114,24 +1491,11 @@ Respond in {"Turkish" if lang == "tr" else "English"}."""
             }.get(lang, "Specify target language: Turkish or English.")
             return {"type": "chat", "message": msg}
 
-        content = resume.content or {}
-        content_json = json.dumps(content, ensure_ascii=False, indent=2)
-
-        prompt = (
-            f"Translate all user-visible text in this resume JSON to {target_language}.\n"
-            "Translate: full_name, job titles, company names, descriptions, school names, "
-            "degrees, field_of_study, project names and descriptions, skills.\n"
-            "Keep emails, URLs, phone numbers, dates, numeric values, and all JSON keys unchanged.\n"
-            "Return ONLY the complete translated JSON, no extra text.\n\n"
-            f"Resume JSON:\n{content_json}"
+        translated = translate_content(
+            resume.content or {}, target_language, user=user
         )
-        meta = f"You are a professional resume translator. Translate all text content to {target_language}. Return valid JSON only."
-
-        result_str = send_openai_message(prompt, meta, is_json=True, temperature=0.2, max_tokens=4000)
-
         try:
-            translated = json.loads(result_str)
-            if not isinstance(translated, dict) or "user_info" not in translated:
+            if translated is None or "user_info" not in translated:
                 raise ValueError("Invalid structure")
             resume.content = translated
             resume.save(update_fields=["content", "updated_at"])
@@ -1145,14 +1509,18 @@ Respond in {"Turkish" if lang == "tr" else "English"}."""
                 "resume_name": resume.display_name,
                 "message": msg,
                 "changes_summary": f"Translated to {target_language}",
-                "quick_replies": (
-                    ["Preview", "Download PDF", "Edit in editor"]
-                    if lang == "en"
-                    else ["Önizle", "PDF İndir", "Editörde düzenle"]
-                ),
+                "quick_replies": [
+                    quick_reply(label, intent, lang, resume_id=resume.id)
+                    for label, intent in zip(
+                        ["Preview", "Download PDF", "Edit in editor"]
+                        if lang == "en"
+                        else ["Önizle", "PDF İndir", "Editörde düzenle"],
+                        ["preview_resume", "download_resume", "edit_resume"],
+                    )
+                ],
             }
-        except (json.JSONDecodeError, ValueError) as e:
-            logger.warning("translate_resume parse error: %s", e)
+        except ValueError as e:
+            logger.warning("translate_resume failed: %s", e)
             msg = {
                 "tr": "Çeviri tamamlanamadı. Lütfen tekrar deneyin.",
                 "en": "Translation couldn't be completed. Please try again.",
@@ -1199,11 +1567,17 @@ Respond in {"Turkish" if lang == "tr" else "English"}."""
                 "_'Update my last experience', 'Add AWS experience', 'Rewrite for DevOps roles'_\n\n"
                 "Replace X with a resume number or name."
             )
-        quick_replies = (
+        labels = (
             ["List resumes", "Check quota", "Upload PDF"]
             if lang == "en"
             else ["Resume'ları listele", "Kotayı kontrol et", "PDF yükle"]
         )
+        quick_replies = [
+            quick_reply(label, intent, lang)
+            for label, intent in zip(
+                labels, ["list_resumes", "check_quota", "upload_resume"]
+            )
+        ]
         return {"type": "chat", "message": msg, "quick_replies": quick_replies}
 
     def _exec_clarify(self, lang: str) -> dict:
@@ -1217,31 +1591,164 @@ Respond in {"Turkish" if lang == "tr" else "English"}."""
     # Helpers
     # ------------------------------------------------------------------
 
-    def _validate_modify_result(self, result: str):
-        """Validate and normalize LLM modify result. Returns parsed dict or None."""
+    def _is_valid_classification(self, result: str) -> bool:
+        """Cascade validator: JSON naming a known intent."""
         try:
-            parsed = json.loads(result)
-            modified = parsed.get("modified_resume")
-            if not modified or not isinstance(modified, dict):
-                logger.warning("modify_resume: missing or invalid modified_resume key")
-                return None
-            if "user_info" not in modified:
-                logger.warning("modify_resume: missing user_info in modified resume")
+            intent = json.loads(result).get("intent")
+        except (ValueError, TypeError, AttributeError):
+            return False
+        return intent == "clarify" or any(t["intent"] == intent for t in TOOL_CATALOG)
+
+    def _validate_modify_result(self, result: str, content=None, keys=None):
+        """
+        Validate and normalize LLM modify result. Returns parsed dict or None.
+        With `keys`, the answer covers only those sections of `content`.
+        """
+        try:
+            parsed = self._parse_modify_json(result, content, keys)
+            if parsed is None:
                 return None
-            # Normalize experience descriptions: string → list
-            for exp in modified.get("experience", []):
-                desc = exp.get("description")
-                if isinstance(desc, str):
-                    exp["description"] = [
-                        d.strip() for d in desc.split("\n") if d.strip()
-                    ]
-            return parsed
-        except (ValueError, TypeError) as e:
+            if keys:
+                self._merge_scoped(parsed, content, keys)
+            return self._normalize_modified(parsed)
+        except (ValueError, TypeError, AttributeError) as e:
             logger.warning(
                 "modify_resume parse error: %s | result: %s", e, result[:200]
             )
             return None
 
+    def _apply_modify_patch(self, result: str, content: dict, keys=None):
+        """
+        Apply a JSON Patch modify result to `content`, or to its `keys`
+        sections when the prompt showed only those.
+        A full "modified_resume" answer is accepted too. Returns the same shape
+        as _validate_modify_result, or None if the patch is invalid.
+        """
+        try:
+            parsed = self._parse_modify_json(result, content, keys)
+            if parsed is None:
+                return None
+            if "patch" not in parsed:
+                if keys:
+                    self._merge_scoped(parsed, content, keys)
+                return self._normalize_modified(parsed)
+            if keys:
+                patched = apply_patch(scoped_content(content, keys), parsed.pop("patch"))
+                parsed["modified_resume"] = merge_sections(content, patched, keys)
+            else:
+                parsed["modified_resume"] = apply_patch(content, parsed.pop("patch"))
+            return self._normalize_modified(parsed)
+        except JsonPatchError as e:
+            logger.warning("modify_resume patch rejected: %s", e)
+            return None
+        except (ValueError, TypeError, AttributeError) as e:
+            logger.warning(
+                "modify_resume patch parse error: %s | result: %s", e, result[:200]
+            )
+            return None
+
+    def _parse_modify_json(self, result: str, content, keys=None):
+        """
+        Parse a modify answer with local JSON repair (code fences, trailing
+        commas, truncated output), so formatting slips don't cost a retry.
+
+        A truncated "modified_resume" is salvaged: sections the model finished
+        are kept, the section it was cut off in and the ones it never reached
+        come from the resume shown. Returns None when nothing usable survived,
+        including a truncated "patch" (applying part of an edit is worse than
+        retrying it).
+        """
+        parsed, truncated_at = loads_lenient(result)
+        if not isinstance(parsed, dict):
+            raise ValueError("Expected a JSON object")
+        if not truncated_at:
+            if truncated_at is not None:
+                logger.info("modify_resume: repaired truncated answer")
+            return parsed
+
+        if truncated_at[0] == "patch":
+            logger.warning("modify_resume: truncated patch, not applying part of it")
+            return None
+        if truncated_at[0] != "modified_resume":
+            # Cut off in changes_summary/response_message; the resume is whole.
+            parsed.pop(truncated_at[0], None)
+            logger.info("modify_resume: repaired answer truncated after the resume")
+            return parsed
+
+        modified = parsed.get("modified_resume")
+        document = content or {}
+        if keys:
+            document = scoped_content(document, keys)
+        if not isinstance(modified, dict) or not document:
+            return None
+        if len(truncated_at) > 1:
+            modified.pop(truncated_at[1], None)
+        for key, value in document.items():
+            modified.setdefault(key, value)
+        if modified == document:
+            logger.warning("modify_resume: truncated before any finished section")
+            return None
+        logger.info(
+            "modify_resume: salvaged truncated answer (kept %s)",
+            [key for key in modified if modified[key] != document.get(key)],
+        )
+        return parsed
+
+    def _merge_scoped(self, parsed: dict, content: dict, keys: list) -> None:
+        """Replace a sections-only "modified_resume" with the merged full resume."""
+        sections = parsed.get("modified_resume")
+        if isinstance(sections, dict):
+            parsed["modified_resume"] = merge_sections(content, sections, keys)
+
+    def _normalize_modified(self, parsed: dict):
+        modified = parsed.get("modified_resume")
+        if not modified or not isinstance(modified, dict):
+            logger.warning("modify_resume: missing or invalid modified_resume key")
+            return None
+        if "user_info" not in modified:
+            logger.warning("modify_resume: missing user_info in modified resume")
+            return None
+        # Sections returned as a single object instead of a list
+        for key in ("experience", "education", "projects_and_publications"):
+            if isinstance(modified.get(key), dict):
+                modified[key] = [modified[key]]
+        # Normalize experience descriptions: string → list
+        for exp in modified.get("experience", []):
+            desc = exp.get("description")
+            if isinstance(desc, str):
+                exp["description"] = [d.strip() for d in desc.split("\n") if d.strip()]
+            elif desc is None and "description" in exp:
+                exp["description"] = []
+        # Skills returned as one comma-separated string
+        skills = modified["user_info"].get("skills")
+        if isinstance(skills, str):
+            modified["user_info"]["skills"] = [
+                s.strip() for s in skills.split(",") if s.strip()
+            ]
+        return parsed
+
+    def _followup_url(self, user, name: str, args: list, lang: str) -> str:
+        """
+        URL of a deferred LLM call (suggestions, summaries) for `user`, good
+        for one request. Only a charged, rate-limited agent turn issues them,
+        so the follow-up endpoints can't be called in a loop.
+        """
+        token = secrets.token_urlsafe(16)
+        cache.set(
+            f"agent_followup:{token}",
+            (user.pk, name, list(args)),
+            settings.AGENT_CHAT_RATE_LIMIT["followup_ttl_seconds"],
+        )
+        url = reverse(f"resume:{name}", args=args)
+        return f"{url}?{urlencode({'lang': lang, 'token': token})}"
+
+    def claim_followup(self, user, name: str, args: list, token: str) -> bool:
+        """Use up a _followup_url() token; False if it isn't valid for this call."""
+        key = f"agent_followup:{token}"
+        if cache.get(key) != (user.pk, name, list(args)):
+            return False
+        return bool(cache.delete(key))
+
     def _resolve_resume(self, user, params: dict):
         resume_id = params.get("resume_id")
         if not resume_id:
@@ -0,0 +1,348 @@
+"""
+Bulk import of many resume PDFs in one request.
+
+Recruiting partners onboarding candidates upload several PDFs (or one ZIP of
+PDFs) at once. run_bulk_import() only does the quick part in the request:
+
+1. spools every PDF to a temporary directory and hashes it; files this user
+   already imported (or repeated inside the batch) are answered from their
+   ResumeImport row,
+2. checks the import and resume quotas once for the whole batch,
+3. queues one ImportJob per new file on the background import pipeline
+   (see import_jobs), which extracts text, calls the LLM and creates the
+   resume, stage by stage.
+
+The view answers 202 with a job id per file for the client to poll through
+import_job_status, so a large batch can't outlive the worker timeout, and
+every file keeps the stages it finished even if another one fails.
+"""
+
+import logging
+import os
+import shutil
+import tempfile
+import zipfile
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+
+from resume.models import ImportJob, ResumeImport
+from resume.services.import_jobs import enqueue_job, is_stale
+from resume.services.import_service import hash_file
+
+logger = logging.getLogger(__name__)
+
+STATUS_QUEUED = "queued"
+STATUS_DUPLICATE = "duplicate"
+STATUS_REJECTED = "rejected"
+
+
+class BulkImportError(Exception):
+    """The batch as a whole can't be imported; `status` is the HTTP status to return."""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class BulkImportFile:
+    name: str
+    path: str = ""
+    sha256: str = ""
+    status: str = ""
+    error: str = ""
+    resume_id: int = None
+    job_id: int = None
+    record: ResumeImport = None
+
+    def as_result(self) -> dict:
+        result = {"file": self.name, "status": self.status}
+        if self.job_id:
+            result["job_id"] = self.job_id
+        if self.resume_id:
+            result["resume_id"] = self.resume_id
+        if self.error:
+            result["error"] = self.error
+        return result
+
+
+@dataclass
+class BulkImportResult:
+    files: list = field(default_factory=list)
+
+    def count(self, status: str) -> int:
+        return sum(1 for f in self.files if f.status == status)
+
+    @property
+    def job_ids(self) -> list:
+        return list(dict.fromkeys(f.job_id for f in self.files if f.job_id))
+
+    def as_dict(self) -> dict:
+        return {
+            "queued": self.count(STATUS_QUEUED),
+            "duplicates": self.count(STATUS_DUPLICATE),
+            "rejected": self.count(STATUS_REJECTED),
+            "jobs": self.job_ids,
+            "results": [f.as_result() for f in self.files],
+        }
+
+
+def _copy_limited(source, target_path: str, limit: int) -> bool:
+    """Copy a file-like object to `target_path`; False if it exceeds `limit` bytes."""
+    size = 0
+    with open(target_path, "wb") as out:
+        while True:
+            chunk = source.read(64 * 1024)
+            if not chunk:
+                return True
+            size += len(chunk)
+            if size > limit:
+                return False
+            out.write(chunk)
+
+
+def _rejected(name: str, error: str) -> BulkImportFile:
+    return BulkImportFile(name, status=STATUS_REJECTED, error=error)
+
+
+def _too_large(name: str, cfg: dict) -> BulkImportFile:
+    return _rejected(
+        name, f"File too large. Maximum size is {cfg['max_file_size'] // 2**20}MB."
+    )
+
+
+def _spool_pdf(workdir: str, name: str, source, cfg: dict) -> BulkImportFile:
+    item = BulkImportFile(name=name)
+    path = os.path.join(workdir, f"{len(os.listdir(workdir))}.pdf")
+    if not _copy_limited(source, path, cfg["max_file_size"]):
+        os.unlink(path)
+        return _too_large(name, cfg)
+    item.path = path
+    item.sha256 = hash_file(path)
+    return item
+
+
+def _zip_plan(archive: zipfile.ZipFile, cfg: dict) -> list:
+    """
+    [(member info, rejection or None)] for the files in `archive`, read from
+    its directory only. Members with None are the PDFs to extract.
+    """
+    plan = []
+    for info in archive.infolist():
+        name = info.filename
+        # Skip folders and the metadata files macOS adds to archives.
+        base = os.path.basename(name)
+        if info.is_dir() or name.startswith("__MACOSX/") or base.startswith("."):
+            continue
+        if not name.lower().endswith(".pdf"):
+            plan.append((info, _rejected(name, "Only PDF files are allowed.")))
+        elif info.file_size > cfg["max_file_size"]:
+            plan.append((info, _too_large(name, cfg)))
+        else:
+            plan.append((info, None))
+    return plan
+
+
+def _spool_zip(workdir: str, archive: zipfile.ZipFile, plan: list, cfg: dict) -> list:
+    items = []
+    for info, rejection in plan:
+        if rejection is not None:
+            items.append(rejection)
+            continue
+        # The declared size can lie; _copy_limited enforces the cap while reading.
+        with archive.open(info) as member:
+            items.append(_spool_pdf(workdir, info.filename, member, cfg))
+    return items
+
+
+def spool_files(workdir: str, uploaded_files: list) -> list:
+    """
+    Write the PDFs of a batch (plain uploads and ZIP members) to `workdir`.
+
+    The limits are checked on the ZIP directories before anything is
+    extracted, so an archive with thousands of members (or a zip bomb) is
+    rejected without touching the disk. Members that are skipped or rejected
+    don't count toward them.
+
+    Raises:
+        BulkImportError: If the batch holds more than BULK_IMPORT["max_files"]
+            PDFs, or its ZIPs declare more than "max_zip_uncompressed_size" of PDFs.
+    """
+    cfg = settings.BULK_IMPORT
+    batch = []  # (uploaded file, archive, zip plan); plain files have no archive
+    try:
+        pdf_count = zip_bytes = 0
+        for uploaded_file in uploaded_files:
+            name = uploaded_file.name.lower()
+            archive = plan = None
+            if name.endswith(".zip") and uploaded_file.size <= cfg["max_zip_size"]:
+                try:
+                    archive = zipfile.ZipFile(uploaded_file)
+                except zipfile.BadZipFile:
+                    pass
+                else:
+                    plan = _zip_plan(archive, cfg)
+                    pdfs = [info for info, rejection in plan if rejection is None]
+                    pdf_count += len(pdfs)
+                    zip_bytes += sum(info.file_size for info in pdfs)
+            elif name.endswith(".pdf"):
+                pdf_count += 1
+            batch.append((uploaded_file, archive, plan))
+
+        if pdf_count > cfg["max_files"]:
+            raise BulkImportError(
+                f"Too many files. A bulk import accepts up to {cfg['max_files']} PDFs."
+            )
+        if zip_bytes > cfg["max_zip_uncompressed_size"]:
+            raise BulkImportError(
+                "ZIP contents too large. The PDFs in a batch may total up to "
+                f"{cfg['max_zip_uncompressed_size'] // 2**20}MB uncompressed."
+            )
+
+        items = []
+        for uploaded_file, archive, plan in batch:
+            name = uploaded_file.name
+            if archive is not None:
+                items.extend(_spool_zip(workdir, archive, plan, cfg))
+            elif name.lower().endswith(".zip"):
+                if uploaded_file.size > cfg["max_zip_size"]:
+                    items.append(_rejected(name, "ZIP file too large."))
+                else:
+                    items.append(_rejected(name, "Invalid ZIP file."))
+            elif name.lower().endswith(".pdf"):
+                items.append(_spool_pdf(workdir, name, uploaded_file, cfg))
+            else:
+                items.append(_rejected(name, "Only PDF or ZIP files are allowed."))
+        return items
+    finally:
+        for _, archive, _ in batch:
+            if archive is not None:
+                archive.close()
+
+
+def _check_quota(profile, new_imports: int, new_resumes: int) -> None:
+    """Reject the whole batch if it doesn't fit the user's remaining quota."""
+    if profile.is_pro():
+        return
+    limits = settings.FREE_TIER_LIMITS
+    profile.reset_if_new_month()
+    remaining_resumes = limits["resume_count"] - profile.user.resumes.count()
+    if new_resumes > remaining_resumes:
+        raise BulkImportError(
+            f"Resume limit reached. This batch needs {new_resumes} new resumes but "
+            f"your Free plan has {max(0, remaining_resumes)} left. "
+            "Upgrade to Pro for unlimited resumes.",
+            status=403,
+        )
+    remaining_imports = limits["import_count"] - profile.import_count
+    if new_imports > remaining_imports:
+        raise BulkImportError(
+            f"Monthly PDF import limit reached. This batch needs {new_imports} imports but "
+            f"your Free plan has {max(0, remaining_imports)} left this month.",
+            status=403,
+        )
+
+
+def _running_job(record: ResumeImport):
+    """An import job of `record` that is still making progress, if any."""
+    if record is None:
+        return None
+    return next(
+        (job for job in record.jobs.all() if job.is_active and not is_stale(job)), None
+    )
+
+
+def _queue_jobs(user, source: str, items: list) -> None:
+    """Create and queue an ImportJob per item, with its PDF if text is still needed."""
+    jobs = []
+    with transaction.atomic():
+        for item in items:
+            if item.record is None:
+                item.record, _ = ResumeImport.objects.get_or_create(
+                    user=user,
+                    source=source,
+                    content_hash=item.sha256,
+                    defaults={"file_name": os.path.basename(item.name)[:255]},
+                )
+            job = ImportJob(user=user, import_record=item.record)
+            if not item.record.extracted_text:
+                with open(item.path, "rb") as f:
+                    job.upload.save(f"{item.sha256}.pdf", File(f), save=False)
+            job.save()
+            item.job_id = job.pk
+            item.status = STATUS_QUEUED
+            jobs.append(job)
+    for job in jobs:
+        enqueue_job(job)
+
+
+def run_bulk_import(
+    user, uploaded_files: list, source: str = ResumeImport.SOURCE_PDF
+) -> BulkImportResult:
+    """
+    Queue an import job for every new PDF in `uploaded_files`.
+
+    Raises:
+        BulkImportError: For batch-level problems (too many files, quota).
+    """
+    result = BulkImportResult()
+    workdir = tempfile.mkdtemp(prefix="bulk-import-")
+    try:
+        result.files = spool_files(workdir, uploaded_files)
+        pending = [f for f in result.files if not f.status]
+        if not pending:
+            return result
+
+        records = {
+            r.content_hash: r
+            for r in ResumeImport.objects.filter(
+                user=user, source=source, content_hash__in={f.sha256 for f in pending}
+            ).prefetch_related("jobs")
+        }
+        first_copy = {}
+        repeated, to_queue = [], []
+        for item in pending:
+            item.record = records.get(item.sha256)
+            if item.sha256 in first_copy:
+                repeated.append(item)
+                continue
+            first_copy[item.sha256] = item
+            if item.record and item.record.resume_id:
+                item.status = STATUS_DUPLICATE
+                item.resume_id = item.record.resume_id
+                continue
+            running = _running_job(item.record)
+            if running:
+                item.status = STATUS_QUEUED
+                item.job_id = running.pk
+                continue
+            to_queue.append(item)
+
+        # Files with stored JSON only rebuild their resume; they aren't charged.
+        new_imports = sum(
+            1
+            for item in to_queue
+            if item.record is None or item.record.parsed_json is None
+        )
+        _check_quota(user.profile, new_imports, len(to_queue))
+        _queue_jobs(user, source, to_queue)
+
+        # Same file twice in one batch: report it against the first copy.
+        for item in repeated:
+            first = first_copy[item.sha256]
+            item.status = STATUS_DUPLICATE
+            item.resume_id, item.job_id = first.resume_id, first.job_id
+        logger.info(
+            "Bulk import for user %s: %d files, %d queued, %d duplicates, %d rejected",
+            user.pk,
+            len(result.files),
+            result.count(STATUS_QUEUED),
+            result.count(STATUS_DUPLICATE),
+            result.count(STATUS_REJECTED),
+        )
+        return result
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
@@ -0,0 +1,67 @@
+"""
+Per-request time budgets for flows that chain several LLM calls.
+
+An agent message can classify, patch, retry with a full document and escalate
+to a stronger model, each call with its own upstream timeout. Without an
+overall limit, the sum can outlive gunicorn's worker timeout and the worker
+is killed mid-request. RequestDeadlineMiddleware starts a deadline for the
+views listed in LLM_DEADLINES["views"]; it is kept in a context variable, so
+it follows the request into run_concurrently() threads, and:
+
+- send_openai_message() gives each call at most the remaining budget and
+  skips calls (including cascade escalations) that can't start in time,
+- callers skip optional steps (such as the modify_resume full-document
+  retry) when has_time_for() says they can't finish, and reply with what
+  they have instead.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_deadline = ContextVar("request_deadline", default=None)
+
+
+@contextmanager
+def deadline_scope(seconds: float = None):
+    """
+    Give code inside the block at most `seconds` in total. An enclosing
+    deadline is never extended; with `seconds=None` the block only restores
+    the outer deadline on exit (see set_deadline()).
+    """
+    deadline = _deadline.get()
+    if seconds is not None:
+        ends_at = time.monotonic() + seconds
+        deadline = ends_at if deadline is None else min(deadline, ends_at)
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def set_deadline(seconds: float) -> None:
+    """Start a `seconds` budget for the rest of the current context."""
+    deadline = _deadline.get()
+    ends_at = time.monotonic() + seconds
+    _deadline.set(ends_at if deadline is None else min(deadline, ends_at))
+
+
+def remaining():
+    """Seconds left before the deadline, or None when there is none."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+
+def has_time_for(seconds: float) -> bool:
+    """Whether a step needing `seconds` can still finish before the deadline."""
+    left = remaining()
+    return left is None or left >= seconds
+
+
+def capped(seconds: float) -> float:
+    """`seconds`, or the remaining budget when that is shorter."""
+    left = remaining()
+    return seconds if left is None else min(seconds, left)
@@ -0,0 +1,319 @@
+"""
+Background import jobs for PDF uploads.
+
+upload_cv / upload_linkedin_cv create an ImportJob and return its id at once.
+The job runs on a small thread pool inside the web worker, through the stages
+
+    extract_text -> call_llm -> validate -> create_resume
+
+and appends "started" / "completed" / "skipped" / "failed" events that the
+client polls via the import_job_status view.
+
+Stage outputs are kept on the job's ResumeImport row (text, parsed JSON,
+resume), so retry_job() skips finished stages. The uploaded PDF is kept only
+until its text has been extracted or the job ends, whichever comes first.
+"""
+
+import contextvars
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from resume.models import ImportJob, Resume, ResumeImport, UserProfile
+from resume.openai_engine import (
+    extract_linkedin_resume_data,
+    extract_resume_data,
+    is_error_response,
+)
+from resume.services.import_service import (
+    auto_title_from_content,
+    extract_pdf_text,
+    parse_extraction_result,
+)
+
+logger = logging.getLogger(__name__)
+
+EXTRACT_FUNCTIONS = {
+    ResumeImport.SOURCE_PDF: extract_resume_data,
+    ResumeImport.SOURCE_LINKEDIN: extract_linkedin_resume_data,
+}
+TITLE_PREFIXES = {
+    ResumeImport.SOURCE_PDF: "",
+    ResumeImport.SOURCE_LINKEDIN: "LinkedIn",
+}
+
+# Progress (percent) at the start and end of each stage
+STAGE_PROGRESS = {
+    ImportJob.STAGE_EXTRACT_TEXT: (5, 25),
+    ImportJob.STAGE_CALL_LLM: (25, 85),
+    ImportJob.STAGE_VALIDATE: (85, 90),
+    ImportJob.STAGE_CREATE_RESUME: (90, 100),
+}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+class ImportStageError(Exception):
+    """A stage failed; `status` mirrors the HTTP status of the old synchronous view."""
+
+    def __init__(self, message: str, status: int = 500):
+        super().__init__(message)
+        self.status = status
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.IMPORT_JOBS["max_workers"],
+                thread_name_prefix="import-job",
+            )
+        return _executor
+
+
+def enqueue_job(job: ImportJob) -> None:
+    """
+    Schedule `job` to run after the current transaction commits.
+
+    With IMPORT_JOBS["eager"] the job runs inline instead (tests, debugging).
+    """
+    if settings.IMPORT_JOBS["eager"]:
+        run_job(job.pk)
+        return
+
+    # Carry the request's metering attribution (user, intent) into the worker.
+    ctx = contextvars.copy_context()
+    transaction.on_commit(lambda: _get_executor().submit(ctx.run, _run_in_worker, job.pk))
+
+
+def _run_in_worker(job_id: int) -> None:
+    try:
+        run_job(job_id)
+    finally:
+        # Pool threads outlive the job; don't leave their DB connections open.
+        connections.close_all()
+
+
+def _add_event(job: ImportJob, stage: str, event: str, **extra) -> None:
+    job.events.append(
+        {"stage": stage, "event": event, "at": timezone.now().isoformat(), **extra}
+    )
+
+
+@contextmanager
+def _stage(job: ImportJob, stage: str):
+    start_progress, end_progress = STAGE_PROGRESS[stage]
+    job.stage = stage
+    job.progress = start_progress
+    _add_event(job, stage, "started")
+    job.save(update_fields=["stage", "progress", "events", "updated_at"])
+
+    started = time.monotonic()
+    details = {}
+    try:
+        yield details
+    except Exception as e:
+        _add_event(
+            job,
+            stage,
+            "failed",
+            duration_ms=int((time.monotonic() - started) * 1000),
+            error=str(e) if isinstance(e, ImportStageError) else "Unexpected error",
+        )
+        raise
+    job.progress = end_progress
+    _add_event(
+        job,
+        stage,
+        "completed",
+        duration_ms=int((time.monotonic() - started) * 1000),
+        **details,
+    )
+    job.save(update_fields=["progress", "events", "updated_at"])
+
+
+def _skip_stage(job: ImportJob, stage: str) -> None:
+    job.stage = stage
+    job.progress = STAGE_PROGRESS[stage][1]
+    _add_event(job, stage, "skipped")
+    job.save(update_fields=["stage", "progress", "events", "updated_at"])
+
+
+def _discard_upload(job: ImportJob) -> None:
+    if not job.upload:
+        return
+    try:
+        job.upload.delete(save=False)
+        job.save(update_fields=["upload", "updated_at"])
+    except Exception:
+        logger.exception("Could not delete the upload of import job %s", job.pk)
+
+
+def run_job(job_id: int) -> ImportJob:
+    """Run every unfinished stage of the job; failures are recorded on the job."""
+    job = ImportJob.objects.select_related("import_record").get(pk=job_id)
+    record = job.import_record
+    job.status = ImportJob.STATUS_RUNNING
+    job.attempts += 1
+    job.error = ""
+    job.error_code = None
+    job.save(update_fields=["status", "attempts", "error", "error_code", "updated_at"])
+
+    try:
+        if record.extracted_text:
+            _skip_stage(job, ImportJob.STAGE_EXTRACT_TEXT)
+        else:
+            with _stage(job, ImportJob.STAGE_EXTRACT_TEXT) as details:
+                if not job.upload:
+                    raise ImportStageError(
+                        "The uploaded file is no longer available. Please upload it again.",
+                        status=410,
+                    )
+                pdf_text = extract_pdf_text(job.upload.path)
+                details.update(
+                    page_count=pdf_text.page_count,
+                    pages_extracted=len(pdf_text.pages),
+                    page_timings_ms=pdf_text.page_timings_ms,
+                    truncated=pdf_text.truncated,
+                    timed_out=pdf_text.timed_out,
+                )
+                record.extracted_text = pdf_text.text
+                record.save(update_fields=["extracted_text", "updated_at"])
+        _discard_upload(job)
+
+        # Guard: minimum text length before calling OpenAI
+        if len(record.extracted_text.strip()) < 50:
+            raise ImportStageError(
+                "Could not extract enough text from this PDF. Please ensure it contains readable text (not a scanned image).",
+                status=422,
+            )
+
+        if record.parsed_json is not None:
+            _skip_stage(job, ImportJob.STAGE_CALL_LLM)
+            _skip_stage(job, ImportJob.STAGE_VALIDATE)
+        else:
+            with _stage(job, ImportJob.STAGE_CALL_LLM):
+                extracted_json_string = EXTRACT_FUNCTIONS[record.source](
+                    record.extracted_text
+                )
+                if is_error_response(extracted_json_string):
+                    raise ImportStageError(
+                        f"AI Service Error: {extracted_json_string}", status=503
+                    )
+            with _stage(job, ImportJob.STAGE_VALIDATE):
+                _store_parsed_json(job, record, extracted_json_string)
+
+        with _stage(job, ImportJob.STAGE_CREATE_RESUME):
+            resume = _create_resume(job, record)
+
+        job.status = ImportJob.STATUS_SUCCEEDED
+        job.resume = resume
+        job.save(update_fields=["status", "resume", "updated_at"])
+    except ImportStageError as e:
+        _fail(job, str(e), e.status)
+    except Exception:
+        logger.exception("Import job %s failed in stage %s", job.pk, job.stage)
+        _fail(job, "Import failed unexpectedly. Please retry.", 500)
+    finally:
+        # Failed jobs would otherwise keep their PDF in MEDIA_ROOT forever.
+        _discard_upload(job)
+    return job
+
+
+def _store_parsed_json(job: ImportJob, record: ResumeImport, extracted_json_string: str):
+    try:
+        extracted_json = parse_extraction_result(extracted_json_string)
+    except json.JSONDecodeError as e:
+        logger.error("Failed to decode JSON: %s", e)
+        raise ImportStageError("Failed to parse extracted JSON", status=500)
+
+    # Check for parse failure from validation layer
+    if extracted_json.get("parse_error"):
+        raise ImportStageError(
+            extracted_json.get("message", "Could not extract resume data."), status=422
+        )
+
+    with transaction.atomic():
+        record.parsed_json = extracted_json
+        record.save(update_fields=["parsed_json", "updated_at"])
+
+        # QUOTA: The import is charged once the LLM work for this file is done;
+        # later retries or re-uploads of the same file reuse the stored JSON.
+        # Incremented in SQL: other jobs of the same user may run alongside.
+        UserProfile.objects.filter(user_id=job.user_id).update(
+            import_count=F("import_count") + 1
+        )
+
+
+def _create_resume(job: ImportJob, record: ResumeImport) -> Resume:
+    with transaction.atomic():
+        # A concurrent job for the same file may have finished first.
+        record = ResumeImport.objects.select_for_update().get(pk=record.pk)
+        if record.resume_id:
+            return record.resume
+
+        resume = Resume.objects.create(
+            user=job.user,
+            title=auto_title_from_content(
+                record.parsed_json, prefix=TITLE_PREFIXES[record.source]
+            ),
+            content=record.parsed_json,
+        )
+        record.resume = resume
+        record.save(update_fields=["resume", "updated_at"])
+        return resume
+
+
+def _fail(job: ImportJob, message: str, status: int) -> None:
+    if not job.events or job.events[-1]["event"] != "failed":
+        _add_event(job, job.stage, "failed", error=message)
+    job.status = ImportJob.STATUS_FAILED
+    job.error = message
+    job.error_code = status
+    job.save(update_fields=["status", "error", "error_code", "events", "updated_at"])
+
+
+def is_stale(job: ImportJob) -> bool:
+    """True for a queued/running job whose worker stopped updating it (e.g. restart)."""
+    cutoff = timezone.now() - timedelta(seconds=settings.IMPORT_JOBS["stale_after_seconds"])
+    return job.is_active and job.updated_at < cutoff
+
+
+def is_retryable(job: ImportJob) -> bool:
+    return job.status == ImportJob.STATUS_FAILED or is_stale(job)
+
+
+def retry_job(job: ImportJob) -> None:
+    """Re-queue a failed job; finished stages are skipped when it runs."""
+    job.status = ImportJob.STATUS_QUEUED
+    _add_event(job, job.stage, "retry")
+    job.save(update_fields=["status", "events", "updated_at"])
+    enqueue_job(job)
+
+
+def job_payload(job: ImportJob, since: int = 0) -> dict:
+    """JSON body for the status endpoint; `since` skips events the client has seen."""
+    return {
+        "job_id": job.pk,
+        "status": job.status,
+        "stage": job.stage,
+        "progress": job.progress,
+        "attempts": job.attempts,
+        "resume_id": job.resume_id,
+        "error": job.error,
+        "error_code": job.error_code,
+        "retryable": is_retryable(job),
+        "events": job.events[since:],
+        "next_event": len(job.events),
+    }
@@ -0,0 +1,275 @@
+"""
+Helpers for importing resumes from uploaded PDFs.
+
+Uploads are spooled to a temporary file in chunks and hashed with a
+memory-mapped read, so large files are never held in memory twice. The
+SHA-256 content hash keys ResumeImport rows, which keep the extracted text
+and parsed JSON of every import: re-uploading the same file skips PDF
+parsing and the LLM call entirely.
+
+PDF text is extracted page by page on a process pool (see extract_pdf_text),
+bounded by a page cap and a wall-clock budget from PDF_TEXT_EXTRACTION, and
+put back in reading order by resume.services.pdf_layout.
+"""
+
+import hashlib
+import json
+import logging
+import mmap
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from django.conf import settings
+from PyPDF2 import PdfReader
+
+from resume.services.pdf_layout import reconstruct_page_text
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SpooledUpload:
+    """An uploaded file written to disk, with its content hash."""
+
+    path: str
+    sha256: str
+    size: int
+
+
+def hash_file(path: str) -> str:
+    """SHA-256 hex digest of the file at `path`, read through mmap."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return digest.hexdigest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            digest.update(mapped)
+    return digest.hexdigest()
+
+
+@contextmanager
+def spool_upload(uploaded_file):
+    """
+    Stream a Django UploadedFile to a temporary file and hash it.
+
+    Yields:
+        SpooledUpload: Removed from disk when the block exits.
+    """
+    fd, path = tempfile.mkstemp(suffix=".pdf")
+    try:
+        size = 0
+        with os.fdopen(fd, "wb") as out:
+            for chunk in uploaded_file.chunks():
+                out.write(chunk)
+                size += len(chunk)
+        yield SpooledUpload(path=path, sha256=hash_file(path), size=size)
+    finally:
+        os.unlink(path)
+
+
+@dataclass
+class PageText:
+    index: int
+    text: str
+    elapsed_ms: int
+
+
+@dataclass
+class PdfText:
+    """Result of extract_pdf_text: page texts in document order plus limits hit."""
+
+    pages: list = field(default_factory=list)
+    page_count: int = 0
+    truncated: bool = False  # More pages than `max_pages`
+    timed_out: bool = False  # Budget ran out before every page finished
+    elapsed_ms: int = 0
+
+    @property
+    def text(self) -> str:
+        return "\n".join(page.text for page in self.pages)
+
+    @property
+    def page_timings_ms(self) -> list:
+        return [page.elapsed_ms for page in self.pages]
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+# Per worker process: the reader of the last PDF opened, so consecutive pages
+# of the same file don't parse the document again.
+_worker_reader = {}
+
+
+def _extract_page(path: str, index: int, layout: bool = True) -> PageText:
+    start = time.perf_counter()
+    reader = _worker_reader.get(path)
+    if reader is None:
+        _worker_reader.clear()
+        reader = _worker_reader[path] = PdfReader(path)
+    page = reader.pages[index]
+    text = (reconstruct_page_text(page) if layout else "") or page.extract_text() or ""
+    return PageText(index, text, int((time.perf_counter() - start) * 1000))
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # forkserver: workers don't inherit the web worker's threads and
+            # open DB connections the way a plain fork would.
+            methods = multiprocessing.get_all_start_methods()
+            method = "forkserver" if "forkserver" in methods else "spawn"
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.PDF_TEXT_EXTRACTION["max_workers"],
+                mp_context=multiprocessing.get_context(method),
+            )
+        return _pool
+
+
+def _discard_pool(pool: ProcessPoolExecutor) -> None:
+    """
+    Stop a pool whose pages ran past the budget; the next call starts a fresh
+    one. Its worker processes are terminated: a slow or malicious page may
+    never finish, and leaving it running would let abandoned processes pile up.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    # ProcessPoolExecutor has no public way to stop running tasks before 3.14.
+    processes = list((getattr(pool, "_processes", None) or {}).values())
+    pool.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+
+
+def extract_pdf_text(path: str, max_pages: int = None, time_budget: float = None) -> PdfText:
+    """
+    Extract the text of the PDF at `path` page by page.
+
+    Documents with at least `parallel_min_pages` pages are split across a
+    process pool, one page per task. Extraction stops at `max_pages` pages and
+    after `time_budget` seconds; whatever finished by then is returned, still
+    in page order.
+
+    With PDF_TEXT_EXTRACTION["layout"] each page goes through
+    pdf_layout.reconstruct_page_text (columns and section headings), falling
+    back to plain extraction for pages without positioned text.
+
+    Parameters:
+        path (str): PDF file on disk.
+        max_pages (int): Page cap; defaults to PDF_TEXT_EXTRACTION["max_pages"].
+        time_budget (float): Seconds; defaults to PDF_TEXT_EXTRACTION["time_budget_seconds"].
+    """
+    cfg = settings.PDF_TEXT_EXTRACTION
+    max_pages = cfg["max_pages"] if max_pages is None else max_pages
+    time_budget = cfg["time_budget_seconds"] if time_budget is None else time_budget
+    start = time.monotonic()
+    deadline = start + time_budget
+
+    page_count = len(PdfReader(path).pages)
+    indexes = range(min(page_count, max_pages))
+    result = PdfText(page_count=page_count, truncated=page_count > max_pages)
+
+    if len(indexes) < cfg["parallel_min_pages"]:
+        # Spinning up worker tasks costs more than it saves for short resumes.
+        for index in indexes:
+            if time.monotonic() >= deadline:
+                result.timed_out = True
+                break
+            try:
+                result.pages.append(_extract_page(path, index, cfg["layout"]))
+            except Exception as e:
+                logger.warning("PDF page extraction failed: %s", e)
+        _worker_reader.clear()
+    else:
+        pool = _get_pool()
+        futures = [
+            pool.submit(_extract_page, path, index, cfg["layout"]) for index in indexes
+        ]
+        done, not_done = wait(futures, timeout=max(0, deadline - time.monotonic()))
+        if not_done:
+            result.timed_out = True
+            _discard_pool(pool)
+        # Failed pages are reported and dropped rather than failing the upload.
+        for index, future in zip(indexes, futures):
+            if future in done and future.exception() is None:
+                result.pages.append(future.result())
+            elif future in done and isinstance(future.exception(), BrokenProcessPool):
+                # Another extraction discarded the shared pool under this one.
+                if time.monotonic() < deadline:
+                    try:
+                        result.pages.append(_extract_page(path, index, cfg["layout"]))
+                    except Exception as e:
+                        logger.warning("PDF page extraction failed: %s", e)
+            elif future in done:
+                logger.warning("PDF page extraction failed: %s", future.exception())
+        _worker_reader.clear()
+
+    result.elapsed_ms = int((time.monotonic() - start) * 1000)
+    if result.truncated or result.timed_out:
+        logger.warning(
+            "Partial PDF text: %d of %d pages in %d ms (truncated=%s, timed_out=%s)",
+            len(result.pages),
+            page_count,
+            result.elapsed_ms,
+            result.truncated,
+            result.timed_out,
+        )
+    return result
+
+
+def parse_extraction_result(extracted_json_string: str) -> dict:
+    """
+    Parse an extraction response, removing markdown code fences first.
+
+    Raises:
+        json.JSONDecodeError: If the response is not valid JSON.
+    """
+    if "```json" in extracted_json_string:
+        extracted_json_string = (
+            extracted_json_string.split("```json")[1].split("```")[0].strip()
+        )
+    elif "```" in extracted_json_string:
+        extracted_json_string = extracted_json_string.split("```")[1].strip()
+
+    return json.loads(extracted_json_string.strip())
+
+
+def auto_title_from_content(content: dict, prefix: str = "") -> str:
+    """Generate a descriptive resume title from parsed content.
+
+    Prefers most recent job title + company (e.g. 'Software Engineer at Google').
+    Falls back to full name or a generic dated label.
+    """
+    experiences = content.get("experience", [])
+    if experiences:
+        exp = experiences[0]
+        job_title = exp.get("title", "").strip()
+        company = exp.get("company", "").strip()
+        if job_title and company:
+            base = f"{job_title} at {company}"
+        elif job_title:
+            base = job_title
+        else:
+            base = ""
+        if base:
+            return f"{prefix} — {base}" if prefix else base
+
+    full_name = content.get("user_info", {}).get("full_name", "").strip()
+    if full_name:
+        label = f"{prefix} — {full_name}" if prefix else full_name
+        return f"{label} · {datetime.now().strftime('%b %Y')}"
+
+    label = prefix or "Resume"
+    return f"{label} · {datetime.now().strftime('%b %Y')}"
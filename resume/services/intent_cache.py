@@ -0,0 +1,87 @@
+"""
+Short-lived cache of LLM intent classifications.
+
+Users repeat the same phrasing ("son resume'u göster", "analyze my resume")
+while nothing they could be referring to has changed. classify_intent() looks
+up the _llm_classify() result by the normalized message plus a signature of
+the context the LLM would have seen:
+
+- resume IDs, ranks and names (creating, deleting, renaming or reordering
+  resumes changes the key, so stale answers are never served),
+- the active resume and when it was last saved,
+- quota flags (pro tier, whether each limit still has room).
+
+Entries expire after AGENT_CLASSIFY_CACHE["ttl_seconds"]. Hits are recorded
+with the usage meter under the "agent:classify:cache" intent, so
+`llm_usage_report` shows them next to the "agent:classify" LLM calls.
+"""
+
+import hashlib
+import json
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from resume.services.intent_parser import normalize
+from resume.services.llm_metering import metering_scope, usage_meter
+
+logger = logging.getLogger(__name__)
+
+CACHE_HIT_INTENT = "agent:classify:cache"
+
+
+def context_signature(context: dict, active_resume=None) -> str:
+    """Compact, order-stable description of what a classification depends on."""
+    quota = context.get("quota", {})
+    parts = {
+        "resumes": [
+            [r.get("id"), r.get("rank"), r.get("display_name")]
+            for r in context.get("resumes", [])
+        ],
+        "active": [
+            active_resume.id,
+            active_resume.updated_at.isoformat() if active_resume.updated_at else "",
+        ]
+        if active_resume
+        else None,
+        "quota": {
+            key: bool(value) if key.endswith("_remaining") or key == "is_pro" else value
+            for key, value in sorted(quota.items())
+        },
+    }
+    return json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+
+
+def _cache_key(message: str, lang: str, signature: str) -> str:
+    digest = hashlib.sha256(
+        "\x1f".join([normalize(message), lang, signature]).encode("utf-8")
+    ).hexdigest()
+    return f"agent:classify:{digest}"
+
+
+def get_cached_classification(message: str, lang: str, signature: str):
+    """Cached {intent, params, llm_message} for this message and context, or None."""
+    cfg = settings.AGENT_CLASSIFY_CACHE
+    if not cfg["enabled"]:
+        return None
+    started = time.monotonic()
+    result = cache.get(_cache_key(message, lang, signature))
+    if result is not None:
+        with metering_scope(intent=CACHE_HIT_INTENT):
+            usage_meter.record(
+                call_site="classify_intent",
+                model="cache",
+                latency_ms=int((time.monotonic() - started) * 1000),
+            )
+        logger.info("Agent intent %s served from cache", result["intent"])
+    return result
+
+
+def cache_classification(message: str, lang: str, signature: str, result: dict) -> None:
+    """Store an LLM classification; "clarify" answers are not reused."""
+    cfg = settings.AGENT_CLASSIFY_CACHE
+    if not cfg["enabled"] or result.get("intent") == "clarify":
+        return
+    cache.set(_cache_key(message, lang, signature), result, cfg["ttl_seconds"])
@@ -0,0 +1,328 @@
+"""
+Local intent classifier trained on logged classifications.
+
+Every agent message that goes through the command parser or _llm_classify()
+is stored as an IntentClassification row. `manage.py train_intent_classifier`
+fits a multinomial logistic regression on character n-grams of those
+messages and saves it as an IntentClassifierModel row.
+
+classify_intent() asks local_classify() before calling the LLM. The newest
+model answers when its probability clears
+LOCAL_INTENT_CLASSIFIER["confidence_threshold"] and the intent can run
+without parameters the model can't supply:
+
+- intents without parameters (list, quota, help, upload, ...),
+- resume intents when there is an active resume to apply them to and the
+  message doesn't point at another resume (a number, or a word from another
+  resume's name: "analyze the Google resume").
+
+Anything else — delete, find, compare, translate, switch_template (which
+needs a template name), or a low-confidence guess — still goes to the LLM,
+whose answer is logged and improves the next model.
+
+Logged messages are kept for LOCAL_INTENT_CLASSIFIER["log_retention_days"];
+train_intent_classifier deletes older rows before it trains.
+
+The model is plain Python: features are sparse, so a prediction is a few
+hundred dictionary lookups (well under a millisecond). Training is offline
+and takes a few seconds per thousand messages.
+"""
+
+import logging
+import math
+import random
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from resume.services.intent_parser import FILLER_WORDS, RESUME_WORD_RE, normalize
+
+logger = logging.getLogger(__name__)
+
+# Intents whose only parameter is the resume they act on.
+RESUME_INTENTS = {
+    "get_resume_details",
+    "preview_resume",
+    "download_resume",
+    "duplicate_resume",
+    "edit_resume",
+    "modify_resume",
+    "analyze_resume",
+}
+# Intents the local model may answer without an active resume.
+STANDALONE_INTENTS = {
+    "list_resumes",
+    "create_blank_resume",
+    "conversational_build",
+    "upload_resume",
+    "upload_linkedin",
+    "check_quota",
+    "help",
+}
+ACTIVE_FEATURE = "ctx:active"
+# Words of resume display names ("Engineer at Acme", "Jane Doe · Oct 2026",
+# "LinkedIn — ...") that don't single out one resume.
+GENERIC_NAME_WORDS = {
+    "at", "and", "new", "copy", "untitled", "linkedin",
+    "jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec",
+}  # fmt: skip
+
+
+def featurize(message: str, has_active_resume: bool = False) -> list:
+    """Word unigrams and character 2-4 grams of the normalized message."""
+    text = normalize(message)
+    features = {f"w:{word}" for word in text.split()}
+    padded = f" {text} "
+    for n in (2, 3, 4):
+        features.update(f"c:{padded[i:i + n]}" for i in range(len(padded) - n + 1))
+    if has_active_resume:
+        features.add(ACTIVE_FEATURE)
+    return sorted(features)
+
+
+class LocalIntentModel:
+    """Linear softmax model over binary features, stored as JSON."""
+
+    def __init__(self, labels: list, weights: dict, bias: list):
+        self.labels = labels
+        self.weights = weights
+        self.bias = bias
+
+    @classmethod
+    def from_record(cls, record) -> "LocalIntentModel":
+        return cls(record.labels, record.weights, record.bias)
+
+    def probabilities(self, features: list) -> list:
+        scale = 1 / math.sqrt(len(features)) if features else 0.0
+        scores = list(self.bias)
+        for feature in features:
+            row = self.weights.get(feature)
+            if row is not None:
+                for k, weight in enumerate(row):
+                    scores[k] += weight * scale
+        return _softmax(scores)
+
+    def predict(self, message: str, has_active_resume: bool = False):
+        """(intent, probability) of the most likely intent."""
+        probs = self.probabilities(featurize(message, has_active_resume))
+        best = max(range(len(probs)), key=probs.__getitem__)
+        return self.labels[best], probs[best]
+
+
+def _softmax(scores: list) -> list:
+    top = max(scores)
+    exps = [math.exp(s - top) for s in scores]
+    total = sum(exps)
+    return [e / total for e in exps]
+
+
+def train_model(
+    samples: list,
+    epochs: int,
+    learning_rate: float,
+    l2: float,
+    min_feature_count: int,
+    seed: int = 0,
+) -> LocalIntentModel:
+    """
+    Fit a model with SGD on (message, has_active_resume, intent, weight) samples.
+    `weight` scales each sample's gradient (the labeller's confidence).
+    """
+    labels = sorted({intent for _, _, intent, _ in samples})
+    index = {label: k for k, label in enumerate(labels)}
+    featurized = [
+        (featurize(message, active), index[intent], weight)
+        for message, active, intent, weight in samples
+    ]
+    counts = Counter(f for features, _, _ in featurized for f in features)
+    data = [
+        ([f for f in features if counts[f] >= min_feature_count], label, weight)
+        for features, label, weight in featurized
+    ]
+
+    weights = defaultdict(lambda: [0.0] * len(labels))
+    bias = [0.0] * len(labels)
+    rng = random.Random(seed)
+    for epoch in range(epochs):
+        rng.shuffle(data)
+        rate = learning_rate / (1 + epoch)
+        model = LocalIntentModel(labels, weights, bias)
+        for features, label, weight in data:
+            probs = model.probabilities(features)
+            scale = 1 / math.sqrt(len(features)) if features else 0.0
+            for k, prob in enumerate(probs):
+                gradient = (prob - (k == label)) * weight
+                bias[k] -= rate * gradient
+                for feature in features:
+                    row = weights[feature]
+                    row[k] -= rate * (gradient * scale + l2 * row[k])
+
+    # Drop features that ended up irrelevant to keep the stored model small.
+    compact = {
+        feature: [round(w, 4) for w in row]
+        for feature, row in weights.items()
+        if max(abs(w) for w in row) >= 1e-3
+    }
+    return LocalIntentModel(labels, compact, [round(b, 4) for b in bias])
+
+
+def evaluate(model: LocalIntentModel, samples: list, threshold: float) -> dict:
+    """Accuracy overall, and coverage/accuracy of predictions above `threshold`."""
+    correct = confident = confident_correct = 0
+    for message, active, intent, _ in samples:
+        predicted, probability = model.predict(message, active)
+        correct += predicted == intent
+        if probability >= threshold:
+            confident += 1
+            confident_correct += predicted == intent
+    total = len(samples) or 1
+    return {
+        "samples": len(samples),
+        "accuracy": round(correct / total, 4),
+        "coverage": round(confident / total, 4),
+        "confident_accuracy": (
+            round(confident_correct / confident, 4) if confident else 0.0
+        ),
+    }
+
+
+def training_samples(max_samples: int, min_label_confidence: float) -> list:
+    """Newest logged LLM and parser classifications, as train_model() samples."""
+    from resume.models import IntentClassification
+
+    labelled = [IntentClassification.SOURCE_LLM, IntentClassification.SOURCE_RULES]
+    rows = (
+        IntentClassification.objects.filter(source__in=labelled)
+        .exclude(intent="clarify")
+        .values_list("message", "has_active_resume", "intent", "confidence")
+        .order_by("-created_at")[:max_samples]
+    )
+    return [
+        (message, active, intent, 1.0 if confidence is None else confidence)
+        for message, active, intent, confidence in rows
+        if confidence is None or confidence >= min_label_confidence
+    ]
+
+
+def log_classification(
+    user, message: str, result: dict, has_active_resume: bool
+) -> None:
+    """Store one classification for training; failures are logged and ignored."""
+    from resume.models import IntentClassification
+
+    cfg = settings.LOCAL_INTENT_CLASSIFIER
+    if not cfg["log_enabled"] or result.get("source") not in dict(
+        IntentClassification.SOURCE_CHOICES
+    ):
+        return
+    try:
+        IntentClassification.objects.create(
+            user=user if getattr(user, "is_authenticated", False) else None,
+            message=message[: cfg["max_message_length"]],
+            intent=result["intent"],
+            lang=result.get("lang") or "",
+            source=result["source"],
+            confidence=_as_confidence(result.get("confidence")),
+            has_active_resume=has_active_resume,
+        )
+    except Exception:
+        logger.exception("Could not log intent classification")
+
+
+def prune_classifications(retention_days: int) -> int:
+    """Delete logged messages older than `retention_days`; returns how many."""
+    from resume.models import IntentClassification
+
+    if not retention_days:
+        return 0
+    cutoff = timezone.now() - timedelta(days=retention_days)
+    deleted, _ = IntentClassification.objects.filter(created_at__lt=cutoff).delete()
+    return deleted
+
+
+def _as_confidence(value):
+    try:
+        return min(1.0, max(0.0, float(value)))
+    except (TypeError, ValueError):
+        return None
+
+
+_loaded = {"model": None, "version": None, "checked_at": 0.0}
+_load_lock = threading.Lock()
+
+
+def current_model():
+    """Newest trained model, re-checked at most every reload_interval_seconds."""
+    from resume.models import IntentClassifierModel
+
+    interval = settings.LOCAL_INTENT_CLASSIFIER["reload_interval_seconds"]
+    with _load_lock:
+        checked_at = _loaded["checked_at"]
+        if checked_at and time.monotonic() - checked_at < interval:
+            return _loaded["model"]
+        _loaded["checked_at"] = time.monotonic()
+        version = IntentClassifierModel.objects.values_list("pk", flat=True).first()
+        if version != _loaded["version"]:
+            record = IntentClassifierModel.objects.filter(pk=version).first()
+            _loaded["model"] = LocalIntentModel.from_record(record) if record else None
+            _loaded["version"] = version
+        return _loaded["model"]
+
+
+def references_other_resume(
+    message: str, resumes: list, active_resume_id=None
+) -> bool:
+    """
+    Whether `message` may name a resume other than the active one: it has a
+    number ("resume 2", "#3") or a word from another resume's display name.
+    """
+    words = set(normalize(message).split())
+    if any(char.isdigit() for word in words for char in word):
+        return True
+    for resume in resumes:
+        if resume.get("id") == active_resume_id:
+            continue
+        name_words = {
+            word
+            for word in normalize(resume.get("display_name") or "").split()
+            if len(word) > 2
+            and not RESUME_WORD_RE.fullmatch(word)
+            and word not in FILLER_WORDS
+            and word not in GENERIC_NAME_WORDS
+        }
+        if words & name_words:
+            return True
+    return False
+
+
+def local_classify(message: str, active_resume=None, resumes=()):
+    """
+    {intent, params, confidence} from the local model, or None when it is
+    missing, unsure, or predicts an intent that needs the LLM's parameters.
+    `resumes` are the context resumes ({id, display_name}) the message may name.
+    """
+    cfg = settings.LOCAL_INTENT_CLASSIFIER
+    if not cfg["enabled"]:
+        return None
+    model = current_model()
+    if model is None:
+        return None
+
+    intent, probability = model.predict(message, active_resume is not None)
+    if probability < cfg["confidence_threshold"]:
+        return None
+    if intent in STANDALONE_INTENTS:
+        params = {}
+    elif (
+        intent in RESUME_INTENTS
+        and active_resume is not None
+        and not references_other_resume(message, resumes, active_resume.id)
+    ):
+        params = {"resume_id": active_resume.id}
+    else:
+        return None
+    return {"intent": intent, "params": params, "confidence": round(probability, 4)}
@@ -0,0 +1,229 @@
+"""
+Deterministic intent parser for agent chat messages.
+
+Quick-reply chips and short commands ("List resumes", "Preview resume 12",
+"PDF indir", "Kotayı kontrol et") don't need an LLM to be understood.
+parse_intent() recognizes that command grammar in English and Turkish and
+resolves resume references ("last", "#2", "resume 12", "bu") against the
+ranked resume list the LLM would otherwise receive.
+
+The whole message must match a command; anything else — including a command
+with words the grammar doesn't know ("remove my last experience") — returns
+None so AgentService falls through to _llm_classify.
+"""
+
+import re
+
+_TURKISH_FOLD = str.maketrans("ıışçğöüâîû", "iiscgouaiu")
+
+RESUME_WORD_RE = re.compile(r"(?:resume|cv|ozgecmis)\w*")
+
+# Full-message commands without a resume reference, per language.
+SIMPLE_COMMANDS = [
+    (
+        "list_resumes",
+        "en",
+        r"(?:list|show|view)(?: all)?(?: my)? (?:resumes|cvs)|(?:my )?(?:resumes|cvs)"
+        r"|list|how many resumes(?: do i have)?",
+    ),
+    (
+        "list_resumes",
+        "tr",
+        r"(?:tum )?(?:resume|cv|ozgecmis)\w* (?:listele|goster)"
+        r"|listele(?: (?:resume|cv|ozgecmis)\w*)?"
+        r"|kac (?:tane )?(?:resume|cv|ozgecmis)\w*(?: var)?(?: mi)?",
+    ),
+    (
+        "check_quota",
+        "en",
+        r"(?:(?:check|show|view) )?(?:my )?(?:quota|limits|usage)|remaining quota",
+    ),
+    (
+        "check_quota",
+        "tr",
+        r"(?:kota|limit|kullanim)\w*(?: (?:kontrol et|goster|durumu\w*))?",
+    ),
+    ("help", "en", r"help|hi|hello|hey|what can you do|commands"),
+    ("help", "tr", r"yardim|merhaba|selam|neler yapabilirsin|komutlar"),
+    (
+        "upload_linkedin",
+        "en",
+        r"upload(?: my)? linkedin(?: pdf| profile)?|import(?: from)? linkedin",
+    ),
+    ("upload_linkedin", "tr", r"linkedin\w*(?: pdf\w*)? yukle"),
+    ("upload_resume", "en", r"upload(?: a| my)?(?: pdf| resume| cv)*"),
+    ("upload_resume", "tr", r"(?:pdf|resume|cv|ozgecmis)\w* yukle|yukle"),
+    (
+        "create_blank_resume",
+        "en",
+        r"(?:create|start|make)(?: a)? new(?: resume| cv)?"
+        r"|(?:create|make)(?: a)? (?:resume|cv)|new (?:resume|cv)",
+    ),
+    (
+        "create_blank_resume",
+        "tr",
+        r"yeni(?: (?:resume|cv|ozgecmis)\w*)?(?: olustur)?"
+        r"|(?:resume|cv|ozgecmis)\w* olustur",
+    ),
+    ("conversational_build", "en", r"step by step"),
+    ("conversational_build", "tr", r"adim adim"),
+]
+
+# Commands that act on one resume: (intent, English verb first, Turkish verb last).
+RESUME_COMMANDS = [
+    ("preview_resume", r"preview|show|view", r"onizle\w*|goster"),
+    ("download_resume", r"download|export", r"indir"),
+    ("analyze_resume", r"analy[sz]e|score|review", r"analiz et|degerlendir|puanla"),
+    ("edit_resume", r"edit", r"duzenle"),
+    ("duplicate_resume", r"duplicate|copy|clone", r"kopyala|cogalt"),
+    ("delete_resume", r"delete", r"sil"),
+    ("get_resume_details", r"(?:show )?details(?: of| for)?", r"detay\w*(?: goster)?"),
+]
+
+# Words that may surround a command without changing it.
+FILLER_WORDS = {
+    "the", "my", "a", "an", "as", "pdf", "please", "in", "of", "for", "form", "editor",
+    "changes", "lutfen", "benim", "olarak", "formda", "editorde", "dosya",
+    "degisiklikleri",
+}  # fmt: skip
+
+# Intents where "this" alone isn't enough: a destructive action needs the
+# user to name the resume rather than rely on what's active.
+EXPLICIT_REFERENCE_INTENTS = {"delete_resume"}
+
+ACTIVE_WORDS = {"this", "current", "bu", "su"}
+RANK_WORDS = {
+    "last": 1, "latest": 1, "newest": 1, "first": 1, "son": 1, "ilk": 1,
+    "second": 2, "ikinci": 2, "third": 3, "ucuncu": 3,
+}  # fmt: skip
+
+TEMPLATE_ALIASES = {
+    "faang": "faangpath-simple",
+    "faangpath": "faangpath-simple",
+    "faangpath-simple": "faangpath-simple",
+    "simple": "faangpath-simple",
+    "classic": "faangpath-simple",
+    "klasik": "faangpath-simple",
+    "modern": "modern-sidebar",
+    "sidebar": "modern-sidebar",
+    "modern-sidebar": "modern-sidebar",
+}
+TEMPLATE_COMMANDS = [
+    (
+        "en",
+        r"(?:switch|change)(?: the)?(?: template)?(?: to)? (?P<template>[a-z\-]+)"
+        r"(?: template)?",
+    ),
+    ("en", r"use(?: the)? (?P<template>[a-z\-]+) template"),
+    ("tr", r"(?P<template>[a-z\-]+)\w* (?:sablon\w* )?(?:gec|kullan)"),
+]
+TEMPLATE_PICKER_COMMANDS = [
+    ("en", r"(?:switch|change)(?: the)? template|(?:try )?another template"),
+    ("tr", r"sablon\w* degistir|(?:baska|farkli) (?:bir )?sablon\w*(?: dene)?"),
+]
+
+
+def normalize(message: str) -> str:
+    """Lowercase, fold Turkish letters to ASCII and drop punctuation except # and -."""
+    text = message.replace("İ", "i").lower().translate(_TURKISH_FOLD)
+    text = re.sub(r"(\d+)\.(?=\s|$)", r"#\1", text)  # "2. resume" is positional
+    text = re.sub(r"['’`]", "", text)
+    text = re.sub(r"[^a-z0-9#\-\s]", " ", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def _resolve_reference(tokens: list, resumes: list, active_resume_id=None):
+    """
+    Resume ID for a reference, "" when there is no reference, or None when the
+    tokens are not a reference this parser understands.
+    """
+    tokens = [
+        t for t in tokens if t not in FILLER_WORDS and not RESUME_WORD_RE.fullmatch(t)
+    ]
+    by_rank = {r.get("rank"): r["id"] for r in resumes}
+    ids = {r["id"] for r in resumes}
+
+    if not tokens:
+        return ""
+    if len(tokens) == 2 and tokens in (["most", "recent"], ["en", "son"]):
+        return by_rank.get(1)
+    if len(tokens) == 2 and tokens[0] == "id" and tokens[1].isdigit():
+        return int(tokens[1]) if int(tokens[1]) in ids else None
+    if len(tokens) != 1:
+        return None
+
+    token = tokens[0]
+    if token in ACTIVE_WORDS:
+        return active_resume_id
+    if token in RANK_WORDS:
+        return by_rank.get(RANK_WORDS[token])
+    if re.fullmatch(r"#\d+", token):
+        return by_rank.get(int(token[1:]))
+    if token.isdigit():
+        # "resume 12" is an ID when the user has one, otherwise a position.
+        number = int(token)
+        return number if number in ids else by_rank.get(number)
+    return None
+
+
+def _parse_resume_command(text: str, resumes: list, active_resume_id):
+    for intent, en_verb, tr_verb in RESUME_COMMANDS:
+        patterns = (
+            ("en", rf"(?:{en_verb})(?: (?P<rest>.*))?"),
+            ("tr", rf"(?:(?P<rest>.*) )?(?:{tr_verb})"),
+        )
+        for lang, pattern in patterns:
+            match = re.fullmatch(pattern, text)
+            if not match:
+                continue
+            resume_id = _resolve_reference(
+                (match.group("rest") or "").split(), resumes, active_resume_id
+            )
+            if resume_id == "" and intent not in EXPLICIT_REFERENCE_INTENTS:
+                resume_id = active_resume_id
+            if resume_id:
+                return {"intent": intent, "params": {"resume_id": resume_id}, "lang": lang}
+    return None
+
+
+def _parse_template_command(text: str, active_resume_id):
+    params = {"resume_id": active_resume_id} if active_resume_id else {}
+    for lang, pattern in TEMPLATE_PICKER_COMMANDS:
+        if re.fullmatch(pattern, text):
+            return {"intent": "switch_template", "params": params, "lang": lang}
+    for lang, pattern in TEMPLATE_COMMANDS:
+        match = re.fullmatch(pattern, text)
+        if match and match.group("template") in TEMPLATE_ALIASES:
+            return {
+                "intent": "switch_template",
+                "params": {
+                    **params,
+                    "template": TEMPLATE_ALIASES[match.group("template")],
+                },
+                "lang": lang,
+            }
+    return None
+
+
+def parse_intent(message: str, resumes: list, active_resume_id=None):
+    """
+    Classify `message` without an LLM when it is a known command.
+
+    Parameters:
+        message (str): The user's chat message or chip label.
+        resumes (list): Ranked resumes from the agent context ({"id", "rank", ...}).
+        active_resume_id (int): Resume the user is working on, if any.
+
+    Returns:
+        dict: {"intent", "params", "lang"}, or None when the parser is unsure.
+    """
+    text = normalize(message)
+    if not text or len(text) > 80:
+        return None
+
+    for intent, lang, pattern in SIMPLE_COMMANDS:
+        if re.fullmatch(pattern, text):
+            return {"intent": intent, "params": {}, "lang": lang}
+    return _parse_template_command(text, active_resume_id) or _parse_resume_command(
+        text, resumes, active_resume_id
+    )
@@ -0,0 +1,145 @@
+"""
+Minimal RFC 6902 (JSON Patch) implementation for resume content.
+
+Used by AgentService._exec_modify_resume: the LLM returns a short list of
+operations instead of regenerating the whole resume, and the server applies
+them here. Supports add, remove, replace, move, copy and test with RFC 6901
+JSON Pointers (including "~0"/"~1" escapes and "-" for array append).
+"""
+
+import copy
+
+
+class JsonPatchError(ValueError):
+    """Raised when a patch is malformed or cannot be applied to the document."""
+
+    pass
+
+
+def _parse_pointer(pointer) -> list:
+    if not isinstance(pointer, str):
+        raise JsonPatchError(f"Path must be a string: {pointer!r}")
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        raise JsonPatchError(f"Path must start with '/': {pointer!r}")
+    return [
+        token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")
+    ]
+
+
+def _array_index(container: list, token: str, allow_end: bool = False) -> int:
+    if allow_end and token == "-":
+        return len(container)
+    if not token.isdigit() or (len(token) > 1 and token.startswith("0")):
+        raise JsonPatchError(f"Invalid array index: {token!r}")
+    index = int(token)
+    limit = len(container) if allow_end else len(container) - 1
+    if index > limit:
+        raise JsonPatchError(f"Array index out of range: {index}")
+    return index
+
+
+def _resolve(doc, tokens: list):
+    """Walk to the value addressed by `tokens`."""
+    current = doc
+    for token in tokens:
+        if isinstance(current, dict):
+            if token not in current:
+                raise JsonPatchError(f"Path not found: /{'/'.join(tokens)}")
+            current = current[token]
+        elif isinstance(current, list):
+            current = current[_array_index(current, token)]
+        else:
+            raise JsonPatchError(f"Cannot traverse into scalar at /{'/'.join(tokens)}")
+    return current
+
+
+def _add(doc, tokens: list, value):
+    if not tokens:
+        return value
+    parent = _resolve(doc, tokens[:-1])
+    key = tokens[-1]
+    if isinstance(parent, dict):
+        parent[key] = value
+    elif isinstance(parent, list):
+        parent.insert(_array_index(parent, key, allow_end=True), value)
+    else:
+        raise JsonPatchError(f"Cannot add to scalar at /{'/'.join(tokens)}")
+    return doc
+
+
+def _remove(doc, tokens: list):
+    if not tokens:
+        raise JsonPatchError("Cannot remove the document root")
+    parent = _resolve(doc, tokens[:-1])
+    key = tokens[-1]
+    if isinstance(parent, dict):
+        if key not in parent:
+            raise JsonPatchError(f"Path not found: /{'/'.join(tokens)}")
+        return parent.pop(key)
+    if isinstance(parent, list):
+        return parent.pop(_array_index(parent, key))
+    raise JsonPatchError(f"Cannot remove from scalar at /{'/'.join(tokens)}")
+
+
+def _replace(doc, tokens: list, value):
+    if not tokens:
+        return value
+    parent = _resolve(doc, tokens[:-1])
+    key = tokens[-1]
+    if isinstance(parent, dict):
+        if key not in parent:
+            raise JsonPatchError(f"Path not found: /{'/'.join(tokens)}")
+        parent[key] = value
+    elif isinstance(parent, list):
+        parent[_array_index(parent, key)] = value
+    else:
+        raise JsonPatchError(f"Cannot replace in scalar at /{'/'.join(tokens)}")
+    return doc
+
+
+def apply_patch(document, operations: list):
+    """
+    Apply `operations` to a deep copy of `document` and return the result.
+
+    The input document is never mutated, so a failed patch leaves the caller's
+    data untouched.
+
+    Raises:
+        JsonPatchError: If any operation is malformed or does not apply.
+    """
+    if not isinstance(operations, list):
+        raise JsonPatchError("Patch must be a list of operations")
+
+    doc = copy.deepcopy(document)
+    for operation in operations:
+        if not isinstance(operation, dict) or "op" not in operation:
+            raise JsonPatchError(f"Invalid operation: {operation!r}")
+        op = operation["op"]
+        tokens = _parse_pointer(operation.get("path"))
+
+        if op in ("add", "replace", "test") and "value" not in operation:
+            raise JsonPatchError(f"'{op}' operation requires a value")
+
+        if op == "add":
+            doc = _add(doc, tokens, copy.deepcopy(operation["value"]))
+        elif op == "remove":
+            _remove(doc, tokens)
+        elif op == "replace":
+            doc = _replace(doc, tokens, copy.deepcopy(operation["value"]))
+        elif op in ("move", "copy"):
+            from_tokens = _parse_pointer(operation.get("from"))
+            if op == "move":
+                if tokens[: len(from_tokens)] == from_tokens and tokens != from_tokens:
+                    raise JsonPatchError("Cannot move a value into its own child")
+                value = _remove(doc, from_tokens)
+            else:
+                value = copy.deepcopy(_resolve(doc, from_tokens))
+            doc = _add(doc, tokens, value)
+        elif op == "test":
+            if _resolve(doc, tokens) != operation["value"]:
+                raise JsonPatchError(f"Test failed at {operation.get('path')}")
+        else:
+            raise JsonPatchError(f"Unknown operation: {op!r}")
+    return doc
@@ -0,0 +1,182 @@
+"""
+Lenient parsing of JSON produced by an LLM.
+
+Model answers that fail json.loads() are usually almost right: wrapped in a
+``` code fence, followed by a remark, with a trailing comma, Python literals
+(True/None), or cut off when the output hit max_tokens. loads_lenient()
+repairs those cases locally so callers don't have to pay for another
+request:
+
+1. strip code fences and anything before the first bracket or after the
+   document,
+2. drop trailing commas and map Python literals to JSON ones,
+3. for truncated output, drop the unfinished key or value and close every
+   open string, array and object.
+
+The result says where truncation happened (`truncated_at`), so callers can
+tell complete parts of the document from the one that was cut off.
+"""
+
+import json
+import re
+from typing import NamedTuple
+
+_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)(?:```|$)", re.DOTALL | re.IGNORECASE)
+_TOKEN_RE = re.compile(
+    r'\s*(?:("(?:[^"\\]|\\.)*(?:"|\\?$))|([{}\[\],:])|([^\s{}\[\],:"]+))', re.DOTALL
+)
+_PYTHON_LITERALS = {"True": "true", "False": "false", "None": "null"}
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+class LenientResult(NamedTuple):
+    value: object
+    # Keys/indexes from the root down to the unfinished value the text was cut
+    # off in, e.g. ("modified_resume", "experience", 2). () when the cut fell
+    # between two members of the root; None when the text was complete.
+    truncated_at: tuple = None
+
+
+def loads_lenient(text: str) -> LenientResult:
+    """
+    Parse `text` as JSON, repairing the usual LLM formatting mistakes.
+
+    Raises:
+        ValueError: If no JSON document can be recovered.
+    """
+    if not isinstance(text, str):
+        raise ValueError("Expected a string")
+    fenced = _FENCE_RE.search(text)
+    if fenced:
+        text = fenced.group(1)
+    start = min((i for i in (text.find("{"), text.find("[")) if i >= 0), default=-1)
+    if start < 0:
+        raise ValueError("No JSON object or array found")
+
+    try:
+        value, _ = json.JSONDecoder().raw_decode(text, start)
+        return LenientResult(value)
+    except ValueError:
+        pass
+
+    tokens = _tokenize(text[start:])
+    tokens, cut_in_value = _trim_truncated_end(tokens)
+    stack, path = _open_containers(tokens, cut_in_value)
+    repaired = "".join(tokens) + "".join(_CLOSERS[c] for c in reversed(stack))
+    try:
+        value = json.loads(repaired)
+    except ValueError as e:
+        raise ValueError(f"Could not repair JSON: {e}") from e
+    return LenientResult(value, tuple(path) if stack else None)
+
+
+def _tokenize(text: str) -> list:
+    """JSON tokens with trailing commas removed; stops at the end of the document."""
+    tokens = []
+    depth = 0
+    for match in _TOKEN_RE.finditer(text):
+        string, punct, literal = match.groups()
+        if punct in ("}", "]"):
+            if tokens and tokens[-1] == ",":
+                tokens.pop()
+            depth -= 1
+        elif punct in ("{", "["):
+            depth += 1
+        token = string or punct or _PYTHON_LITERALS.get(literal, literal)
+        if token:
+            tokens.append(token)
+        if depth == 0 and tokens:
+            break  # Trailing remarks after the document are ignored.
+    return tokens
+
+
+def _is_key(tokens: list) -> list:
+    """For each token, whether it is an object key."""
+    flags = []
+    stack = []  # [container, expecting_key]
+    for token in tokens:
+        is_key = False
+        if token in ("{", "["):
+            stack.append([token, token == "{"])
+        elif token in ("}", "]"):
+            if stack:
+                stack.pop()
+        elif token == ",":
+            if stack and stack[-1][0] == "{":
+                stack[-1][1] = True
+        elif token != ":":
+            if stack and stack[-1][0] == "{" and stack[-1][1]:
+                is_key = True
+                stack[-1][1] = False
+        flags.append(is_key)
+    return flags
+
+
+def _is_complete_value(token: str) -> bool:
+    if token.startswith('"'):
+        return len(token) > 1 and token.endswith('"') and not token.endswith('\\"')
+    try:
+        json.loads(token)
+        return True
+    except ValueError:
+        return False
+
+
+def _trim_truncated_end(tokens: list):
+    """
+    Drop an unfinished key, colon, comma or literal at the end of the tokens.
+    Also returns whether the output was cut inside the last value (a string
+    closed here, or a number that may have had more digits).
+    """
+    tokens = list(tokens)
+    trimmed = False
+    while tokens:
+        last = tokens[-1]
+        key = _is_key(tokens)[-1]
+        if last == ",":
+            tokens.pop()
+        elif last == ":":
+            tokens.pop()
+            if tokens:
+                tokens.pop()  # the key it belonged to
+        elif last in ("{", "[", "}", "]"):
+            break
+        elif key:
+            tokens.pop()
+        elif last.startswith('"') and not _is_complete_value(last):
+            # A string value cut short: keep what was written and close it.
+            tokens[-1] = last.rstrip("\\") + '"'
+            return tokens, True
+        elif not _is_complete_value(last):
+            tokens.pop()
+        else:
+            return tokens, not trimmed and last[0] in "-0123456789"
+        trimmed = True
+    return tokens, False
+
+
+def _open_containers(tokens: list, cut_in_value: bool):
+    """
+    Containers left open after `tokens`, and the key/index path to the value
+    the output was cut off in.
+    """
+    stack = []
+    path = []  # current key (objects) or index (arrays) of each open container
+    flags = _is_key(tokens)
+    for token, is_key in zip(tokens, flags):
+        if token in ("{", "["):
+            stack.append(token)
+            path.append(None if token == "{" else 0)
+        elif token in ("}", "]"):
+            stack.pop()
+            path.pop()
+        elif token == ",":
+            if stack[-1] == "[":
+                path[-1] += 1
+        elif is_key:
+            path[-1] = json.loads(token)
+    # Every open container is the unfinished value of its parent; the
+    # innermost one's current slot only counts when it was cut mid-value.
+    if path and not cut_in_value:
+        path.pop()
+    return stack, path
@@ -0,0 +1,278 @@
+"""
+LLM usage metering — token, latency and cost accounting for every OpenAI call.
+
+send_openai_message() hands each call to `usage_meter.record()`, which only
+appends to an in-memory buffer. The buffer is written with one bulk insert
+(plus one upsert per daily aggregate row) when it reaches `batch_size` or
+`flush_interval_seconds` have passed, and once more at interpreter exit.
+
+Who and what a call is attributed to comes from context variables:
+- LLMMeteringMiddleware sets the request user and the URL name as intent.
+- AgentService narrows the intent to "agent:<intent>" while it runs.
+"""
+
+import atexit
+import logging
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Aggregate, F, FloatField
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+_current_user = ContextVar("llm_meter_user", default=None)
+_current_intent = ContextVar("llm_meter_intent", default=None)
+
+
+@contextmanager
+def metering_scope(user=None, intent: str = None):
+    """Attribute LLM calls made inside the block to `user` and/or `intent`."""
+    user_token = _current_user.set(user) if user is not None else None
+    intent_token = _current_intent.set(intent) if intent else None
+    try:
+        yield
+    finally:
+        if intent_token is not None:
+            _current_intent.reset(intent_token)
+        if user_token is not None:
+            _current_user.reset(user_token)
+
+
+def set_metering_intent(intent: str) -> None:
+    """Set the intent label for the rest of the current context."""
+    _current_intent.set(intent)
+
+
+def current_user_id():
+    """Primary key of the user LLM calls are attributed to, or None."""
+    # The stored user may be request.user (a lazy object); resolve it only
+    # when a call is actually recorded.
+    user = _current_user.get()
+    if user is None or not getattr(user, "is_authenticated", False):
+        return None
+    return user.pk
+
+
+def estimate_cost(
+    model: str, prompt_tokens: int, completion_tokens: int, cached_tokens: int = 0
+) -> float:
+    """Estimate the USD cost of a call from LLM_METERING['pricing_per_1m_tokens']."""
+    pricing = settings.LLM_METERING["pricing_per_1m_tokens"].get(model)
+    if not pricing:
+        return 0.0
+    uncached = max(0, prompt_tokens - cached_tokens)
+    return (
+        uncached * pricing["input"]
+        + cached_tokens * pricing["cached_input"]
+        + completion_tokens * pricing["output"]
+    ) / 1_000_000
+
+
+def _percentile(sorted_values: list, pct: float) -> int:
+    if not sorted_values:
+        return 0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class _PercentileCont(Aggregate):
+    """PostgreSQL percentile_cont(p) WITHIN GROUP (ORDER BY expression)."""
+
+    function = "percentile_cont"
+    template = "%(function)s(%(percentile)s) WITHIN GROUP (ORDER BY %(expressions)s)"
+    output_field = FloatField()
+
+    def __init__(self, expression, percentile: float, **extra):
+        super().__init__(expression, percentile=float(percentile), **extra)
+
+
+def _latency_percentiles(since, field: str) -> dict:
+    """{group key: (p50, p95, p99)} latency in ms for calls since `since`."""
+    from resume.models import LLMUsageRecord
+
+    records = LLMUsageRecord.objects.filter(created_at__gte=since)
+    if connection.vendor == "postgresql":
+        rows = records.values(field).annotate(
+            p50=_PercentileCont("latency_ms", 0.50),
+            p95=_PercentileCont("latency_ms", 0.95),
+            p99=_PercentileCont("latency_ms", 0.99),
+        )
+        return {
+            row[field] or "anonymous": tuple(
+                int(round(row[p] or 0)) for p in ("p50", "p95", "p99")
+            )
+            for row in rows
+        }
+
+    # Other databases: percentiles of the most recent rows only.
+    latencies = defaultdict(list)
+    limit = settings.LLM_METERING["report_max_latency_rows"]
+    for key, latency in records.order_by("-created_at", "-id").values_list(
+        field, "latency_ms"
+    )[:limit]:
+        latencies[key or "anonymous"].append(latency)
+    result = {}
+    for key, values in latencies.items():
+        values.sort()
+        result[key] = tuple(_percentile(values, pct) for pct in (50, 95, 99))
+    return result
+
+
+class UsageMeter:
+    """Thread-safe buffered writer for LLMUsageRecord rows."""
+
+    def __init__(self):
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def record(
+        self,
+        call_site: str,
+        model: str,
+        latency_ms: int,
+        usage=None,
+        success: bool = True,
+    ) -> None:
+        """Buffer one call. `usage` is the `usage` object of an OpenAI response."""
+        cfg = settings.LLM_METERING
+        if not cfg["enabled"]:
+            return
+
+        details = getattr(usage, "prompt_tokens_details", None)
+        entry = {
+            "user_id": current_user_id(),
+            "intent": (_current_intent.get() or call_site)[:100],
+            "call_site": call_site[:100],
+            "model": model,
+            "prompt_tokens": getattr(usage, "prompt_tokens", 0) or 0,
+            "completion_tokens": getattr(usage, "completion_tokens", 0) or 0,
+            "cached_tokens": getattr(details, "cached_tokens", 0) or 0,
+            "latency_ms": latency_ms,
+            "success": success,
+            "created_at": timezone.now(),
+        }
+
+        with self._lock:
+            self._buffer.append(entry)
+            due = (
+                len(self._buffer) >= cfg["batch_size"]
+                or time.monotonic() - self._last_flush >= cfg["flush_interval_seconds"]
+            )
+        if due:
+            self.flush()
+
+    def flush(self) -> int:
+        """Write buffered records and update daily aggregates. Returns rows written."""
+        with self._lock:
+            entries, self._buffer = self._buffer, []
+            self._last_flush = time.monotonic()
+        if not entries:
+            return 0
+
+        try:
+            self._write(entries)
+        except Exception:
+            # Metering must never break an LLM call; drop the batch.
+            logger.exception("LLM metering flush failed, dropped %d records", len(entries))
+            return 0
+        return len(entries)
+
+    def _write(self, entries: list) -> None:
+        from resume.models import LLMUsageDaily, LLMUsageRecord
+
+        totals = defaultdict(lambda: defaultdict(int))
+        for e in entries:
+            key = (e["created_at"].date(), e["user_id"], e["intent"], e["model"])
+            row = totals[key]
+            row["calls"] += 1
+            row["errors"] += 0 if e["success"] else 1
+            row["prompt_tokens"] += e["prompt_tokens"]
+            row["completion_tokens"] += e["completion_tokens"]
+            row["cached_tokens"] += e["cached_tokens"]
+            row["total_latency_ms"] += e["latency_ms"]
+
+        with transaction.atomic():
+            LLMUsageRecord.objects.bulk_create([LLMUsageRecord(**e) for e in entries])
+            for (day, user_id, intent, model), row in totals.items():
+                lookup = {"date": day, "user_id": user_id, "intent": intent, "model": model}
+                increments = {name: F(name) + value for name, value in row.items()}
+                if LLMUsageDaily.objects.filter(**lookup).update(**increments):
+                    continue
+                try:
+                    with transaction.atomic():
+                        LLMUsageDaily.objects.create(**lookup, **row)
+                except IntegrityError:
+                    # Another worker created the row between our update and insert.
+                    LLMUsageDaily.objects.filter(**lookup).update(**increments)
+
+
+def usage_report(days: int = 7, group_by: str = "intent") -> list:
+    """
+    Cost and latency summary over the last `days` days.
+
+    Token totals and cost come from LLMUsageDaily; latency percentiles are
+    computed from LLMUsageRecord in SQL (percentile_cont) on PostgreSQL.
+    `group_by` is "intent", "user" or "model".
+    Rows are sorted by estimated cost, most expensive first.
+    """
+    from resume.models import LLMUsageDaily
+
+    field = {"intent": "intent", "user": "user__username", "model": "model"}[group_by]
+    since = timezone.now() - timedelta(days=days)
+
+    rows = defaultdict(
+        lambda: {
+            "calls": 0,
+            "errors": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "cached_tokens": 0,
+            "cost_usd": 0.0,
+        }
+    )
+    daily = LLMUsageDaily.objects.filter(date__gte=since.date()).values(
+        field,
+        "model",
+        "calls",
+        "errors",
+        "prompt_tokens",
+        "completion_tokens",
+        "cached_tokens",
+    )
+    for d in daily:
+        row = rows[d[field] or "anonymous"]
+        for name in ("calls", "errors", "prompt_tokens", "completion_tokens", "cached_tokens"):
+            row[name] += d[name]
+        row["cost_usd"] += estimate_cost(
+            d["model"], d["prompt_tokens"], d["completion_tokens"], d["cached_tokens"]
+        )
+
+    percentiles = _latency_percentiles(since, field)
+
+    report = []
+    for key, row in rows.items():
+        p50, p95, p99 = percentiles.get(key, (0, 0, 0))
+        report.append(
+            {
+                "key": key,
+                **row,
+                "cost_usd": round(row["cost_usd"], 4),
+                "p50_ms": p50,
+                "p95_ms": p95,
+                "p99_ms": p99,
+            }
+        )
+    report.sort(key=lambda r: r["cost_usd"], reverse=True)
+    return report
+
+
+usage_meter = UsageMeter()
+atexit.register(usage_meter.flush)
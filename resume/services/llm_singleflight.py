@@ -0,0 +1,218 @@
+"""
+Single-flight coalescing of identical concurrent LLM calls.
+
+Double-clicks, client retries and duplicate browser tabs send the same prompt
+at the same time. send_openai_message() runs every call through
+`single_flight.do()` keyed by a fingerprint of the request and its user, so
+only one upstream call is made and all of that user's concurrent callers share
+its result:
+
+- Within a worker, callers on other threads wait on the leader's Event.
+- Across workers, the leader claims a row in the LLMInflightCall lock table;
+  callers in other workers poll that row until the result is written or the
+  row disappears (leader failed), then fall back to their own call.
+
+A finished result stays in the lock table for `result_ttl_seconds`, which also
+covers a retry that arrives just after the first call returned. Error results
+are never shared.
+
+Views that charge quota wrap their work in `track_shared_calls()` to find out
+how many results were served from someone else's call.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError, transaction
+from django.utils import timezone
+
+from resume.services.deadline import capped
+
+logger = logging.getLogger(__name__)
+
+_shared_calls = ContextVar("llm_shared_calls", default=None)
+_shared_calls_lock = threading.Lock()
+
+
+@contextmanager
+def track_shared_calls():
+    """
+    Count LLM results inside the block that came from another caller's call.
+
+    Yields a dict {"shared": int}. The same dict is seen by threads started
+    with run_concurrently(), since they run in copies of this context.
+    """
+    counter = {"shared": 0}
+    token = _shared_calls.set(counter)
+    try:
+        yield counter
+    finally:
+        _shared_calls.reset(token)
+
+
+def _mark_shared() -> None:
+    counter = _shared_calls.get()
+    if counter is not None:
+        with _shared_calls_lock:
+            counter["shared"] += 1
+
+
+def request_fingerprint(**parts) -> str:
+    """SHA-256 of the request parts that determine the LLM response."""
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class _Flight:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.shareable = False
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one execution."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights = {}
+
+    def do(self, key: str, fn, shareable=None):
+        """
+        Run `fn()` once for all concurrent callers with the same `key`.
+
+        Parameters:
+            key (str): Request fingerprint.
+            fn (callable): Zero-argument function making the upstream call.
+            shareable (callable): Predicate on the result; results failing it
+                                  (e.g. API errors) are not handed to waiters,
+                                  who then make their own call.
+
+        Returns:
+            The leader's result, or this caller's own result if none could be shared.
+        """
+        cfg = settings.LLM_SINGLE_FLIGHT
+        if not cfg["enabled"]:
+            return fn()
+
+        with self._lock:
+            flight = self._flights.get(key)
+            is_leader = flight is None
+            if is_leader:
+                flight = _Flight()
+                self._flights[key] = flight
+
+        if not is_leader:
+            waited = flight.event.wait(capped(cfg["wait_timeout_seconds"]))
+            if waited and flight.shareable:
+                _mark_shared()
+                return flight.result
+            return fn()
+
+        try:
+            if cfg["shared"]:
+                result = self._run_shared(key, fn, shareable, cfg)
+            else:
+                result = fn()
+            flight.result = result
+            flight.shareable = shareable is None or shareable(result)
+            return result
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.event.set()
+
+    def _run_shared(self, key: str, fn, shareable, cfg: dict):
+        try:
+            claimed, result = self._claim(key, cfg)
+            if not claimed and result is None:
+                result = self._wait_for_other_worker(key, cfg)
+        except DatabaseError:
+            logger.warning(
+                "Single-flight lock table unavailable, calling upstream directly",
+                exc_info=True,
+            )
+            return fn()
+
+        if not claimed:
+            if result is not None:
+                _mark_shared()
+                return result
+            return fn()
+
+        result = None
+        try:
+            result = fn()
+            return result
+        finally:
+            if result is not None and (shareable is None or shareable(result)):
+                self._release(key, result, cfg)
+            else:
+                self._release(key, None, cfg)
+
+    def _claim(self, key: str, cfg: dict):
+        """
+        Try to become the leader for `key` across workers.
+
+        Returns:
+            (claimed, result): result is a finished result still within its TTL.
+        """
+        from resume.models import LLMInflightCall
+
+        now = timezone.now()
+        row = LLMInflightCall.objects.filter(fingerprint=key, expires_at__gt=now).first()
+        if row is not None:
+            return False, row.result
+        try:
+            with transaction.atomic():
+                LLMInflightCall.objects.filter(expires_at__lte=now).delete()
+                LLMInflightCall.objects.create(
+                    fingerprint=key,
+                    expires_at=now + timedelta(seconds=cfg["lock_timeout_seconds"]),
+                )
+        except IntegrityError:
+            # Another worker claimed it between our read and insert.
+            return False, None
+        return True, None
+
+    def _wait_for_other_worker(self, key: str, cfg: dict):
+        from resume.models import LLMInflightCall
+
+        deadline = time.monotonic() + capped(cfg["wait_timeout_seconds"])
+        while time.monotonic() < deadline:
+            time.sleep(cfg["poll_interval_seconds"])
+            row = LLMInflightCall.objects.filter(
+                fingerprint=key, expires_at__gt=timezone.now()
+            ).first()
+            if row is None:
+                return None
+            if row.result is not None:
+                return row.result
+        logger.warning("Single-flight wait timed out for %s", key[:12])
+        return None
+
+    def _release(self, key: str, result, cfg: dict) -> None:
+        from resume.models import LLMInflightCall
+
+        try:
+            rows = LLMInflightCall.objects.filter(fingerprint=key)
+            if result is None:
+                rows.delete()
+            else:
+                rows.update(
+                    result=result,
+                    expires_at=timezone.now()
+                    + timedelta(seconds=cfg["result_ttl_seconds"]),
+                )
+        except DatabaseError:
+            logger.warning("Could not release single-flight lock %s", key[:12], exc_info=True)
+
+
+single_flight = SingleFlight()
@@ -0,0 +1,90 @@
+"""
+Work out which parts of a resume an edit instruction touches.
+
+_exec_modify_resume() sends the model only the top-level sections an
+instruction is about ("add Kubernetes to my skills" → user_info), so prompt
+size follows the size of the edit instead of the size of the resume. The
+model's answer covers only those sections and is merged back with
+merge_sections().
+
+Targeting is a keyword match in English and Turkish. When nothing matches,
+or the instruction is about the resume as a whole (translate, rewrite
+everything), target_sections() returns None and the whole resume is sent.
+"""
+
+import re
+
+from resume.services.intent_parser import normalize
+
+# Top-level content key -> word stems that point at it (matched after normalize()).
+SECTION_KEYWORDS = {
+    "user_info": [
+        "skill", "yetenek", "beceri", "yetkinlik", "name", "isim", "adim", "soyad",
+        "email", "e-mail", "e-posta", "eposta", "mail", "phone", "telefon", "numara",
+        "linkedin", "github", "address", "adres", "contact", "iletisim", "website",
+    ],
+    "experience": [
+        "experience", "deneyim", "tecrube", "job", "work", "is yeri", "isyeri",
+        "position", "pozisyon", "role", "rol", "company", "sirket", "firma",
+        "employer", "intern", "staj", "bullet", "responsibilit", "sorumluluk",
+        "title", "unvan", "gorev",
+    ],
+    "education": [
+        "education", "egitim", "school", "okul", "university", "universite",
+        "college", "degree", "derece", "diploma", "bachelor", "master", "phd",
+        "lisans", "yuksek lisans", "doktora", "gpa", "mezun", "graduat", "bolum",
+    ],
+    "projects_and_publications": [
+        "project", "proje", "publication", "yayin", "paper", "makale", "article",
+        "portfolio",
+    ],
+}  # fmt: skip
+
+# Instructions that reach across sections.
+ROLE_KEYWORDS = ["optimi", "tailor", "uyarla", "uyumlu", "ats", "for a role", "icin"]
+WHOLE_RESUME_KEYWORDS = [
+    "translate", "cevir", "everything", "whole", "entire", "all sections", "tamam",
+    "tum", "butun", "hepsi", "tone", "ton", "typo", "yazim", "grammar", "dilbilgisi",
+    "language", "dil",
+]  # fmt: skip
+
+_WORD_START = r"(?:(?<=\s)|^)"
+
+
+def _mentions(text: str, stems: list) -> bool:
+    return any(re.search(_WORD_START + re.escape(stem), text) for stem in stems)
+
+
+def target_sections(instruction: str, content: dict):
+    """
+    Top-level keys of `content` the instruction touches, in content order,
+    or None when the whole resume should be sent.
+    """
+    text = normalize(instruction)
+    if not text or _mentions(text, WHOLE_RESUME_KEYWORDS):
+        return None
+
+    keys = {key for key, stems in SECTION_KEYWORDS.items() if _mentions(text, stems)}
+    if _mentions(text, ROLE_KEYWORDS):
+        # Tailoring to a role rewrites experience bullets and skills.
+        keys |= {"experience", "user_info"}
+    if not keys:
+        return None
+    return [key for key in content if key in keys] + sorted(keys - set(content))
+
+
+def scoped_content(content: dict, keys: list) -> dict:
+    """The part of `content` covered by `keys` (missing sections start empty)."""
+    return {
+        key: content.get(key, {} if key == "user_info" else [])
+        for key in keys
+    }
+
+
+def merge_sections(content: dict, sections: dict, keys: list) -> dict:
+    """`content` with the `keys` sections replaced by those in `sections`."""
+    merged = dict(content)
+    for key in keys:
+        if key in sections:
+            merged[key] = sections[key]
+    return merged
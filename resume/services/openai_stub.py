@@ -0,0 +1,517 @@
+"""
+Local OpenAI-compatible stub server for load tests and offline development.
+
+Speaks enough of POST /v1/chat/completions for resume.openai_engine to work
+when OPENAI_BASE_URL points at it (e.g. http://127.0.0.1:8765/v1).
+
+Responses come from, in order:
+1. A recording keyed by the SHA-256 of the request (model, messages,
+   response_format, temperature, max_tokens), stored as <hash>.json.
+2. In "record" mode, the real upstream API — the answer is saved for replay.
+3. A generator that returns schema-valid output for each prompt type used
+   in this app (resume extraction, intent classification, modify patch, ...).
+
+A latency profile and error injection make it possible to measure throughput
+and tail latency without the real API. GET /stats returns request counters.
+
+Only the standard library is used so the server can also run outside Django:
+    python -m resume.services.openai_stub --port 8765
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import random
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+MODES = ("replay", "record", "generate")
+
+
+def request_fingerprint(body: dict) -> str:
+    """Stable hash of the parts of a chat-completions request that affect the answer."""
+    key = {
+        "model": body.get("model"),
+        "messages": body.get("messages"),
+        "response_format": body.get("response_format"),
+        "temperature": body.get("temperature"),
+        "max_tokens": body.get("max_tokens"),
+    }
+    canonical = json.dumps(key, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token), good enough for usage stats."""
+    return max(1, len(text or "") // 4)
+
+
+# ---------------------------------------------------------------------------
+# Latency profiles
+# ---------------------------------------------------------------------------
+
+
+class LatencyProfile:
+    """
+    Parsed from a spec string:
+        fixed:800             always 800 ms
+        uniform:300,1500      uniform between 300 and 1500 ms
+        normal:900,200        mean 900 ms, std dev 200 ms
+        lognormal:900,0.5     median 900 ms, sigma 0.5 (long right tail)
+    `ms_per_output_token` adds generation time proportional to the answer size;
+    `seed` makes the sampled latencies reproducible.
+    """
+
+    def __init__(
+        self, spec: str = "fixed:0", ms_per_output_token: float = 0.0, seed: int = None
+    ):
+        kind, _, args = spec.partition(":")
+        try:
+            values = [float(v) for v in args.split(",") if v.strip()]
+        except ValueError:
+            raise ValueError(f"Invalid latency spec: {spec!r}")
+        expected = {"fixed": 1, "uniform": 2, "normal": 2, "lognormal": 2}
+        if kind not in expected or len(values) != expected[kind]:
+            raise ValueError(f"Invalid latency spec: {spec!r}")
+        self.kind = kind
+        self.values = values
+        self.ms_per_output_token = ms_per_output_token
+        self._random = random.Random(seed)
+
+    def sample_ms(self, output_tokens: int = 0) -> float:
+        if self.kind == "fixed":
+            base = self.values[0]
+        elif self.kind == "uniform":
+            base = self._random.uniform(*self.values)
+        elif self.kind == "normal":
+            base = self._random.gauss(*self.values)
+        else:
+            median, sigma = self.values
+            base = median * self._random.lognormvariate(0, sigma)
+        return max(0.0, base + output_tokens * self.ms_per_output_token)
+
+
+# ---------------------------------------------------------------------------
+# Schema-valid response generators, one per prompt type
+# ---------------------------------------------------------------------------
+
+_SAMPLE_RESUME = {
+    "language": "English",
+    "user_info": {
+        "full_name": "Stub User",
+        "email": "stub.user@example.com",
+        "phone": "+1 555 000 0000",
+        "address": "",
+        "linkedin": "https://linkedin.com/in/stub-user",
+        "github": "https://github.com/stub-user",
+        "skills": ["Python", "Django", "PostgreSQL"],
+    },
+    "experience": [
+        {
+            "title": "Software Engineer",
+            "company": "Stub Corp",
+            "start_date": "2022-01",
+            "end_date": None,
+            "description": [
+                "Developed REST APIs with Django",
+                "Improved query performance with indexing",
+            ],
+            "current_role": True,
+        }
+    ],
+    "education": [
+        {
+            "degree": "Bachelor",
+            "school": "Stub University",
+            "field_of_study": "Computer Science",
+            "start_date": "2017-09",
+            "end_date": "2021-06",
+        }
+    ],
+    "projects_and_publications": [
+        {"name": "Stub Project", "description": "Built a CLI tool", "link": ""}
+    ],
+}
+
+
+def _embedded_json(text: str, marker: str):
+    """Return the JSON object that follows `marker` in `text`, if any."""
+    index = text.find(marker)
+    if index < 0:
+        return None
+    start = text.find("{", index)
+    if start < 0:
+        return None
+    try:
+        value, _ = json.JSONDecoder().raw_decode(text[start:])
+        return value
+    except ValueError:
+        return None
+
+
+def _gen_extraction(system: str, user: str):
+    return _SAMPLE_RESUME
+
+
+def _gen_classification(system: str, user: str):
+    return {"intent": "help", "params": {}, "message": "Here is what I can do."}
+
+
+def _gen_modify_patch(system: str, user: str):
+    return {
+        "patch": [{"op": "add", "path": "/user_info/skills/-", "value": "Kubernetes"}],
+        "changes_summary": "Added Kubernetes to skills",
+        "response_message": "Added Kubernetes to your skills.",
+    }
+
+
+def _gen_modify_full(system: str, user: str):
+    # "CURRENT RESUME:" or "CURRENT RESUME SECTIONS (experience; ...):"
+    resume = _embedded_json(system, "CURRENT RESUME") or _SAMPLE_RESUME
+    return {
+        "modified_resume": resume,
+        "changes_summary": "No changes",
+        "response_message": "Done.",
+    }
+
+
+def _gen_suggestions(system: str, user: str):
+    return {
+        "top_suggestions": ["Add metrics", "List more skills", "Tighten bullets"],
+        "response_message": "Your resume is solid; a few changes would help.",
+    }
+
+
+def _gen_comparison(system: str, user: str):
+    return {
+        "comparison_summary": "Both resumes are comparable.",
+        "recommendation": "Resume 1 is slightly stronger.",
+    }
+
+
+def _gen_translation(system: str, user: str):
+    # The user message is the batch itself: {"0": text, "1": text, ...}.
+    return _embedded_json(user, "{") or {}
+
+
+def _gen_enhancement(system: str, user: str):
+    lines = [line.strip() for line in re.split(r"[.\n]", user) if line.strip()]
+    return "\n\n".join(f"Delivered {line[0].lower()}{line[1:]}" for line in lines)
+
+
+# (marker in system prompt, generator). First match wins.
+PROMPT_GENERATORS = [
+    ("resume parser", _gen_extraction),
+    ("LinkedIn profile parser", _gen_extraction),
+    ("AVAILABLE TOOLS", _gen_classification),
+    ("JSON Patch", _gen_modify_patch),
+    ("modified_resume", _gen_modify_full),
+    ("top_suggestions", _gen_suggestions),
+    ("comparison_summary", _gen_comparison),
+    ("resume translator", _gen_translation),
+    ("enhancer", _gen_enhancement),
+]
+
+
+def generate_content(body: dict) -> str:
+    """Produce a plausible answer for a chat-completions request."""
+    messages = body.get("messages") or []
+    system = "\n".join(m.get("content", "") for m in messages if m.get("role") == "system")
+    user = "\n".join(m.get("content", "") for m in messages if m.get("role") == "user")
+    wants_json = (body.get("response_format") or {}).get("type") == "json_object"
+
+    for marker, generator in PROMPT_GENERATORS:
+        if marker in system or marker in user:
+            value = generator(system, user)
+            return value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+
+    if wants_json:
+        return json.dumps({"message": "stub response"})
+    return "Stub response."
+
+
+# ---------------------------------------------------------------------------
+# Server
+# ---------------------------------------------------------------------------
+
+
+class StubState:
+    """Configuration and counters shared by all request handler threads."""
+
+    def __init__(
+        self,
+        mode: str = "generate",
+        recordings_dir: str = None,
+        latency: LatencyProfile = None,
+        error_rate: float = 0.0,
+        error_codes: tuple = (429, 500),
+        upstream_url: str = "https://api.openai.com/v1",
+        upstream_api_key: str = None,
+        seed: int = None,
+    ):
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}")
+        self.mode = mode
+        self.recordings_dir = Path(recordings_dir) if recordings_dir else None
+        self.latency = latency or LatencyProfile()
+        self.error_rate = error_rate
+        self.error_codes = tuple(error_codes)
+        self.upstream_url = upstream_url.rstrip("/")
+        self.upstream_api_key = upstream_api_key
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {
+            "requests": 0,
+            "replayed": 0,
+            "recorded": 0,
+            "generated": 0,
+            "injected_errors": 0,
+            "misses": 0,
+        }
+
+    def count(self, name: str) -> None:
+        with self._lock:
+            self.stats[name] += 1
+
+    def should_fail(self) -> bool:
+        with self._lock:
+            return self.error_rate > 0 and self._random.random() < self.error_rate
+
+    def pick_error_code(self) -> int:
+        with self._lock:
+            return self._random.choice(self.error_codes)
+
+    def recording_path(self, fingerprint: str):
+        return self.recordings_dir / f"{fingerprint}.json" if self.recordings_dir else None
+
+    def load_recording(self, fingerprint: str):
+        path = self.recording_path(fingerprint)
+        if path and path.exists():
+            return json.loads(path.read_text(encoding="utf-8"))
+        return None
+
+    def save_recording(self, fingerprint: str, body: dict, response: dict) -> None:
+        path = self.recording_path(fingerprint)
+        if not path:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            json.dumps({"request": body, "response": response}, ensure_ascii=False, indent=2),
+            encoding="utf-8",
+        )
+
+    def forward(self, body: dict) -> dict:
+        request = urllib.request.Request(
+            f"{self.upstream_url}/chat/completions",
+            data=json.dumps(body).encode("utf-8"),
+            headers={
+                "Content-Type": "application/json",
+                "Authorization": f"Bearer {self.upstream_api_key}",
+            },
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=120) as response:
+            return json.loads(response.read())
+
+
+def build_completion(body: dict, content: str) -> dict:
+    prompt_text = "".join(m.get("content", "") for m in body.get("messages") or [])
+    prompt_tokens = estimate_tokens(prompt_text)
+    completion_tokens = estimate_tokens(content)
+    return {
+        "id": f"chatcmpl-stub-{uuid.uuid4().hex[:24]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "gpt-4o-mini"),
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "prompt_tokens_details": {"cached_tokens": 0},
+        },
+    }
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    server_version = "OpenAIStub/1.0"
+
+    @property
+    def state(self) -> StubState:
+        return self.server.stub_state
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    def _send_json(self, status: int, payload: dict) -> None:
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_error(self, status: int, message: str) -> None:
+        self._send_json(
+            status,
+            {"error": {"message": message, "type": "stub_error", "code": status}},
+        )
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/stats"):
+            self._send_json(200, self.state.stats)
+        elif self.path.rstrip("/").endswith("/models"):
+            self._send_json(
+                200,
+                {"object": "list", "data": [{"id": "gpt-4o-mini", "object": "model"}]},
+            )
+        else:
+            self._send_error(404, f"Unknown path: {self.path}")
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_error(404, f"Unknown path: {self.path}")
+            return
+
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send_error(400, "Request body is not valid JSON")
+            return
+
+        state = self.state
+        state.count("requests")
+
+        if state.should_fail():
+            state.count("injected_errors")
+            time.sleep(state.latency.sample_ms() / 1000)
+            self._send_error(state.pick_error_code(), "Injected error")
+            return
+
+        fingerprint = request_fingerprint(body)
+        completion = state.load_recording(fingerprint) if state.mode != "generate" else None
+        if completion is not None:
+            state.count("replayed")
+            completion = completion["response"]
+        elif state.mode == "record":
+            try:
+                completion = state.forward(body)
+            except urllib.error.HTTPError as e:
+                self._send_error(e.code, f"Upstream error: {e.reason}")
+                return
+            except (urllib.error.URLError, OSError) as e:
+                self._send_error(502, f"Upstream unreachable: {e}")
+                return
+            state.save_recording(fingerprint, body, completion)
+            state.count("recorded")
+        else:
+            if state.mode == "replay":
+                state.count("misses")
+            completion = build_completion(body, generate_content(body))
+            state.count("generated")
+
+        output_tokens = (completion.get("usage") or {}).get("completion_tokens", 0)
+        time.sleep(state.latency.sample_ms(output_tokens) / 1000)
+        self._send_json(200, completion)
+
+
+def make_server(host: str, port: int, state: StubState) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), StubRequestHandler)
+    server.daemon_threads = True
+    server.stub_state = state
+    return server
+
+
+def add_stub_arguments(parser) -> None:
+    """Command-line options shared by the management command and `python -m`."""
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="Port (default: 8765)")
+    parser.add_argument(
+        "--mode",
+        choices=MODES,
+        default="generate",
+        help="replay: recordings first, generated fallback; record: forward misses "
+        "to the real API and save them; generate: always generate (default)",
+    )
+    parser.add_argument(
+        "--recordings-dir",
+        default=None,
+        help="Directory of <request hash>.json recordings",
+    )
+    parser.add_argument(
+        "--latency",
+        default="fixed:0",
+        help="Latency profile: fixed:MS, uniform:MIN,MAX, normal:MEAN,STD or "
+        "lognormal:MEDIAN,SIGMA (default: fixed:0)",
+    )
+    parser.add_argument(
+        "--ms-per-token",
+        type=float,
+        default=0.0,
+        help="Extra latency per output token in ms (default: 0)",
+    )
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of requests answered with an injected error (default: 0)",
+    )
+    parser.add_argument(
+        "--error-codes",
+        default="429,500",
+        help="Comma-separated HTTP codes used for injected errors (default: 429,500)",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="Random seed for latency samples and error injection",
+    )
+
+
+def state_from_options(options: dict, upstream_api_key: str = None) -> StubState:
+    return StubState(
+        mode=options["mode"],
+        recordings_dir=options["recordings_dir"],
+        latency=LatencyProfile(
+            options["latency"], options["ms_per_token"], seed=options["seed"]
+        ),
+        error_rate=options["error_rate"],
+        error_codes=tuple(int(c) for c in options["error_codes"].split(",") if c.strip()),
+        upstream_api_key=upstream_api_key,
+        seed=options["seed"],
+    )
+
+
+if __name__ == "__main__":
+    import os
+
+    parser = argparse.ArgumentParser(description="Local OpenAI-compatible stub server")
+    add_stub_arguments(parser)
+    options = vars(parser.parse_args())
+    stub_server = make_server(
+        options["host"],
+        options["port"],
+        state_from_options(options, os.environ.get("OPENAI_API_KEY")),
+    )
+    print(f"OpenAI stub listening on http://{options['host']}:{options['port']}/v1")
+    try:
+        stub_server.serve_forever()
+    except KeyboardInterrupt:
+        pass
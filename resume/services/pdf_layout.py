@@ -0,0 +1,215 @@
+"""
+Coordinate-aware text layout for resume PDFs.
+
+pypdf's plain extract_text() follows the content stream, which for two-column
+resumes interleaves the columns line by line. reconstruct_page_text() instead
+collects every text fragment with its position, then:
+
+1. groups fragments into lines by baseline,
+2. finds a column gutter (a vertical strip almost no text crosses) in the
+   middle of the page,
+3. emits full-width lines in place and, between them, the left column before
+   the right column,
+4. marks section headings ("## Experience") so the model sees sections
+   grouped in reading order.
+
+Only the standard library and PyPDF2 are used, so this runs inside the PDF
+extraction process pool.
+"""
+
+import re
+from dataclasses import dataclass
+from statistics import median
+
+SECTION_HEADINGS = {
+    # English
+    "summary", "profile", "about", "about me", "objective", "experience",
+    "work experience", "professional experience", "employment", "employment history",
+    "education", "skills", "technical skills", "core skills", "projects",
+    "publications", "projects and publications", "certifications", "certificates",
+    "languages", "awards", "honors", "interests", "volunteering", "volunteer experience",
+    "references", "contact", "top skills", "honors-awards",
+    # Turkish
+    "özet", "hakkımda", "profil", "deneyim", "iş deneyimi", "deneyimler", "eğitim",
+    "yetenekler", "beceriler", "projeler", "yayınlar", "sertifikalar", "diller",
+    "ödüller", "ilgi alanları", "referanslar", "iletişim",
+}  # fmt: skip
+
+CHAR_WIDTH = 0.5  # Average glyph width as a fraction of the font size
+GUTTER_BINS = 60  # Horizontal resolution of the gutter search
+
+
+@dataclass
+class TextFragment:
+    x: float
+    y: float
+    size: float
+    text: str
+
+    @property
+    def x_end(self) -> float:
+        return self.x + len(self.text) * self.size * CHAR_WIDTH
+
+
+@dataclass
+class TextLine:
+    y: float
+    size: float
+    fragments: list
+
+    @property
+    def x(self) -> float:
+        return self.fragments[0].x
+
+    @property
+    def x_end(self) -> float:
+        return max(f.x_end for f in self.fragments)
+
+    @property
+    def text(self) -> str:
+        return " ".join(f.text.strip() for f in self.fragments if f.text.strip())
+
+    def split(self, gutter: float):
+        """Split into (left, right) lines at `gutter`; either may be None."""
+        left = [f for f in self.fragments if f.x < gutter]
+        right = [f for f in self.fragments if f.x >= gutter]
+        return (
+            TextLine(self.y, self.size, left) if left else None,
+            TextLine(self.y, self.size, right) if right else None,
+        )
+
+
+def collect_fragments(page) -> list:
+    """Text fragments of a PyPDF2 page with their page coordinates."""
+    fragments = []
+
+    def visitor(text, cm, tm, font_dict, font_size):
+        if not text or not text.strip():
+            return
+        x = tm[4] * cm[0] + tm[5] * cm[2] + cm[4]
+        y = tm[4] * cm[1] + tm[5] * cm[3] + cm[5]
+        size = (font_size or 10) * (abs(tm[3] * cm[3]) or 1)
+        for offset, part in enumerate(text.split("\n")):
+            if part.strip():
+                fragments.append(TextFragment(x, y - offset * size * 1.2, size, part))
+
+    page.extract_text(visitor_text=visitor)
+    return fragments
+
+
+def group_lines(fragments: list) -> list:
+    """Group fragments sharing a baseline into lines, top of the page first."""
+    lines = []
+    for fragment in sorted(fragments, key=lambda f: (-f.y, f.x)):
+        if lines and abs(lines[-1].y - fragment.y) <= fragment.size * 0.4:
+            lines[-1].fragments.append(fragment)
+        else:
+            lines.append(TextLine(fragment.y, fragment.size, [fragment]))
+    for line in lines:
+        line.fragments.sort(key=lambda f: f.x)
+    return lines
+
+
+def find_gutter(lines: list, page_width: float):
+    """
+    x position of a column gutter, or None for single-column pages.
+
+    A gutter is a run of horizontal bins in the middle 60% of the page that
+    almost no fragment covers (full-width header lines may cross it), with
+    enough text on both sides of it.
+    """
+    if len(lines) < 4 or page_width <= 0:
+        return None
+    bin_width = page_width / GUTTER_BINS
+    covered = [0] * GUTTER_BINS
+    for line in lines:
+        for fragment in line.fragments:
+            first = max(0, int(fragment.x / bin_width))
+            last = min(GUTTER_BINS - 1, int(fragment.x_end / bin_width))
+            for index in range(first, last + 1):
+                covered[index] += 1
+
+    best = None
+    run_start = None
+    max_crossing = max(1, len(lines) // 10)
+    low, high = int(GUTTER_BINS * 0.2), int(GUTTER_BINS * 0.8)
+    for index in range(low, high + 1):
+        empty = index < high and covered[index] <= max_crossing
+        if empty and run_start is None:
+            run_start = index
+        elif not empty and run_start is not None:
+            if best is None or index - run_start > best[1] - best[0]:
+                best = (run_start, index)
+            run_start = None
+    if best is None:
+        return None
+
+    gutter = (best[0] + best[1]) / 2 * bin_width
+    left = sum(1 for line in lines for f in line.fragments if f.x_end <= gutter)
+    right = sum(1 for line in lines for f in line.fragments if f.x >= gutter)
+    total = left + right
+    if not total or min(left, right) / total < 0.15:
+        return None
+    return gutter
+
+
+def _is_heading(line: TextLine, body_size: float) -> bool:
+    text = line.text.strip().rstrip(":").strip()
+    if not text or len(text) > 40:
+        return False
+    if text.lower() in SECTION_HEADINGS:
+        return True
+    # Other short all-caps titles ("VOLUNTEER WORK") at body size or larger
+    return (
+        len(text.split()) <= 3
+        and text.isupper()
+        and line.size >= body_size
+        and not re.search(r"[\d@,.;|]", text)
+    )
+
+
+def _render(lines: list, body_size: float, name_y: float = None) -> list:
+    # The first line of a page is usually the name, which can look like a title.
+    return [
+        f"## {line.text.rstrip(':')}"
+        if line.y != name_y and _is_heading(line, body_size)
+        else line.text
+        for line in lines
+    ]
+
+
+def reconstruct_page_text(page) -> str:
+    """
+    Text of a PyPDF2 page in reading order, with section headings marked.
+
+    Returns an empty string when the page has no positioned text, so callers
+    can fall back to plain extraction.
+    """
+    lines = group_lines(collect_fragments(page))
+    if not lines:
+        return ""
+    body_size = median(line.size for line in lines)
+    name_y = lines[0].y
+    gutter = find_gutter(lines, float(page.mediabox.width))
+    if gutter is None:
+        return "\n".join(_render(lines, body_size, name_y))
+
+    output = []
+    left_block, right_block = [], []
+    for line in lines:
+        if line.x < gutter < line.x_end and all(f.x < gutter for f in line.fragments):
+            # Full-width line (e.g. name and contact header): flush columns first.
+            output += _render(left_block, body_size, name_y) + _render(
+                right_block, body_size, name_y
+            )
+            left_block, right_block = [], []
+            output += _render([line], body_size, name_y)
+            continue
+        left, right = line.split(gutter)
+        if left:
+            left_block.append(left)
+        if right:
+            right_block.append(right)
+    output += _render(left_block, body_size, name_y)
+    output += _render(right_block, body_size, name_y)
+    return "\n".join(output)
@@ -0,0 +1,216 @@
+"""
+Structural diff of two resumes for compare_resumes.
+
+diff_resumes() compares two Resume.content trees section by section:
+
+- experience, education and projects are paired by their identifying
+  fields (company + title, school + degree, name) with fuzzy matching, so a
+  renamed title or reworded company still pairs up; unpaired entries are
+  reported as only in one resume,
+- paired experiences report title and date changes, and how similar their
+  bullets are (each bullet matched to its closest counterpart),
+- skills are compared as case-insensitive sets.
+
+The result is plain JSON: render_diff() turns it into the chat message and
+_exec_compare_resumes() sends it, instead of both resumes, to the LLM when a
+narrative summary is wanted.
+"""
+
+from difflib import SequenceMatcher
+
+from resume.services.intent_parser import normalize
+
+# Entries whose identifying text is at least this similar are the same entry.
+MATCH_THRESHOLD = 0.6
+# Bullets at least this similar count as the same bullet (possibly reworded).
+BULLET_THRESHOLD = 0.5
+
+SECTION_KEYS = {
+    "experience": ("title", "company"),
+    "education": ("degree", "school"),
+    "projects_and_publications": ("name",),
+}
+
+
+def _similarity(a: str, b: str) -> float:
+    a, b = normalize(a), normalize(b)
+    if not a or not b:
+        return 1.0 if a == b else 0.0
+    return SequenceMatcher(None, a, b).ratio()
+
+
+def _label(entry: dict, keys: tuple) -> str:
+    parts = [str(entry.get(key) or "").strip() for key in keys]
+    return " @ ".join(p for p in parts if p) or "?"
+
+
+def _entries(content: dict, section: str) -> list:
+    return [e for e in content.get(section) or [] if isinstance(e, dict)]
+
+
+def _bullets(entry: dict) -> list:
+    desc = entry.get("description")
+    if isinstance(desc, str):
+        desc = desc.split("\n")
+    if not isinstance(desc, list):
+        return []
+    return [d.strip() for d in desc if isinstance(d, str) and d.strip()]
+
+
+def _pair(left: list, right: list, key) -> list:
+    """
+    Greedy best-first pairing of two lists by key(a, b) similarity.
+    Returns [(i, j, similarity)] for pairs above MATCH_THRESHOLD.
+    """
+    scored = sorted(
+        (
+            (key(a, b), i, j)
+            for i, a in enumerate(left)
+            for j, b in enumerate(right)
+        ),
+        reverse=True,
+    )
+    used_left, used_right, pairs = set(), set(), []
+    for score, i, j in scored:
+        if score < MATCH_THRESHOLD:
+            break
+        if i not in used_left and j not in used_right:
+            used_left.add(i)
+            used_right.add(j)
+            pairs.append((i, j, score))
+    return sorted(pairs)
+
+
+def bullet_diff(left: list, right: list) -> dict:
+    """How the bullets of two versions of an entry compare."""
+    if not left and not right:
+        return {"similarity": 1.0, "only_in_1": 0, "only_in_2": 0}
+    matrix = [[_similarity(a, b) for b in right] for a in left]
+    best = [max(row, default=0.0) for row in matrix]
+    best_reverse = [
+        max((row[j] for row in matrix), default=0.0) for j in range(len(right))
+    ]
+    scores = best + best_reverse
+    return {
+        "similarity": round(sum(scores) / len(scores), 2),
+        "only_in_1": sum(1 for s in best if s < BULLET_THRESHOLD),
+        "only_in_2": sum(1 for s in best_reverse if s < BULLET_THRESHOLD),
+    }
+
+
+def _diff_section(content1: dict, content2: dict, section: str) -> dict:
+    keys = SECTION_KEYS[section]
+    left, right = _entries(content1, section), _entries(content2, section)
+    pairs = _pair(
+        left, right, lambda a, b: _similarity(_label(a, keys), _label(b, keys))
+    )
+    paired_left = {i for i, _, _ in pairs}
+    paired_right = {j for _, j, _ in pairs}
+
+    changed = []
+    for i, j, _ in pairs:
+        a, b = left[i], right[j]
+        change = {"entry": _label(a, keys)}
+        for field in keys + ("start_date", "end_date"):
+            if (a.get(field) or None) != (b.get(field) or None):
+                change[field] = [a.get(field), b.get(field)]
+        if section == "experience":
+            bullets = bullet_diff(_bullets(a), _bullets(b))
+            if bullets["similarity"] < 1.0:
+                change["bullets"] = bullets
+        if len(change) > 1:
+            changed.append(change)
+
+    return {
+        "common": len(pairs),
+        "only_in_1": [
+            _label(e, keys) for i, e in enumerate(left) if i not in paired_left
+        ],
+        "only_in_2": [
+            _label(e, keys) for j, e in enumerate(right) if j not in paired_right
+        ],
+        "changed": changed,
+    }
+
+
+def _skills(content: dict) -> dict:
+    """Normalized skill -> skill as written."""
+    skills = (content.get("user_info") or {}).get("skills") or []
+    return {normalize(str(s)): str(s).strip() for s in skills if normalize(str(s))}
+
+
+def diff_resumes(content1: dict, content2: dict) -> dict:
+    """Structural differences between two resume contents (JSON-serializable)."""
+    content1, content2 = content1 or {}, content2 or {}
+    skills1, skills2 = _skills(content1), _skills(content2)
+    diff = {
+        section: _diff_section(content1, content2, section) for section in SECTION_KEYS
+    }
+    diff["skills"] = {
+        "common": sorted(skills1[s] for s in skills1.keys() & skills2.keys()),
+        "only_in_1": sorted(skills1[s] for s in skills1.keys() - skills2.keys()),
+        "only_in_2": sorted(skills2[s] for s in skills2.keys() - skills1.keys()),
+    }
+    diff["language"] = [content1.get("language"), content2.get("language")]
+    return diff
+
+
+LABELS = {
+    "en": {
+        "experience": "Experience",
+        "education": "Education",
+        "projects_and_publications": "Projects",
+        "skills": "Skills",
+        "differences": "Key Differences",
+        "in_common": "in common",
+        "only": "Only in {name}",
+        "title": "title {0} → {1}",
+        "dates": "dates changed",
+        "bullets": "bullets {percent}% similar",
+        "identical": "These resumes have the same structure and content.",
+    },
+    "tr": {
+        "experience": "Deneyim",
+        "education": "Eğitim",
+        "projects_and_publications": "Projeler",
+        "skills": "Yetenekler",
+        "differences": "Temel Farklar",
+        "in_common": "ortak",
+        "only": "Yalnızca {name}",
+        "title": "unvan {0} → {1}",
+        "dates": "tarihler farklı",
+        "bullets": "maddeler %{percent} benzer",
+        "identical": "Bu resume'ların yapısı ve içeriği aynı.",
+    },
+}
+
+
+def render_diff(diff: dict, name1: str, name2: str, lang: str = "en") -> str:
+    """Markdown summary of a diff_resumes() result for the chat."""
+    text = LABELS.get(lang, LABELS["en"])
+    lines = [f"**{text['differences']}:**"]
+    for section in list(SECTION_KEYS) + ["skills"]:
+        part = diff[section]
+        common = part["common"] if section != "skills" else len(part["common"])
+        items = []
+        for key, name in (("only_in_1", name1), ("only_in_2", name2)):
+            if part[key]:
+                only = text["only"].format(name=name)
+                items.append(f"  - {only}: {', '.join(part[key])}")
+        for change in part.get("changed", []):
+            what = []
+            if "title" in change:
+                what.append(text["title"].format(*change["title"]))
+            if "start_date" in change or "end_date" in change:
+                what.append(text["dates"])
+            if "bullets" in change:
+                percent = round(100 * change["bullets"]["similarity"])
+                what.append(text["bullets"].format(percent=percent))
+            if what:
+                items.append(f"  - {change['entry']}: {'; '.join(what)}")
+        if items:
+            lines.append(f"- **{text[section]}** ({common} {text['in_common']})")
+            lines.extend(items)
+    if len(lines) == 1:
+        return text["identical"]
+    return "\n".join(lines)
@@ -0,0 +1,173 @@
+"""
+Deterministic pre-parsing of raw resume text before LLM extraction.
+
+Regexes find contact fields, profile URLs and date ranges in microseconds, so
+extract_resume_data / extract_linkedin_resume_data don't need the model to
+search for them:
+
+- Page artifacts ("Page 1 of 3", "Sayfa 2 / 4") are removed and whitespace
+  is collapsed.
+- Email, phone, LinkedIn and GitHub are pulled out as hints and removed from
+  the text sent to the model.
+- Date ranges are rewritten in place as "YYYY-MM to YYYY-MM|Present".
+
+merge_contact_hints() writes the hints back into the parsed JSON, so the
+regex result wins over whatever the model produced for those fields.
+"""
+
+import re
+from dataclasses import dataclass, field
+
+MONTHS = {
+    # English
+    "jan": 1, "january": 1, "feb": 2, "february": 2, "mar": 3, "march": 3,
+    "apr": 4, "april": 4, "may": 5, "jun": 6, "june": 6, "jul": 7, "july": 7,
+    "aug": 8, "august": 8, "sep": 9, "sept": 9, "september": 9, "oct": 10,
+    "october": 10, "nov": 11, "november": 11, "dec": 12, "december": 12,
+    # Turkish
+    "ocak": 1, "şubat": 2, "subat": 2, "mart": 3, "nisan": 4, "mayıs": 5,
+    "mayis": 5, "haziran": 6, "temmuz": 7, "ağustos": 8, "agustos": 8,
+    "eylül": 9, "eylul": 9, "ekim": 10, "kasım": 11, "kasim": 11,
+    "aralık": 12, "aralik": 12,
+}  # fmt: skip
+PRESENT_WORDS = ["present", "current", "now", "today", "günümüz", "halen", "devam ediyor"]
+
+_MONTH_RE = "|".join(sorted(MONTHS, key=len, reverse=True))
+_YEAR_RE = r"(?:19|20)\d{2}"
+_DATE_RE = (
+    rf"(?:(?:{_MONTH_RE})\.?,?\s+{_YEAR_RE}"  # Jan 2020, March 2021, Ocak 2019
+    rf"|\d{{1,2}}[/.]{_YEAR_RE}"  # 01/2020, 3.2021
+    rf"|{_YEAR_RE}[/-]\d{{1,2}}(?!\d)"  # 2020-01
+    rf"|{_YEAR_RE})"  # 2020
+)
+_PRESENT_RE = "|".join(PRESENT_WORDS)
+
+DATE_RANGE_RE = re.compile(
+    rf"(?<![\w/.-])({_DATE_RE})\s*(?:-|–|—|to|until|till)\s*"
+    rf"({_DATE_RE}|{_PRESENT_RE})(?![\w/])",
+    re.IGNORECASE,
+)
+EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+LINKEDIN_RE = re.compile(
+    r"(?:https?://)?(?:[a-z]{2,3}\.)?linkedin\.com/in/[A-Za-z0-9\-_%]+/?", re.IGNORECASE
+)
+GITHUB_RE = re.compile(
+    r"(?:https?://)?(?:www\.)?github\.com/[A-Za-z0-9\-_]+/?(?![A-Za-z0-9\-_./])",
+    re.IGNORECASE,
+)
+PHONE_RE = re.compile(r"(?<![\w/])\+?\(?\d[\d \t().-]{7,18}\d(?![\w/])")
+PAGE_ARTIFACT_RE = re.compile(
+    r"\b(?:page|sayfa)\s+\d+\s*(?:of|/)\s*\d+\b", re.IGNORECASE
+)
+
+
+@dataclass
+class PreParsedText:
+    text: str
+    hints: dict = field(default_factory=dict)
+    date_ranges: list = field(default_factory=list)
+    original_length: int = 0
+
+
+def normalize_date(value: str):
+    """
+    Convert one date as written in a resume to "YYYY-MM".
+
+    Returns None for "Present"-style words and for values it can't read.
+    """
+    value = value.strip().lower().rstrip(".,")
+    if value in PRESENT_WORDS:
+        return None
+    match = re.fullmatch(rf"([^\W\d]+)\.?,?\s+({_YEAR_RE})", value)
+    if match and match.group(1) in MONTHS:
+        return f"{match.group(2)}-{MONTHS[match.group(1)]:02d}"
+    match = re.fullmatch(rf"(\d{{1,2}})[/.]({_YEAR_RE})", value)
+    if match and 1 <= int(match.group(1)) <= 12:
+        return f"{match.group(2)}-{int(match.group(1)):02d}"
+    match = re.fullmatch(rf"({_YEAR_RE})[/-](\d{{1,2}})", value)
+    if match and 1 <= int(match.group(2)) <= 12:
+        return f"{match.group(1)}-{int(match.group(2)):02d}"
+    if re.fullmatch(_YEAR_RE, value):
+        return f"{value}-01"
+    return None
+
+
+def _https(url: str) -> str:
+    url = re.sub(r"^https?://", "", url.rstrip("/"), flags=re.IGNORECASE)
+    return f"https://{url}"
+
+
+def _find_phone(text: str):
+    for match in PHONE_RE.finditer(text):
+        digits = re.sub(r"\D", "", match.group())
+        # Skip year ranges and other number runs that aren't phone-sized.
+        if 9 <= len(digits) <= 15 and not re.search(
+            rf"{_YEAR_RE}-\d{{2}}(?!\d)|{_YEAR_RE}\s*[-–]\s*{_YEAR_RE}", match.group()
+        ):
+            return match.group().strip()
+    return None
+
+
+def preparse_resume_text(raw_text: str) -> PreParsedText:
+    """Compact `raw_text` and pull out contact hints and date ranges."""
+    text = PAGE_ARTIFACT_RE.sub(" ", raw_text)
+    hints = {}
+
+    for key, pattern in (("linkedin", LINKEDIN_RE), ("github", GITHUB_RE)):
+        match = pattern.search(text)
+        if match:
+            hints[key] = _https(match.group())
+            text = pattern.sub(" ", text)
+
+    email = EMAIL_RE.search(text)
+    if email:
+        hints["email"] = email.group()
+        text = text.replace(email.group(), " ")
+
+    date_ranges = []
+
+    def _normalize_range(match):
+        start = normalize_date(match.group(1))
+        end = normalize_date(match.group(2))
+        if start is None:
+            return match.group()
+        current = match.group(2).strip().lower() in PRESENT_WORDS
+        date_ranges.append(
+            {"text": match.group(), "start": start, "end": end, "current": current}
+        )
+        return f"{start} to {'Present' if current else end or match.group(2)}"
+
+    text = DATE_RANGE_RE.sub(_normalize_range, text)
+
+    # Look for the phone only after date ranges are normalized, so runs of
+    # years like "2019 - 2021 2021 - 2023" can't read as a number.
+    phone = _find_phone(text)
+    if phone:
+        hints["phone"] = phone
+        text = text.replace(phone, " ")
+
+    # Drop separators left behind by removed fields ("jane@x.com | +1 555 ...").
+    text = re.sub(r"(?m)^[\s|•·,;/-]+$", "", text)
+    text = re.sub(r"(?:[ \t]*[|•·][ \t]*){2,}", " | ", text)
+    text = re.sub(r"[ \t\u00a0]+", " ", text)
+    text = re.sub(r"\s*\n\s*", "\n", text).strip()
+
+    return PreParsedText(
+        text=text,
+        hints=hints,
+        date_ranges=date_ranges,
+        original_length=len(raw_text),
+    )
+
+
+def merge_contact_hints(parsed: dict, hints: dict) -> dict:
+    """Overwrite user_info contact fields in `parsed` with the pre-extracted hints."""
+    if not hints or not isinstance(parsed, dict):
+        return parsed
+    user_info = parsed.get("user_info")
+    if not isinstance(user_info, dict):
+        user_info = parsed["user_info"] = {}
+    for key in ("email", "phone", "linkedin", "github"):
+        if hints.get(key):
+            user_info[key] = hints[key]
+    return parsed
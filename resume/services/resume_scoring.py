@@ -0,0 +1,361 @@
+"""
+Deterministic resume scoring for analyze_resume.
+
+The five categories of the analysis panel (0-20 points each) are computed
+from text statistics over Resume.content, without an LLM call, in a few
+milliseconds for any resume:
+
+- Content Completeness: contact details, core sections, described roles.
+- Impact Language: bullets open with an action verb and quantify results.
+- Formatting & Structure: 3-6 bullets per role of readable length, YYYY-MM
+  dates, most recent role first.
+- Skills Coverage: a focused, duplicate-free skills list that shows up in
+  the experience bullets.
+- ATS Friendliness: consistent date ranges, no first-person voice, plain
+  text, a valid email.
+
+Each category is a weighted mean of signals in [0, 1]. Its feedback names
+the weakest signal, and the local suggestions are the signals that lose the
+most points overall. _exec_analyze_resume() may replace the suggestions with
+LLM-written ones; the scores are always these.
+"""
+
+import hashlib
+import json
+import re
+import unicodedata
+from datetime import date
+
+from resume.services.intent_parser import normalize
+
+# Bump when scoring changes so cached analyses are recomputed.
+SCORING_VERSION = 1
+CATEGORY_MAX = 20
+
+ACTION_VERBS = {
+    "accelerated", "achieved", "automated", "architected", "boosted", "built",
+    "championed", "collaborated", "conducted", "configured", "consolidated",
+    "coordinated", "created", "cut", "debugged", "decreased", "defined",
+    "delivered", "deployed", "designed", "developed", "directed", "drove",
+    "enabled", "engineered", "established", "expanded", "facilitated", "founded",
+    "generated", "grew", "guided", "headed", "implemented", "improved",
+    "increased", "initiated", "integrated", "introduced", "launched", "led",
+    "maintained", "managed", "mentored", "migrated", "modernized", "negotiated",
+    "optimized", "orchestrated", "organized", "owned", "pioneered", "planned",
+    "produced", "programmed", "proposed", "published", "rebuilt", "redesigned",
+    "reduced", "refactored", "resolved", "restructured", "revamped", "saved",
+    "scaled", "shipped", "simplified", "spearheaded", "standardized",
+    "streamlined", "strengthened", "supervised", "taught", "tested", "trained",
+    "transformed", "tripled", "doubled", "upgraded", "wrote",
+}  # fmt: skip
+# Turkish bullets end with the verb in past tense ("... geliştirdim",
+# "... tasarlandı"); matched on the normalized last word.
+TURKISH_PAST_SUFFIXES = (
+    "dim", "tim", "dum", "tum", "dik", "tik", "duk", "tuk", "di", "ti",
+)  # fmt: skip
+FIRST_PERSON = {"i", "me", "my", "mine", "myself", "ben", "benim", "bana"}
+METRIC_RE = re.compile(r"\d|%|[$€£₺]")
+DATE_RE = re.compile(r"^\d{4}-(0[1-9]|1[0-2])$")
+EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[a-zA-Z]{2,}$")
+CONTACT_FIELDS = ("full_name", "email", "phone")
+BULLET_WORDS = (8, 30)
+BULLETS_PER_ROLE = (3, 6)
+SKILLS_COUNT = (8, 25)
+
+# (category, signal, weight)
+SIGNALS = [
+    ("Content Completeness", "contact", 3),
+    ("Content Completeness", "sections", 4),
+    ("Content Completeness", "described_roles", 3),
+    ("Impact Language", "action_verbs", 5),
+    ("Impact Language", "metrics", 5),
+    ("Formatting & Structure", "bullets_per_role", 4),
+    ("Formatting & Structure", "bullet_length", 3),
+    ("Formatting & Structure", "date_format", 2),
+    ("Formatting & Structure", "order", 1),
+    ("Skills Coverage", "skills_count", 5),
+    ("Skills Coverage", "skills_used", 3),
+    ("Skills Coverage", "skills_unique", 2),
+    ("ATS Friendliness", "date_ranges", 3),
+    ("ATS Friendliness", "third_person", 3),
+    ("ATS Friendliness", "plain_text", 2),
+    ("ATS Friendliness", "email", 2),
+]
+
+CATEGORY_PRAISE = {
+    "Content Completeness": {
+        "en": "All the essential sections and contact details are there.",
+        "tr": "Temel bölümler ve iletişim bilgileri eksiksiz.",
+    },
+    "Impact Language": {
+        "en": "Bullets lead with action verbs and quantify results.",
+        "tr": "Maddeler güçlü fiillerle yazılmış ve sonuçları sayılarla veriyor.",
+    },
+    "Formatting & Structure": {
+        "en": "Roles are well structured with concise bullets.",
+        "tr": "Deneyimler düzenli ve maddeler kısa ve net.",
+    },
+    "Skills Coverage": {
+        "en": "A focused skills list backed up by your experience.",
+        "tr": "Yetenek listesi odaklı ve deneyimlerle destekleniyor.",
+    },
+    "ATS Friendliness": {
+        "en": "Plain, consistent formatting that ATS parsers read well.",
+        "tr": "ATS sistemlerinin kolayca okuyacağı sade ve tutarlı bir yapı.",
+    },
+}
+
+ADVICE = {
+    "contact": {
+        "en": "Add your {missing} to the contact details.",
+        "tr": "İletişim bilgilerine şunları ekleyin: {missing}.",
+    },
+    "sections": {
+        "en": "Fill in the missing sections: {missing}.",
+        "tr": "Eksik bölümleri doldurun: {missing}.",
+    },
+    "described_roles": {
+        "en": "Describe every role with bullets ({count} roles have none).",
+        "tr": "Her deneyimi maddelerle anlatın ({count} deneyimde madde yok).",
+    },
+    "action_verbs": {
+        "en": "Start bullets with strong action verbs (only {percent}% do).",
+        "tr": "Maddeleri güçlü eylem fiilleriyle yazın (şu an %{percent}).",
+    },
+    "metrics": {
+        "en": "Quantify results with numbers or percentages"
+        " ({count} of {total} bullets have none).",
+        "tr": "Sonuçları sayı veya yüzdelerle ifade edin"
+        " ({total} maddenin {count} tanesinde yok).",
+    },
+    "bullets_per_role": {
+        "en": "Keep 3-6 bullets per role.",
+        "tr": "Her deneyim için 3-6 madde kullanın.",
+    },
+    "bullet_length": {
+        "en": "Keep bullets between 8 and 30 words.",
+        "tr": "Maddeleri 8-30 kelime arasında tutun.",
+    },
+    "date_format": {
+        "en": "Write dates as YYYY-MM (e.g. 2024-03).",
+        "tr": "Tarihleri YYYY-AA biçiminde yazın (örn. 2024-03).",
+    },
+    "order": {
+        "en": "List experience with the most recent role first.",
+        "tr": "Deneyimleri en yeniden eskiye doğru sıralayın.",
+    },
+    "skills_count": {
+        "en": "List 8-25 relevant skills (you have {count}).",
+        "tr": "8-25 arası ilgili yetenek listeleyin (şu an {count}).",
+    },
+    "skills_used": {
+        "en": "Mention your key skills in experience bullets to back them up.",
+        "tr": "Yeteneklerinizi deneyim maddelerinde kullanarak destekleyin.",
+    },
+    "skills_unique": {
+        "en": "Remove duplicate skills.",
+        "tr": "Tekrarlanan yetenekleri kaldırın.",
+    },
+    "date_ranges": {
+        "en": "Fix date ranges that end before they start or lie in the future.",
+        "tr": "Başlangıçtan önce biten veya gelecekteki tarih aralıklarını düzeltin.",
+    },
+    "third_person": {
+        "en": "Drop first-person words like 'I' and 'my' from bullets.",
+        "tr": "Maddelerde 'ben', 'benim' gibi birinci şahıs ifadeleri kullanmayın.",
+    },
+    "plain_text": {
+        "en": "Remove emoji and decorative symbols; ATS parsers drop them.",
+        "tr": "Emoji ve süs karakterlerini kaldırın; ATS sistemleri bunları okuyamaz.",
+    },
+    "email": {
+        "en": "Use a valid email address.",
+        "tr": "Geçerli bir e-posta adresi kullanın.",
+    },
+}
+
+
+def content_hash(content: dict) -> str:
+    """Stable hash of resume content, for caching analyses."""
+    data = json.dumps(content, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def _bullets(entry: dict) -> list:
+    desc = entry.get("description") if isinstance(entry, dict) else None
+    if isinstance(desc, str):
+        desc = desc.split("\n")
+    if not isinstance(desc, list):
+        return []
+    return [d.strip() for d in desc if isinstance(d, str) and d.strip()]
+
+
+def _ratio(count: int, total: int, empty: float = 0.0) -> float:
+    return count / total if total else empty
+
+
+def _band(value: int, low: int, high: int) -> float:
+    """1 inside [low, high], falling off linearly to 0 at 0 and at 2 * high."""
+    if low <= value <= high:
+        return 1.0
+    if value < low:
+        return value / low
+    return max(0.0, 1 - (value - high) / high)
+
+
+def _is_action_bullet(bullet: str) -> bool:
+    words = normalize(bullet).split()
+    if not words:
+        return False
+    return words[0] in ACTION_VERBS or words[-1].endswith(TURKISH_PAST_SUFFIXES)
+
+
+def _month(value):
+    """(year, month) of a YYYY-MM date, or None."""
+    if isinstance(value, str) and DATE_RE.match(value.strip()):
+        year, month = value.strip().split("-")
+        return int(year), int(month)
+    return None
+
+
+def resume_signals(content: dict) -> dict:
+    """signal name -> (value in [0, 1], advice format arguments)."""
+    content = content or {}
+    user_info = content.get("user_info") or {}
+    experience = [e for e in content.get("experience") or [] if isinstance(e, dict)]
+    education = content.get("education") or []
+    skills = [str(s).strip() for s in user_info.get("skills") or [] if str(s).strip()]
+
+    per_role = [_bullets(e) for e in experience]
+    bullets = [b for role in per_role for b in role]
+    total = len(bullets)
+    bullet_text = normalize(" ".join(bullets))
+
+    missing_contact = [f for f in CONTACT_FIELDS if not user_info.get(f)]
+    if not (user_info.get("linkedin") or user_info.get("github")):
+        missing_contact.append("linkedin")
+    missing_sections = [
+        name
+        for name, present in (
+            ("experience", experience),
+            ("education", education),
+            ("skills", skills),
+        )
+        if not present
+    ]
+    undescribed = sum(1 for role in per_role if not role)
+    with_verbs = sum(1 for b in bullets if _is_action_bullet(b))
+    without_metrics = sum(1 for b in bullets if not METRIC_RE.search(b))
+    good_length = sum(
+        1 for b in bullets if BULLET_WORDS[0] <= len(b.split()) <= BULLET_WORDS[1]
+    )
+    first_person = sum(1 for b in bullets if FIRST_PERSON & set(normalize(b).split()))
+    symbols = sum(
+        1 for b in bullets if any(unicodedata.category(ch) == "So" for ch in b)
+    )
+
+    dates = [e.get(k) for e in experience for k in ("start_date", "end_date")]
+    dates = [d for d in dates if d]
+    starts = [_month(e.get("start_date")) for e in experience]
+    known_starts = [s for s in starts if s]
+    today = (date.today().year, date.today().month)
+    valid_ranges = 0
+    for exp, start in zip(experience, starts):
+        end = _month(exp.get("end_date")) or today
+        valid_ranges += bool(start) and start <= end <= today
+
+    unique_skills = {normalize(s) for s in skills}
+    used_skills = sum(1 for s in unique_skills if s and f" {s} " in f" {bullet_text} ")
+
+    return {
+        "contact": (
+            1 - len(missing_contact) / (len(CONTACT_FIELDS) + 1),
+            {"missing": ", ".join(missing_contact)},
+        ),
+        "sections": (
+            1 - len(missing_sections) / 3,
+            {"missing": ", ".join(missing_sections)},
+        ),
+        "described_roles": (
+            _ratio(len(experience) - undescribed, len(experience)),
+            {"count": undescribed},
+        ),
+        "action_verbs": (
+            _ratio(with_verbs, total),
+            {"percent": round(100 * _ratio(with_verbs, total))},
+        ),
+        # Half of the bullets carrying a number is already strong.
+        "metrics": (
+            min(1.0, 2 * _ratio(total - without_metrics, total)),
+            {"count": without_metrics, "total": total},
+        ),
+        "bullets_per_role": (
+            _ratio(
+                sum(_band(len(role), *BULLETS_PER_ROLE) for role in per_role),
+                len(per_role),
+            ),
+            {},
+        ),
+        "bullet_length": (_ratio(good_length, total), {}),
+        "date_format": (_ratio(sum(1 for d in dates if _month(d)), len(dates)), {}),
+        "order": (float(known_starts == sorted(known_starts, reverse=True)), {}),
+        "skills_count": (_band(len(skills), *SKILLS_COUNT), {"count": len(skills)}),
+        # A third of the skills shown in context is enough for full points.
+        "skills_used": (min(1.0, 3 * _ratio(used_skills, len(unique_skills))), {}),
+        "skills_unique": (_ratio(len(unique_skills), len(skills)), {}),
+        "date_ranges": (_ratio(valid_ranges, len(experience)), {}),
+        "third_person": (1 - _ratio(first_person, total), {}),
+        "plain_text": (1 - _ratio(symbols, total), {}),
+        "email": (float(bool(EMAIL_RE.match(str(user_info.get("email") or "")))), {}),
+    }
+
+
+def _advice(signal: str, args: dict, lang: str) -> str:
+    texts = ADVICE[signal]
+    return texts.get(lang, texts["en"]).format(**args)
+
+
+def score_resume(content: dict, lang: str = "en", max_suggestions: int = 3) -> dict:
+    """
+    {overall_score, categories: [{name, score, max, feedback}], top_suggestions}
+    in the shape the analysis panel renders.
+    """
+    signals = resume_signals(content)
+    categories = {}
+    for category, name, weight in SIGNALS:
+        categories.setdefault(category, []).append((name, weight))
+
+    results = []
+    losses = []
+    for category, members in categories.items():
+        total_weight = sum(weight for _, weight in members)
+        earned = sum(signals[name][0] * weight for name, weight in members)
+        score = round(CATEGORY_MAX * earned / total_weight)
+        weakest, _ = max(members, key=lambda m: m[1] * (1 - signals[m[0]][0]))
+        if score >= CATEGORY_MAX - 2 or signals[weakest][0] >= 1:
+            praise = CATEGORY_PRAISE[category]
+            feedback = praise.get(lang, praise["en"])
+        else:
+            feedback = _advice(weakest, signals[weakest][1], lang)
+        results.append(
+            {
+                "name": category,
+                "score": score,
+                "max": CATEGORY_MAX,
+                "feedback": feedback,
+            }
+        )
+        for name, weight in members:
+            lost = CATEGORY_MAX * weight * (1 - signals[name][0]) / total_weight
+            if lost >= 1:
+                losses.append((lost, name))
+
+    losses.sort(key=lambda item: -item[0])
+    return {
+        "overall_score": sum(c["score"] for c in results),
+        "categories": results,
+        "top_suggestions": [
+            _advice(name, signals[name][1], lang)
+            for _, name in losses[:max_suggestions]
+        ],
+    }
@@ -0,0 +1,112 @@
+"""
+Indexed full-text search over a user's resumes (find_resume, the search API).
+
+Each Resume keeps a `search_document`: its title, name, skills, companies,
+job titles, bullets, schools and projects, lowercased and folded to ASCII
+(ş -> s, ı/İ -> i, é -> e) so "muhendis" finds "Mühendis". The model fills
+it on save(); queries never load resume content into Python.
+
+On PostgreSQL two GIN indexes cover the column (see Resume.Meta.indexes):
+
+- to_tsvector('simple', search_document), queried with a prefix tsquery
+  ("pyth" matches "python") and ranked with ts_rank,
+- gin_trgm_ops, queried with the word-similarity operator (<%) so typos
+  such as "pyhton" still match when RESUME_SEARCH["fuzzy"] is on.
+
+Other databases (the sqlite test database) fall back to one case-folded
+LIKE per term on the same column.
+"""
+
+import re
+import unicodedata
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import F, Q
+
+# Must match the configuration of the expression index on Resume.
+SEARCH_CONFIG = "simple"
+
+_DOTLESS = str.maketrans({"ı": "i", "İ": "i", "I": "i"})
+_TERM_RE = re.compile(r"\w+")
+
+
+def fold(text: str) -> str:
+    """Lowercase `text` and strip accents, treating the Turkish i's as one letter."""
+    text = unicodedata.normalize("NFKD", str(text or "").translate(_DOTLESS))
+    return "".join(c for c in text if not unicodedata.combining(c)).lower()
+
+
+def search_terms(query: str) -> list:
+    return _TERM_RE.findall(fold(query))
+
+
+def build_search_document(title: str, content: dict) -> str:
+    """The folded text that find_resume searches for one resume."""
+    content = content if isinstance(content, dict) else {}
+    parts = [title]
+
+    user_info = content.get("user_info") or {}
+    parts.append(user_info.get("full_name"))
+    parts.extend(user_info.get("skills") or [])
+
+    for exp in content.get("experience") or []:
+        if not isinstance(exp, dict):
+            continue
+        parts.extend([exp.get("company"), exp.get("title")])
+        desc = exp.get("description")
+        parts.extend(desc if isinstance(desc, list) else [desc])
+
+    for edu in content.get("education") or []:
+        if isinstance(edu, dict):
+            parts.extend(edu.get(key) for key in ("school", "field_of_study", "degree"))
+
+    for proj in content.get("projects_and_publications") or []:
+        if isinstance(proj, dict):
+            parts.extend([proj.get("name"), proj.get("description")])
+
+    return fold(" ".join(str(p) for p in parts if isinstance(p, (str, int, float))))
+
+
+def search_resumes(queryset, query: str, limit: int = None) -> list:
+    """
+    Resumes from `queryset` matching every term of `query`, best first.
+    Returns [] for a query without terms.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return []
+    limit = limit or settings.RESUME_SEARCH["max_results"]
+
+    if connection.vendor != "postgresql":
+        for term in terms:
+            queryset = queryset.filter(search_document__contains=term)
+        return list(queryset.order_by("-updated_at")[:limit])
+
+    from django.contrib.postgres.search import (
+        SearchQuery,
+        SearchRank,
+        SearchVector,
+        TrigramWordSimilarity,
+    )
+
+    # Terms are \w+ only, so they are safe inside a raw tsquery.
+    tsquery = SearchQuery(
+        " & ".join(f"{term}:*" for term in terms),
+        config=SEARCH_CONFIG,
+        search_type="raw",
+    )
+    vector = SearchVector("search_document", config=SEARCH_CONFIG)
+    matched = Q(search_vector=tsquery)
+    ranking = [F("rank").desc()]
+    queryset = queryset.annotate(
+        search_vector=vector, rank=SearchRank(vector, tsquery)
+    )
+    if settings.RESUME_SEARCH["fuzzy"]:
+        folded = " ".join(terms)
+        matched |= Q(search_document__trigram_word_similar=folded)
+        queryset = queryset.annotate(
+            similarity=TrigramWordSimilarity(folded, "search_document")
+        )
+        ranking.append(F("similarity").desc())
+    return list(queryset.filter(matched).order_by(*ranking, "-updated_at")[:limit])
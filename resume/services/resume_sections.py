@@ -0,0 +1,77 @@
+"""
+Split resume text into the groups extracted separately in chunked mode.
+
+extract_resume_data() sends long resumes to the model as one request per
+group (header, experience, education, projects, skills), so no single
+generation has to produce the whole document. Sections are found from the
+"## " headings written by pdf_layout, or from lines that are a known heading
+on their own when the text didn't go through layout reconstruction.
+
+Headings that aren't known section names (an all-caps company name marked by
+pdf_layout, for instance) stay in the section they appear in.
+"""
+
+import re
+
+HEADER = "header"
+EXPERIENCE = "experience"
+EDUCATION = "education"
+PROJECTS = "projects"
+SKILLS = "skills"
+
+SECTION_GROUPS = {
+    EXPERIENCE: {
+        "experience", "work experience", "professional experience", "employment",
+        "employment history", "work history", "volunteering", "volunteer experience",
+        "deneyim", "iş deneyimi", "deneyimler", "gönüllü çalışmalar",
+    },
+    EDUCATION: {"education", "academic background", "eğitim", "eğitim bilgileri"},
+    PROJECTS: {
+        "projects", "publications", "projects and publications", "selected publications",
+        "research", "projeler", "yayınlar",
+    },
+    SKILLS: {
+        "skills", "technical skills", "core skills", "top skills", "languages",
+        "certifications", "certificates", "licenses & certifications", "yetenekler",
+        "beceriler", "sertifikalar", "diller",
+    },
+    HEADER: {
+        "summary", "profile", "about", "about me", "objective", "contact",
+        "özet", "hakkımda", "profil", "iletişim",
+    },
+}  # fmt: skip
+
+_HEADING_GROUP = {
+    heading: group for group, headings in SECTION_GROUPS.items() for heading in headings
+}
+
+
+def _heading_group(line: str):
+    """Group for a heading line, or None when the line is not a known heading."""
+    text = line.strip()
+    if text.startswith("## "):
+        text = text[3:]
+    text = re.sub(r"\s+", " ", text.rstrip(":").strip().lower())
+    return _HEADING_GROUP.get(text)
+
+
+def split_resume_sections(text: str) -> dict:
+    """
+    Group the lines of `text` by section.
+
+    Returns:
+        dict: group name -> section text, only for groups with content; text
+              before the first known heading belongs to HEADER.
+    """
+    groups = {}
+    current = HEADER
+    for line in text.splitlines():
+        group = _heading_group(line)
+        if group is not None:
+            current = group
+        groups.setdefault(current, []).append(line)
+    return {
+        group: "\n".join(lines).strip()
+        for group, lines in groups.items()
+        if "\n".join(lines).strip()
+    }
@@ -0,0 +1,230 @@
+"""
+Section-parallel resume translation with a translation memory.
+
+translate_content() translates the user-visible strings of Resume.content
+rather than the whole JSON document:
+
+1. Strings are collected from the tree; contact details, links, dates and
+   other values under UNTRANSLATED_KEYS are copied as they are.
+2. Strings already in the TranslationMemory table for the target language
+   are reused without an LLM call: the user's own translations, and those
+   that RESUME_TRANSLATION["min_users_to_share"] users got identically. A
+   single account can't plant a translation (e.g. via a prompt injected in
+   a batch) that other users would be served.
+3. The rest are grouped by top-level section (user_info, experience, ...),
+   split into batches of RESUME_TRANSLATION["max_strings_per_call"] and
+   translated concurrently, each batch as a small {id: text} JSON object.
+   The wall time is that of the slowest batch, and no single answer is long
+   enough to be truncated.
+4. New translations of short strings (skills, titles, schools, degrees;
+   up to "memory_max_chars") are stored under the user for the next resume.
+   Longer strings such as bullets rarely recur and stay out of the table.
+"""
+
+import hashlib
+import json
+import logging
+import re
+from functools import partial
+
+from django.conf import settings
+from django.db.models import Count
+
+from resume.openai_engine import run_concurrently, send_openai_message
+
+logger = logging.getLogger(__name__)
+
+# Names stay as written, which also keeps them out of the shared memory.
+UNTRANSLATED_KEYS = {
+    "full_name", "email", "phone", "github", "linkedin", "website", "url", "link",
+    "start_date", "end_date", "start_year", "end_year", "current_role",
+    "language", "gpa",
+}  # fmt: skip
+# Values that read the same in every language: URLs, emails, numbers, dates.
+_VERBATIM_RE = re.compile(
+    r"^(https?://\S+|www\.\S+|[^@\s]+@[^@\s]+|[\d\s.,:/%+()-]+)$", re.IGNORECASE
+)
+
+
+def source_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def collect_strings(content: dict) -> list:
+    """[(section, text)] for every translatable string, in document order."""
+    found = []
+
+    def walk(value, section, key=None):
+        if key in UNTRANSLATED_KEYS:
+            return
+        if isinstance(value, dict):
+            for k, v in value.items():
+                walk(v, section, k)
+        elif isinstance(value, list):
+            for item in value:
+                walk(item, section, key)
+        elif isinstance(value, str) and value.strip():
+            if not _VERBATIM_RE.match(value.strip()):
+                found.append((section, value))
+
+    for section, value in (content or {}).items():
+        walk(value, section, section)
+    return found
+
+
+def apply_translations(content: dict, translations: dict) -> dict:
+    """Copy of `content` with every translatable string replaced."""
+
+    def walk(value, key=None):
+        if key in UNTRANSLATED_KEYS:
+            return value
+        if isinstance(value, dict):
+            return {k: walk(v, k) for k, v in value.items()}
+        if isinstance(value, list):
+            return [walk(item, key) for item in value]
+        if isinstance(value, str):
+            return translations.get(value, value)
+        return value
+
+    return {key: walk(value, key) for key, value in content.items()}
+
+
+def lookup_memory(texts: list, target_language: str, user=None) -> dict:
+    """
+    {text: translation} for the texts in the translation memory: the user's
+    own entries first, then translations enough users agree on.
+    """
+    from resume.models import TranslationMemory
+
+    cfg = settings.RESUME_TRANSLATION
+    if not texts or not cfg["memory_enabled"]:
+        return {}
+    by_hash = {source_hash(text): text for text in texts}
+    rows = TranslationMemory.objects.filter(
+        target_language=target_language, source_hash__in=list(by_hash)
+    )
+    found = {}
+    if user is not None:
+        own = rows.filter(user=user).values_list("source_hash", "translated_text")
+        found = {by_hash[h]: translated for h, translated in own}
+    shared = (
+        rows.values("source_hash", "translated_text")
+        .annotate(users=Count("user"))
+        .filter(users__gte=cfg["min_users_to_share"])
+        .order_by("-users")
+    )
+    for row in shared:
+        found.setdefault(by_hash[row["source_hash"]], row["translated_text"])
+    return found
+
+
+def remember(translations: dict, target_language: str, user) -> None:
+    """Store new translations of short strings; failures are logged and ignored."""
+    from resume.models import TranslationMemory
+
+    cfg = settings.RESUME_TRANSLATION
+    if not cfg["memory_enabled"] or user is None:
+        return
+    rows = [
+        TranslationMemory(
+            user=user,
+            source_hash=source_hash(text),
+            target_language=target_language,
+            source_text=text,
+            translated_text=translated,
+        )
+        for text, translated in translations.items()
+        if len(text) <= cfg["memory_max_chars"]
+    ]
+    try:
+        TranslationMemory.objects.bulk_create(rows, ignore_conflicts=True)
+    except Exception:
+        logger.exception("Could not store translations")
+
+
+def _parse_batch(result: str, count: int):
+    """The `count` translations in order, or None when any is missing."""
+    try:
+        parsed = json.loads(result)
+    except (ValueError, TypeError):
+        return None
+    if not isinstance(parsed, dict):
+        return None
+    values = [parsed.get(str(i)) for i in range(count)]
+    if not all(isinstance(v, str) and v.strip() for v in values):
+        return None
+    return values
+
+
+def _translate_batch(section: str, texts: list, target_language: str):
+    """Translations of `texts` in order, or None when the LLM answer is unusable."""
+    payload = json.dumps(
+        {str(i): text for i, text in enumerate(texts)}, ensure_ascii=False
+    )
+    meta = (
+        f"You are a professional resume translator. Translate every value of the"
+        f" JSON object (strings from the '{section}' section of a resume) to"
+        f" {target_language}. Keep the keys. Keep technology, product and brand"
+        " names (e.g. Python, AWS), emails, URLs and numbers as they are."
+        " Return ONLY the JSON object with the same keys."
+    )
+    result = send_openai_message(
+        payload,
+        meta,
+        task="translate_resume_section",
+        is_json=True,
+        temperature=0.2,
+        validate=lambda r: _parse_batch(r, len(texts)) is not None,
+    )
+    return _parse_batch(result, len(texts))
+
+
+def translate_content(content: dict, target_language: str, user=None):
+    """
+    `content` translated to `target_language` for `user`, or None when a batch
+    could not be translated (nothing is half-translated).
+    """
+    cfg = settings.RESUME_TRANSLATION
+    content = content or {}
+    strings = collect_strings(content)
+    unique = list(dict.fromkeys(text for _, text in strings))
+    translations = lookup_memory(unique, target_language, user)
+
+    pending = {}  # section -> texts still to translate, each text only once
+    queued = set(translations)
+    for section, text in strings:
+        if text not in queued:
+            queued.add(text)
+            pending.setdefault(section, []).append(text)
+    size = cfg["max_strings_per_call"]
+    batches = [
+        (section, texts[i : i + size])
+        for section, texts in pending.items()
+        for i in range(0, len(texts), size)
+    ]
+    logger.info(
+        "translate_resume: %d strings, %d from memory, %d LLM batches",
+        len(unique),
+        len(translations),
+        len(batches),
+    )
+
+    results = run_concurrently(
+        [
+            partial(_translate_batch, section, texts, target_language)
+            for section, texts in batches
+        ],
+        max_workers=cfg["max_concurrency"],
+    )
+    learned = {}
+    for (section, texts), translated in zip(batches, results):
+        if translated is None:
+            logger.warning("translate_resume: %s batch failed", section)
+            return None
+        learned.update(zip(texts, translated))
+    remember(learned, target_language, user)
+    translations.update(learned)
+
+    result = apply_translations(content, translations)
+    result["language"] = target_language
+    return result
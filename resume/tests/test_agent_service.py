@@ -5,13 +5,22 @@ All OpenAI calls are mocked via @patch('resume.services.agent_service.send_opena
 """
 
 import json
+import threading
 from unittest.mock import patch
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
 
 from resume.models import Resume
-from resume.services.agent_service import AgentService
+from resume.services.agent_service import (
+    CLASSIFY_SYSTEM_PROMPT,
+    AgentService,
+    plan_waves,
+)
+from resume.services.deadline import deadline_scope
 
 User = get_user_model()
 
@@ -82,6 +91,7 @@ class AgentServiceTestBase(TestCase):
     """Shared fixtures for all agent service tests."""
 
     def setUp(self):
+        cache.clear()
         self.user = User.objects.create_user(
             username="testuser", password="testpass123", email="test@example.com"
         )
@@ -118,7 +128,9 @@ class ClassifyIntentTest(AgentServiceTestBase):
                 "message": "Here are your resumes.",
             }
         )
-        result = self.service.classify_intent("show my resumes", self.context)
+        result = self.service.classify_intent(
+            "which of my resumes would suit a backend role?", self.context
+        )
         self.assertEqual(result["intent"], "list_resumes")
         self.assertEqual(result["params"], {})
         self.assertEqual(result["lang"], "en")
@@ -154,10 +166,335 @@ class ClassifyIntentTest(AgentServiceTestBase):
                 "message": "Hello! How can I help?",
             }
         )
-        result = self.service.classify_intent("hi", self.context)
+        result = self.service.classify_intent("hi, what's this app for?", self.context)
         self.assertEqual(result["llm_message"], "Hello! How can I help?")
 
 
+@patch("resume.services.agent_service.send_openai_message")
+class ClassifyPromptTest(AgentServiceTestBase):
+    """The classification prompt is a static prefix plus a compact context."""
+
+    def _prompt(self, mock_llm, context, active_resume=None):
+        mock_llm.return_value = json.dumps({"intent": "help", "params": {}})
+        self.service._llm_classify("hmm", context, "en", active_resume=active_resume)
+        return mock_llm.call_args.kwargs["meta_prompt"]
+
+    def test_context_follows_static_prefix(self, mock_llm):
+        first = self._prompt(mock_llm, self.context)
+        second = self._prompt(
+            mock_llm,
+            {"resumes": [], "quota": {"is_pro": True}},
+            active_resume=self.resume,
+        )
+
+        self.assertTrue(first.startswith(CLASSIFY_SYSTEM_PROMPT))
+        self.assertTrue(second.startswith(CLASSIFY_SYSTEM_PROMPT))
+        self.assertIn(f"1. #{self.resume.id} | {self.resume.display_name}", first)
+        self.assertIn("ACTIVE RESUME: none", first)
+        self.assertIn(f"ACTIVE RESUME: #{self.resume.id}", second)
+        self.assertNotIn("USER'S RESUMES (", CLASSIFY_SYSTEM_PROMPT)
+
+    @override_settings(
+        AGENT_CLASSIFY_PROMPT={**settings.AGENT_CLASSIFY_PROMPT, "max_resumes": 2}
+    )
+    def test_resume_list_is_capped(self, mock_llm):
+        resumes = [
+            {"id": 100 + rank, "display_name": f"CV {rank}", "rank": rank}
+            for rank in range(1, 6)
+        ]
+        prompt = self._prompt(mock_llm, {"resumes": resumes, "quota": {}})
+
+        self.assertIn("1. #101 | CV 1", prompt)
+        self.assertIn("2. #102 | CV 2", prompt)
+        self.assertNotIn("#103", prompt)
+        self.assertIn("(+3 older resumes not shown)", prompt)
+
+    @override_settings(
+        AGENT_CLASSIFY_PROMPT={**settings.AGENT_CLASSIFY_PROMPT, "max_resumes": 1}
+    )
+    def test_active_resume_is_always_listed(self, mock_llm):
+        newer = {"id": 999, "display_name": "Newer", "rank": 1}
+        context = {
+            "resumes": [newer, {**self.context["resumes"][0], "rank": 2}],
+            "quota": {},
+        }
+        prompt = self._prompt(mock_llm, context, active_resume=self.resume)
+
+        self.assertIn(f"2. #{self.resume.id}", prompt)
+        self.assertNotIn("not shown", prompt)
+
+
+@patch("resume.services.agent_service.send_openai_message")
+class LocalIntentParserTest(AgentServiceTestBase):
+    """Chip labels and short commands are classified without the LLM."""
+
+    def setUp(self):
+        super().setUp()
+        self.older = Resume.objects.create(
+            user=self.user, title="Older", content=MOCK_RESUME_CONTENT_2.copy()
+        )
+        self.context["resumes"].append(
+            {"id": self.older.id, "display_name": self.older.display_name, "rank": 2}
+        )
+
+    def _classify(self, message, active_resume=None):
+        return self.service.classify_intent(
+            message, self.context, active_resume=active_resume
+        )
+
+    def test_chip_labels_in_both_languages(self, mock_llm):
+        cases = {
+            "List resumes": ("list_resumes", {}, "en"),
+            "Resume'ları listele": ("list_resumes", {}, "tr"),
+            "Check quota": ("check_quota", {}, "en"),
+            "Kotayı kontrol et": ("check_quota", {}, "tr"),
+            "Upload PDF": ("upload_resume", {}, "en"),
+            "Yeni oluştur": ("create_blank_resume", {}, "tr"),
+            "Preview first resume": ("preview_resume", {"resume_id": self.resume.id}, "en"),
+        }
+        for message, (intent, params, lang) in cases.items():
+            with self.subTest(message=message):
+                result = self._classify(message)
+                self.assertEqual(
+                    (result["intent"], result["params"], result["lang"]),
+                    (intent, params, lang),
+                )
+                self.assertEqual(result["source"], "rules")
+        mock_llm.assert_not_called()
+
+    def test_resume_references(self, mock_llm):
+        cases = {
+            f"Preview resume {self.older.id}": ("preview_resume", self.older.id),
+            "download #2": ("download_resume", self.older.id),
+            "son resume'u indir": ("download_resume", self.resume.id),
+            "PDF indir": ("download_resume", self.older.id),
+            "Bu resume'u analiz et": ("analyze_resume", self.older.id),
+        }
+        for message, (intent, resume_id) in cases.items():
+            with self.subTest(message=message):
+                result = self._classify(message, active_resume=self.older)
+                self.assertEqual(result["intent"], intent)
+                self.assertEqual(result["params"], {"resume_id": resume_id})
+        mock_llm.assert_not_called()
+
+    def test_template_commands(self, mock_llm):
+        result = self._classify("Switch to modern-sidebar", active_resume=self.resume)
+        self.assertEqual(
+            result["params"], {"resume_id": self.resume.id, "template": "modern-sidebar"}
+        )
+        result = self._classify("Şablon değiştir", active_resume=self.resume)
+        self.assertEqual(result["intent"], "switch_template")
+        self.assertEqual(result["lang"], "tr")
+        mock_llm.assert_not_called()
+
+    def test_unsure_messages_fall_through_to_llm(self, mock_llm):
+        mock_llm.return_value = json.dumps({"intent": "clarify", "params": {}})
+        for message in [
+            "remove my last experience",
+            "Improve this resume",
+            "delete",  # destructive: needs an explicit reference
+            "preview resume 999",  # no such ID or position
+            "Download PDF",  # no active resume to default to
+        ]:
+            with self.subTest(message=message):
+                self.assertEqual(self._classify(message)["source"], "llm")
+        self.assertEqual(mock_llm.call_count, 5)
+
+    def test_quick_reply_payload_skips_classification(self, mock_llm):
+        result = self.service.classify_intent(
+            "PDF indir",
+            self.context,
+            intent_payload={
+                "intent": "download_resume",
+                "params": {"resume_id": self.older.id, "sql": "drop"},
+                "lang": "tr",
+            },
+        )
+        self.assertEqual(result["intent"], "download_resume")
+        self.assertEqual(result["params"], {"resume_id": self.older.id})
+        self.assertEqual(result["lang"], "tr")
+        self.assertEqual(result["source"], "chip")
+        mock_llm.assert_not_called()
+
+    def test_invalid_payload_is_ignored(self, mock_llm):
+        result = self.service.classify_intent(
+            "List resumes", self.context, intent_payload={"intent": "drop_tables"}
+        )
+        self.assertEqual(result["source"], "rules")
+
+
+@patch("resume.services.agent_service.send_openai_message")
+class ClassificationCacheTest(AgentServiceTestBase):
+    """Repeated messages in an unchanged context reuse the LLM classification."""
+
+    MESSAGE = "which resume fits a backend role best?"
+
+    def _classify(self, message=MESSAGE, context=None, active_resume=None):
+        return self.service.classify_intent(
+            message, context or self.context, active_resume=active_resume
+        )
+
+    def test_repeated_message_is_served_from_cache(self, mock_llm):
+        mock_llm.return_value = json.dumps(
+            {"intent": "find_resume", "params": {"query": "backend"}, "message": "Ok"}
+        )
+        first = self._classify()
+        second = self._classify("Which resume fits a backend role best")
+
+        self.assertEqual(first["source"], "llm")
+        self.assertEqual(second["source"], "cache")
+        self.assertEqual(second["params"], {"query": "backend"})
+        self.assertEqual(second["llm_message"], "Ok")
+        mock_llm.assert_called_once()
+
+    def test_context_changes_miss_the_cache(self, mock_llm):
+        mock_llm.return_value = json.dumps(
+            {"intent": "find_resume", "params": {"query": "backend"}, "message": ""}
+        )
+        self._classify()
+        new = Resume.objects.create(user=self.user, title="New", content={})
+        with_new_resume = {
+            **self.context,
+            "resumes": [{"id": new.id, "display_name": "New", "rank": 1}]
+            + [{**r, "rank": 2} for r in self.context["resumes"]],
+        }
+        self._classify(context=with_new_resume)
+        self._classify(active_resume=self.resume)
+        self._classify(context={**self.context, "quota": {"is_pro": True}})
+
+        self.assertEqual(mock_llm.call_count, 4)
+
+    def test_clarify_is_not_cached(self, mock_llm):
+        mock_llm.return_value = "not json"
+        self._classify()
+        self._classify()
+
+        self.assertEqual(mock_llm.call_count, 2)
+
+    @override_settings(
+        AGENT_CLASSIFY_CACHE={**settings.AGENT_CLASSIFY_CACHE, "enabled": False}
+    )
+    def test_disabled(self, mock_llm):
+        mock_llm.return_value = json.dumps({"intent": "help", "params": {}})
+        self._classify()
+        self._classify()
+
+        self.assertEqual(mock_llm.call_count, 2)
+
+
+class MultiIntentPlanTest(AgentServiceTestBase):
+    """Messages with several actions run as a plan in one turn."""
+
+    @staticmethod
+    def _step(intent, **params):
+        return {"intent": intent, "params": params}
+
+    @patch("resume.services.agent_service.send_openai_message")
+    def test_classifier_returns_steps(self, mock_llm):
+        steps = [
+            self._step("analyze_resume", resume_id=1),
+            self._step("analyze_resume", resume_id=2),
+        ]
+        mock_llm.return_value = json.dumps(
+            {"intent": "analyze_resume", "params": {"resume_id": 1}, "steps": steps}
+        )
+        result = self.service.classify_intent("analyze resume 1 and 2", self.context)
+        self.assertEqual(result["steps"], steps)
+
+        # A step that would navigate away or confirm makes it a single action.
+        mock_llm.return_value = json.dumps(
+            {
+                "intent": "analyze_resume",
+                "params": {"resume_id": 1},
+                "steps": steps + [self._step("delete_resume", resume_id=2)],
+            }
+        )
+        result = self.service.classify_intent("analyze both then delete 2", self.context)
+        self.assertNotIn("steps", result)
+
+    def test_plan_waves(self):
+        cases = [
+            # Independent reads run together.
+            ([("analyze_resume", 1), ("analyze_resume", 2)], [[0, 1]]),
+            # A change waits for earlier steps on the same resume.
+            ([("translate_resume", 3), ("switch_template", 3)], [[0], [1]]),
+            (
+                [("analyze_resume", 1), ("modify_resume", 1), ("analyze_resume", 2)],
+                [[0, 2], [1]],
+            ),
+            # Listing reads every resume.
+            ([("modify_resume", 1), ("list_resumes", None)], [[0], [1]]),
+            ([("check_quota", None), ("modify_resume", 1)], [[0, 1]]),
+        ]
+        for steps, waves in cases:
+            with self.subTest(steps=steps):
+                plan = [
+                    self._step(intent, **({"resume_id": rid} if rid else {}))
+                    for intent, rid in steps
+                ]
+                self.assertEqual(plan_waves(plan), waves)
+
+    def test_independent_steps_run_concurrently(self):
+        # Both steps must be in flight at once to get past the barrier.
+        barrier = threading.Barrier(2, timeout=5)
+
+        def fake_execute(intent, params, user, **kwargs):
+            barrier.wait()
+            return {
+                "type": "analyze_resume",
+                "resume_id": params["resume_id"],
+                "message": f"Scored {params['resume_id']}",
+                "quick_replies": ["Download PDF"],
+            }
+
+        steps = [
+            self._step("analyze_resume", resume_id=1),
+            self._step("analyze_resume", resume_id=2),
+        ]
+        with patch.object(self.service, "execute_intent", side_effect=fake_execute):
+            result = self.service.execute_plan(steps, self.user)
+
+        self.assertEqual(result["type"], "plan")
+        self.assertEqual([r["resume_id"] for r in result["results"]], [1, 2])
+        self.assertEqual(result["message"], "Scored 1\n\nScored 2")
+        self.assertNotIn("quick_replies", result["results"][0])
+        self.assertIn("quick_replies", result["results"][1])
+
+    @patch("resume.services.agent_service.has_time_for", side_effect=[True, False])
+    def test_waves_past_the_deadline_are_skipped(self, _):
+        steps = [
+            self._step("modify_resume", resume_id=self.resume.id),
+            self._step("switch_template", resume_id=self.resume.id, template="modern"),
+        ]
+        done = {"type": "modify_resume", "message": "Updated."}
+        with patch.object(self.service, "execute_intent", return_value=done) as run:
+            result = self.service.execute_plan(steps, self.user)
+
+        self.assertEqual(run.call_count, 1)
+        self.assertEqual(result["results"][0], done)
+        self.assertTrue(result["results"][1]["timed_out"])
+        self.assertIn("switch_template", result["message"])
+
+    @patch("resume.services.resume_translation.send_openai_message")
+    def test_dependent_steps_run_in_order(self, mock_llm):
+        mock_llm.side_effect = lambda payload, meta, **kwargs: payload
+        steps = [
+            self._step(
+                "translate_resume", resume_id=self.resume.id, target_language="turkish"
+            ),
+            self._step("switch_template", resume_id=self.resume.id, template="modern"),
+        ]
+
+        result = self.service.execute_plan(steps, self.user)
+
+        self.assertEqual(
+            [r["type"] for r in result["results"]], ["modify_resume", "switch_template"]
+        )
+        self.resume.refresh_from_db()
+        self.assertEqual(self.resume.content["language"], "Turkish")
+        self.assertEqual(self.resume.template_selector, "modern-sidebar")
+
+
 class ExecuteIntentTest(AgentServiceTestBase):
     """Tests for execute_intent dispatching and individual _exec_* methods."""
 
@@ -477,6 +814,179 @@ class ModifyResumeTest(AgentServiceTestBase):
         self.assertEqual(result["type"], "modify_resume")
         self.assertEqual(result["resume_id"], self.resume.id)
 
+    @patch("resume.services.agent_service.send_openai_message")
+    def test_modify_resume_applies_json_patch(self, mock_llm):
+        mock_llm.return_value = json.dumps(
+            {
+                "patch": [
+                    {"op": "add", "path": "/user_info/skills/-", "value": "AWS"},
+                    {"op": "replace", "path": "/experience/0/title", "value": "Senior Engineer"},
+                ],
+                "changes_summary": "Added AWS, updated title",
+                "response_message": "Done.",
+            }
+        )
+        result = self.service.execute_intent(
+            "modify_resume",
+            {"resume_id": self.resume.id},
+            self.user,
+            lang="en",
+            user_message="Add AWS and make me senior",
+        )
+        self.assertEqual(result["type"], "modify_resume")
+        self.assertEqual(mock_llm.call_count, 1)
+        self.assertEqual(mock_llm.call_args.kwargs["task"], "modify_resume_patch")
+        self.resume.refresh_from_db()
+        self.assertEqual(self.resume.content["user_info"]["skills"][-1], "AWS")
+        self.assertEqual(self.resume.content["experience"][0]["title"], "Senior Engineer")
+        self.assertEqual(self.resume.content["education"], MOCK_RESUME_CONTENT["education"])
+
+    @patch("resume.services.agent_service.send_openai_message")
+    def test_modify_resume_invalid_patch_falls_back_to_full_document(self, mock_llm):
+        modified_content = json.loads(json.dumps(MOCK_RESUME_CONTENT))
+        modified_content["user_info"]["full_name"] = "Jane Full"
+        mock_llm.side_effect = [
+            json.dumps(
+                {
+                    "patch": [{"op": "remove", "path": "/experience/7"}],
+                    "response_message": "Removed.",
+                }
+            ),
+            json.dumps({"modified_resume": modified_content, "response_message": "Done."}),
+        ]
+        result = self.service.execute_intent(
+            "modify_resume",
+            {"resume_id": self.resume.id},
+            self.user,
+            lang="en",
+            user_message="change my name",
+        )
+        self.assertEqual(result["type"], "modify_resume")
+        self.assertEqual(mock_llm.call_count, 2)
+        self.resume.refresh_from_db()
+        self.assertEqual(self.resume.content["user_info"]["full_name"], "Jane Full")
+
+    @patch("resume.services.agent_service.send_openai_message")
+    def test_modify_resume_sends_only_targeted_sections(self, mock_llm):
+        mock_llm.return_value = json.dumps(
+            {
+                "patch": [{"op": "add", "path": "/user_info/skills/-", "value": "Kubernetes"}],
+                "response_message": "Added.",
+            }
+        )
+        self.service.execute_intent(
+            "modify_resume",
+            {"resume_id": self.resume.id},
+            self.user,
+            user_message="Add Kubernetes to my skills",
+        )
+
+        prompt = mock_llm.call_args.kwargs["meta_prompt"]
+        self.assertIn('"skills"', prompt)
+        self.assertNotIn("Acme Corp", prompt)
+        self.assertNotIn("MIT", prompt)
+        self.resume.refresh_from_db()
+        self.assertEqual(self.resume.content["user_info"]["skills"][-1], "Kubernetes")
+        self.assertEqual(self.resume.content["experience"], MOCK_RESUME_CONTENT["experience"])
+
+    @patch("resume.services.agent_service.send_openai_message")
+    def test_modify_resume_merges_returned_sections(self, mock_llm):
+        experience = [{**MOCK_RESUME_CONTENT["experience"][0], "company": "Beta"}]
+        mock_llm.side_effect = [
+            json.dumps({"patch": [{"op": "remove", "path": "/education/0"}]}),
+            json.dumps({"modified_resume": {"experience": experience}}),
+        ]
+        result = self.service.execute_intent(
+            "modify_resume",
+            {"resume_id": self.resume.id},
+            self.user,
+            user_message="Change the company of my last job to Beta",
+        )
+
+        self.assertEqual(result["type"], "modify_resume")
+        self.resume.refresh_from_db()
+        self.assertEqual(self.resume.content["experience"][0]["company"], "Beta")
+        self.assertEqual(self.resume.content["user_info"], MOCK_RESUME_CONTENT["user_info"])
+        self.assertEqual(self.resume.content["education"], MOCK_RESUME_CONTENT["education"])
+
+    @patch("resume.services.agent_service.send_openai_message")
+    def test_modify_resume_repairs_fenced_patch_locally(self, mock_llm):
+        mock_llm.return_value = (
+            '```json\n{"patch": [{"op": "add", "path": "/user_info/skills/-",'
+            ' "value": "AWS"},], "response_message": "Added.",}\n```'
+        )
+        result = self.service.execute_intent(
+            "modify_resume",
+            {"resume_id": self.resume.id},
+            self.user,
+            user_message="Add AWS to my skills",
+        )
+
+        self.assertEqual(result["type"], "modify_resume")
+        self.assertEqual(mock_llm.call_count, 1)
+        self.resume.refresh_from_db()
+        self.assertEqual(self.resume.content["user_info"]["skills"][-1], "AWS")
+
+    @patch("resume.services.agent_service.send_openai_message")
+    def test_modify_resume_salvages_truncated_full_answer(self, mock_llm):
+        user_info = {**MOCK_RESUME_CONTENT["user_info"], "full_name": "Jane Cut"}
+        answer = json.dumps(
+            {"modified_resume": {"user_info": user_info, "education": [{"school": "M"}]}}
+        )
+        mock_llm.return_value = answer[: answer.index('"M"') + 2]
+        result = self.service.execute_intent(
+            "modify_resume",
+            {"resume_id": self.resume.id},
+            self.user,
+            user_message="do the usual",
+        )
+
+        self.assertEqual(result["type"], "modify_resume")
+        self.assertEqual(mock_llm.call_count, 1)
+        self.resume.refresh_from_db()
+        self.assertEqual(self.resume.content["user_info"]["full_name"], "Jane Cut")
+        # The section the answer was cut off in, and those after it, are kept.
+        self.assertEqual(self.resume.content["education"], MOCK_RESUME_CONTENT["education"])
+        self.assertEqual(self.resume.content["experience"], MOCK_RESUME_CONTENT["experience"])
+
+    @patch("resume.services.agent_service.send_openai_message")
+    def test_modify_resume_truncated_patch_is_not_applied(self, mock_llm):
+        modified_content = json.loads(json.dumps(MOCK_RESUME_CONTENT))
+        modified_content["user_info"]["skills"] = ["Go", "Rust"]
+        mock_llm.side_effect = [
+            '{"patch": [{"op": "remove", "path": "/user_info/skills/0"},'
+            ' {"op": "add", "path": "/user_info/skills/-", "val',
+            json.dumps({"modified_resume": modified_content}),
+        ]
+        self.service.execute_intent(
+            "modify_resume",
+            {"resume_id": self.resume.id},
+            self.user,
+            user_message="do the usual",
+        )
+
+        self.assertEqual(mock_llm.call_count, 2)
+        self.resume.refresh_from_db()
+        self.assertEqual(self.resume.content["user_info"]["skills"], ["Go", "Rust"])
+
+    @patch("resume.services.agent_service.send_openai_message")
+    def test_modify_resume_skips_retry_without_time_left(self, mock_llm):
+        mock_llm.return_value = json.dumps(
+            {"patch": [{"op": "remove", "path": "/experience/7"}]}
+        )
+        with deadline_scope(10):
+            result = self.service.execute_intent(
+                "modify_resume",
+                {"resume_id": self.resume.id},
+                self.user,
+                user_message="do the usual",
+            )
+
+        self.assertTrue(result["timed_out"])
+        self.assertEqual(mock_llm.call_count, 1)
+        self.resume.refresh_from_db()
+        self.assertEqual(self.resume.content, MOCK_RESUME_CONTENT)
+
     def test_modify_resume_no_resumes_at_all(self):
         self.resume.delete()
         result = self.service.execute_intent(
@@ -493,65 +1003,103 @@ class ModifyResumeTest(AgentServiceTestBase):
 class AnalyzeResumeTest(AgentServiceTestBase):
     """Tests for _exec_analyze_resume."""
 
+    def _analyze(self):
+        return self.service.execute_intent(
+            "analyze_resume", {"resume_id": self.resume.id}, self.user, lang="en"
+        )
+
     @patch("resume.services.agent_service.send_openai_message")
-    def test_analyze_returns_scores_and_suggestions(self, mock_llm):
+    def test_analyze_returns_local_scores_then_llm_suggestions(self, mock_llm):
         mock_llm.return_value = json.dumps(
             {
-                "overall_score": 72,
-                "categories": [
-                    {
-                        "name": "Content Completeness",
-                        "score": 15,
-                        "max": 20,
-                        "feedback": "Good coverage.",
-                    },
-                    {
-                        "name": "Impact Language",
-                        "score": 14,
-                        "max": 20,
-                        "feedback": "Decent verbs.",
-                    },
-                    {
-                        "name": "Formatting & Structure",
-                        "score": 16,
-                        "max": 20,
-                        "feedback": "Clean layout.",
-                    },
-                    {
-                        "name": "Skills Coverage",
-                        "score": 13,
-                        "max": 20,
-                        "feedback": "Could add more.",
-                    },
-                    {
-                        "name": "ATS Friendliness",
-                        "score": 14,
-                        "max": 20,
-                        "feedback": "Well structured.",
-                    },
-                ],
                 "top_suggestions": ["Add metrics", "Expand skills", "Add summary"],
-                "response_message": "Your resume scores 72/100.",
+                "response_message": "Solid resume, a few gaps.",
             }
         )
-        result = self.service.execute_intent(
-            "analyze_resume", {"resume_id": self.resume.id}, self.user, lang="en"
-        )
+        result = self._analyze()
         self.assertEqual(result["type"], "analyze_resume")
         self.assertEqual(result["resume_id"], self.resume.id)
-        self.assertEqual(result["analysis"]["overall_score"], 72)
-        self.assertEqual(len(result["analysis"]["categories"]), 5)
-        self.assertEqual(len(result["analysis"]["top_suggestions"]), 3)
+        analysis = result["analysis"]
+        self.assertEqual(len(analysis["categories"]), 5)
+        self.assertEqual(
+            analysis["overall_score"], sum(c["score"] for c in analysis["categories"])
+        )
+        self.assertIn("/100", result["message"])
         self.assertIn("quick_replies", result)
+        # The scores don't wait for the LLM.
+        mock_llm.assert_not_called()
+        self.assertTrue(result["pending_suggestions"])
+
+        self.client.force_login(self.user)
+        response = self.client.get(result["suggestions_url"])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            {
+                "top_suggestions": ["Add metrics", "Expand skills", "Add summary"],
+                "message": "Solid resume, a few gaps.",
+            },
+        )
+        self.assertIn("SCORES (", mock_llm.call_args.kwargs["meta_prompt"])
+        # The link is good for one request only.
+        self.assertEqual(self.client.get(result["suggestions_url"]).status_code, 403)
+
+        # Once fetched, the suggestions come with the next analysis.
+        result = self._analyze()
+        self.assertNotIn("pending_suggestions", result)
+        self.assertEqual(result["analysis"]["top_suggestions"][0], "Add metrics")
+        self.assertEqual(result["message"], "Solid resume, a few gaps.")
+        self.assertEqual(mock_llm.call_count, 1)
 
     @patch("resume.services.agent_service.send_openai_message")
-    def test_analyze_llm_parse_failure(self, mock_llm):
+    def test_analyze_llm_failure_keeps_local_suggestions(self, mock_llm):
         mock_llm.return_value = "not json"
-        result = self.service.execute_intent(
-            "analyze_resume", {"resume_id": self.resume.id}, self.user, lang="en"
+        result = self._analyze()
+        self.assertTrue(result["analysis"]["top_suggestions"])
+
+        self.client.force_login(self.user)
+        response = self.client.get(result["suggestions_url"])
+        self.assertEqual(response.status_code, 503)
+        self.assertTrue(self._analyze()["pending_suggestions"])
+
+    @patch("resume.services.agent_service.send_openai_message")
+    def test_suggestions_need_a_token_from_an_analysis(self, mock_llm):
+        self.client.force_login(self.user)
+        url = reverse("resume:analysis_suggestions", args=[self.resume.id])
+
+        self.assertEqual(self.client.get(url).status_code, 403)
+        self.assertEqual(self.client.get(url, {"token": "guess"}).status_code, 403)
+        mock_llm.assert_not_called()
+
+    def test_suggestions_of_another_users_resume_are_not_found(self):
+        stranger = User.objects.create_user(username="stranger", password="pw")
+        self.client.force_login(stranger)
+        response = self.client.get(
+            reverse("resume:analysis_suggestions", args=[self.resume.id])
+        )
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(
+        ANALYZE_RESUME={**settings.ANALYZE_RESUME, "llm_suggestions": False}
+    )
+    def test_analyze_without_llm_suggestions(self):
+        self.assertNotIn("pending_suggestions", self._analyze())
+
+    @patch("resume.services.agent_service.send_openai_message")
+    def test_analyze_is_cached_per_content(self, mock_llm):
+        mock_llm.return_value = json.dumps({"top_suggestions": ["Add metrics"]})
+        for _ in range(2):
+            first = self._analyze()
+            self.service.analysis_suggestions(self.resume, "en")
+        self.assertEqual(mock_llm.call_count, 1)
+
+        self.resume.content = {**self.resume.content, "education": []}
+        self.resume.save()
+        second = self._analyze()
+        self.assertTrue(second["pending_suggestions"])
+        self.assertLess(
+            second["analysis"]["overall_score"], first["analysis"]["overall_score"]
         )
-        self.assertEqual(result["type"], "chat")
-        self.assertIn("couldn't analyze", result["message"].lower())
 
     @patch("resume.services.agent_service.send_openai_message")
     def test_analyze_falls_back_to_active_resume(self, mock_llm):
@@ -617,6 +1165,16 @@ class FindResumeTest(AgentServiceTestBase):
         )
         self.assertEqual(len(result["data"]), 1)
 
+    def test_find_ignores_accents(self):
+        experience = dict(MOCK_RESUME_CONTENT["experience"][0])
+        experience["title"] = "Yazılım Mühendisi"
+        self.resume.content = {**MOCK_RESUME_CONTENT, "experience": [experience]}
+        self.resume.save()
+        result = self.service.execute_intent(
+            "find_resume", {"query": "yazilim muhendisi"}, self.user, lang="tr"
+        )
+        self.assertEqual(len(result["data"]), 1)
+
 
 class CompareResumesTest(AgentServiceTestBase):
     """Tests for _exec_compare_resumes."""
@@ -627,38 +1185,89 @@ class CompareResumesTest(AgentServiceTestBase):
             user=self.user, title="Second Resume", content=MOCK_RESUME_CONTENT_2.copy()
         )
 
+    def _compare(self):
+        return self.service.execute_intent(
+            "compare_resumes",
+            {"resume_id_1": self.resume.id, "resume_id_2": self.resume2.id},
+            self.user,
+            lang="en",
+        )
+
     @patch("resume.services.agent_service.send_openai_message")
     def test_compare_two_resumes_success(self, mock_llm):
         mock_llm.return_value = json.dumps(
             {
                 "comparison_summary": "Resume 1 is backend-focused, Resume 2 is frontend-focused.",
-                "resume_1_strengths": ["Strong backend skills"],
-                "resume_2_strengths": ["Strong frontend skills"],
-                "key_differences": ["Tech stack differs"],
                 "recommendation": "Depends on the target role.",
             }
         )
-        result = self.service.execute_intent(
-            "compare_resumes",
-            {"resume_id_1": self.resume.id, "resume_id_2": self.resume2.id},
-            self.user,
-            lang="en",
-        )
+        result = self._compare()
         self.assertEqual(result["type"], "chat")
-        self.assertIn("backend-focused", result["message"])
         self.assertIn("Key Differences", result["message"])
+        self.assertEqual(
+            result["diff"]["skills"]["only_in_2"], ["AWS", "React", "TypeScript"]
+        )
+        # The diff doesn't wait for the LLM.
+        mock_llm.assert_not_called()
+        self.assertTrue(result["pending_summary"])
+
+        self.client.force_login(self.user)
+        response = self.client.get(result["summary_url"])
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("backend-focused", response.json()["message"])
+        self.assertIn("Depends on the target role.", response.json()["message"])
+        self.assertEqual(self.client.get(result["summary_url"]).status_code, 403)
+
+        # The LLM sees the compact diff, not the resumes.
+        prompt = mock_llm.call_args.kwargs["meta_prompt"]
+        self.assertIn('"only_in_2":["AWS","React","TypeScript"]', prompt)
+        self.assertNotIn("Developed REST APIs", prompt)
+
+        # Once fetched, the summary comes with the next comparison.
+        result = self._compare()
+        self.assertNotIn("pending_summary", result)
+        self.assertIn("backend-focused", result["message"])
+        self.assertEqual(mock_llm.call_count, 1)
 
     @patch("resume.services.agent_service.send_openai_message")
-    def test_compare_llm_parse_failure(self, mock_llm):
+    def test_compare_llm_failure_still_shows_diff(self, mock_llm):
         mock_llm.return_value = "not json"
+        result = self._compare()
+        self.assertEqual(result["type"], "chat")
+        self.assertIn(
+            "Only in Second Resume: Frontend Developer @ Google", result["message"]
+        )
+
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(result["summary_url"]).status_code, 503)
+
+    @patch("resume.services.agent_service.send_openai_message")
+    def test_summary_needs_a_token_from_a_comparison(self, mock_llm):
+        self.client.force_login(self.user)
+        url = reverse("resume:compare_summary", args=[self.resume.id, self.resume2.id])
+
+        self.assertEqual(self.client.get(url).status_code, 403)
+        mock_llm.assert_not_called()
+
+    def test_summary_of_another_users_resumes_is_not_found(self):
+        stranger = User.objects.create_user(username="stranger", password="pw")
+        self.client.force_login(stranger)
+        url = reverse("resume:compare_summary", args=[self.resume.id, self.resume2.id])
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    @override_settings(COMPARE_RESUMES={"llm_summary": False})
+    @patch("resume.services.agent_service.send_openai_message")
+    def test_compare_without_llm_summary(self, mock_llm):
         result = self.service.execute_intent(
             "compare_resumes",
-            {"resume_id_1": self.resume.id, "resume_id_2": self.resume2.id},
+            {"resume_id_1": self.resume.id, "resume_id_2": self.resume.id},
             self.user,
             lang="en",
         )
-        self.assertEqual(result["type"], "chat")
-        self.assertIn("couldn't compare", result["message"].lower())
+        mock_llm.assert_not_called()
+        self.assertEqual(
+            result["message"], "These resumes have the same structure and content."
+        )
 
     def test_compare_missing_ids(self):
         result = self.service.execute_intent(
@@ -805,6 +1414,10 @@ class LanguageDetectionTest(AgentServiceTestBase):
 class QuickRepliesTest(AgentServiceTestBase):
     """Tests for quick_replies in various responses."""
 
+    @staticmethod
+    def _labels(result):
+        return [r["label"] if isinstance(r, dict) else r for r in result["quick_replies"]]
+
     def test_list_resumes_has_quick_replies(self):
         result = self.service.execute_intent("list_resumes", {}, self.user, lang="en")
         self.assertIn("quick_replies", result)
@@ -820,7 +1433,15 @@ class QuickRepliesTest(AgentServiceTestBase):
             "preview_resume", {"resume_id": self.resume.id}, self.user, lang="en"
         )
         self.assertIn("quick_replies", result)
-        self.assertIn("Download PDF", result["quick_replies"])
+        self.assertIn(
+            {
+                "label": "Download PDF",
+                "intent": "download_resume",
+                "params": {"resume_id": self.resume.id},
+                "lang": "en",
+            },
+            result["quick_replies"],
+        )
 
     @patch("resume.services.agent_service.send_openai_message")
     def test_modify_resume_has_quick_replies(self, mock_llm):
@@ -839,20 +1460,19 @@ class QuickRepliesTest(AgentServiceTestBase):
             user_message="test",
         )
         self.assertIn("quick_replies", result)
-        self.assertIn("Preview changes", result["quick_replies"])
+        self.assertIn("Preview changes", self._labels(result))
 
     def test_list_resumes_turkish_quick_replies(self):
         result = self.service.execute_intent("list_resumes", {}, self.user, lang="tr")
         self.assertIn("quick_replies", result)
         # Turkish quick replies should not contain English text
-        for reply in result["quick_replies"]:
-            self.assertNotIn("Preview first", reply)
+        for label in self._labels(result):
+            self.assertNotIn("Preview first", label)
 
     def test_help_turkish_quick_replies(self):
         result = self.service.execute_intent("help", {}, self.user, lang="tr")
-        replies = result["quick_replies"]
         # Should contain Turkish text
-        self.assertTrue(any("listele" in r.lower() for r in replies))
+        self.assertTrue(any("listele" in label.lower() for label in self._labels(result)))
 
 
 class ResumeResolutionTest(AgentServiceTestBase):
@@ -0,0 +1,191 @@
+"""
+Tests for the multi-file bulk import endpoint and API action.
+
+Files are queued as import jobs, which run eagerly here. PDF text
+extraction and the LLM call are mocked by patching
+resume.services.import_jobs.extract_pdf_text and
+resume.services.import_jobs.EXTRACT_FUNCTIONS.
+"""
+
+import io
+import json
+import tempfile
+import zipfile
+from unittest.mock import MagicMock, patch
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from resume.models import ImportJob, Resume, ResumeImport, UserProfile
+from resume.tests.test_upload_views import EXTRACTED, RESUME_TEXT, _pdf_text
+
+User = get_user_model()
+
+
+def _pdf(name, content=None):
+    return SimpleUploadedFile(name, content or f"%PDF-1.4 {name}".encode())
+
+
+def _zip(name, members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for member, content in members.items():
+            archive.writestr(member, content)
+    return SimpleUploadedFile(name, buffer.getvalue())
+
+
+@override_settings(
+    IMPORT_JOBS={**settings.IMPORT_JOBS, "eager": True},
+    MEDIA_ROOT=tempfile.mkdtemp(),
+)
+@patch("resume.services.import_jobs.extract_pdf_text", return_value=_pdf_text(RESUME_TEXT))
+class BulkImportTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="recruiter", password="pass12345")
+        self.profile = self.user.profile
+        self.profile.tier = UserProfile.TIER_PRO
+        self.profile.save()
+        self.client.force_login(self.user)
+        self.url = reverse("resume:bulk_import")
+        self.extract = MagicMock(return_value=EXTRACTED)
+        patcher = patch.dict(
+            "resume.services.import_jobs.EXTRACT_FUNCTIONS",
+            {ResumeImport.SOURCE_PDF: self.extract},
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _post(self, files):
+        response = self.client.post(self.url, {"files": files})
+        return response, json.loads(response.content)
+
+    def test_pdfs_and_zip_members_are_queued_with_one_job_each(self, mock_text):
+        archive = _zip(
+            "batch.zip",
+            {
+                "c.pdf": b"%PDF-1.4 c",
+                "notes.txt": b"hello",
+                "__MACOSX/._c.pdf": b"",
+            },
+        )
+
+        response, data = self._post([_pdf("a.pdf"), _pdf("b.pdf"), archive])
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual((data["queued"], data["rejected"]), (3, 1))
+        self.assertEqual(
+            [(r["file"], r["status"]) for r in data["results"]],
+            [
+                ("a.pdf", "queued"),
+                ("b.pdf", "queued"),
+                ("c.pdf", "queued"),
+                ("notes.txt", "rejected"),
+            ],
+        )
+        self.assertEqual(data["jobs"], [r["job_id"] for r in data["results"][:3]])
+        jobs = ImportJob.objects.filter(pk__in=data["jobs"])
+        self.assertEqual({job.status for job in jobs}, {ImportJob.STATUS_SUCCEEDED})
+        self.assertEqual(Resume.objects.filter(user=self.user).count(), 3)
+        self.assertEqual(self.extract.call_count, 3)
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.import_count, 3)
+
+    def test_known_and_repeated_files_are_duplicates(self, mock_text):
+        _, first = self._post([_pdf("a.pdf")])
+        resume_id = ImportJob.objects.get(pk=first["jobs"][0]).resume_id
+
+        _, data = self._post(
+            [_pdf("a.pdf"), _pdf("b.pdf"), _pdf("copy.pdf", b"%PDF-1.4 b.pdf")]
+        )
+
+        self.assertEqual(
+            data["results"][0],
+            {"file": "a.pdf", "status": "duplicate", "resume_id": resume_id},
+        )
+        self.assertEqual(data["results"][1]["status"], "queued")
+        self.assertEqual(data["results"][2]["status"], "duplicate")
+        self.assertEqual(data["results"][2]["job_id"], data["results"][1]["job_id"])
+        self.assertEqual(data["jobs"], [data["results"][1]["job_id"]])
+        self.assertEqual(self.extract.call_count, 2)
+
+    def test_failed_file_does_not_fail_the_batch(self, mock_text):
+        self.extract.side_effect = [EXTRACTED, "Error: timeout"]
+
+        _, data = self._post([_pdf("a.pdf"), _pdf("b.pdf")])
+
+        jobs = ImportJob.objects.filter(pk__in=data["jobs"])
+        self.assertEqual(
+            sorted(job.status for job in jobs),
+            [ImportJob.STATUS_FAILED, ImportJob.STATUS_SUCCEEDED],
+        )
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.import_count, 1)
+
+    def test_batch_over_free_quota_is_rejected_up_front(self, mock_text):
+        self.profile.tier = UserProfile.TIER_FREE
+        self.profile.save()
+
+        response, data = self._post([_pdf("a.pdf"), _pdf("b.pdf"), _pdf("c.pdf")])
+
+        self.assertEqual(response.status_code, 403)
+        self.assertIn("import limit", data["error"])
+        self.extract.assert_not_called()
+        self.assertFalse(ImportJob.objects.exists())
+
+    @override_settings(BULK_IMPORT={**settings.BULK_IMPORT, "max_files": 2})
+    def test_too_many_files(self, mock_text):
+        response, _ = self._post([_pdf("a.pdf"), _pdf("b.pdf"), _pdf("c.pdf")])
+
+        self.assertEqual(response.status_code, 400)
+        self.extract.assert_not_called()
+
+    @override_settings(BULK_IMPORT={**settings.BULK_IMPORT, "max_files": 2})
+    @patch("resume.services.bulk_import._spool_pdf")
+    def test_zip_limits_apply_before_extraction(self, mock_spool, mock_text):
+        members = {f"{n}.pdf": b"%PDF-1.4" for n in range(3)}
+        response, _ = self._post([_zip("many.zip", members)])
+        self.assertEqual(response.status_code, 400)
+
+        bomb = _zip("bomb.zip", {"a.pdf": b"\0" * 4096})
+        with self.settings(
+            BULK_IMPORT={**settings.BULK_IMPORT, "max_zip_uncompressed_size": 1024}
+        ):
+            response, data = self._post([bomb])
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("ZIP contents too large", data["error"])
+        mock_spool.assert_not_called()
+
+    @override_settings(BULK_IMPORT={**settings.BULK_IMPORT, "max_files": 2})
+    def test_skipped_zip_members_do_not_count(self, mock_text):
+        archive = _zip(
+            "batch.zip",
+            {
+                "a.pdf": b"%PDF-1.4 a",
+                "b.txt": b"x",
+                "c.txt": b"y",
+                "__MACOSX/._a.pdf": b"",
+            },
+        )
+
+        response, data = self._post([_pdf("d.pdf"), archive])
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(data["queued"], 2)
+
+    def test_api_action(self, mock_text):
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        response = client.post(
+            "/api/v1/resumes/bulk-import/",
+            {"files": [_pdf("a.pdf"), _pdf("b.pdf")]},
+            format="multipart",
+        )
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data["queued"], 2)
+        self.assertEqual(len(response.data["jobs"]), 2)
@@ -0,0 +1,98 @@
+"""
+Tests for per-request deadlines and how LLM calls honour them.
+"""
+
+from unittest.mock import MagicMock, patch
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from resume.middleware import RequestDeadlineMiddleware
+from resume.openai_engine import DEADLINE_ERROR, send_openai_message
+from resume.services.deadline import capped, deadline_scope, has_time_for, remaining
+
+POLICIES = {
+    "default": {"models": ["gpt-4o-mini"], "max_tokens": None},
+    "cascade_task": {"models": ["fast-model", "strong-model"], "max_tokens": None},
+}
+
+
+class DeadlineScopeTest(SimpleTestCase):
+    def test_no_deadline_by_default(self):
+        self.assertIsNone(remaining())
+        self.assertTrue(has_time_for(1000))
+        self.assertEqual(capped(90), 90)
+
+    def test_inner_scope_never_extends_outer(self):
+        with deadline_scope(10):
+            with deadline_scope(1000):
+                self.assertLessEqual(remaining(), 10)
+            with deadline_scope(2):
+                self.assertLessEqual(capped(90), 2)
+                self.assertFalse(has_time_for(5))
+            self.assertTrue(has_time_for(5))
+        self.assertIsNone(remaining())
+
+
+DEADLINES = {**settings.LLM_DEADLINES, "views": {"agent_chat": 30}}
+
+
+@override_settings(LLM_DEADLINES=DEADLINES)
+class RequestDeadlineMiddlewareTest(SimpleTestCase):
+    def _run(self, url_name):
+        seen = {}
+        request = RequestFactory().get("/")
+        request.resolver_match = MagicMock(url_name=url_name)
+
+        def get_response(req):
+            middleware.process_view(req, None, (), {})
+            seen["remaining"] = remaining()
+            return HttpResponse()
+
+        middleware = RequestDeadlineMiddleware(get_response)
+        middleware(request)
+        self.assertIsNone(remaining())  # Not left behind for the next request.
+        return seen["remaining"]
+
+    def test_listed_view_gets_its_budget(self):
+        self.assertLessEqual(self._run("agent_chat"), 30)
+        self.assertIsNone(self._run("upload_cv"))
+
+
+@override_settings(
+    LLM_TASK_POLICIES=POLICIES,
+    LLM_SINGLE_FLIGHT={**settings.LLM_SINGLE_FLIGHT, "shared": False},
+)
+@patch("resume.openai_engine.usage_meter", MagicMock())
+@patch("resume.openai_engine.client")
+class LLMCallDeadlineTest(SimpleTestCase):
+    def test_call_gets_remaining_budget_without_sdk_retries(self, mock_client):
+        api = mock_client.with_options.return_value
+        api.chat.completions.create.return_value.choices[0].message.content = "ok"
+
+        with deadline_scope(40):
+            self.assertEqual(send_openai_message("hi"), "ok")
+
+        mock_client.with_options.assert_called_once_with(max_retries=0)
+        kwargs = api.chat.completions.create.call_args.kwargs
+        self.assertLessEqual(kwargs["timeout"], 40)
+
+    def test_no_call_is_started_without_budget(self, mock_client):
+        with deadline_scope(1), self.assertLogs("resume.openai_engine", "WARNING"):
+            result = send_openai_message("hi")
+
+        self.assertEqual(result, DEADLINE_ERROR)
+        mock_client.with_options.assert_not_called()
+        mock_client.chat.completions.create.assert_not_called()
+
+    @patch("resume.openai_engine.has_time_for", side_effect=[True, False])
+    def test_escalation_is_skipped_when_time_runs_out(self, _, mock_client):
+        api = mock_client.with_options.return_value
+        api.chat.completions.create.return_value.choices[0].message.content = "bad"
+
+        with deadline_scope(60), self.assertLogs("resume.openai_engine", "WARNING"):
+            result = send_openai_message("hi", task="cascade_task", is_json=True)
+
+        self.assertEqual(result, "bad")
+        self.assertEqual(api.chat.completions.create.call_count, 1)
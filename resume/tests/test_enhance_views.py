@@ -0,0 +1,83 @@
+"""
+Tests for the batched "enhance all" endpoint.
+
+LLM calls are mocked by patching resume.views.ENHANCE_ALL_FUNCTIONS.
+"""
+
+import json
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+User = get_user_model()
+
+
+class EnhanceAllTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="enhancer", password="pass12345")
+        self.profile = self.user.profile
+        self.client.force_login(self.user)
+        self.url = reverse("resume:enhance_all")
+        self.functions = {
+            "experience": lambda text: f"EXP: {text}",
+            "project": lambda text: f"PROJ: {text}",
+        }
+
+    def _post(self, data):
+        with patch.dict("resume.views.ENHANCE_ALL_FUNCTIONS", self.functions):
+            return self.client.post(self.url, data)
+
+    def test_enhances_all_descriptions_and_charges_per_entry(self):
+        response = self._post(
+            {
+                "experience-0-description": "built apis",
+                "experience-1-description": "led team",
+                "project-0-description": "cli tool",
+                "experience-0-title": "ignored",
+            }
+        )
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        self.assertEqual(
+            data["fields"],
+            {
+                "experience-0-description": "EXP: built apis",
+                "experience-1-description": "EXP: led team",
+                "project-0-description": "PROJ: cli tool",
+            },
+        )
+        self.assertEqual(data["enhanced_count"], 3)
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.enhance_count, 3)
+
+    def test_failed_entries_are_not_charged(self):
+        self.functions["project"] = lambda text: "OpenAI API returned an API Error: boom"
+        response = self._post(
+            {
+                "experience-0-description": "built apis",
+                "project-0-description": "cli tool",
+            }
+        )
+        data = json.loads(response.content)
+        self.assertEqual(data["failed"], ["project-0-description"])
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.enhance_count, 1)
+
+    def test_batch_larger_than_remaining_quota_is_rejected(self):
+        self.profile.enhance_count = 9
+        self.profile.save()
+        response = self._post(
+            {
+                "experience-0-description": "built apis",
+                "experience-1-description": "led team",
+            }
+        )
+        self.assertEqual(response.status_code, 403)
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.enhance_count, 9)
+
+    def test_empty_batch_returns_400(self):
+        response = self._post({"experience-0-description": "   "})
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,216 @@
+"""
+Tests for the local intent classifier: logging, training and serving.
+"""
+
+import io
+import itertools
+import json
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from resume.models import IntentClassification, IntentClassifierModel, Resume
+from resume.services import intent_classifier
+from resume.services.agent_service import AgentService
+from resume.services.intent_classifier import evaluate, train_model
+
+User = get_user_model()
+
+PHRASES = {
+    "list_resumes": (
+        ["could you list", "i want to see", "bring up", "what are"],
+        ["all my resumes", "every cv i have", "my saved resumes"],
+    ),
+    "check_quota": (
+        ["how much", "what is left of", "tell me about"],
+        ["my monthly quota", "my usage limits", "the remaining credits"],
+    ),
+    "modify_resume": (
+        ["please add", "can you rewrite", "remove", "update"],
+        ["my last job", "the summary section", "python to skills"],
+    ),
+    "delete_resume": (
+        ["permanently delete", "get rid of", "trash"],
+        ["this whole resume", "the entire cv", "that resume completely"],
+    ),
+}
+
+
+def _samples():
+    """(message, has_active_resume, intent, weight) for every phrase pair."""
+    samples = []
+    for intent, (verbs, objects) in PHRASES.items():
+        active = intent in ("modify_resume", "delete_resume")
+        for verb, obj in itertools.product(verbs, objects):
+            samples.append((f"{verb} {obj}", active, intent, 1.0))
+    return samples
+
+
+TRAINING = {
+    **settings.LOCAL_INTENT_CLASSIFIER,
+    "min_samples": 10,
+    "min_feature_count": 1,
+    "epochs": 30,
+    "confidence_threshold": 0.6,
+    "reload_interval_seconds": 0,
+}
+
+
+class TrainModelTest(TestCase):
+    def test_learns_phrasings(self):
+        model = train_model(
+            _samples(), epochs=30, learning_rate=0.5, l2=1e-5, min_feature_count=1
+        )
+
+        intent, probability = model.predict("could you list my resumes")
+        self.assertEqual(intent, "list_resumes")
+        self.assertGreater(probability, 0.6)
+        self.assertEqual(model.predict("what is left of my quota")[0], "check_quota")
+        self.assertEqual(evaluate(model, _samples(), 0.5)["accuracy"], 1.0)
+
+
+@override_settings(LOCAL_INTENT_CLASSIFIER=TRAINING)
+class IntentClassifierServingTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="u", password="pass12345")
+        self.resume = Resume.objects.create(user=self.user, title="CV", content={})
+        self.context = {"resumes": [{"id": self.resume.id, "rank": 1}], "quota": {}}
+        self.service = AgentService()
+        self.addCleanup(
+            intent_classifier._loaded.update, model=None, version=None, checked_at=0.0
+        )
+
+    def _log(self, samples):
+        IntentClassification.objects.bulk_create(
+            IntentClassification(
+                message=message,
+                intent=intent,
+                source=IntentClassification.SOURCE_LLM,
+                confidence=0.95,
+                has_active_resume=active,
+            )
+            for message, active, intent, _ in samples
+        )
+
+    def _train(self):
+        self._log(_samples())
+        call_command("train_intent_classifier", holdout=0.0, stdout=io.StringIO())
+
+    def test_command_refuses_too_little_data(self):
+        self._log(_samples()[:3])
+
+        with self.assertRaises(CommandError):
+            call_command("train_intent_classifier")
+        self.assertFalse(IntentClassifierModel.objects.exists())
+
+    def test_command_prunes_expired_messages(self):
+        self._log(_samples()[:3])
+        expired = IntentClassification.objects.order_by("pk").first()
+        IntentClassification.objects.filter(pk=expired.pk).update(
+            created_at=timezone.now() - timedelta(days=91)
+        )
+
+        call_command("train_intent_classifier", prune_only=True, stdout=io.StringIO())
+
+        self.assertEqual(IntentClassification.objects.count(), 2)
+        self.assertFalse(IntentClassification.objects.filter(pk=expired.pk).exists())
+
+    @patch("resume.services.agent_service.send_openai_message")
+    def test_confident_prediction_skips_the_llm(self, mock_llm):
+        self._train()
+
+        result = self.service.classify_intent(
+            "could you list every cv i have", self.context, user=self.user
+        )
+        self.assertEqual(result["intent"], "list_resumes")
+        self.assertEqual(result["source"], "local")
+
+        result = self.service.classify_intent(
+            "please add python to skills", self.context, active_resume=self.resume
+        )
+        self.assertEqual(result["intent"], "modify_resume")
+        self.assertEqual(result["params"], {"resume_id": self.resume.id})
+        mock_llm.assert_not_called()
+        self.assertEqual(IntentClassification.objects.filter(source="local").count(), 2)
+
+    @patch("resume.services.agent_service.send_openai_message")
+    def test_intents_needing_the_llm_fall_through(self, mock_llm):
+        self._train()
+        mock_llm.return_value = json.dumps(
+            {"intent": "clarify", "params": {}, "message": "Which one?"}
+        )
+
+        # Destructive, and a resume intent without an active resume.
+        self.service.classify_intent(
+            "permanently delete this whole resume",
+            self.context,
+            active_resume=self.resume,
+        )
+        self.service.classify_intent("can you rewrite my last job", self.context)
+
+        self.assertEqual(mock_llm.call_count, 2)
+
+    @patch("resume.services.agent_service.send_openai_message")
+    def test_reference_to_another_resume_falls_through(self, mock_llm):
+        self._train()
+        mock_llm.return_value = json.dumps(
+            {"intent": "clarify", "params": {}, "message": "Which one?"}
+        )
+        other = Resume.objects.create(user=self.user, title="Python Developer")
+        context = {
+            "resumes": [
+                {"id": self.resume.id, "display_name": "CV", "rank": 2},
+                {"id": other.id, "display_name": other.display_name, "rank": 1},
+            ],
+            "quota": {},
+        }
+
+        self.service.classify_intent(
+            "please add python to skills", context, active_resume=self.resume
+        )
+
+        mock_llm.assert_called_once()
+
+    @patch("resume.services.intent_classifier.current_model")
+    def test_switch_template_needs_the_llm(self, mock_model):
+        mock_model.return_value.predict.return_value = ("switch_template", 0.99)
+
+        result = intent_classifier.local_classify(
+            "use the modern template", active_resume=self.resume
+        )
+
+        self.assertIsNone(result)
+
+    def test_references_other_resume(self):
+        resumes = [
+            {"id": 1, "display_name": "Backend Engineer at Google"},
+            {"id": 2, "display_name": "Jane Doe · Oct 2026"},
+        ]
+        check = intent_classifier.references_other_resume
+        self.assertTrue(check("analyze the Google resume", resumes, active_resume_id=2))
+        self.assertTrue(check("download resume 3", resumes, active_resume_id=2))
+        self.assertFalse(
+            check("analyze the google resume", resumes, active_resume_id=1)
+        )
+        self.assertFalse(check("analyze my resume at oct", resumes, active_resume_id=1))
+
+    @patch("resume.services.agent_service.send_openai_message")
+    def test_llm_answers_are_logged_with_confidence(self, mock_llm):
+        mock_llm.return_value = json.dumps(
+            {"intent": "find_resume", "params": {"query": "go"}, "confidence": 0.8}
+        )
+
+        self.service.classify_intent(
+            "which resume mentions golang?", self.context, user=self.user
+        )
+
+        row = IntentClassification.objects.get()
+        self.assertEqual(
+            (row.user, row.intent, row.source, row.confidence),
+            (self.user, "find_resume", "llm", 0.8),
+        )
@@ -0,0 +1,69 @@
+"""
+Tests for the RFC 6902 JSON Patch helper used by modify_resume.
+"""
+
+from django.test import SimpleTestCase
+
+from resume.services.json_patch import JsonPatchError, apply_patch
+
+DOC = {
+    "user_info": {"full_name": "Jane", "skills": ["Python", "Django"]},
+    "experience": [
+        {"title": "Engineer", "description": ["a", "b"]},
+        {"title": "Intern", "description": ["c"]},
+    ],
+    "a/b": {"~key": 1},
+}
+
+
+class ApplyPatchTest(SimpleTestCase):
+    def test_add_append_and_insert(self):
+        result = apply_patch(
+            DOC,
+            [
+                {"op": "add", "path": "/user_info/skills/-", "value": "AWS"},
+                {"op": "add", "path": "/experience/0/description/0", "value": "new"},
+                {"op": "add", "path": "/user_info/email", "value": "j@x.com"},
+            ],
+        )
+        self.assertEqual(result["user_info"]["skills"], ["Python", "Django", "AWS"])
+        self.assertEqual(result["experience"][0]["description"], ["new", "a", "b"])
+        self.assertEqual(result["user_info"]["email"], "j@x.com")
+
+    def test_remove_replace_move_copy(self):
+        result = apply_patch(
+            DOC,
+            [
+                {"op": "remove", "path": "/experience/1"},
+                {"op": "replace", "path": "/experience/0/title", "value": "Lead"},
+                {"op": "copy", "from": "/user_info/full_name", "path": "/title"},
+                {"op": "move", "from": "/user_info/skills/0", "path": "/user_info/skills/-"},
+            ],
+        )
+        self.assertEqual(len(result["experience"]), 1)
+        self.assertEqual(result["experience"][0]["title"], "Lead")
+        self.assertEqual(result["title"], "Jane")
+        self.assertEqual(result["user_info"]["skills"], ["Django", "Python"])
+
+    def test_escaped_pointer_tokens(self):
+        result = apply_patch(DOC, [{"op": "replace", "path": "/a~1b/~0key", "value": 2}])
+        self.assertEqual(result["a/b"]["~key"], 2)
+
+    def test_original_document_is_not_mutated(self):
+        apply_patch(DOC, [{"op": "remove", "path": "/user_info/skills/0"}])
+        self.assertEqual(DOC["user_info"]["skills"], ["Python", "Django"])
+
+    def test_invalid_operations_raise(self):
+        bad_patches = [
+            [{"op": "remove", "path": "/experience/5"}],
+            [{"op": "replace", "path": "/missing", "value": 1}],
+            [{"op": "add", "path": "no-slash", "value": 1}],
+            [{"op": "add", "path": "/user_info/skills/-"}],
+            [{"op": "frobnicate", "path": "/user_info"}],
+            [{"op": "test", "path": "/user_info/full_name", "value": "John"}],
+            {"op": "add"},
+        ]
+        for patch in bad_patches:
+            with self.subTest(patch=patch):
+                with self.assertRaises(JsonPatchError):
+                    apply_patch(DOC, patch)
@@ -0,0 +1,48 @@
+"""
+Tests for lenient parsing of LLM JSON output.
+"""
+
+from django.test import SimpleTestCase
+
+from resume.services.json_repair import loads_lenient
+
+
+class LoadsLenientTest(SimpleTestCase):
+    def test_valid_json_is_not_marked_truncated(self):
+        self.assertEqual(loads_lenient('{"a": [1, 2]}'), ({"a": [1, 2]}, None))
+
+    def test_code_fence_and_surrounding_text(self):
+        text = 'Sure!\n```json\n{"a": {"b": "x"}}\n```\nLet me know.'
+        self.assertEqual(loads_lenient(text).value, {"a": {"b": "x"}})
+
+    def test_trailing_commas_and_python_literals(self):
+        value, truncated_at = loads_lenient(
+            '{"a": [1, 2,], "b": True, "c": None,} trailing remark'
+        )
+        self.assertEqual(value, {"a": [1, 2], "b": True, "c": None})
+        self.assertIsNone(truncated_at)
+
+    def test_truncated_string_value_is_closed(self):
+        value, truncated_at = loads_lenient(
+            '{"resume": {"skills": ["Go"], "experience": [{"title": "Eng"}, {"title": "Le'
+        )
+        self.assertEqual(
+            value,
+            {
+                "resume": {
+                    "skills": ["Go"],
+                    "experience": [{"title": "Eng"}, {"title": "Le"}],
+                }
+            },
+        )
+        self.assertEqual(truncated_at, ("resume", "experience", 1, "title"))
+
+    def test_unfinished_key_and_literal_are_dropped(self):
+        self.assertEqual(loads_lenient('{"a": 1, "b": {"c": tr').value, {"a": 1, "b": {}})
+        self.assertEqual(loads_lenient('{"a": 1, "bc').value, {"a": 1})
+        self.assertEqual(loads_lenient('{"a": 1, "b":').truncated_at, ())
+
+    def test_unrecoverable_text_raises(self):
+        for text in ("not json at all", '{"a": 1 "b": 2}', None):
+            with self.assertRaises(ValueError):
+                loads_lenient(text)
@@ -0,0 +1,136 @@
+"""
+Tests for LLM usage metering — buffered writes, daily aggregates and reports.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.conf import settings
+
+from resume.models import LLMUsageDaily, LLMUsageRecord
+from resume.openai_engine import send_openai_message
+from resume.services.llm_metering import (
+    UsageMeter,
+    estimate_cost,
+    metering_scope,
+    usage_report,
+)
+
+User = get_user_model()
+
+
+def _usage(prompt=100, completion=20, cached=0):
+    return SimpleNamespace(
+        prompt_tokens=prompt,
+        completion_tokens=completion,
+        prompt_tokens_details=SimpleNamespace(cached_tokens=cached),
+    )
+
+
+class UsageMeterTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="metered", password="pass12345")
+        self.meter = UsageMeter()
+
+    def test_records_are_buffered_until_flush(self):
+        self.meter.record("extract_resume_data", "gpt-4o-mini", 1200, _usage())
+        self.assertEqual(LLMUsageRecord.objects.count(), 0)
+
+        self.assertEqual(self.meter.flush(), 1)
+        self.assertEqual(LLMUsageRecord.objects.count(), 1)
+
+    def test_flush_when_batch_size_reached(self):
+        cfg = {**settings.LLM_METERING, "batch_size": 2}
+        with override_settings(LLM_METERING=cfg):
+            self.meter.record("a", "gpt-4o-mini", 10, _usage())
+            self.meter.record("a", "gpt-4o-mini", 10, _usage())
+        self.assertEqual(LLMUsageRecord.objects.count(), 2)
+
+    def test_scope_attributes_user_and_intent(self):
+        with metering_scope(user=self.user, intent="agent:modify_resume"):
+            self.meter.record("_exec_modify_resume", "gpt-4o-mini", 900, _usage(cached=64))
+        self.meter.flush()
+
+        record = LLMUsageRecord.objects.get()
+        self.assertEqual(record.user, self.user)
+        self.assertEqual(record.intent, "agent:modify_resume")
+        self.assertEqual(record.call_site, "_exec_modify_resume")
+        self.assertEqual(record.cached_tokens, 64)
+
+    def test_daily_aggregate_accumulates_across_flushes(self):
+        with metering_scope(user=self.user, intent="upload_cv"):
+            self.meter.record("extract_resume_data", "gpt-4o-mini", 1000, _usage(100, 10))
+            self.meter.flush()
+            self.meter.record("extract_resume_data", "gpt-4o-mini", 3000, _usage(200, 30), success=False)
+            self.meter.flush()
+
+        daily = LLMUsageDaily.objects.get()
+        self.assertEqual(daily.calls, 2)
+        self.assertEqual(daily.errors, 1)
+        self.assertEqual(daily.prompt_tokens, 300)
+        self.assertEqual(daily.completion_tokens, 40)
+        self.assertEqual(daily.avg_latency_ms, 2000)
+
+    def test_report_includes_cost_and_percentiles(self):
+        with metering_scope(intent="enhance_all"):
+            for latency in (100, 200, 300, 400, 1000):
+                self.meter.record("enhance_resume_experience", "gpt-4o-mini", latency, _usage())
+        self.meter.flush()
+
+        row = usage_report(days=1, group_by="intent")[0]
+        self.assertEqual(row["key"], "enhance_all")
+        self.assertEqual(row["calls"], 5)
+        self.assertEqual(row["p50_ms"], 300)
+        self.assertEqual(row["p99_ms"], 1000)
+        self.assertGreater(row["cost_usd"], 0)
+
+    def test_report_reads_a_bounded_number_of_latency_rows(self):
+        with metering_scope(intent="enhance_all"):
+            for latency in (100, 200, 300, 400, 1000):
+                self.meter.record("enhance_all", "gpt-4o-mini", latency, _usage())
+        self.meter.flush()
+
+        with self.settings(
+            LLM_METERING={**settings.LLM_METERING, "report_max_latency_rows": 2}
+        ):
+            row = usage_report(days=1, group_by="intent")[0]
+        self.assertEqual(row["calls"], 5)
+        self.assertEqual((row["p50_ms"], row["p99_ms"]), (400, 1000))
+
+    def test_estimate_cost_discounts_cached_tokens(self):
+        full = estimate_cost("gpt-4o-mini", 1_000_000, 0, 0)
+        cached = estimate_cost("gpt-4o-mini", 1_000_000, 0, 1_000_000)
+        self.assertAlmostEqual(full, 0.15)
+        self.assertAlmostEqual(cached, 0.075)
+        self.assertEqual(estimate_cost("unknown-model", 1000, 1000), 0.0)
+
+
+class SendOpenAIMessageMeteringTest(TestCase):
+    @patch("resume.openai_engine.usage_meter")
+    @patch("resume.openai_engine.client")
+    def test_successful_call_is_recorded_with_call_site(self, mock_client, mock_meter):
+        response = MagicMock()
+        response.usage = _usage()
+        response.choices[0].message.content = "ok"
+        mock_client.chat.completions.create.return_value = response
+
+        self.assertEqual(send_openai_message("hi"), "ok")
+
+        kwargs = mock_meter.record.call_args.kwargs
+        self.assertEqual(kwargs["call_site"], "test_successful_call_is_recorded_with_call_site")
+        self.assertTrue(kwargs["success"])
+        self.assertIs(kwargs["usage"], response.usage)
+
+    @patch("resume.openai_engine.usage_meter")
+    @patch("resume.openai_engine.client")
+    def test_failed_call_is_recorded_as_error(self, mock_client, mock_meter):
+        mock_client.chat.completions.create.side_effect = RuntimeError("down")
+
+        result = send_openai_message("hi", call_site="custom")
+
+        self.assertTrue(result.startswith("Error:"))
+        kwargs = mock_meter.record.call_args.kwargs
+        self.assertEqual(kwargs["call_site"], "custom")
+        self.assertFalse(kwargs["success"])
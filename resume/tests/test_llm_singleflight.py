@@ -0,0 +1,160 @@
+"""
+Tests for single-flight coalescing of identical concurrent LLM calls.
+"""
+
+import threading
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from resume.models import LLMInflightCall
+from resume.openai_engine import send_openai_message
+from resume.services.llm_metering import metering_scope
+from resume.services.llm_singleflight import request_fingerprint, track_shared_calls
+
+LOCAL_ONLY = {**settings.LLM_SINGLE_FLIGHT, "shared": False}
+
+
+def _response(content):
+    response = MagicMock()
+    response.choices[0].message.content = content
+    return response
+
+
+def _fingerprint(message, model="gpt-4o-mini", user=None):
+    return request_fingerprint(
+        user=user,
+        task=None,
+        models=[model],
+        meta_prompt="You are a helpful assistant.",
+        user_message=message,
+        is_json=False,
+        temperature=None,
+        max_tokens=None,
+    )
+
+
+@override_settings(LLM_SINGLE_FLIGHT=LOCAL_ONLY)
+@patch("resume.openai_engine.usage_meter", MagicMock())
+@patch("resume.openai_engine.client")
+class InProcessSingleFlightTest(SimpleTestCase):
+    def _run_concurrent_callers(self, mock_client, first_result, callers=3):
+        started = threading.Event()
+        release = threading.Event()
+
+        def create(**kwargs):
+            if not started.is_set():
+                started.set()
+                release.wait(5)
+                return first_result()
+            return _response("own call")
+
+        mock_client.chat.completions.create.side_effect = create
+        results = [None] * callers
+        counters = [None] * callers
+
+        def call(index):
+            with track_shared_calls() as shared:
+                results[index] = send_openai_message("same prompt")
+            counters[index] = shared["shared"]
+
+        threads = [threading.Thread(target=call, args=(0,))]
+        threads[0].start()
+        started.wait(5)
+        for index in range(1, callers):
+            threads.append(threading.Thread(target=call, args=(index,)))
+            threads[-1].start()
+        # Give the followers time to start waiting on the leader.
+        threading.Event().wait(0.2)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+        return results, counters
+
+    def test_concurrent_identical_calls_share_one_request(self, mock_client):
+        results, counters = self._run_concurrent_callers(
+            mock_client, lambda: _response("enhanced")
+        )
+
+        self.assertEqual(results, ["enhanced"] * 3)
+        self.assertEqual(mock_client.chat.completions.create.call_count, 1)
+        self.assertEqual(counters, [0, 1, 1])
+
+    def test_error_results_are_not_shared(self, mock_client):
+        def fail():
+            raise RuntimeError("down")
+
+        results, counters = self._run_concurrent_callers(mock_client, fail)
+
+        self.assertTrue(results[0].startswith("Error:"))
+        self.assertEqual(results[1:], ["own call", "own call"])
+        self.assertEqual(counters, [0, 0, 0])
+
+    def test_different_requests_are_not_coalesced(self, mock_client):
+        self.assertNotEqual(_fingerprint("a"), _fingerprint("b"))
+        self.assertNotEqual(_fingerprint("a"), _fingerprint("a", model="gpt-4o"))
+
+
+@patch("resume.openai_engine.usage_meter", MagicMock())
+@patch("resume.openai_engine.client")
+class SharedLockTableTest(TestCase):
+    def test_result_from_other_worker_is_reused(self, mock_client):
+        LLMInflightCall.objects.create(
+            fingerprint=_fingerprint("same prompt"),
+            result="from another worker",
+            expires_at=timezone.now() + timedelta(seconds=10),
+        )
+
+        with track_shared_calls() as shared:
+            result = send_openai_message("same prompt")
+
+        self.assertEqual(result, "from another worker")
+        self.assertEqual(shared["shared"], 1)
+        mock_client.chat.completions.create.assert_not_called()
+
+    def test_results_are_not_shared_between_users(self, mock_client):
+        other = User.objects.create_user(username="other", password="pw")
+        me = User.objects.create_user(username="me", password="pw")
+        LLMInflightCall.objects.create(
+            fingerprint=_fingerprint("same prompt", user=other.pk),
+            result="from another user",
+            expires_at=timezone.now() + timedelta(seconds=10),
+        )
+        mock_client.chat.completions.create.return_value = _response("own call")
+
+        with metering_scope(user=me), track_shared_calls() as shared:
+            result = send_openai_message("same prompt")
+
+        self.assertEqual(result, "own call")
+        self.assertEqual(shared["shared"], 0)
+
+    def test_leader_publishes_result_for_late_duplicates(self, mock_client):
+        mock_client.chat.completions.create.return_value = _response("enhanced")
+
+        self.assertEqual(send_openai_message("same prompt"), "enhanced")
+        self.assertEqual(send_openai_message("same prompt"), "enhanced")
+
+        self.assertEqual(mock_client.chat.completions.create.call_count, 1)
+        row = LLMInflightCall.objects.get()
+        self.assertEqual(row.result, "enhanced")
+
+    def test_failed_call_releases_lock(self, mock_client):
+        mock_client.chat.completions.create.side_effect = RuntimeError("down")
+
+        send_openai_message("same prompt")
+
+        self.assertFalse(LLMInflightCall.objects.exists())
+
+    def test_expired_lock_is_taken_over(self, mock_client):
+        LLMInflightCall.objects.create(
+            fingerprint=_fingerprint("same prompt"),
+            expires_at=timezone.now() - timedelta(seconds=1),
+        )
+        mock_client.chat.completions.create.return_value = _response("fresh")
+
+        self.assertEqual(send_openai_message("same prompt"), "fresh")
+        self.assertEqual(LLMInflightCall.objects.get().result, "fresh")
@@ -0,0 +1,55 @@
+"""
+Tests for targeting resume edits at the sections they touch.
+"""
+
+from django.test import SimpleTestCase
+
+from resume.services.modify_scope import merge_sections, scoped_content, target_sections
+
+CONTENT = {
+    "language": "English",
+    "user_info": {"full_name": "Jane Doe", "skills": ["Python"]},
+    "experience": [{"title": "Engineer", "company": "Acme"}],
+    "education": [{"school": "MIT"}],
+    "projects_and_publications": [],
+}
+
+
+class TargetSectionsTest(SimpleTestCase):
+    def test_instructions_map_to_sections(self):
+        cases = {
+            "Add Kubernetes to my skills": ["user_info"],
+            "Yeteneklerime Kubernetes ekle": ["user_info"],
+            "Change my phone number": ["user_info"],
+            "Son deneyimimi kaldır": ["experience"],
+            "add my master's degree from ETH": ["education"],
+            "Add a project called ResuStack": ["projects_and_publications"],
+            "update my job title and add Go to skills": ["user_info", "experience"],
+            "Optimize it for a DevOps Engineer role": ["user_info", "experience"],
+        }
+        for instruction, keys in cases.items():
+            with self.subTest(instruction=instruction):
+                self.assertEqual(target_sections(instruction, CONTENT), keys)
+
+    def test_broad_or_unknown_instructions_use_whole_resume(self):
+        for instruction in [
+            "Translate everything to Turkish",
+            "fix typos in the whole resume",
+            "make it better",
+            "",
+        ]:
+            with self.subTest(instruction=instruction):
+                self.assertIsNone(target_sections(instruction, CONTENT))
+
+    def test_scope_and_merge(self):
+        scoped = scoped_content(CONTENT, ["user_info"])
+        self.assertEqual(scoped, {"user_info": CONTENT["user_info"]})
+
+        merged = merge_sections(
+            CONTENT,
+            {"user_info": {"full_name": "Jane"}, "education": []},
+            ["user_info"],
+        )
+        self.assertEqual(merged["user_info"], {"full_name": "Jane"})
+        # Sections outside the scope are never replaced.
+        self.assertEqual(merged["education"], CONTENT["education"])
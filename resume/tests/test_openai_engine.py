@@ -0,0 +1,145 @@
+"""
+Tests for openai_engine task routing and the fast-model-first cascade.
+
+The OpenAI client is mocked via @patch('resume.openai_engine.client').
+"""
+
+import json
+from unittest.mock import MagicMock, patch
+
+from django.conf import settings
+from django.test import SimpleTestCase, override_settings
+
+from resume.openai_engine import (
+    extract_resume_data,
+    run_concurrently,
+    send_openai_message,
+)
+
+POLICIES = {
+    "default": {"models": ["gpt-4o-mini"], "max_tokens": None},
+    "cascade_task": {"models": ["fast-model", "strong-model"], "max_tokens": 123},
+}
+
+
+def _response(content):
+    response = MagicMock()
+    response.choices[0].message.content = content
+    return response
+
+
+@override_settings(
+    LLM_TASK_POLICIES=POLICIES,
+    LLM_SINGLE_FLIGHT={**settings.LLM_SINGLE_FLIGHT, "shared": False},
+)
+@patch("resume.openai_engine.usage_meter", MagicMock())
+@patch("resume.openai_engine.client")
+class ModelRouterTest(SimpleTestCase):
+    def _models_called(self, mock_client):
+        return [c.kwargs["model"] for c in mock_client.chat.completions.create.call_args_list]
+
+    def test_policy_sets_model_and_token_budget(self, mock_client):
+        mock_client.chat.completions.create.return_value = _response('{"ok": true}')
+
+        result = send_openai_message("hi", task="cascade_task", is_json=True)
+
+        self.assertEqual(result, '{"ok": true}')
+        kwargs = mock_client.chat.completions.create.call_args.kwargs
+        self.assertEqual(kwargs["model"], "fast-model")
+        self.assertEqual(kwargs["max_tokens"], 123)
+
+    def test_invalid_json_escalates_to_stronger_model(self, mock_client):
+        mock_client.chat.completions.create.side_effect = [
+            _response("not json"),
+            _response('{"ok": true}'),
+        ]
+
+        with self.assertLogs("resume.openai_engine", level="WARNING") as logs:
+            result = send_openai_message("hi", task="cascade_task", is_json=True)
+
+        self.assertEqual(result, '{"ok": true}')
+        self.assertEqual(self._models_called(mock_client), ["fast-model", "strong-model"])
+        self.assertIn("escalating fast-model -> strong-model", logs.output[0])
+
+    def test_custom_validator_controls_escalation(self, mock_client):
+        mock_client.chat.completions.create.side_effect = [
+            _response('{"intent": "bogus"}'),
+            _response('{"intent": "help"}'),
+        ]
+
+        result = send_openai_message(
+            "hi",
+            task="cascade_task",
+            is_json=True,
+            validate=lambda r: "help" in r,
+        )
+
+        self.assertEqual(result, '{"intent": "help"}')
+
+    def test_last_model_result_returned_when_all_fail(self, mock_client):
+        mock_client.chat.completions.create.return_value = _response("still not json")
+
+        result = send_openai_message("hi", task="cascade_task", is_json=True)
+
+        self.assertEqual(result, "still not json")
+        self.assertEqual(mock_client.chat.completions.create.call_count, 2)
+
+    def test_api_error_does_not_escalate(self, mock_client):
+        mock_client.chat.completions.create.side_effect = RuntimeError("down")
+
+        result = send_openai_message("hi", task="cascade_task", is_json=True)
+
+        self.assertTrue(result.startswith("Error:"))
+        self.assertEqual(mock_client.chat.completions.create.call_count, 1)
+
+    def test_explicit_model_disables_cascade(self, mock_client):
+        mock_client.chat.completions.create.return_value = _response("not json")
+
+        send_openai_message("hi", model="gpt-4o", task="cascade_task", is_json=True)
+
+        self.assertEqual(self._models_called(mock_client), ["gpt-4o"])
+
+    def test_unknown_task_uses_default_policy(self, mock_client):
+        mock_client.chat.completions.create.return_value = _response("plain text")
+
+        send_openai_message("hi", task="no_such_task")
+
+        kwargs = mock_client.chat.completions.create.call_args.kwargs
+        self.assertEqual(kwargs["model"], "gpt-4o-mini")
+        self.assertNotIn("max_tokens", kwargs)
+
+
+@override_settings(LLM_SINGLE_FLIGHT={**settings.LLM_SINGLE_FLIGHT, "shared": False})
+@patch("resume.openai_engine.usage_meter", MagicMock())
+@patch("resume.openai_engine.client")
+class ExtractionEscalationTest(SimpleTestCase):
+    EMPTY_RESULT = '{"user_info": {"full_name": ""}, "experience": []}'
+
+    def test_blank_pdf_text_is_not_escalated(self, mock_client):
+        mock_client.chat.completions.create.return_value = _response(self.EMPTY_RESULT)
+
+        result = extract_resume_data("  Page 1 \n\n ")
+
+        self.assertEqual(mock_client.chat.completions.create.call_count, 1)
+        self.assertTrue(json.loads(result)["parse_error"])
+
+    def test_readable_text_without_resume_data_is_escalated(self, mock_client):
+        mock_client.chat.completions.create.return_value = _response(self.EMPTY_RESULT)
+
+        extract_resume_data("Jane Doe\nSoftware Engineer at Acme, 2020 - 2024\n" * 3)
+
+        self.assertEqual(mock_client.chat.completions.create.call_count, 2)
+
+
+class RunConcurrentlyTest(SimpleTestCase):
+    @patch("resume.openai_engine.connections")
+    def test_pool_threads_close_their_connections(self, mock_connections):
+        results = run_concurrently([lambda: 1, lambda: 2, lambda: 3], max_workers=2)
+
+        self.assertEqual(results, [1, 2, 3])
+        self.assertEqual(mock_connections.close_all.call_count, 3)
+
+    @patch("resume.openai_engine.connections")
+    def test_single_call_keeps_the_callers_connection(self, mock_connections):
+        self.assertEqual(run_concurrently([lambda: 1]), [1])
+        mock_connections.close_all.assert_not_called()
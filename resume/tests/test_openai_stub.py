@@ -0,0 +1,175 @@
+"""
+Tests for the local OpenAI-compatible stub server.
+
+The server runs on an ephemeral port and is exercised with the real OpenAI
+client, the same way openai_engine talks to it via OPENAI_BASE_URL.
+"""
+
+import argparse
+import json
+import shutil
+import tempfile
+import threading
+
+import openai
+from django.test import SimpleTestCase
+from openai import OpenAI
+
+from resume.services.openai_stub import (
+    LatencyProfile,
+    StubState,
+    add_stub_arguments,
+    build_completion,
+    generate_content,
+    make_server,
+    request_fingerprint,
+    state_from_options,
+)
+
+
+class OpenAIStubServerTest(SimpleTestCase):
+    def _start(self, **state_kwargs):
+        state = StubState(**state_kwargs)
+        server = make_server("127.0.0.1", 0, state)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        client = OpenAI(
+            api_key="stub",
+            base_url=f"http://127.0.0.1:{server.server_address[1]}/v1",
+            max_retries=0,
+        )
+        return state, client
+
+    def _chat(self, client, system, user="hello", **kwargs):
+        return client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": system},
+                {"role": "user", "content": user},
+            ],
+            **kwargs,
+        )
+
+    def test_generates_schema_valid_extraction_json(self):
+        state, client = self._start()
+        response = self._chat(
+            client,
+            "Act as a resume parser. I will provide you with raw text",
+            response_format={"type": "json_object"},
+        )
+        parsed = json.loads(response.choices[0].message.content)
+        self.assertIn("full_name", parsed["user_info"])
+        self.assertIsInstance(parsed["experience"][0]["description"], list)
+        self.assertGreater(response.usage.prompt_tokens, 0)
+        self.assertEqual(state.stats["generated"], 1)
+
+    def test_generates_classification_json(self):
+        _, client = self._start()
+        response = self._chat(client, "AVAILABLE TOOLS:\n[]")
+        parsed = json.loads(response.choices[0].message.content)
+        self.assertEqual(parsed["intent"], "help")
+
+    def test_full_modify_echoes_the_sections_shown(self):
+        sections = {"experience": [{"title": "Engineer", "description": ["x"]}]}
+        system = (
+            "CURRENT RESUME SECTIONS (experience; the rest is unchanged):\n"
+            f"{json.dumps(sections)}\n\nReturn the COMPLETE modified JSON "
+            'of the sections shown: {"modified_resume": {...}}'
+        )
+        content = generate_content(
+            {"messages": [{"role": "system", "content": system}]}
+        )
+        self.assertEqual(json.loads(content)["modified_resume"], sections)
+
+    def test_generates_analysis_suggestions(self):
+        system = (
+            "You are a professional resume reviewer. The resume below has already"
+            ' been scored.\n{"top_suggestions": ["..."], "response_message": "..."}'
+        )
+        content = generate_content(
+            {"messages": [{"role": "system", "content": system}]}
+        )
+        self.assertTrue(json.loads(content)["top_suggestions"])
+
+    def test_generates_comparison_narrative(self):
+        system = (
+            "Summarize how two resumes differ, given their structural diff.\n"
+            '{"comparison_summary": "...", "recommendation": "..."}'
+        )
+        content = generate_content(
+            {"messages": [{"role": "system", "content": system}]}
+        )
+        self.assertEqual(
+            set(json.loads(content)), {"comparison_summary", "recommendation"}
+        )
+
+    def test_translation_echoes_the_keyed_batch(self):
+        batch = {"0": "Backend Engineer", "1": "Built payment APIs"}
+        content = generate_content(
+            {
+                "messages": [
+                    {"role": "system", "content": "You are a resume translator."},
+                    {"role": "user", "content": json.dumps(batch)},
+                ]
+            }
+        )
+        self.assertEqual(json.loads(content), batch)
+
+    def test_replays_recording_by_request_hash(self):
+        recordings = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, recordings)
+        body = {
+            "model": "gpt-4o-mini",
+            "messages": [
+                {"role": "system", "content": "sys"},
+                {"role": "user", "content": "hello"},
+            ],
+        }
+        recorded = build_completion(body, "recorded answer")
+        with open(f"{recordings}/{request_fingerprint(body)}.json", "w") as f:
+            json.dump({"request": body, "response": recorded}, f)
+
+        state, client = self._start(mode="replay", recordings_dir=recordings)
+        response = self._chat(client, "sys", "hello")
+        self.assertEqual(response.choices[0].message.content, "recorded answer")
+        self.assertEqual(state.stats["replayed"], 1)
+
+        self._chat(client, "sys", "something else")
+        self.assertEqual(state.stats["misses"], 1)
+
+    def test_error_injection(self):
+        state, client = self._start(error_rate=1.0, error_codes=(500,))
+        with self.assertRaises(openai.InternalServerError):
+            self._chat(client, "sys")
+        self.assertEqual(state.stats["injected_errors"], 1)
+
+
+class LatencyProfileTest(SimpleTestCase):
+    def test_fixed_profile_adds_per_token_time(self):
+        profile = LatencyProfile("fixed:100", ms_per_output_token=2)
+        self.assertEqual(profile.sample_ms(output_tokens=50), 200)
+
+    def test_uniform_profile_stays_in_range(self):
+        profile = LatencyProfile("uniform:10,20")
+        for _ in range(50):
+            self.assertTrue(10 <= profile.sample_ms() <= 20)
+
+    def test_seed_makes_latency_reproducible(self):
+        parser = argparse.ArgumentParser()
+        add_stub_arguments(parser)
+        args = ["--latency", "lognormal:900,0.5", "--seed", "7"]
+        options = vars(parser.parse_args(args))
+
+        runs = [
+            [state_from_options(options).latency.sample_ms() for _ in range(5)]
+            for _ in range(2)
+        ]
+        self.assertEqual(runs[0], runs[1])
+
+    def test_invalid_spec_raises(self):
+        for spec in ("fixed", "gamma:1,2", "normal:1", "uniform:a,b"):
+            with self.subTest(spec=spec):
+                with self.assertRaises(ValueError):
+                    LatencyProfile(spec)
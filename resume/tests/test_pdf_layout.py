@@ -0,0 +1,96 @@
+"""
+Tests for coordinate-aware PDF layout reconstruction.
+"""
+
+import os
+
+from django.conf import settings
+from django.test import SimpleTestCase, override_settings
+from PyPDF2 import PdfReader
+
+from resume.services.import_service import extract_pdf_text
+from resume.services.pdf_layout import reconstruct_page_text
+from resume.tests.test_upload_views import _write_pdf
+
+# A two-column resume whose content stream interleaves the columns row by row,
+# the way many resume builders write them.
+TWO_COLUMN_PAGE = [
+    (72, 740, 18, "JANE DOE"),
+    (72, 720, 10, "jane@example.com  Istanbul, Turkey  Senior backend engineer"),
+    (72, 690, 12, "EXPERIENCE"),
+    (340, 690, 12, "SKILLS"),
+    (72, 674, 10, "Senior Engineer, Acme"),
+    (340, 674, 10, "Python, Django"),
+    (72, 660, 10, "Built billing APIs"),
+    (340, 660, 10, "PostgreSQL"),
+    (72, 640, 12, "EDUCATION"),
+    (340, 640, 12, "LANGUAGES"),
+    (72, 624, 10, "BSc Computer Science"),
+    (340, 624, 10, "English, Turkish"),
+]
+
+SINGLE_COLUMN_PAGE = [
+    (72, 740, 18, "JANE DOE"),
+    (72, 710, 12, "Experience"),
+    (72, 694, 10, "Senior Engineer at Acme Corp, building billing and payments APIs"),
+    (72, 680, 10, "Led a team of five engineers across two product lines"),
+    (72, 660, 12, "Education"),
+    (72, 644, 10, "BSc Computer Science, Middle East Technical University"),
+]
+
+
+class ReconstructPageTextTest(SimpleTestCase):
+    def _page(self, items):
+        path = _write_pdf([items])
+        self.addCleanup(os.unlink, path)
+        return PdfReader(path).pages[0]
+
+    def test_two_columns_are_read_left_then_right(self):
+        text = reconstruct_page_text(self._page(TWO_COLUMN_PAGE))
+        lines = text.splitlines()
+
+        self.assertEqual(lines[0], "JANE DOE")
+        self.assertTrue(lines[1].startswith("jane@example.com"))
+        self.assertEqual(
+            [line for line in lines if line.startswith("## ")],
+            ["## EXPERIENCE", "## EDUCATION", "## SKILLS", "## LANGUAGES"],
+        )
+        # Each section's content stays under its own heading.
+        self.assertEqual(lines[lines.index("## SKILLS") + 1], "Python, Django")
+        self.assertEqual(lines[lines.index("## EDUCATION") + 1], "BSc Computer Science")
+
+    def test_single_column_keeps_line_order_and_marks_headings(self):
+        text = reconstruct_page_text(self._page(SINGLE_COLUMN_PAGE))
+
+        self.assertEqual(
+            text.splitlines(),
+            [
+                "JANE DOE",
+                "## Experience",
+                "Senior Engineer at Acme Corp, building billing and payments APIs",
+                "Led a team of five engineers across two product lines",
+                "## Education",
+                "BSc Computer Science, Middle East Technical University",
+            ],
+        )
+
+    def test_page_without_text_returns_empty_string(self):
+        self.assertEqual(reconstruct_page_text(self._page([])), "")
+
+
+class ExtractPdfTextLayoutTest(SimpleTestCase):
+    def setUp(self):
+        self.path = _write_pdf([TWO_COLUMN_PAGE])
+        self.addCleanup(os.unlink, self.path)
+
+    def test_layout_is_applied_by_default(self):
+        text = extract_pdf_text(self.path).text
+
+        self.assertLess(text.index("BSc Computer Science"), text.index("Python, Django"))
+
+    def test_layout_can_be_disabled(self):
+        cfg = {**settings.PDF_TEXT_EXTRACTION, "layout": False}
+        with override_settings(PDF_TEXT_EXTRACTION=cfg):
+            text = extract_pdf_text(self.path).text
+
+        self.assertNotIn("## ", text)
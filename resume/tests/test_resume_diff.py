@@ -0,0 +1,69 @@
+"""
+Tests for the structural resume diff behind compare_resumes.
+"""
+
+import copy
+
+from django.test import SimpleTestCase
+
+from resume.services.resume_diff import bullet_diff, diff_resumes, render_diff
+
+BASE = {
+    "user_info": {"skills": ["Python", "Django", "Docker"]},
+    "experience": [
+        {
+            "title": "Software Engineer",
+            "company": "Acme Corp",
+            "start_date": "2022-03",
+            "description": ["Developed REST APIs", "Led migration to Docker"],
+        },
+        {"title": "Intern", "company": "Beta", "description": ["Wrote tests"]},
+    ],
+    "education": [{"school": "MIT", "degree": "BSc"}],
+}
+
+
+class DiffResumesTest(SimpleTestCase):
+    def test_paired_and_unpaired_entries(self):
+        other = copy.deepcopy(BASE)
+        other["experience"][0]["title"] = "Senior Software Engineer"
+        other["experience"][0]["description"][1] = "Mentored two engineers"
+        other["experience"][1] = {"title": "Founder", "company": "Gamma"}
+        other["user_info"]["skills"] = ["python", "Django", "Go"]
+
+        diff = diff_resumes(BASE, other)
+
+        experience = diff["experience"]
+        self.assertEqual(experience["common"], 1)
+        self.assertEqual(experience["only_in_1"], ["Intern @ Beta"])
+        self.assertEqual(experience["only_in_2"], ["Founder @ Gamma"])
+        [change] = experience["changed"]
+        self.assertEqual(
+            change["title"], ["Software Engineer", "Senior Software Engineer"]
+        )
+        self.assertEqual(change["bullets"]["only_in_1"], 1)
+        self.assertEqual(change["bullets"]["only_in_2"], 1)
+        self.assertEqual(diff["education"], {
+            "common": 1, "only_in_1": [], "only_in_2": [], "changed": [],
+        })  # fmt: skip
+        skills = diff["skills"]
+        self.assertEqual(skills["common"], ["Django", "Python"])
+        self.assertEqual((skills["only_in_1"], skills["only_in_2"]), (["Docker"], ["Go"]))
+
+    def test_bullet_similarity(self):
+        same = bullet_diff(["Built APIs"], ["Built APIs"])
+        self.assertEqual(same, {"similarity": 1.0, "only_in_1": 0, "only_in_2": 0})
+        reworded = bullet_diff(["Built REST APIs"], ["Built the REST APIs", "New one"])
+        self.assertGreater(reworded["similarity"], 0.5)
+        self.assertEqual((reworded["only_in_1"], reworded["only_in_2"]), (0, 1))
+
+    def test_render(self):
+        other = copy.deepcopy(BASE)
+        other["user_info"]["skills"].append("Go")
+
+        self.assertEqual(
+            render_diff(diff_resumes(BASE, other), "A", "B"),
+            "**Key Differences:**\n- **Skills** (3 in common)\n  - Only in B: Go",
+        )
+        self.assertIn("aynı", render_diff(diff_resumes(BASE, BASE), "A", "A", "tr"))
+        self.assertEqual(diff_resumes({}, None)["experience"]["common"], 0)
@@ -0,0 +1,112 @@
+"""
+Tests for the deterministic resume pre-parser and its use in extraction.
+"""
+
+import json
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from resume.openai_engine import extract_linkedin_resume_data, extract_resume_data
+from resume.services.resume_preparse import (
+    merge_contact_hints,
+    normalize_date,
+    preparse_resume_text,
+)
+
+RAW_RESUME = """Jane Doe
+jane.doe@example.com | +90 (532) 123 45 67 | www.linkedin.com/in/jane-doe-42 | github.com/janedoe
+Experience
+Senior Engineer   Acme Corp    Jan 2020 – Present
+  Built APIs.     See https://github.com/janedoe/project
+Engineer, Beta    03/2017 - 12/2019
+Page 1 of 2
+Education
+BSc Computer Science, METU  2013 - 2017
+Yazılım Mühendisi  Ocak 2015 - Mayıs 2016
+Page 2 of 2"""
+
+
+class PreparseResumeTextTest(SimpleTestCase):
+    def setUp(self):
+        self.result = preparse_resume_text(RAW_RESUME)
+
+    def test_extracts_contact_hints(self):
+        self.assertEqual(
+            self.result.hints,
+            {
+                "email": "jane.doe@example.com",
+                "phone": "+90 (532) 123 45 67",
+                "linkedin": "https://www.linkedin.com/in/jane-doe-42",
+                "github": "https://github.com/janedoe",
+            },
+        )
+
+    def test_compacts_text(self):
+        text = self.result.text
+        self.assertNotIn("Page 1 of 2", text)
+        self.assertNotIn("jane.doe@example.com", text)
+        self.assertNotIn("  ", text)
+        # Project links are not profile URLs and stay in the text.
+        self.assertIn("https://github.com/janedoe/project", text)
+        self.assertLess(len(text), len(RAW_RESUME) * 0.7)
+
+    def test_normalizes_date_ranges_in_place(self):
+        text = self.result.text
+        self.assertIn("Acme Corp 2020-01 to Present", text)
+        self.assertIn("Beta 2017-03 to 2019-12", text)
+        self.assertIn("2015-01 to 2016-05", text)
+        self.assertTrue(self.result.date_ranges[0]["current"])
+
+    def test_year_ranges_are_not_taken_for_phone_numbers(self):
+        result = preparse_resume_text("Worked 2019 - 2021 2021 - 2023 at Acme")
+        self.assertNotIn("phone", result.hints)
+
+    def test_normalize_date_formats(self):
+        cases = {
+            "March 2022": "2022-03",
+            "Sept. 2019": "2019-09",
+            "04/2018": "2018-04",
+            "2021-7": "2021-07",
+            "2020": "2020-01",
+            "Aralık 2023": "2023-12",
+            "Present": None,
+            "13/2020": None,
+        }
+        for value, expected in cases.items():
+            with self.subTest(value=value):
+                self.assertEqual(normalize_date(value), expected)
+
+    def test_merge_overwrites_contact_fields(self):
+        parsed = {"user_info": {"full_name": "Jane", "email": "wrong@x.com", "github": ""}}
+        merged = merge_contact_hints(parsed, self.result.hints)
+        self.assertEqual(merged["user_info"]["email"], "jane.doe@example.com")
+        self.assertEqual(merged["user_info"]["github"], "https://github.com/janedoe")
+        self.assertEqual(merged["user_info"]["full_name"], "Jane")
+
+
+class ExtractionUsesPreparseTest(SimpleTestCase):
+    MODEL_OUTPUT = json.dumps(
+        {"user_info": {"full_name": "Jane Doe", "email": "", "linkedin": "linkedin"}}
+    )
+
+    @patch("resume.openai_engine.send_openai_message")
+    def test_extract_resume_data_sends_hints_and_merges_them(self, mock_send):
+        mock_send.return_value = self.MODEL_OUTPUT
+
+        result = json.loads(extract_resume_data(RAW_RESUME))
+
+        message = mock_send.call_args.kwargs["user_message"]
+        self.assertTrue(message.startswith("PRE-EXTRACTED FIELDS:"))
+        self.assertIn("RESUME TEXT:\nJane Doe", message)
+        self.assertNotIn("Page 1 of 2", message)
+        self.assertEqual(result["user_info"]["email"], "jane.doe@example.com")
+        self.assertEqual(
+            result["user_info"]["linkedin"], "https://www.linkedin.com/in/jane-doe-42"
+        )
+
+    @patch("resume.openai_engine.send_openai_message")
+    def test_api_errors_pass_through_unchanged(self, mock_send):
+        mock_send.return_value = "Error: timeout"
+
+        self.assertEqual(extract_linkedin_resume_data(RAW_RESUME), "Error: timeout")
@@ -0,0 +1,108 @@
+"""
+Tests for the local resume scoring engine behind analyze_resume.
+"""
+
+from django.test import SimpleTestCase
+
+from resume.services.resume_scoring import content_hash, resume_signals, score_resume
+
+STRONG = {
+    "user_info": {
+        "full_name": "Jane Doe",
+        "email": "jane@example.com",
+        "phone": "+1 555 000 0000",
+        "linkedin": "https://linkedin.com/in/janedoe",
+        "skills": ["Python", "Django", "PostgreSQL", "Docker", "AWS", "Redis",
+                   "Celery", "Kubernetes"],
+    },
+    "experience": [
+        {
+            "title": "Senior Engineer",
+            "start_date": "2022-03",
+            "end_date": None,
+            "description": [
+                "Led the migration of 40 Django services to Kubernetes on AWS",
+                "Reduced PostgreSQL query latency by 60% with targeted indexes",
+                "Built a Celery pipeline processing 2M Redis events per day",
+            ],
+        },
+        {
+            "title": "Engineer",
+            "start_date": "2019-01",
+            "end_date": "2022-02",
+            "description": [
+                "Developed Python APIs serving 500 requests per second in Docker",
+                "Automated release checks, cutting deploys from 2 hours to 15 minutes",
+                "Mentored 3 junior engineers through code review and pairing",
+            ],
+        },
+    ],
+    "education": [{"school": "MIT", "degree": "BSc"}],
+}  # fmt: skip
+
+WEAK = {
+    "user_info": {"full_name": "Jo", "email": "not-an-email", "skills": ["Go", "Go"]},
+    "experience": [
+        {
+            "title": "Dev",
+            "start_date": "2021",
+            "end_date": "2019-05",
+            "description": "I did stuff 🚀\nmy tasks",
+        },
+        {"title": "Intern", "start_date": "2022-01", "description": []},
+    ],
+}
+
+
+class ScoreResumeTest(SimpleTestCase):
+    def test_strong_resume_scores_high(self):
+        result = score_resume(STRONG)
+
+        self.assertGreaterEqual(result["overall_score"], 90)
+        self.assertEqual(
+            [c["name"] for c in result["categories"]],
+            [
+                "Content Completeness",
+                "Impact Language",
+                "Formatting & Structure",
+                "Skills Coverage",
+                "ATS Friendliness",
+            ],
+        )
+        self.assertEqual(
+            result["overall_score"], sum(c["score"] for c in result["categories"])
+        )
+
+    def test_weak_resume_gets_specific_advice(self):
+        signals = resume_signals(WEAK)
+        self.assertEqual(signals["action_verbs"][0], 0.0)
+        self.assertEqual(signals["metrics"][1], {"count": 2, "total": 2})
+        self.assertEqual(signals["skills_unique"][0], 0.5)
+        self.assertEqual(signals["date_ranges"][0], 0.5)
+        self.assertEqual(signals["third_person"][0], 0.0)
+        self.assertEqual(signals["plain_text"][0], 0.5)
+        self.assertEqual(signals["email"][0], 0.0)
+        self.assertEqual(signals["order"][0], 1.0)
+
+        result = score_resume(WEAK, lang="tr")
+        self.assertLess(result["overall_score"], 40)
+        self.assertEqual(len(result["top_suggestions"]), 3)
+        self.assertEqual(
+            result["categories"][0]["feedback"],
+            "İletişim bilgilerine şunları ekleyin: phone, linkedin.",
+        )
+
+    def test_turkish_past_tense_counts_as_action(self):
+        content = {
+            "experience": [{"description": ["Ödeme servisini sıfırdan geliştirdim"]}]
+        }
+        self.assertEqual(resume_signals(content)["action_verbs"][0], 1.0)
+
+    def test_empty_content_does_not_fail(self):
+        self.assertEqual(score_resume({})["categories"][0]["score"], 0)
+
+    def test_content_hash_ignores_key_order(self):
+        self.assertEqual(
+            content_hash({"a": 1, "b": 2}), content_hash({"b": 2, "a": 1})
+        )
+        self.assertNotEqual(content_hash({"a": 1}), content_hash({"a": 2}))
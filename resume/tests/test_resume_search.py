@@ -0,0 +1,91 @@
+"""
+Tests for the indexed resume search behind find_resume and the search API.
+"""
+
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+
+from resume.models import Resume
+from resume.services.resume_search import build_search_document, fold, search_resumes
+
+CONTENT = {
+    "user_info": {"full_name": "Ayşe Yılmaz", "skills": ["Python", "Django"]},
+    "experience": [
+        {
+            "company": "Trendyol",
+            "title": "Kıdemli Yazılım Mühendisi",
+            "description": ["Ödeme servisini geliştirdim"],
+        }
+    ],
+    "education": [{"school": "İstanbul Teknik Üniversitesi", "degree": "Lisans"}],
+    "projects_and_publications": [{"name": "Kargo Takip", "description": None}],
+}
+
+
+class SearchDocumentTest(SimpleTestCase):
+    def test_fold_is_accent_and_dotless_i_insensitive(self):
+        self.assertEqual(
+            fold("Kıdemli MÜHENDİS Işık café"), "kidemli muhendis isik cafe"
+        )
+
+    def test_document_covers_searchable_fields(self):
+        document = build_search_document("Backend CV", CONTENT)
+        for expected in (
+            "backend cv",
+            "ayse yilmaz",
+            "django",
+            "trendyol",
+            "kidemli yazilim muhendisi",
+            "odeme servisini",
+            "istanbul teknik universitesi",
+            "kargo takip",
+        ):
+            self.assertIn(expected, document)
+
+    def test_malformed_content_does_not_fail(self):
+        self.assertEqual(
+            build_search_document("CV", {"experience": ["x"], "user_info": None}), "cv"
+        )
+
+
+class SearchResumesTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="ayse", password="pw")
+        self.resume = Resume.objects.create(
+            user=self.user, title="Backend CV", content=CONTENT
+        )
+        self.other = Resume.objects.create(
+            user=self.user,
+            title="Frontend CV",
+            content={"user_info": {"skills": ["React"]}},
+        )
+
+    def test_matches_every_term_accent_insensitively(self):
+        resumes = Resume.objects.filter(user=self.user)
+        self.assertEqual(search_resumes(resumes, "muhendis"), [self.resume])
+        self.assertEqual(search_resumes(resumes, "ISTANBUL python"), [self.resume])
+        self.assertEqual(search_resumes(resumes, "python react"), [])
+        self.assertEqual(search_resumes(resumes, "cv"), [self.other, self.resume])
+        self.assertEqual(search_resumes(resumes, "  ...  "), [])
+
+    def test_save_keeps_the_document_in_sync(self):
+        self.other.content = {"user_info": {"skills": ["Kotlin"]}}
+        self.other.save(update_fields=["content", "updated_at"])
+
+        self.other.refresh_from_db()
+        self.assertIn("kotlin", self.other.search_document)
+        self.assertNotIn("react", self.other.search_document)
+
+    def test_search_endpoint(self):
+        stranger = User.objects.create_user(username="stranger", password="pw")
+        Resume.objects.create(user=stranger, title="Python CV", content={})
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        response = client.get("/api/v1/resumes/search/", {"q": "pyth"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([r["id"] for r in response.json()], [self.resume.id])
+
+        response = client.get("/api/v1/resumes/search/")
+        self.assertEqual(response.status_code, 400)
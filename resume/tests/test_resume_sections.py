@@ -0,0 +1,118 @@
+"""
+Tests for section splitting and section-chunked resume extraction.
+"""
+
+import json
+from unittest.mock import patch
+
+from django.conf import settings
+from django.test import SimpleTestCase, override_settings
+
+from resume.openai_engine import extract_resume_data
+from resume.services.resume_sections import split_resume_sections
+
+LAYOUT_TEXT = """JANE DOE
+Backend engineer based in Istanbul
+## EXPERIENCE
+Senior Engineer, Acme
+## ACME LABS
+Research Engineer
+## Education
+BSc Computer Science
+## PROJECTS
+Billing engine
+## SKILLS
+Python, Django"""
+
+PLAIN_TEXT = """Jane Doe
+Deneyim
+Yazılım Mühendisi, Beta
+Eğitim:
+ODTÜ"""
+
+SECTION_OUTPUTS = {
+    "header": {
+        "language": "English",
+        "user_info": {"full_name": "Jane Doe", "email": "", "skills": ["Python"]},
+    },
+    "experience": {"experience": [{"title": "Senior Engineer", "company": "Acme"}]},
+    "education": {"education": [{"school": "METU"}]},
+    "projects": {"projects_and_publications": [{"name": "Billing engine"}]},
+    "skills": {"skills": ["python", "Django"]},
+}
+
+
+def _fake_section_call(**kwargs):
+    group = kwargs["call_site"].rsplit(".", 1)[-1]
+    return json.dumps(SECTION_OUTPUTS[group])
+
+
+class SplitResumeSectionsTest(SimpleTestCase):
+    def test_groups_layout_headings(self):
+        sections = split_resume_sections(LAYOUT_TEXT)
+
+        self.assertEqual(
+            list(sections), ["header", "experience", "education", "projects", "skills"]
+        )
+        self.assertTrue(sections["header"].startswith("JANE DOE"))
+        # Unknown headings stay in the current section.
+        self.assertIn("## ACME LABS\nResearch Engineer", sections["experience"])
+        self.assertEqual(sections["skills"], "## SKILLS\nPython, Django")
+
+    def test_recognizes_plain_heading_lines(self):
+        sections = split_resume_sections(PLAIN_TEXT)
+
+        self.assertEqual(sections["experience"], "Deneyim\nYazılım Mühendisi, Beta")
+        self.assertEqual(sections["education"], "Eğitim:\nODTÜ")
+
+
+@override_settings(
+    RESUME_CHUNKED_EXTRACTION={
+        **settings.RESUME_CHUNKED_EXTRACTION,
+        "enabled": True,
+        "min_chars": 100,
+    }
+)
+class ChunkedExtractionTest(SimpleTestCase):
+    TEXT = LAYOUT_TEXT + "\njane@example.com\n" + "Built APIs and services.\n" * 5
+
+    @patch("resume.openai_engine.send_openai_message", side_effect=_fake_section_call)
+    def test_sections_are_extracted_separately_and_merged(self, mock_send):
+        result = json.loads(extract_resume_data(self.TEXT))
+
+        tasks = {call.kwargs["task"] for call in mock_send.call_args_list}
+        self.assertEqual(tasks, {"extract_resume_section"})
+        self.assertEqual(mock_send.call_count, 5)
+        self.assertEqual(result["language"], "English")
+        self.assertEqual(result["user_info"]["full_name"], "Jane Doe")
+        self.assertEqual(result["user_info"]["email"], "jane@example.com")
+        self.assertEqual(result["user_info"]["skills"], ["Python", "Django"])
+        self.assertEqual(result["experience"][0]["company"], "Acme")
+        self.assertEqual(result["education"][0]["school"], "METU")
+        self.assertEqual(result["projects_and_publications"][0]["name"], "Billing engine")
+
+    @patch("resume.openai_engine.send_openai_message")
+    def test_failed_section_falls_back_to_single_call(self, mock_send):
+        full = json.dumps({"user_info": {"full_name": "Jane Doe"}, "experience": []})
+
+        def fake(**kwargs):
+            if kwargs["task"] == "extract_resume":
+                return full
+            if kwargs["call_site"].endswith(".education"):
+                return "Error: timeout"
+            return _fake_section_call(**kwargs)
+
+        mock_send.side_effect = fake
+        result = json.loads(extract_resume_data(self.TEXT))
+
+        self.assertEqual(mock_send.call_args.kwargs["task"], "extract_resume")
+        self.assertEqual(result["user_info"]["full_name"], "Jane Doe")
+
+    @patch("resume.openai_engine.send_openai_message")
+    def test_short_resume_uses_single_call(self, mock_send):
+        mock_send.return_value = json.dumps({"user_info": {"full_name": "Jane Doe"}})
+
+        extract_resume_data("Jane Doe\nExperience\nEngineer at Acme")
+
+        mock_send.assert_called_once()
+        self.assertEqual(mock_send.call_args.kwargs["task"], "extract_resume")
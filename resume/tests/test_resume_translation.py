@@ -0,0 +1,155 @@
+"""
+Tests for section-parallel resume translation and the translation memory.
+"""
+
+import json
+import threading
+from unittest.mock import patch
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+
+from resume.models import TranslationMemory
+from resume.services.resume_translation import (
+    collect_strings,
+    source_hash,
+    lookup_memory,
+    translate_content,
+)
+
+User = get_user_model()
+
+CONTENT = {
+    "language": "English",
+    "user_info": {
+        "full_name": "Jane Doe",
+        "email": "jane@example.com",
+        "linkedin": "https://linkedin.com/in/jane",
+        "skills": ["Team leadership", "Python"],
+    },
+    "experience": [
+        {
+            "title": "Software Engineer",
+            "company": "Acme",
+            "start_date": "2022-03",
+            "description": ["Built payment APIs", "Cut costs by 30%"],
+        }
+    ],
+    "education": [{"school": "MIT", "degree": "Bachelor", "end_year": 2020}],
+}
+
+
+def _fake_llm(payload, meta, **kwargs):
+    """Translate by prefixing every string with "TR "."""
+    return json.dumps({k: f"TR {v}" for k, v in json.loads(payload).items()})
+
+
+@override_settings(RESUME_TRANSLATION={**settings.RESUME_TRANSLATION})
+class TranslateContentTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="jane", password="pw")
+
+    def test_collects_only_translatable_strings(self):
+        self.assertEqual(
+            [text for _, text in collect_strings(CONTENT)],
+            [
+                "Team leadership",
+                "Python",
+                "Software Engineer",
+                "Acme",
+                "Built payment APIs",
+                "Cut costs by 30%",
+                "MIT",
+                "Bachelor",
+            ],
+        )
+
+    @patch("resume.services.resume_translation.send_openai_message")
+    def test_sections_are_translated_concurrently(self, mock_llm):
+        # Each section's batch must be in flight at once to pass the barrier.
+        barrier = threading.Barrier(3, timeout=5)
+
+        def fake(payload, meta, **kwargs):
+            barrier.wait()
+            return _fake_llm(payload, meta)
+
+        mock_llm.side_effect = fake
+
+        result = translate_content(CONTENT, "Turkish")
+
+        self.assertEqual(mock_llm.call_count, 3)
+        self.assertEqual(result["language"], "Turkish")
+        self.assertEqual(result["user_info"]["full_name"], "Jane Doe")
+        self.assertEqual(result["user_info"]["email"], "jane@example.com")
+        self.assertEqual(
+            result["user_info"]["skills"], ["TR Team leadership", "TR Python"]
+        )
+        self.assertEqual(result["experience"][0]["start_date"], "2022-03")
+        self.assertEqual(
+            result["experience"][0]["description"],
+            ["TR Built payment APIs", "TR Cut costs by 30%"],
+        )
+        self.assertEqual(result["education"][0]["end_year"], 2020)
+
+    @patch("resume.services.resume_translation.send_openai_message")
+    def test_memory_is_reused(self, mock_llm):
+        mock_llm.side_effect = _fake_llm
+        settings.RESUME_TRANSLATION["memory_max_chars"] = 17
+
+        translate_content(CONTENT, "Turkish", user=self.user)
+        stored = set(TranslationMemory.objects.values_list("source_text", flat=True))
+        self.assertIn("Software Engineer", stored)
+        self.assertNotIn("Built payment APIs", stored)  # Longer than memory_max_chars
+
+        mock_llm.reset_mock()
+        result = translate_content(CONTENT, "Turkish", user=self.user)
+
+        # Only the strings too long for the memory go to the LLM again.
+        [call] = mock_llm.call_args_list
+        self.assertEqual(json.loads(call.args[0]), {"0": "Built payment APIs"})
+        self.assertEqual(result["experience"][0]["title"], "TR Software Engineer")
+
+    @patch("resume.services.resume_translation.send_openai_message")
+    def test_failed_batch_fails_the_translation(self, mock_llm):
+        TranslationMemory.objects.create(
+            user=self.user,
+            source_hash=source_hash("MIT"),
+            target_language="Turkish",
+            source_text="MIT",
+            translated_text="MIT",
+        )
+        mock_llm.return_value = '{"0": "only one"}'
+
+        self.assertIsNone(translate_content(CONTENT, "Turkish", user=self.user))
+        self.assertEqual(TranslationMemory.objects.count(), 1)
+
+    def test_other_users_entries_need_agreement(self):
+        settings.RESUME_TRANSLATION["min_users_to_share"] = 2
+        # One account's answer (e.g. from an injected prompt) is never shared.
+        entries = [("a", "Visit evil.example"), ("b", "Python"), ("c", "Python")]
+        for name, translated in entries:
+            TranslationMemory.objects.create(
+                user=User.objects.create_user(username=name, password="pw"),
+                source_hash=source_hash("Python"),
+                target_language="Turkish",
+                source_text="Python",
+                translated_text=translated,
+            )
+
+        self.assertEqual(
+            lookup_memory(["Python"], "Turkish", self.user), {"Python": "Python"}
+        )
+
+        settings.RESUME_TRANSLATION["min_users_to_share"] = 3
+        self.assertEqual(lookup_memory(["Python"], "Turkish", self.user), {})
+        TranslationMemory.objects.create(
+            user=self.user,
+            source_hash=source_hash("Python"),
+            target_language="Turkish",
+            source_text="Python",
+            translated_text="Piton",
+        )
+        self.assertEqual(
+            lookup_memory(["Python"], "Turkish", self.user), {"Python": "Piton"}
+        )
@@ -0,0 +1,336 @@
+"""
+Tests for PDF upload imports: background jobs, retries and content-hash
+deduplication.
+
+Jobs run inline (IMPORT_JOBS["eager"]). PDF text extraction and the LLM call
+are mocked by patching resume.services.import_jobs.extract_pdf_text and
+resume.services.import_jobs.EXTRACT_FUNCTIONS.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from resume.models import ImportJob, Resume, ResumeImport
+from resume.services.import_service import (
+    PageText,
+    PdfText,
+    _discard_pool,
+    _get_pool,
+    extract_pdf_text,
+    hash_file,
+    parse_extraction_result,
+)
+
+User = get_user_model()
+
+RESUME_TEXT = "Jane Doe - Senior Engineer at Acme. Built APIs and led a team of five."
+EXTRACTED = json.dumps(
+    {"user_info": {"full_name": "Jane Doe"}, "experience": [{"title": "Engineer"}]}
+)
+
+
+def _pdf_text(text):
+    return PdfText(pages=[PageText(0, text, 5)], page_count=1)
+
+
+def _write_pdf(page_texts):
+    """
+    Write a minimal Helvetica PDF and return its path.
+
+    Each page is either one line of text, or a list of (x, y, size, text)
+    items drawn in that order.
+    """
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None]
+    font_id = 3
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    page_ids = []
+    for page in page_texts:
+        items = [(72, 720, 12, page)] if isinstance(page, str) else page
+        stream = " ".join(
+            f"BT /F1 {size} Tf {x} {y} Td ({text}) Tj ET" for x, y, size, text in items
+        ).encode()
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>"
+            % (font_id, content_id)
+        )
+        page_ids.append(len(objects))
+    kids = " ".join(f"{pid} 0 R" for pid in page_ids).encode()
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref,
+    )
+
+    fd, path = tempfile.mkstemp(suffix=".pdf")
+    with os.fdopen(fd, "wb") as f:
+        f.write(out)
+    return path
+
+
+@override_settings(
+    IMPORT_JOBS={**settings.IMPORT_JOBS, "eager": True},
+    MEDIA_ROOT=tempfile.mkdtemp(),
+)
+@patch("resume.services.import_jobs.extract_pdf_text", return_value=_pdf_text(RESUME_TEXT))
+class ImportJobTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="uploader", password="pass12345")
+        self.profile = self.user.profile
+        self.client.force_login(self.user)
+        self.url = reverse("resume:upload_cv")
+        self.extract = MagicMock(return_value=EXTRACTED)
+        patcher = patch.dict(
+            "resume.services.import_jobs.EXTRACT_FUNCTIONS",
+            {ResumeImport.SOURCE_PDF: self.extract},
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _upload(self, content=b"%PDF-1.4 same file"):
+        return self.client.post(
+            self.url, {"cv_file": SimpleUploadedFile("cv.pdf", content)}
+        )
+
+    def _status(self, job_id, since=0):
+        url = reverse("resume:import_job_status", args=[job_id])
+        return json.loads(self.client.get(url, {"since": since}).content)
+
+    def test_upload_returns_job_and_reports_stage_progress(self, mock_text):
+        response = self._upload()
+
+        self.assertEqual(response.status_code, 202)
+        data = json.loads(response.content)
+        self.assertEqual(
+            data["retry_url"], reverse("resume:retry_import_job", args=[data["job_id"]])
+        )
+        status = self._status(data["job_id"])
+        self.assertEqual(status["status"], ImportJob.STATUS_SUCCEEDED)
+        self.assertEqual(status["progress"], 100)
+        self.assertTrue(Resume.objects.filter(pk=status["resume_id"]).exists())
+        self.assertEqual(
+            [(e["stage"], e["event"]) for e in status["events"]],
+            [
+                (stage, event)
+                for stage in ImportJob.STAGES
+                for event in ("started", "completed")
+            ],
+        )
+        self.assertEqual(self._status(data["job_id"], since=status["next_event"])["events"], [])
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.import_count, 1)
+        # The stored PDF is removed once its text is extracted.
+        self.assertFalse(ImportJob.objects.get().upload)
+        self.assertEqual(status["events"][1]["page_timings_ms"], [5])
+
+    def test_failed_llm_stage_is_retried_without_reupload(self, mock_text):
+        self.extract.side_effect = ["Error: timeout", EXTRACTED]
+
+        job_id = json.loads(self._upload().content)["job_id"]
+        status = self._status(job_id)
+        self.assertEqual(status["status"], ImportJob.STATUS_FAILED)
+        self.assertEqual(status["stage"], ImportJob.STAGE_CALL_LLM)
+        self.assertEqual(status["error_code"], 503)
+        self.assertTrue(status["retryable"])
+
+        response = self.client.post(reverse("resume:retry_import_job", args=[job_id]))
+        self.assertEqual(response.status_code, 202)
+
+        status = self._status(job_id)
+        self.assertEqual(status["status"], ImportJob.STATUS_SUCCEEDED)
+        self.assertEqual(status["attempts"], 2)
+        self.assertIn(
+            {"stage": ImportJob.STAGE_EXTRACT_TEXT, "event": "skipped"},
+            [{"stage": e["stage"], "event": e["event"]} for e in status["events"]],
+        )
+        self.assertEqual(mock_text.call_count, 1)
+
+    def test_abandoned_job_is_reported_retryable(self, mock_text):
+        self.extract.side_effect = ["Error: timeout", EXTRACTED]
+        job_id = json.loads(self._upload().content)["job_id"]
+        # A worker restart left the job "running" with nobody working on it.
+        ImportJob.objects.filter(pk=job_id).update(
+            status=ImportJob.STATUS_RUNNING,
+            updated_at=timezone.now() - timedelta(hours=1),
+        )
+
+        status = self._status(job_id)
+        self.assertEqual(status["status"], ImportJob.STATUS_RUNNING)
+        self.assertTrue(status["retryable"])
+
+        response = self.client.post(reverse("resume:retry_import_job", args=[job_id]))
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(self._status(job_id)["status"], ImportJob.STATUS_SUCCEEDED)
+
+    def test_succeeded_job_cannot_be_retried(self, mock_text):
+        job_id = json.loads(self._upload().content)["job_id"]
+
+        response = self.client.post(reverse("resume:retry_import_job", args=[job_id]))
+
+        self.assertEqual(response.status_code, 409)
+
+    def test_short_text_fails_with_validation_error(self, mock_text):
+        mock_text.return_value = _pdf_text("too short")
+
+        job_id = json.loads(self._upload().content)["job_id"]
+
+        status = self._status(job_id)
+        self.assertEqual(status["status"], ImportJob.STATUS_FAILED)
+        self.assertEqual(status["error_code"], 422)
+        self.extract.assert_not_called()
+
+    def test_failed_job_deletes_its_upload(self, mock_text):
+        mock_text.side_effect = RuntimeError("corrupt PDF")
+
+        job_id = json.loads(self._upload().content)["job_id"]
+
+        self.assertEqual(self._status(job_id)["status"], ImportJob.STATUS_FAILED)
+        self.assertFalse(ImportJob.objects.get().upload)
+
+    def test_other_users_cannot_see_job(self, mock_text):
+        job_id = json.loads(self._upload().content)["job_id"]
+        other = User.objects.create_user(username="other", password="pass12345")
+        self.client.force_login(other)
+
+        response = self.client.get(reverse("resume:import_job_status", args=[job_id]))
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_reupload_returns_existing_resume_without_new_job(self, mock_text):
+        job_id = json.loads(self._upload().content)["job_id"]
+        resume_id = self._status(job_id)["resume_id"]
+
+        second = json.loads(self._upload().content)
+
+        self.assertTrue(second["duplicate"])
+        self.assertEqual(second["resume_id"], resume_id)
+        self.assertEqual(ImportJob.objects.count(), 1)
+        self.assertEqual(self.extract.call_count, 1)
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.import_count, 1)
+
+    def test_deleted_resume_is_rebuilt_from_stored_json(self, mock_text):
+        job_id = json.loads(self._upload().content)["job_id"]
+        Resume.objects.filter(pk=self._status(job_id)["resume_id"]).delete()
+
+        second = json.loads(self._upload().content)
+
+        self.assertTrue(second["duplicate"])
+        self.assertEqual(
+            Resume.objects.get(pk=second["resume_id"]).content["user_info"]["full_name"],
+            "Jane Doe",
+        )
+        self.assertEqual(self.extract.call_count, 1)
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.import_count, 1)
+
+    def test_different_files_are_imported_separately(self, mock_text):
+        self._upload(b"%PDF-1.4 first")
+        self._upload(b"%PDF-1.4 second")
+
+        self.assertEqual(self.extract.call_count, 2)
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.import_count, 2)
+
+    def test_overlapping_jobs_each_charge_an_import(self, mock_text):
+        def second_import_meanwhile(*args, **kwargs):
+            # The second file's job runs to completion during the first's LLM call.
+            self.extract.side_effect = None
+            self._upload(b"%PDF-1.4 second")
+            return EXTRACTED
+
+        self.extract.side_effect = second_import_meanwhile
+        self._upload(b"%PDF-1.4 first")
+
+        self.assertEqual(Resume.objects.filter(user=self.user).count(), 2)
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.import_count, 2)
+
+
+class ImportServiceTest(TestCase):
+    def test_hash_file_matches_hashlib(self):
+        fd, path = tempfile.mkstemp()
+        self.addCleanup(os.unlink, path)
+        with os.fdopen(fd, "wb") as f:
+            f.write(b"resume bytes")
+        self.assertEqual(hash_file(path), hashlib.sha256(b"resume bytes").hexdigest())
+
+    def test_parse_extraction_result_strips_code_fences(self):
+        self.assertEqual(parse_extraction_result('```json\n{"a": 1}\n```'), {"a": 1})
+
+
+class ExtractPdfTextTest(TestCase):
+    def _pdf(self, pages):
+        path = _write_pdf([f"Page {n} text" for n in range(pages)])
+        self.addCleanup(os.unlink, path)
+        return path
+
+    def test_short_pdf_is_extracted_inline_in_order(self):
+        result = extract_pdf_text(self._pdf(2))
+
+        self.assertEqual([p.index for p in result.pages], [0, 1])
+        self.assertIn("Page 0 text", result.text)
+        self.assertLess(result.text.index("Page 0"), result.text.index("Page 1"))
+        self.assertEqual(len(result.page_timings_ms), 2)
+
+    def test_pages_run_on_process_pool_and_keep_order(self):
+        cfg = {**settings.PDF_TEXT_EXTRACTION, "parallel_min_pages": 2, "max_workers": 2}
+        with override_settings(PDF_TEXT_EXTRACTION=cfg):
+            result = extract_pdf_text(self._pdf(5))
+
+        self.assertFalse(result.timed_out)
+        self.assertEqual([p.index for p in result.pages], [0, 1, 2, 3, 4])
+        self.assertEqual(
+            [p.text.strip() for p in result.pages],
+            [f"Page {n} text" for n in range(5)],
+        )
+
+    def test_page_cap_truncates(self):
+        result = extract_pdf_text(self._pdf(3), max_pages=2)
+
+        self.assertTrue(result.truncated)
+        self.assertEqual(result.page_count, 3)
+        self.assertEqual(len(result.pages), 2)
+
+    def test_discarded_pool_terminates_its_workers(self):
+        pool = _get_pool()
+        pool.submit(time.sleep, 60)
+        processes = list(pool._processes.values())
+
+        _discard_pool(pool)
+
+        for process in processes:
+            process.join(10)
+            self.assertFalse(process.is_alive())
+        self.assertIsNot(_get_pool(), pool)
+
+    def test_exhausted_budget_returns_partial_result(self):
+        result = extract_pdf_text(self._pdf(3), time_budget=0)
+
+        self.assertTrue(result.timed_out)
+        self.assertEqual(result.pages, [])
+
@@ -14,9 +14,21 @@ urlpatterns = [
     path("test-faangpath/", views.test_faangpath_template, name="test_faangpath"),
     path("enhance-project", views.enhance_project, name="enhance_project"),
     path("enhance-experience", views.enhance_experience, name="enhance_experience"),
+    path("enhance-all", views.enhance_all, name="enhance_all"),
     path("preview-resume-form", views.preview_resume_form, name="preview_resume_form"),
     path("upload-cv/", views.upload_cv, name="upload_cv"),
     path("upload-linkedin/", views.upload_linkedin_cv, name="upload_linkedin_cv"),
+    path("bulk-import/", views.bulk_import, name="bulk_import"),
+    path(
+        "import-jobs/<int:pk>/",
+        views.import_job_status,
+        name="import_job_status",
+    ),
+    path(
+        "import-jobs/<int:pk>/retry/",
+        views.retry_import_job,
+        name="retry_import_job",
+    ),
     path(
         "resume/<int:pk>/download/",
         views.download_resume_pdf,
@@ -28,6 +40,16 @@ urlpatterns = [
         name="preview_saved_resume",
     ),
     path("agent/chat/", views.agent_chat, name="agent_chat"),
+    path(
+        "agent/analysis/<int:pk>/suggestions/",
+        views.analysis_suggestions,
+        name="analysis_suggestions",
+    ),
+    path(
+        "agent/compare/<int:pk1>/<int:pk2>/summary/",
+        views.compare_summary,
+        name="compare_summary",
+    ),
     path("agent/toggle-mode/", views.toggle_agent_mode, name="toggle_agent_mode"),
     path("agent/toggle-language/", views.toggle_ui_language, name="toggle_ui_language"),
 ]
@@ -2,32 +2,45 @@ import json
 import logging
 import re
 from datetime import date, datetime
+from functools import partial
 
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.forms import formset_factory
+from django.core.files import File
 from django.http import HttpResponse, JsonResponse
 from django.shortcuts import redirect, render
+from django.urls import reverse
 from django.views.decorators.clickjacking import xframe_options_sameorigin
 from django.views.decorators.http import require_http_methods
 from django.views.generic import ListView, TemplateView
-from PyPDF2 import PdfReader
 
 from resume.forms import UserInfoForm, EducationForm, ExperienceForm, ProjectForm
 from resume.openai_engine import (
     enhance_resume_experience,
     enhance_project_description,
-    extract_resume_data,
-    extract_linkedin_resume_data,
+    is_error_response,
+    run_concurrently,
 )
+from resume.services.bulk_import import BulkImportError, run_bulk_import
+from resume.services.import_jobs import (
+    TITLE_PREFIXES,
+    enqueue_job,
+    is_retryable,
+    is_stale,
+    job_payload,
+    retry_job,
+)
+from resume.services.import_service import auto_title_from_content, spool_upload
+from resume.services.llm_singleflight import track_shared_calls
 from resume.services.pdf_service import (
     ResumePdfService,
     PdfGenerationError,
     resume_pdf_service,
 )
-from resume.models import Resume
+from resume.models import ImportJob, Resume, ResumeImport
 
 logger = logging.getLogger(__name__)
 
@@ -49,35 +62,6 @@ def _normalize_skills(skills) -> list:
     return []
 
 
-def _auto_title_from_content(content: dict, prefix: str = "") -> str:
-    """Generate a descriptive resume title from parsed content.
-
-    Prefers most recent job title + company (e.g. 'Software Engineer at Google').
-    Falls back to full name or a generic dated label.
-    """
-    experiences = content.get("experience", [])
-    if experiences:
-        exp = experiences[0]
-        job_title = exp.get("title", "").strip()
-        company = exp.get("company", "").strip()
-        if job_title and company:
-            base = f"{job_title} at {company}"
-        elif job_title:
-            base = job_title
-        else:
-            base = ""
-        if base:
-            return f"{prefix} — {base}" if prefix else base
-
-    full_name = content.get("user_info", {}).get("full_name", "").strip()
-    if full_name:
-        label = f"{prefix} — {full_name}" if prefix else full_name
-        return f"{label} · {datetime.now().strftime('%b %Y')}"
-
-    label = prefix or "Resume"
-    return f"{label} · {datetime.now().strftime('%b %Y')}"
-
-
 def landing_page(request):
     """Landing page for anonymous and logged-in users."""
     if request.user.is_authenticated:
@@ -693,7 +677,7 @@ class ResumeFormView(TemplateView):
             # Create a new resume if editing from scratch (no pk)
             resume = Resume.objects.create(
                 user=self.request.user,
-                title=resume_title or _auto_title_from_content(updated_content),
+                title=resume_title or auto_title_from_content(updated_content),
                 content=updated_content,
                 template_selector=template_selector,
             )
@@ -770,6 +754,17 @@ def get_field_value(request, prefix, field):
     return form_index, field_value
 
 
+def _format_enhanced_text(enhanced_text):
+    """
+    Format with double newlines for better readability.
+    If GPT returns single-newline separated bullets, convert to double.
+    """
+    if enhanced_text and "\n" in enhanced_text:
+        lines = [line.strip() for line in enhanced_text.split("\n") if line.strip()]
+        enhanced_text = "\n\n".join(lines)
+    return enhanced_text
+
+
 def enhance_field(request, prefix, field, enhance_function):
     """
     Enhances the specified field based on given enhancement function.
@@ -785,13 +780,7 @@ def enhance_field(request, prefix, field, enhance_function):
     """
     form_index, field_value = get_field_value(request, prefix=prefix, field=field)
     if form_index and field_value:
-        enhanced_text = enhance_function(field_value)
-
-        # Format with double newlines for better readability
-        # If GPT returns single-newline separated bullets, convert to double
-        if enhanced_text and "\n" in enhanced_text:
-            lines = [line.strip() for line in enhanced_text.split("\n") if line.strip()]
-            enhanced_text = "\n\n".join(lines)
+        enhanced_text = _format_enhanced_text(enhance_function(field_value))
 
         description_html = f"""
         <textarea name="{prefix}-{form_index}-{field}" cols="40" rows="10" 
@@ -813,15 +802,17 @@ def enhance_experience(request):
             status=403,
         )
 
-    response = enhance_field(
-        request,
-        prefix="experience",
-        field="description",
-        enhance_function=enhance_resume_experience,
-    )
+    with track_shared_calls() as shared:
+        response = enhance_field(
+            request,
+            prefix="experience",
+            field="description",
+            enhance_function=enhance_resume_experience,
+        )
 
-    # QUOTA: Increment enhance counter on success
-    if response.status_code == 200:
+    # QUOTA: Increment enhance counter on success, unless the result was shared
+    # with an identical in-flight request (double-click, retry) already charged
+    if response.status_code == 200 and not shared["shared"]:
         profile.enhance_count += 1
         profile.save()
 
@@ -839,21 +830,117 @@ def enhance_project(request):
             status=403,
         )
 
-    response = enhance_field(
-        request,
-        prefix="project",
-        field="description",
-        enhance_function=enhance_project_description,
-    )
+    with track_shared_calls() as shared:
+        response = enhance_field(
+            request,
+            prefix="project",
+            field="description",
+            enhance_function=enhance_project_description,
+        )
 
-    # QUOTA: Increment enhance counter on success
-    if response.status_code == 200:
+    # QUOTA: Increment enhance counter on success, unless the result was shared
+    # with an identical in-flight request (double-click, retry) already charged
+    if response.status_code == 200 and not shared["shared"]:
         profile.enhance_count += 1
         profile.save()
 
     return response
 
 
+ENHANCE_ALL_FUNCTIONS = {
+    "experience": enhance_resume_experience,
+    "project": enhance_project_description,
+}
+ENHANCE_ALL_FIELD_RE = re.compile(r"^(experience|project)-(\d+)-description$")
+
+
+@login_required
+@require_http_methods(["POST"])
+def enhance_all(request):
+    """
+    Enhances every non-empty experience and project description in one request.
+
+    Entries are sent to the LLM concurrently (capped by ENHANCE_BATCH_SETTINGS),
+    so the wall time is about that of the slowest entry rather than the sum.
+
+    QUOTA: The whole batch must fit in the remaining enhance quota; the counter
+    is charged once per successfully enhanced entry, except for results shared
+    with an identical concurrent call.
+
+    Returns:
+        JsonResponse: {"fields": {field_name: enhanced_text}, "failed": [field_name],
+        "enhanced_count": int}
+    """
+    batch_cfg = settings.ENHANCE_BATCH_SETTINGS
+
+    entries = []
+    for name, value in request.POST.items():
+        match = ENHANCE_ALL_FIELD_RE.match(name)
+        if match and value.strip():
+            entries.append((match.group(1), int(match.group(2)), name, value))
+    entries.sort(key=lambda entry: (entry[0], entry[1]))
+
+    if not entries:
+        return JsonResponse({"error": "Nothing to enhance."}, status=400)
+    if len(entries) > batch_cfg["max_entries"]:
+        return JsonResponse(
+            {
+                "error": f"Too many entries. At most {batch_cfg['max_entries']} descriptions can be enhanced at once."
+            },
+            status=400,
+        )
+
+    # QUOTA: Check enhance limit for the whole batch up front
+    profile = request.user.profile
+    if not profile.can_enhance():
+        return JsonResponse(
+            {
+                "error": "Monthly AI enhancement limit reached. Free plan allows 10 enhancements per month."
+            },
+            status=403,
+        )
+    if not profile.is_pro():
+        remaining = settings.FREE_TIER_LIMITS["enhance_count"] - profile.enhance_count
+        if len(entries) > remaining:
+            return JsonResponse(
+                {
+                    "error": f"Not enough AI enhancements left for {len(entries)} entries ({remaining} remaining this month)."
+                },
+                status=403,
+            )
+
+    with track_shared_calls() as shared:
+        results = run_concurrently(
+            [
+                partial(ENHANCE_ALL_FUNCTIONS[prefix], value)
+                for prefix, _, _, value in entries
+            ],
+            max_workers=batch_cfg["max_concurrency"],
+        )
+
+    fields = {}
+    failed = []
+    for (_, _, name, _), enhanced_text in zip(entries, results):
+        if is_error_response(enhanced_text):
+            logger.warning("enhance_all: %s failed: %s", name, enhanced_text)
+            failed.append(name)
+        else:
+            fields[name] = _format_enhanced_text(enhanced_text)
+
+    # QUOTA: Increment enhance counter per enhanced entry; results shared with
+    # an identical in-flight call are not charged again
+    charged = max(0, len(fields) - shared["shared"])
+    if charged:
+        profile.enhance_count += charged
+        profile.save()
+
+    status = 200 if fields else 503
+    return JsonResponse(
+        {"fields": fields, "failed": failed, "enhanced_count": len(fields)},
+        status=status,
+    )
+
+
 @login_required
 @require_http_methods(["POST"])
 def preview_resume_form(request):
@@ -953,110 +1040,141 @@ def preview_resume_form(request):
         )
 
 
-@login_required
-def upload_cv(request):
-    if request.method == "POST":
-        # QUOTA: Check resume creation limit (PDF upload with AI parsing counts toward resume limit)
-        profile = request.user.profile
-        if not profile.can_create_resume():
-            return JsonResponse(
-                {
-                    "error": f"Resume limit reached. Free plan allows {settings.FREE_TIER_LIMITS['resume_count']} resumes. Upgrade to Pro for unlimited resumes."
-                },
-                status=403,
-            )
-
-        # QUOTA: Check import limit
-        if not profile.can_import():
-            return JsonResponse(
-                {
-                    "error": "Monthly PDF import limit reached. Free plan allows 2 imports per month."
-                },
-                status=403,
-            )
+def _quota_error_for_import(profile, charge_import=True):
+    """Returns a 403 JsonResponse if the user can't import another resume, else None."""
+    # QUOTA: Check resume creation limit (PDF upload with AI parsing counts toward resume limit)
+    if not profile.can_create_resume():
+        return JsonResponse(
+            {
+                "error": f"Resume limit reached. Free plan allows {settings.FREE_TIER_LIMITS['resume_count']} resumes. Upgrade to Pro for unlimited resumes."
+            },
+            status=403,
+        )
 
-        cv_file = request.FILES.get("cv_file")
-        if not cv_file:
-            return JsonResponse({"error": "No file uploaded."}, status=400)
-        logger.info("CV file uploaded: %s", cv_file.name)
+    # QUOTA: Check import limit
+    if charge_import and not profile.can_import():
+        return JsonResponse(
+            {
+                "error": "Monthly PDF import limit reached. Free plan allows 2 imports per month."
+            },
+            status=403,
+        )
+    return None
 
-        # Ensure the uploaded file is a PDF
-        if not cv_file.name.endswith(".pdf"):
-            return JsonResponse({"error": "Only PDF files are allowed."}, status=400)
 
-        # SECURITY: File size limit (5MB)
-        if cv_file.size > 5 * 1024 * 1024:
-            return JsonResponse(
-                {"error": "File too large. Maximum size is 5MB."}, status=400
-            )
+def _job_accepted_response(job):
+    return JsonResponse(
+        {
+            "status": job.status,
+            "job_id": job.pk,
+            "status_url": reverse("resume:import_job_status", args=[job.pk]),
+            "retry_url": reverse("resume:retry_import_job", args=[job.pk]),
+        },
+        status=202,
+    )
 
-        # Extract data from the PDF
-        reader = PdfReader(cv_file)
-        extracted_text = " ".join((page.extract_text() or "") for page in reader.pages)
 
-        # Guard: minimum text length before calling OpenAI
-        if len(extracted_text.strip()) < 50:
-            return JsonResponse(
-                {
-                    "error": "Could not extract enough text from this PDF. Please ensure it contains readable text (not a scanned image)."
-                },
-                status=422,
-            )
+def _import_uploaded_pdf(request, uploaded_file, source):
+    """
+    Starts a background import of an uploaded PDF.
 
-        start_time = datetime.now()
-        extracted_json_string = extract_resume_data(extracted_text)
-        logger.info("OpenAI API response time: %s", datetime.now() - start_time)
+    The upload is spooled to disk and hashed first. A file this user already
+    imported is answered from its ResumeImport row: the existing resume is
+    returned (or recreated from the stored JSON if it was deleted) without
+    parsing the PDF, calling the LLM or charging the import quota again, and a
+    resubmit while the first import is still running returns that job.
 
-        # Check for API Errors
-        if extracted_json_string.startswith(
-            "OpenAI API"
-        ) or extracted_json_string.startswith("Error:"):
-            return JsonResponse(
-                {"error": f"AI Service Error: {extracted_json_string}"}, status=503
-            )
+    Returns:
+        JsonResponse: 202 {"status", "job_id", "status_url", "retry_url"} for a
+        new job,
+        200 {"status": "success", "resume_id", "duplicate": true} for a known
+        file, or {"error": str} with a 4xx status.
+    """
+    logger.info("%s file uploaded: %s", source, uploaded_file.name)
 
-        # Clean up JSON string (remove markdown code blocks)
-        if "```json" in extracted_json_string:
-            extracted_json_string = (
-                extracted_json_string.split("```json")[1].split("```")[0].strip()
-            )
-        elif "```" in extracted_json_string:
-            extracted_json_string = extracted_json_string.split("```")[1].strip()
+    # Ensure the uploaded file is a PDF
+    if not uploaded_file.name.endswith(".pdf"):
+        return JsonResponse({"error": "Only PDF files are allowed."}, status=400)
 
-        extracted_json_string = extracted_json_string.strip()
+    # SECURITY: File size limit (5MB)
+    if uploaded_file.size > 5 * 1024 * 1024:
+        return JsonResponse(
+            {"error": "File too large. Maximum size is 5MB."}, status=400
+        )
 
-        try:
-            extracted_json = json.loads(extracted_json_string)
+    profile = request.user.profile
 
-            # Check for parse failure from validation layer
-            if extracted_json.get("parse_error"):
+    with spool_upload(uploaded_file) as upload:
+        record = ResumeImport.objects.filter(
+            user=request.user, source=source, content_hash=upload.sha256
+        ).first()
+
+        if record and record.parsed_json is not None:
+            if record.resume_id:
+                logger.info(
+                    "Duplicate upload %s, reusing resume %s",
+                    upload.sha256[:12],
+                    record.resume_id,
+                )
                 return JsonResponse(
-                    {
-                        "error": extracted_json.get(
-                            "message", "Could not extract resume data."
-                        )
-                    },
-                    status=422,
+                    {"status": "success", "resume_id": record.resume_id, "duplicate": True}
                 )
-
-            # Save to Database instead of Session
+            # Resume was deleted since; rebuild it from the stored JSON.
+            quota_error = _quota_error_for_import(profile, charge_import=False)
+            if quota_error:
+                return quota_error
             resume = Resume.objects.create(
                 user=request.user,
-                title=_auto_title_from_content(extracted_json),
-                content=extracted_json,
+                title=auto_title_from_content(
+                    record.parsed_json, prefix=TITLE_PREFIXES[source]
+                ),
+                content=record.parsed_json,
+            )
+            record.resume = resume
+            record.save(update_fields=["resume", "updated_at"])
+            return JsonResponse(
+                {"status": "success", "resume_id": resume.pk, "duplicate": True}
             )
 
-            # QUOTA: Increment counters
-            profile = request.user.profile
-            profile.import_count += 1
-            profile.save()
+        if record:
+            running = next(
+                (job for job in record.jobs.all() if job.is_active and not is_stale(job)),
+                None,
+            )
+            if running:
+                return _job_accepted_response(running)
+
+        quota_error = _quota_error_for_import(profile)
+        if quota_error:
+            return quota_error
 
-            # Return resume ID for frontend redirect (AJAX-friendly)
-            return JsonResponse({"status": "success", "resume_id": resume.pk})
+        if record is None:
+            record, _ = ResumeImport.objects.get_or_create(
+                user=request.user,
+                source=source,
+                content_hash=upload.sha256,
+                defaults={"file_name": uploaded_file.name},
+            )
+
+        job = ImportJob(user=request.user, import_record=record)
+        if not record.extracted_text:
+            with open(upload.path, "rb") as f:
+                job.upload.save(f"{upload.sha256}.pdf", File(f), save=False)
+        job.save()
+
+    enqueue_job(job)
+    job.refresh_from_db()
+    return _job_accepted_response(job)
 
-        except json.JSONDecodeError as e:
-            logger.error("Failed to decode JSON: %s", e)
-            return JsonResponse({"error": "Failed to parse extracted JSON"}, status=500)
+
+@login_required
+def upload_cv(request):
+    if request.method == "POST":
+        cv_file = request.FILES.get("cv_file")
+        if not cv_file:
+            return JsonResponse({"error": "No file uploaded."}, status=400)
+
+        return _import_uploaded_pdf(request, cv_file, source=ResumeImport.SOURCE_PDF)
 
     return redirect("resume:index")
 
@@ -1064,94 +1182,96 @@ def upload_cv(request):
 @login_required
 def upload_linkedin_cv(request):
     if request.method == "POST" and request.FILES.get("linkedin_file"):
-        # QUOTA: Check resume creation limit (PDF upload with AI parsing counts toward resume limit)
-        profile = request.user.profile
-        if not profile.can_create_resume():
-            return JsonResponse(
-                {
-                    "error": f"Resume limit reached. Free plan allows {settings.FREE_TIER_LIMITS['resume_count']} resumes. Upgrade to Pro for unlimited resumes."
-                },
-                status=403,
-            )
-
-        # QUOTA: Check import limit
-        if not profile.can_import():
-            return JsonResponse(
-                {
-                    "error": "Monthly PDF import limit reached. Free plan allows 2 imports per month."
-                },
-                status=403,
-            )
+        return _import_uploaded_pdf(
+            request,
+            request.FILES["linkedin_file"],
+            source=ResumeImport.SOURCE_LINKEDIN,
+        )
 
-        linkedin_file = request.FILES["linkedin_file"]
-        logger.info("LinkedIn file uploaded: %s", linkedin_file.name)
+    return redirect("resume:index")
 
-        if not linkedin_file.name.endswith(".pdf"):
-            return JsonResponse({"error": "Only PDF files are allowed."}, status=400)
 
-        # SECURITY: File size limit (5MB)
-        if linkedin_file.size > 5 * 1024 * 1024:
-            return JsonResponse(
-                {"error": "File too large. Maximum size is 5MB."}, status=400
-            )
+@login_required
+@require_http_methods(["POST"])
+def bulk_import(request):
+    """
+    Imports several resume PDFs at once, one background import job per new file.
 
-        reader = PdfReader(linkedin_file)
-        extracted_text = " ".join((page.extract_text() or "") for page in reader.pages)
+    Form fields:
+        files: PDFs and/or ZIP archives of PDFs (up to BULK_IMPORT["max_files"]).
+        source: "pdf" (default) or "linkedin".
 
-        # Guard: minimum text length before calling OpenAI
-        if len(extracted_text.strip()) < 50:
-            return JsonResponse(
-                {
-                    "error": "Could not extract enough text from this PDF. Please ensure it contains readable text (not a scanned image)."
-                },
-                status=422,
-            )
+    Returns:
+        JsonResponse: {"queued", "duplicates", "rejected", "jobs", "results": [per
+        file]}, with status 202 when jobs were queued. Poll each job through
+        import_job_status.
+    """
+    source = request.POST.get("source", ResumeImport.SOURCE_PDF)
+    if source not in dict(ResumeImport.SOURCE_CHOICES):
+        return JsonResponse({"error": "Invalid source."}, status=400)
+    files = request.FILES.getlist("files")
+    if not files:
+        return JsonResponse({"error": "No files uploaded."}, status=400)
 
-        start_time = datetime.now()
-        extracted_json_string = extract_linkedin_resume_data(extracted_text)
-        logger.info("OpenAI API response time: %s", datetime.now() - start_time)
+    try:
+        result = run_bulk_import(request.user, files, source=source)
+    except BulkImportError as e:
+        return JsonResponse({"error": str(e)}, status=e.status)
+    return JsonResponse(result.as_dict(), status=202 if result.job_ids else 200)
 
-        # Check for API Errors
-        if extracted_json_string.startswith(
-            "OpenAI API"
-        ) or extracted_json_string.startswith("Error:"):
-            return JsonResponse(
-                {"error": f"AI Service Error: {extracted_json_string}"}, status=503
-            )
 
-        # Clean up JSON string (remove markdown code blocks)
-        if "```json" in extracted_json_string:
-            extracted_json_string = (
-                extracted_json_string.split("```json")[1].split("```")[0].strip()
-            )
-        elif "```" in extracted_json_string:
-            extracted_json_string = extracted_json_string.split("```")[1].strip()
-
-        extracted_json_string = extracted_json_string.strip()
+@login_required
+@require_http_methods(["GET"])
+def import_job_status(request, pk):
+    """
+    Progress of a background import job.
 
-        try:
-            extracted_json = json.loads(extracted_json_string)
+    Query params:
+        since (int): Index of the first stage event to return; pass the
+                     previous response's "next_event" to get only new events.
+    """
+    job = ImportJob.objects.filter(pk=pk, user=request.user).first()
+    if job is None:
+        return JsonResponse({"error": "Import job not found."}, status=404)
 
-            # Save to Database
-            resume = Resume.objects.create(
-                user=request.user,
-                title=_auto_title_from_content(extracted_json, prefix="LinkedIn"),
-                content=extracted_json,
-            )
+    try:
+        since = max(0, int(request.GET.get("since", 0)))
+    except ValueError:
+        since = 0
+    return JsonResponse(job_payload(job, since=since))
 
-            # QUOTA: Increment import counter
-            profile = request.user.profile
-            profile.import_count += 1
-            profile.save()
 
-            # Return resume ID for frontend redirect (AJAX-friendly)
-            return JsonResponse({"status": "success", "resume_id": resume.pk})
+@login_required
+@require_http_methods(["POST"])
+def retry_import_job(request, pk):
+    """Re-runs a failed import job from its first unfinished stage."""
+    job = (
+        ImportJob.objects.select_related("import_record")
+        .filter(pk=pk, user=request.user)
+        .first()
+    )
+    if job is None:
+        return JsonResponse({"error": "Import job not found."}, status=404)
+    if not is_retryable(job):
+        return JsonResponse(
+            {"error": f"Import job is {job.status} and cannot be retried."}, status=409
+        )
 
-        except json.JSONDecodeError as e:
-            logger.error("Failed to decode JSON: %s", e)
-            return JsonResponse({"error": "Failed to parse extracted JSON"}, status=500)
+    record = job.import_record
+    if not record.extracted_text and not job.upload:
+        return JsonResponse(
+            {"error": "The uploaded file is no longer available. Please upload it again."},
+            status=410,
+        )
+    quota_error = _quota_error_for_import(
+        request.user.profile, charge_import=record.parsed_json is None
+    )
+    if quota_error:
+        return quota_error
 
-    return redirect("resume:index")
+    retry_job(job)
+    job.refresh_from_db()
+    return _job_accepted_response(job)
 
 
 @login_required
@@ -1377,8 +1497,11 @@ def preview_saved_resume(request, pk):
 @require_http_methods(["POST"])
 def agent_chat(request):
     """
-    JSON in:  {message, history, builder_state, active_resume_id}
+    JSON in:  {message, history, builder_state, active_resume_id, intent?}
     JSON out: {type, message, ...extra fields, active_resume_id?}
+
+    `intent` is the {intent, params, lang} payload of a clicked quick reply;
+    it skips classification.
     """
     from django.core.cache import cache
     from resume.services.agent_service import agent_service
@@ -1464,31 +1587,48 @@ def agent_chat(request):
         result = agent_service.handle_builder_step(message, builder_state, request.user)
     else:
         classified = agent_service.classify_intent(
-            message, context, active_resume=active_resume
+            message,
+            context,
+            active_resume=active_resume,
+            intent_payload=data.get("intent"),
+            user=request.user,
         )
         lang = classified.get("lang", "en")
         llm_msg = classified.pop("llm_message", None)
-        result = agent_service.execute_intent(
-            classified["intent"],
-            classified.get("params", {}),
-            request.user,
-            lang=lang,
-            builder_state=builder_state,
-            active_resume=active_resume,
-            user_message=message,
-        )
+        if classified.get("steps"):
+            # Several actions in one message: run them all in this turn.
+            result = agent_service.execute_plan(
+                classified["steps"],
+                request.user,
+                lang=lang,
+                active_resume=active_resume,
+                user_message=message,
+            )
+        else:
+            result = agent_service.execute_intent(
+                classified["intent"],
+                classified.get("params", {}),
+                request.user,
+                lang=lang,
+                builder_state=builder_state,
+                active_resume=active_resume,
+                user_message=message,
+            )
         if llm_msg and result.get("type") == "chat" and not result.get("message"):
             result["message"] = llm_msg
 
     # Propagate active_resume_id to frontend so it stays in sync.
     # For modify_resume / preview, update the active resume to the one that was acted on.
-    if result.get("type") in (
-        "modify_resume",
-        "preview",
-        "analyze_resume",
-        "switch_template",
-    ) and result.get("resume_id"):
-        result["active_resume_id"] = result["resume_id"]
+    acted_on_types = ("modify_resume", "preview", "analyze_resume", "switch_template")
+    acted_on = [result]
+    if result.get("type") == "plan":
+        acted_on = result["results"][::-1]  # the last step's resume wins
+    acted_on = next(
+        (r for r in acted_on if r.get("type") in acted_on_types and r.get("resume_id")),
+        None,
+    )
+    if acted_on:
+        result["active_resume_id"] = acted_on["resume_id"]
     elif active_resume_id and result.get("type") not in ("redirect", "multi_step"):
         # Keep existing active resume unless we're navigating away
         result["active_resume_id"] = active_resume_id
@@ -1500,6 +1640,74 @@ def agent_chat(request):
     return JsonResponse({**result, "user_message": message})
 
 
+@login_required
+@require_http_methods(["GET"])
+def analysis_suggestions(request, pk):
+    """
+    LLM suggestions for an analyze_resume answer sent with pending_suggestions.
+
+    Query params:
+        lang (str): Language of the analysis, "en" (default) or "tr".
+        token (str): One-use token from the answer's suggestions_url.
+    Returns {top_suggestions, message}; 403 for a missing or used token, 503
+    when the LLM gave no usable answer (the local suggestions stand).
+    """
+    from resume.services.agent_service import agent_service
+
+    resume = Resume.objects.filter(pk=pk, user=request.user).first()
+    if resume is None:
+        return JsonResponse({"error": "Resume not found."}, status=404)
+    if not agent_service.claim_followup(
+        request.user, "analysis_suggestions", [pk], request.GET.get("token", "")
+    ):
+        return JsonResponse(
+            {"error": "This link has expired. Ask for an analysis again."}, status=403
+        )
+
+    lang = "tr" if request.GET.get("lang") == "tr" else "en"
+    advice = agent_service.analysis_suggestions(resume, lang)
+    if not advice:
+        return JsonResponse({"error": "No suggestions available."}, status=503)
+    return JsonResponse(
+        {
+            "top_suggestions": advice["top_suggestions"],
+            "message": advice.get("response_message") or "",
+        }
+    )
+
+
+@login_required
+@require_http_methods(["GET"])
+def compare_summary(request, pk1, pk2):
+    """
+    LLM summary for a compare_resumes answer sent with pending_summary.
+
+    Query params:
+        lang (str): Language of the comparison, "en" (default) or "tr".
+        token (str): One-use token from the answer's summary_url.
+    Returns {message}; 403 for a missing or used token, 503 when the LLM gave
+    no usable answer (the diff stands on its own).
+    """
+    from resume.services.agent_service import agent_service
+
+    resumes = Resume.objects.filter(user=request.user).in_bulk([pk1, pk2])
+    if pk1 not in resumes or pk2 not in resumes:
+        return JsonResponse({"error": "Resume not found."}, status=404)
+    if not agent_service.claim_followup(
+        request.user, "compare_summary", [pk1, pk2], request.GET.get("token", "")
+    ):
+        return JsonResponse(
+            {"error": "This link has expired. Ask for the comparison again."},
+            status=403,
+        )
+
+    lang = "tr" if request.GET.get("lang") == "tr" else "en"
+    message = agent_service.compare_summary(resumes[pk1], resumes[pk2], lang)
+    if not message:
+        return JsonResponse({"error": "No summary available."}, status=503)
+    return JsonResponse({"message": message})
+
+
 # ---------------------------------------------------------------------------
 # Agentic dashboard — toggle UI mode
 # ---------------------------------------------------------------------------